@@ -0,0 +1,285 @@
+"""
+Kernel autotuning.
+
+tune_matmul(M, K, N, hardware_config) picks the fastest schedule of the
+generated tiled matmul (npu_model.kernels) for one shape:
+  1. every MatmulVariant (loop order, cached group size, MXU assignment) the
+     shape fits is generated, unscheduled
+  2. each is given an analytical lower bound: the busiest resource among
+     single-issue dispatch, each execution unit (sum of its latencies) and
+     the DMA engine (sum of its transfer times)
+  3. each is scheduled and its cycles predicted by the static estimator
+     (npu_model.estimator), without simulating
+  4. the `keep` variants with the smallest prediction are simulated in
+     parallel against the golden result of random inputs
+  5. the fastest correct one wins and is recorded in a TuningDatabase
+
+tune_attention(q_rows, k_seq, hardware_config) runs the same search over
+the fused attention kernel's AttentionVariants (the MXU of each of its two
+matmuls, single or double buffering), checked at the tolerance of the
+hand-written attention kernels.
+
+A TuningDatabase is a JSON file keyed by hardware config, kernel and shape;
+a shape already in it is rebuilt from the recorded variant without
+simulating anything.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Sequence, TypeVar
+
+from .delay_tuner import CandidateCheck, evaluate_candidate
+from .estimator import estimate_instructions
+from .hardware.config import HardwareConfig
+from .hardware.dma import dma_transfer_cycles
+from .isa import Instruction
+from .isa_types import EXU
+from .kernels import AttentionVariant, KernelBuilder, MatmulVariant, build_attention, build_matmul
+from .kernels.library import ATTENTION_TOLERANCE
+from .kernels.matmul import NUM_ACCUMULATORS
+from .scheduler import instruction_latency
+from .software.program import EncodedProgram, InstantiableProgram, Program
+
+ORDERS = ("mn", "nm")
+MXU_ASSIGNMENTS: tuple[tuple[int, ...], ...] = ((0,), (1,), (0, 1))
+
+Variant = TypeVar("Variant", MatmulVariant, AttentionVariant)
+
+
+@dataclass
+class Candidate:
+    variant: MatmulVariant | AttentionVariant
+    estimate: int
+    """ Analytical lower bound on the cycle count. """
+    predicted: int | None = None
+    """ Static estimate of the scheduled kernel; candidates are ranked by it. """
+    cycles: int | None = None
+    """ Simulated cycle count; None if pruned or failed. """
+    error: str = ""
+
+
+@dataclass
+class TuningResult:
+    key: str
+    variant: MatmulVariant | AttentionVariant
+    cycles: int
+    program: InstantiableProgram
+    """ The tuned kernel with random inputs and their golden result. """
+    candidates: list[Candidate] = field(default_factory=list)
+    cached: bool = False
+    """ True if the variant came from the tuning database. """
+
+
+class TuningDatabase:
+    """Best variant per (hardware config, kernel, shape), kept in a JSON file."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = None if path is None else Path(path)
+        self.entries: dict[str, dict] = {}
+        if self.path is not None and self.path.exists():
+            self.entries = json.loads(self.path.read_text())
+
+    def get(self, key: str) -> dict | None:
+        return self.entries.get(key)
+
+    def put(self, key: str, entry: dict) -> None:
+        self.entries[key] = entry
+        self.save()
+
+    def save(self) -> None:
+        if self.path is not None:
+            self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + "\n")
+
+
+def matmul_key(M: int, K: int, N: int, hardware_config: HardwareConfig) -> str:
+    return f"{hardware_config.name}/matmul/{M}x{K}x{N}"
+
+
+def attention_key(q_rows: int, k_seq: int, head_dim: int, hardware_config: HardwareConfig) -> str:
+    return f"{hardware_config.name}/attention/q{q_rows}_k{k_seq}_d{head_dim}"
+
+
+def matmul_variants() -> list[MatmulVariant]:
+    return [
+        MatmulVariant(order=order, reuse=reuse, mxus=mxus)
+        for order, reuse, mxus in itertools.product(ORDERS, range(1, NUM_ACCUMULATORS + 1), MXU_ASSIGNMENTS)
+    ]
+
+
+def attention_variants() -> list[AttentionVariant]:
+    return [
+        AttentionVariant(score_mxu=score, value_mxu=value, double_buffer=double)
+        for score, value, double in itertools.product((0, 1), (0, 1), (True, False))
+    ]
+
+
+def estimate_cycles(builder: KernelBuilder) -> int:
+    """Lower bound on the cycles of a generated kernel, assuming perfect overlap."""
+    busy: Counter[EXU] = Counter()
+    for insn in builder.instructions:
+        if insn.exu != EXU.DMA:
+            busy[insn.exu] += instruction_latency(insn)
+    busy[EXU.DMA] = sum(dma_transfer_cycles(builder.hardware_config, n) for n in builder.transfer_bytes)
+    return max(len(builder.instructions), *busy.values())
+
+
+def _simulate(program: Program, check: CandidateCheck) -> tuple[int | None, str]:
+    outcome = evaluate_candidate(program, check)
+    return (outcome.cycles, "") if outcome.ok else (None, outcome.reason)
+
+
+def _tune(
+    key: str,
+    kernel: str,
+    variants: Sequence[Variant],
+    build: Callable[[Variant], KernelBuilder],
+    check: CandidateCheck,
+    database: TuningDatabase | None,
+    keep: int,
+    workers: int | None,
+) -> TuningResult:
+    """Steps 2-5 of the search (see the module docstring) for one shape."""
+    scheduled: dict[Variant, list[Instruction]] = {}
+    candidates: list[Candidate] = []
+    errors: list[str] = []
+    for variant in variants:
+        try:
+            builder = build(variant)
+        except ValueError as exc:
+            errors.append(f"{variant.label}: {exc}")
+            continue
+        scheduled[variant] = builder.build(schedule=True)
+        predicted = estimate_instructions(scheduled[variant], check.hardware_config).cycles
+        candidates.append(Candidate(variant, estimate_cycles(builder), predicted))
+    if not candidates:
+        raise ValueError(f"No {kernel} variant fits: " + "; ".join(errors))
+    candidates.sort(key=lambda c: (c.predicted, c.estimate))
+
+    survivors = candidates[:keep]
+    workers = min(workers or os.cpu_count() or 1, len(survivors))
+    pool: Executor | None = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        jobs = [EncodedProgram.from_instructions(scheduled[c.variant]) for c in survivors]
+        if pool is None:
+            outcomes = [_simulate(job, check) for job in jobs]
+        else:
+            outcomes = list(pool.map(_simulate, jobs, [check] * len(jobs)))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    for candidate, (cycles, error) in zip(survivors, outcomes):
+        candidate.cycles, candidate.error = cycles, error
+
+    simulated = [c for c in survivors if c.cycles is not None]
+    if not simulated:
+        raise ValueError(
+            f"No {kernel} variant ran correctly: "
+            + "; ".join(f"{c.variant.label}: {c.error}" for c in survivors)
+        )
+    best = min(simulated, key=lambda c: (c.cycles, c.estimate))
+    assert best.cycles is not None
+    if database is not None:
+        database.put(key, {"variant": asdict(best.variant), "cycles": best.cycles, "estimate": best.estimate})
+    program = InstantiableProgram(scheduled[best.variant])
+    program.memory_regions = check.memory_regions
+    program.golden_result = check.golden_result
+    return TuningResult(key, best.variant, best.cycles, program, candidates)
+
+
+def tune_matmul(
+    M: int,
+    K: int,
+    N: int,
+    hardware_config: HardwareConfig,
+    database: TuningDatabase | None = None,
+    keep: int = 4,
+    workers: int | None = None,
+    max_cycles: int = 1_000_000,
+    seed: int = 0,
+) -> TuningResult:
+    """
+    Find the fastest generated M×K×N matmul.
+
+    Raises:
+        ValueError: if no variant fits the shape or none simulates correctly.
+    """
+    # imported here: the program configs import the hardware, which must load first
+    from .configs.programs.parameterized_matmul import _make_program
+
+    key = matmul_key(M, K, N, hardware_config)
+    regions, golden = _make_program(M, K, N, seed)
+
+    def build(variant: MatmulVariant) -> KernelBuilder:
+        return build_matmul(M, K, N, hardware_config, variant=variant)
+
+    entry = database.get(key) if database is not None else None
+    if entry is not None:
+        variant = MatmulVariant(**{**entry["variant"], "mxus": tuple(entry["variant"]["mxus"])})
+        program = InstantiableProgram(build(variant).build())
+        program.memory_regions = regions
+        program.golden_result = golden
+        return TuningResult(key, variant, entry["cycles"], program, cached=True)
+
+    check = CandidateCheck(
+        hardware_config=hardware_config,
+        memory_regions=regions,
+        golden_result=golden,
+        tolerance=(0.0, 0.0),
+        max_cycles=max_cycles,
+    )
+    return _tune(key, f"{M}x{K}x{N} matmul", matmul_variants(), build, check, database, keep, workers)
+
+
+def tune_attention(
+    q_rows: int,
+    k_seq: int,
+    hardware_config: HardwareConfig,
+    head_dim: int = 64,
+    database: TuningDatabase | None = None,
+    keep: int = 4,
+    workers: int | None = None,
+    max_cycles: int = 1_000_000,
+    seed: int = 0,
+) -> TuningResult:
+    """
+    Find the fastest generated fused attention over q_rows queries and
+    k_seq keys.  Results are checked at the hand-written kernels' tolerance.
+
+    Raises:
+        ValueError: if no variant fits the shape or none simulates correctly.
+    """
+    from .configs.programs.parameterized_fused_attention import _make_attn_program
+
+    key = attention_key(q_rows, k_seq, head_dim, hardware_config)
+    regions, golden = _make_attn_program(q_rows, k_seq, seed, HEAD_DIM=head_dim)
+
+    def build(variant: AttentionVariant) -> KernelBuilder:
+        return build_attention(q_rows, k_seq, hardware_config, head_dim, variant=variant)
+
+    entry = database.get(key) if database is not None else None
+    if entry is not None:
+        variant = AttentionVariant(**entry["variant"])
+        program = InstantiableProgram(build(variant).build())
+        program.memory_regions = regions
+        program.golden_result = golden
+        program.kernel_tolerance = ATTENTION_TOLERANCE
+        return TuningResult(key, variant, entry["cycles"], program, cached=True)
+
+    check = CandidateCheck(
+        hardware_config=hardware_config,
+        memory_regions=regions,
+        golden_result=golden,
+        tolerance=ATTENTION_TOLERANCE,
+        max_cycles=max_cycles,
+    )
+    shape = f"q{q_rows}/k{k_seq}/d{head_dim} attention"
+    result = _tune(key, shape, attention_variants(), build, check, database, keep, workers)
+    result.program.kernel_tolerance = ATTENTION_TOLERANCE
+    return result
@@ -0,0 +1,349 @@
+"""
+Instruction encoders and decoders compiled from the ISA registry.
+
+Every instruction format in isa.py lists the bit layout of its fields
+(`fields`).  When an instruction class is defined, compile_codec() folds the
+class's constants (opcode, funct3, constant operands such as ecall's imm)
+into one word and generates straight-line Python for the operands that
+remain: an encoder, a decoder and a constructor.  The generated expressions
+only use shifts and masks, so the same functions work on ints (one
+instruction) and on NumPy int64 columns (every instruction of a class at
+once), which is what encode_program(), decode_program() and
+validate_program() do.
+
+Word bits that no operand can set are fixed: an operand only owns as many
+bits as its type's range needs (a shamt takes 5 of the 12 immediate bits,
+an accumulator 1 of the 6 vd bits).  That is what tells srai from srli, and
+decoding checks every fixed bit.  Where one instruction's encodings are a
+subset of another's (dma.wait.chN is dma.config.chN x0), the one with more
+fixed bits is decoded.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Sequence
+
+from .isa_types import BoundedInt, Bundled
+from .util.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .isa import Instruction
+else:
+    # the linter and language server import the ISA without ever encoding
+    np = lazy_import("numpy")
+
+WORD_MASK = 0xFFFFFFFF
+OPCODE_MASK = 0x7F
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    An instruction field.  Each segment stores `width` value bits starting
+    at value bit `src` in the word starting at bit `dst`, so a field split
+    across the word (branch offsets) lists one segment per piece.
+    """
+
+    name: str
+    segments: tuple[tuple[int, int, int], ...]
+    """ (src, width, dst) """
+    signed: bool = False
+    """ Decoding sign-extends from the field's top bit. """
+
+    @property
+    def width(self) -> int:
+        return max(src + width for src, width, _ in self.segments)
+
+    def place(self, value: int) -> int:
+        """The word bits of *value* (ints only)."""
+        word = 0
+        for src, width, dst in self.segments:
+            word |= ((value >> src) & ((1 << width) - 1)) << dst
+        return word
+
+    def extract(self, word: int) -> int:
+        """The (unsigned) value *word* stores in the field (ints only)."""
+        value = 0
+        for src, width, dst in self.segments:
+            value |= ((word >> dst) & ((1 << width) - 1)) << src
+        return value
+
+    def narrowed(self, operand: type[BoundedInt]) -> Field:
+        """The field restricted to the bits *operand*'s range can set."""
+        if operand.lower_bound < 0:
+            return self
+        width = min(self.width, (operand.upper_bound - 1).bit_length())
+        segments = tuple(
+            (src, min(n, width - src), dst) for src, n, dst in self.segments if src < width
+        )
+        return Field(self.name, segments, False)
+
+
+def field(name: str, width: int, at: int, signed: bool = False) -> Field:
+    """A field stored contiguously: value bits [0, width) at word bit *at*."""
+    return Field(name, ((0, width, at),), signed)
+
+
+@dataclass(frozen=True)
+class Codec:
+    """The compiled encoding of one instruction class."""
+
+    cls: type[Instruction]
+    operands: tuple[Field, ...]
+    """ Fields set per instruction, narrowed to their operand types. """
+    declared: tuple[Field, ...]
+    """ The same fields as the format declares them. """
+    types: tuple[type[BoundedInt], ...]
+    mask: int
+    """ Word bits fixed for the class (every bit no operand owns). """
+    match: int
+    """ Their value: opcode, functs and constant fields. """
+    encode: Callable[..., Any]
+    """ encode(*operands) -> word; ints or int64 columns. """
+    encode_instruction: Callable[[Instruction], int]
+    decode: Callable[[Any], tuple[Any, ...]]
+    """ decode(word) -> operand values; an int or an int64 column. """
+    build: Callable[..., Instruction]
+    """ build(*operands) -> the instruction. """
+    source: str
+    """ The generated code, for debugging. """
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(f.name for f in self.operands)
+
+    def problems(self, values: Any) -> list[tuple[Any, str]]:
+        """
+        (rows, message) for operand columns that do not survive encoding.
+
+        *values* is an int64 array with one column per operand; rows is a
+        boolean mask of the offending rows.
+        """
+        found: list[tuple[Any, str]] = []
+        for column, f, declared in zip(values.T, self.operands, self.declared):
+            width = declared.width
+            lower = -(1 << (width - 1)) if declared.signed else 0
+            # like BoundedInt, a signed field also takes the unsigned range
+            out_of_range = (column < lower) | (column >= 1 << width)
+            if out_of_range.any():
+                found.append((out_of_range, f"{f.name} does not fit in {width} bits"))
+            # value bits the operand does not own must be the ones the word fixes
+            # (0, or srai's upper immediate)
+            others = ((1 << width) - 1) & ~f.extract(-1)
+            wrong = ~out_of_range & ((column & others) != declared.extract(self.match) & others)
+            if wrong.any():
+                found.append((wrong, f"{f.name} has bits its encoding cannot hold"))
+        return found
+
+
+def _operand_types(cls: type) -> dict[str, type[BoundedInt]]:
+    """Operand name -> type, from the class's instruction pattern."""
+    operands: dict[str, type[BoundedInt]] = {}
+    for param in getattr(cls, "params", []):
+        for named in (param.reg, param.imm) if isinstance(param, Bundled) else (param,):
+            operands[named.repr] = named.inner
+    return operands
+
+
+def _encode_expr(f: Field, value: str) -> list[str]:
+    terms: list[str] = []
+    for src, width, dst in f.segments:
+        bits = f"({value} >> {src})" if src else value
+        term = f"({bits} & 0x{(1 << width) - 1:x})"
+        terms.append(f"{term} << {dst}" if dst else term)
+    return terms
+
+
+def _decode_expr(f: Field) -> str:
+    terms: list[str] = []
+    for src, width, dst in f.segments:
+        term = f"((word >> {dst}) & 0x{(1 << width) - 1:x})"
+        terms.append(f"{term} << {src}" if src else term)
+    expr = " | ".join(terms)
+    if f.signed:
+        sign = 1 << (f.width - 1)
+        expr = f"((({expr}) ^ 0x{sign:x}) - 0x{sign:x})"
+    return expr
+
+
+def compile_codec(cls: type[Instruction], fields: Iterable[Field]) -> Codec:
+    """
+    Compile *cls*'s encoding from its format's *fields*.
+
+    Raises:
+        TypeError: if a constant of the class does not fit its field or
+            overlaps an operand.
+    """
+    fields = list(fields)
+    types = _operand_types(cls)
+    if missing := set(types) - {f.name for f in fields}:
+        raise TypeError(f"{cls.__name__}: no field encodes {', '.join(sorted(missing))}")
+    declared = sorted((f for f in fields if f.name in types), key=lambda f: list(types).index(f.name))
+    operands = [f.narrowed(types[f.name]) for f in declared]
+    constants = [(f, int(getattr(cls, f.name, 0))) for f in fields if f.name not in types]
+
+    owned = 0
+    for f in operands:
+        owned |= f.place(-1)
+    match = 0
+    for f, value in constants:
+        bits = f.place(value)
+        if value < 0 or value >= 1 << f.width or bits & owned:
+            raise TypeError(f"{cls.__name__}: {f.name}={value} does not fit its encoding")
+        match |= bits
+
+    names = [f.name for f in operands]
+    encode_expr = " | ".join([f"0x{match:08x}", *(t for f in operands for t in _encode_expr(f, f.name))])
+    instruction_expr = " | ".join([f"0x{match:08x}", *(t for f in operands for t in _encode_expr(f, f"insn.{f.name}"))])
+    args = ", ".join(names)
+    decoded = "".join(f"{_decode_expr(f)}, " for f in operands)
+    built = ", ".join(f"{name}=_t{i}({name})" for i, name in enumerate(names))
+    source = (
+        f"def encode({args}):\n    return {encode_expr}\n"
+        f"def encode_instruction(insn):\n    return {instruction_expr}\n"
+        f"def decode(word):\n    return ({decoded})\n"
+        f"def build({args}):\n    return _cls({built})\n"
+    )
+    namespace: dict[str, Any] = {"_cls": cls, **{f"_t{i}": types[name] for i, name in enumerate(names)}}
+    exec(compile(source, f"<codec {cls.__name__}>", "exec"), namespace)
+    return Codec(
+        cls,
+        tuple(operands),
+        tuple(declared),
+        tuple(types[name] for name in names),
+        WORD_MASK & ~owned,
+        match,
+        namespace["encode"],
+        namespace["encode_instruction"],
+        namespace["decode"],
+        namespace["build"],
+        source,
+    )
+
+
+# opcode -> codecs of the classes using it, most fixed bits first
+_by_opcode: dict[int, list[Codec]] = {}
+
+
+def register(codec: Codec) -> None:
+    """
+    Add *codec* to the decode table, replacing a class of the same mnemonic.
+
+    Raises:
+        TypeError: if another instruction already has the same encoding.
+    """
+    candidates = _by_opcode.setdefault(codec.match & OPCODE_MASK, [])
+    candidates[:] = [c for c in candidates if c.cls.mnemonic != codec.cls.mnemonic]
+    for other in candidates:
+        if (other.mask, other.match) == (codec.mask, codec.match):
+            raise TypeError(f"{codec.cls.__name__} has the same encoding as {other.cls.__name__}")
+    candidates.append(codec)
+    candidates.sort(key=lambda c: -c.mask.bit_count())
+
+
+def _columns(codec: Codec, instructions: Sequence[Instruction]) -> Any:
+    """The operand values of *instructions* (all of codec.cls) as an int64 array."""
+    if not codec.operands:
+        return np.empty((len(instructions), 0), dtype=np.int64)
+    values = list(map(attrgetter(*codec.names), instructions))
+    return np.array(values, dtype=np.int64).reshape(len(instructions), len(codec.operands))
+
+
+def _by_class(instructions: Sequence[Instruction]) -> dict[type, list[int]]:
+    groups: dict[type, list[int]] = {}
+    for index, insn in enumerate(instructions):
+        groups.setdefault(type(insn), []).append(index)
+    return groups
+
+
+def encode_program(instructions: Sequence[Instruction]) -> np.ndarray:
+    """The machine code of *instructions* as a uint32 array, one class at a time."""
+    words = np.empty(len(instructions), dtype=np.uint32)
+    for cls, indices in _by_class(instructions).items():
+        codec: Codec = cls.codec
+        columns = _columns(codec, [instructions[i] for i in indices])
+        words[indices] = codec.encode(*columns.T) if codec.operands else codec.match
+    return words
+
+
+def classify(words: Sequence[int] | np.ndarray) -> tuple[np.ndarray, list[Codec]]:
+    """
+    The instruction class of every word: (kinds, codecs), where
+    codecs[kinds[i]] decodes words[i].
+
+    Raises:
+        ValueError: if a word matches no instruction.
+    """
+    words = np.asarray(words, dtype=np.int64) & WORD_MASK
+    kinds = np.empty(len(words), dtype=np.uint16)
+    codecs: list[Codec] = []
+    opcodes = words & OPCODE_MASK
+    for opcode in np.unique(opcodes).tolist():
+        pending = np.flatnonzero(opcodes == opcode)
+        for codec in _by_opcode.get(opcode, ()):
+            hit = (words[pending] & codec.mask) == codec.match
+            if not hit.any():
+                continue
+            kinds[pending[hit]] = len(codecs)
+            codecs.append(codec)
+            pending = pending[~hit]
+        if pending.size:
+            index = int(pending[0])
+            raise ValueError(f"Word {index} (0x{int(words[index]):08x}) is not a valid instruction")
+    return kinds, codecs
+
+
+def decode_operands(words: Sequence[int] | np.ndarray, kinds: np.ndarray, codecs: Sequence[Codec]) -> np.ndarray:
+    """
+    The operand values of every word as an int64 array, one row per word
+    and one column per operand of its class (in Codec.names order), padded
+    with zeros to the widest class.
+    """
+    words = np.asarray(words, dtype=np.int64) & WORD_MASK
+    operands = np.zeros((len(words), max((len(c.operands) for c in codecs), default=0)), dtype=np.int64)
+    for kind, codec in enumerate(codecs):
+        rows = np.flatnonzero(kinds == kind)
+        if codec.operands and rows.size:
+            operands[rows, : len(codec.operands)] = np.stack(codec.decode(words[rows]), axis=1)
+    return operands
+
+
+def decode_program(words: Sequence[int] | np.ndarray) -> list[Instruction]:
+    """
+    Instructions from machine code.
+
+    Raises:
+        ValueError: if a word matches no instruction.
+    """
+    kinds, codecs = classify(words)
+    operands = decode_operands(words, kinds, codecs).tolist()
+    decoded: list[Instruction] = []
+    for kind, row in zip(kinds.tolist(), operands):
+        codec = codecs[kind]
+        decoded.append(codec.build(*row[: len(codec.operands)]))
+    return decoded
+
+
+def decode_word(word: int) -> Instruction:
+    """The instruction encoded by *word* (see decode_program)."""
+    return decode_program([word])[0]
+
+
+def validate_program(instructions: Sequence[Instruction]) -> list[tuple[int, str]]:
+    """
+    (index, message) for every operand that would not survive encoding.
+
+    Checks whole classes at once with array comparisons instead of
+    constructing and catching an exception per operand.
+    """
+    problems: list[tuple[int, str]] = []
+    for cls, indices in _by_class(instructions).items():
+        codec: Codec = cls.codec
+        columns = _columns(codec, [instructions[i] for i in indices])
+        for rows, message in codec.problems(columns):
+            problems.extend((indices[i], f"{cls.mnemonic}: {message}") for i in np.flatnonzero(rows).tolist())
+    return sorted(problems)
@@ -23,6 +23,7 @@ class DefaultHardwareConfig(HardwareConfig):
     mxu1_matmul_latency_cycles: int = 32
     vpu_simple_op_latency_cycles: int = 4
     vpu_non_pipelineable_op_latency_cycles: int = 16
+    vpu_max_in_flight: int = 8
     xlu_transform_latency_cycles: int = 4
     offchip_link_width_bits: int = 32
     offchip_link_core_cycles_per_beat: int = 2
@@ -30,6 +31,11 @@ class DefaultHardwareConfig(HardwareConfig):
     vmem_bus_width_bits: int = 512
     vmem_bus_core_cycles_per_beat: int = 1
     vmem_bytes_per_cycle: int = 64
+    imem_model: str = "ideal"
+    imem_size_bytes: int = 16 * 1024
+    icache_line_bytes: int = 64
+    icache_ways: int = 2
+    icache_miss_latency_cycles: int = 4
     execution_units: dict[str, str] = {
         "Scalar0": "ScalarExecutionUnit",
         "Matrix0": "MatrixExecutionUnitSystolic",
@@ -54,3 +60,35 @@ class FullDramHardwareConfig(DefaultHardwareConfig):
         dram_size=16 * 1024 * 1024 * 1024,
         vmem_size=1024 * 1024,
     )
+
+
+class PipelinedVpuHardwareConfig(DefaultHardwareConfig):
+    name: str = "SimpleNPUPipelinedVPU"
+    execution_units: dict[str, str] = {
+        "Scalar0": "ScalarExecutionUnit",
+        "Matrix0": "MatrixExecutionUnitSystolic",
+        "Matrix1": "MatrixExecutionUnitInner",
+        "Vector0": "PipelinedVectorExecutionUnit",
+        "DMA0": "DmaExecutionUnit",
+        "LSU": "LoadStoreUnit"
+    }
+
+
+# The kernels under configs/programs are scheduled for single issue: two
+# uops dispatched in one cycle can access the same bank, so wide dispatch
+# interlocks instead of raising.
+class DualIssueHardwareConfig(DefaultHardwareConfig):
+    name: str = "SimpleNPUDualIssue"
+    fetch_width: int = 2
+    bank_conflict_policy: str = "stall"
+
+
+class ICacheHardwareConfig(DefaultHardwareConfig):
+    name: str = "SimpleNPUICache"
+    imem_model: str = "cache"
+    imem_size_bytes: int = 4 * 1024
+
+
+class InterlockedHardwareConfig(DefaultHardwareConfig):
+    name: str = "SimpleNPUInterlocked"
+    bank_conflict_policy: str = "stall"
@@ -1,5 +1,4 @@
 from typing import TYPE_CHECKING
-import torch
 from npu_model.isa import (
     CSRType,
     IType,
@@ -48,8 +47,16 @@ from npu_model.isa_types import (
     EXU,
 )
 
+from npu_model.util.lazy_import import lazy_import
+
 if TYPE_CHECKING:
+    import torch
+
     from npu_model.hardware.arch_state import ArchState
+else:
+    # only the exec implementations need torch; the assembler, linter and
+    # language server import this module for the encodings alone
+    torch = lazy_import("torch")
 
 PIPELINE_LATENCY = 2
 
@@ -174,8 +174,7 @@ def fused_attention_golden(
     return torch.cat(out_parts, dim=0)
 
 
-def _make_attn_program(Q_ROWS: int, K_SEQ: int, seed: int):
-    HEAD_DIM = 64
+def _make_attn_program(Q_ROWS: int, K_SEQ: int, seed: int, HEAD_DIM: int = 64):
     K_TILES = K_SEQ // TILE
     Q_BLOCKS = Q_ROWS // TILE
     TILE_BYTES = TILE * HEAD_DIM * BF16
@@ -33,6 +33,8 @@ import torch
 from npu_model.software.program import Program, ASM_FOLDER
 from npu_model.util.converter import load_asm
 from npu_model.software.instruction import Instruction
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.kernels import double_buffered_matmul
 
 VMEM_A = 0x2000
 VMEM_B = 0x2400
@@ -181,3 +183,18 @@ class ParameterizedMatmul64x32x96Program(Program):
     instructions: list[Instruction] = load_asm(ASM_FOLDER / 'parameterized_matmul64x32x96.S')
     memory_regions: List[Tuple[int, torch.Tensor]] = _multi_regions
     golden_result: tuple[int, torch.Tensor] = _multi_golden
+
+
+# 64×64×64 again, generated with ping-pong DMA buffers
+
+class ParameterizedMatmulDoubleBufferedProgram(Program):
+    """64×64×64 fp8 matmul from npu_model.kernels.double_buffered_matmul."""
+
+    instructions: list[Instruction] = double_buffered_matmul(
+        M, K, N, DefaultHardwareConfig(), dram_a=DRAM_A, dram_b=DRAM_B, dram_c=DRAM_C
+    )
+    memory_regions: List[Tuple[int, torch.Tensor]] = [
+        (DRAM_A, INPUT_A_TILED),
+        (DRAM_B, INPUT_B_TILED),
+    ]
+    golden_result: tuple[int, torch.Tensor] = (DRAM_C, EXPECTED_DRAM)
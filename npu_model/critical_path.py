@@ -0,0 +1,243 @@
+"""
+Critical-path analysis over the executed instruction graph.
+
+Run a Simulation with record_graph=True, then call analyze_critical_path(sim).
+
+Every dispatched instruction becomes a node carrying its fetch, dispatch and
+completion cycles.  Edges point from an instruction to the ones it had to
+wait for:
+  - order  : the previously dispatched instruction (the IDU is in-order)
+  - mrf / vmem / weight / acc : the previous instruction touching the same
+             SRAM bank; concurrent accesses are bank conflicts, so the later
+             instruction cannot execute before the earlier one completes
+  - flag   : dma.wait.chN waits on the last DMA op issued on channel N
+
+Walking back from the last instruction to complete, each step follows the
+predecessor that became available last.  The cycles along that path are
+split into segments and attributed to the responsible instruction and unit:
+  - execute : dispatch to completion of an instruction on the path
+  - issue   : waiting for the previous instruction to dispatch (delays,
+              fetch bubbles and single-issue ordering)
+  - wait    : waiting for a bank or DMA-flag producer to complete
+  - start   : cycles before the first instruction on the path dispatched
+
+Only segments on the path lengthen the run; execution off the path is
+overlapped with it and reported per unit.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .hardware.bank_conflict import acc_buffer_accesses, mrf_accesses, weight_buffer_accesses
+from .isa_types import EXU
+
+if TYPE_CHECKING:
+    from .simulation import Simulation
+    from .software.instruction import Uop
+
+
+@dataclass
+class InstructionNode:
+    index: int
+    uop_id: int
+    pc: int
+    mnemonic: str
+    unit: str
+    fetch: int
+    dispatch: int
+    complete: int
+    preds: list[tuple[int, str]] = field(default_factory=list)
+    """ (node index, edge kind) of every instruction this one waited for. """
+
+    @property
+    def latency(self) -> int:
+        return self.complete - self.dispatch
+
+
+@dataclass
+class PathSegment:
+    node: int
+    kind: str
+    start: int
+    end: int
+    edge: str | None = None
+    """ Edge kind followed into this segment; None for execute / start. """
+
+    @property
+    def cycles(self) -> int:
+        return max(0, self.end - self.start)
+
+
+@dataclass
+class CriticalInstruction:
+    pc: int
+    mnemonic: str
+    unit: str
+    execute_cycles: int = 0
+    wait_cycles: int = 0
+    """ Issue, wait and start cycles spent before the instruction dispatched. """
+    occurrences: int = 0
+
+    @property
+    def cycles(self) -> int:
+        return self.execute_cycles + self.wait_cycles
+
+
+@dataclass
+class CriticalPath:
+    length: int
+    """ Completion cycle of the last instruction. """
+    nodes: list[InstructionNode]
+    segments: list[PathSegment]
+    """ Segments on the critical path in program order. """
+    instructions: list[CriticalInstruction]
+    """ Instructions on the path (aggregated by PC), most critical cycles first. """
+    unit_cycles: dict[str, int]
+    """ Critical execute cycles per unit, largest first. """
+    overlapped_cycles: dict[str, int]
+    """ Execute cycles per unit hidden under the critical path. """
+
+    @property
+    def path(self) -> list[InstructionNode]:
+        """Distinct instructions on the path in program order."""
+        seen: list[int] = []
+        for segment in self.segments:
+            if not seen or seen[-1] != segment.node:
+                seen.append(segment.node)
+        return [self.nodes[index] for index in seen]
+
+
+def build_execution_graph(
+    dispatch_log: list[tuple[Uop, str, frozenset[int]]],
+) -> list[InstructionNode]:
+    """Build the dynamic dependency graph from the IDU's dispatch log."""
+    nodes: list[InstructionNode] = []
+    last_access: dict[tuple[str, int], int] = {}
+    last_dma: dict[int, int] = {}
+
+    for index, (uop, unit, vmem_banks) in enumerate(dispatch_log):
+        insn = uop.insn
+        dispatch = uop.dispatch_cycle if uop.dispatch_cycle is not None else 0
+        node = InstructionNode(
+            index=index,
+            uop_id=uop.id,
+            pc=uop.pc,
+            mnemonic=insn.mnemonic,
+            unit=unit,
+            fetch=uop.fetch_cycle if uop.fetch_cycle is not None else dispatch,
+            dispatch=dispatch,
+            complete=uop.complete_cycle if uop.complete_cycle is not None else dispatch,
+        )
+        if index > 0:
+            node.preds.append((index - 1, "order"))
+
+        resources = (
+            [("mrf", int(bank)) for bank in mrf_accesses(insn)]
+            + [("vmem", bank) for bank in vmem_banks]
+            + [("weight", int(bank)) for bank in weight_buffer_accesses(insn)]
+            + [("acc", int(bank)) for bank in acc_buffer_accesses(insn)]
+        )
+        for resource in resources:
+            producer = last_access.get(resource)
+            if producer is not None and (producer, resource[0]) not in node.preds:
+                node.preds.append((producer, resource[0]))
+            last_access[resource] = index
+
+        if insn.exu == EXU.DMA:
+            channel = getattr(insn, "funct3")
+            if unit == "IDU":
+                # dma.wait is consumed in the IDU
+                producer = last_dma.get(channel)
+                if producer is not None:
+                    node.preds.append((producer, "flag"))
+            else:
+                last_dma[channel] = index
+
+        nodes.append(node)
+    return nodes
+
+
+def find_critical_path(nodes: list[InstructionNode]) -> CriticalPath:
+    """Walk back from the last completion along the latest-arriving edges."""
+    if not nodes:
+        return CriticalPath(0, nodes, [], [], {}, {})
+
+    index = max(range(len(nodes)), key=lambda i: (nodes[i].complete, i))
+    length = nodes[index].complete
+    segments: list[PathSegment] = []
+    at_completion = True
+    while True:
+        node = nodes[index]
+        if at_completion:
+            segments.append(PathSegment(index, "execute", node.dispatch, node.complete))
+
+        binding: tuple[int, int, str] | None = None
+        for pred, kind in node.preds:
+            source = nodes[pred]
+            arrival = source.dispatch if kind == "order" else source.complete
+            # on ties prefer a data edge over plain dispatch order
+            if (
+                binding is None
+                or arrival > binding[0]
+                or (arrival == binding[0] and binding[2] == "order")
+            ):
+                binding = (arrival, pred, kind)
+
+        if binding is None:
+            segments.append(PathSegment(index, "start", 0, node.dispatch))
+            break
+        arrival, index, kind = binding
+        segments.append(
+            PathSegment(
+                node.index,
+                "issue" if kind == "order" else "wait",
+                arrival,
+                node.dispatch,
+                edge=kind,
+            )
+        )
+        at_completion = kind != "order"
+    segments.reverse()
+
+    by_pc: dict[tuple[int, str, str], CriticalInstruction] = {}
+    unit_cycles: defaultdict[str, int] = defaultdict(int)
+    on_path: set[int] = set()
+    for segment in segments:
+        node = nodes[segment.node]
+        key = (node.pc, node.mnemonic, node.unit)
+        entry = by_pc.setdefault(key, CriticalInstruction(node.pc, node.mnemonic, node.unit))
+        if segment.kind == "execute":
+            entry.execute_cycles += segment.cycles
+            unit_cycles[node.unit] += segment.cycles
+        else:
+            entry.wait_cycles += segment.cycles
+        if segment.node not in on_path:
+            on_path.add(segment.node)
+            entry.occurrences += 1
+
+    overlapped: defaultdict[str, int] = defaultdict(int)
+    for node in nodes:
+        if node.index not in on_path:
+            overlapped[node.unit] += node.latency
+
+    return CriticalPath(
+        length=length,
+        nodes=nodes,
+        segments=segments,
+        instructions=sorted(by_pc.values(), key=lambda entry: entry.cycles, reverse=True),
+        unit_cycles=dict(sorted(unit_cycles.items(), key=lambda item: item[1], reverse=True)),
+        overlapped_cycles=dict(overlapped),
+    )
+
+
+def analyze_critical_path(sim: Simulation) -> CriticalPath:
+    """Critical path of a finished simulation run with record_graph=True."""
+    if sim.core is None:
+        raise ValueError("Attempted to analyze the critical path without a core.")
+    dispatch_log = sim.core.idu.dispatch_log
+    if dispatch_log is None:
+        raise ValueError("No execution graph recorded. Run with record_graph=True.")
+    return find_critical_path(build_execution_graph(dispatch_log))
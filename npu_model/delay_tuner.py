@@ -0,0 +1,208 @@
+"""
+Simulator-driven delay minimization.
+
+minimize_delays(program, hardware_config) shrinks the immediate of every
+`delay` in a kernel, one delay at a time in program order, and keeps the
+smallest value for which the kernel still runs correctly:
+  - the simulation finishes within max_cycles without a BankConflictError
+    or any other model error (backpressure, DMA protocol assertions)
+  - the golden result still matches; a program without one must leave the
+    MRF, scalar registers and VMEM exactly as the untuned program does
+
+Each delay is searched with a k-ary bisection: with `workers` processes, k
+candidate values are simulated in parallel per round, so a delay of
+immediate N takes about log_{k+1}(N) rounds.  Correctness is assumed to be
+monotone in each immediate; delays are kept (at 0 if need be) rather than
+removed, so instruction addresses and branch offsets do not change.
+Candidates are shipped to the workers as EncodedPrograms.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import torch
+
+from .configs.isa_definition import DELAY
+from .hardware.config import HardwareConfig
+from .logging import LoggerConfig
+from .simulation import Simulation
+from .software.program import EncodedProgram, InstantiableProgram, Program
+
+
+@dataclass
+class DelayChange:
+    index: int
+    """ Position of the delay in the program. """
+    original: int
+    tuned: int
+
+
+@dataclass
+class DelayTuningResult:
+    program: InstantiableProgram
+    """ The program with every delay shrunk to its tuned immediate. """
+    original_cycles: int
+    tuned_cycles: int
+    changes: list[DelayChange] = field(default_factory=list)
+    simulations: int = 0
+
+    @property
+    def cycles_saved(self) -> int:
+        return self.original_cycles - self.tuned_cycles
+
+
+@dataclass
+class CandidateOutcome:
+    """Whether a candidate ran correctly, its cycles, and why it failed."""
+
+    ok: bool
+    cycles: int
+    reason: str = ""
+
+
+@dataclass
+class CandidateCheck:
+    """Everything a worker process needs to judge one candidate program."""
+
+    hardware_config: HardwareConfig
+    memory_regions: list[tuple[int, torch.Tensor]]
+    golden_result: tuple[int, torch.Tensor] | None
+    tolerance: tuple[float, float]
+    max_cycles: int
+    reference_digest: str | None = None
+
+
+def _state_digest(sim: Simulation) -> str:
+    arch_state = sim.core.arch_state
+    digest = hashlib.sha256()
+    for tensor in arch_state.mrf:
+        digest.update(tensor.contiguous().view(torch.uint8).numpy().tobytes())
+    digest.update(repr(list(arch_state.xrf)).encode())
+    digest.update(arch_state.vmem.numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _evaluate(program: Program, check: CandidateCheck) -> tuple[CandidateOutcome, str]:
+    """Simulate one candidate; returns its outcome and final-state digest."""
+    program.memory_regions = check.memory_regions
+    sim = Simulation(
+        hardware_config=check.hardware_config,
+        logger_config=LoggerConfig(filename=os.devnull),
+        program=program,
+        verbose=False,
+    )
+    try:
+        # the DMA unit prints every flag it clears
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.run(max_cycles=check.max_cycles)
+    except (RuntimeError, AssertionError) as exc:
+        cycles = sim.cycle_count
+        sim.close()
+        return CandidateOutcome(False, cycles, f"{type(exc).__name__}: {exc}"), ""
+    try:
+        if not sim.core.is_finished():
+            return CandidateOutcome(False, sim.cycle_count, "did not finish"), ""
+        digest = _state_digest(sim) if check.golden_result is None else ""
+        if check.golden_result is not None:
+            base, expected = check.golden_result
+            size = expected.numel() * expected.element_size()
+            actual = sim.core.arch_state.read_dram(base, size).view(expected.dtype).reshape(expected.shape)
+            rtol, atol = check.tolerance
+            if not torch.allclose(actual.float(), expected.float(), rtol=rtol, atol=atol):
+                return CandidateOutcome(False, sim.cycle_count, "golden mismatch"), digest
+        elif check.reference_digest is not None and digest != check.reference_digest:
+            return CandidateOutcome(False, sim.cycle_count, "final state differs"), digest
+        return CandidateOutcome(True, sim.cycle_count), digest
+    finally:
+        sim.close()
+
+
+def evaluate_candidate(program: Program, check: CandidateCheck) -> CandidateOutcome:
+    """Simulate one candidate program and judge it against *check*."""
+    return _evaluate(program, check)[0]
+
+
+def _search_points(lo: int, hi: int, k: int) -> list[int]:
+    """Up to k distinct values in [lo, hi) splitting the range evenly."""
+    return sorted({lo + (hi - lo) * j // (k + 1) for j in range(1, k + 1)})
+
+
+def minimize_delays(
+    program: Program,
+    hardware_config: HardwareConfig,
+    max_cycles: int | None = None,
+    workers: int | None = None,
+) -> DelayTuningResult:
+    """
+    Shrink every delay of *program* to the smallest immediate that keeps it correct.
+
+    Raises:
+        ValueError: if the untuned program cannot be encoded or itself fails
+            the checks.
+    """
+    workers = workers or os.cpu_count() or 1
+    instructions = list(program.instructions)
+    encoded = EncodedProgram.from_instructions(instructions)
+    check = CandidateCheck(
+        hardware_config=hardware_config,
+        memory_regions=list(program.memory_regions),
+        golden_result=getattr(program, "golden_result", None),
+        tolerance=getattr(program, "kernel_tolerance", (1e-2, 1e-2)),
+        max_cycles=max_cycles or getattr(program, "kernel_max_cycles", 1_000_000),
+    )
+    baseline, digest = _evaluate(encoded, check)
+    if not baseline.ok:
+        raise ValueError(f"The untuned program fails: {baseline.reason}")
+    check.reference_digest = digest or None
+    # shrinking delays only makes a correct kernel faster
+    check.max_cycles = min(check.max_cycles, baseline.cycles)
+
+    result = DelayTuningResult(
+        program=InstantiableProgram(instructions),
+        original_cycles=baseline.cycles,
+        tuned_cycles=baseline.cycles,
+        simulations=1,
+    )
+    pool: Executor | None = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for index, insn in enumerate(instructions):
+            if not isinstance(insn, DELAY) or int(insn.imm) == 0:
+                continue
+            lo, hi = 0, int(insn.imm)
+            best_cycles = result.tuned_cycles
+            while lo < hi:
+                points = _search_points(lo, hi, workers)
+                candidates = [encoded.replaced(index, DELAY(imm=imm)) for imm in points]
+                if pool is None:
+                    outcomes = [evaluate_candidate(c, check) for c in candidates]
+                else:
+                    outcomes = list(pool.map(evaluate_candidate, candidates, [check] * len(candidates)))
+                result.simulations += len(candidates)
+                passing = [(imm, o) for imm, o in zip(points, outcomes) if o.ok]
+                if passing:
+                    hi, outcome = passing[0]
+                    best_cycles = outcome.cycles
+                failing = [imm for imm, o in zip(points, outcomes) if not o.ok and imm < hi]
+                if failing:
+                    lo = max(failing) + 1
+            if hi < int(insn.imm):
+                instructions[index] = DELAY(imm=hi)
+                encoded = encoded.replaced(index, instructions[index])
+                result.changes.append(DelayChange(index=index, original=int(insn.imm), tuned=hi))
+                result.tuned_cycles = best_cycles
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    result.program = InstantiableProgram(instructions)
+    result.program.memory_regions = list(program.memory_regions)
+    for attr in ("golden_result", "kernel_tolerance", "kernel_max_cycles"):
+        if hasattr(program, attr):
+            setattr(result.program, attr, getattr(program, attr))
+    return result
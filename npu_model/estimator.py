@@ -0,0 +1,171 @@
+"""
+Whole-program static cycle estimates.
+
+estimate_program(program, hardware_config) predicts how many cycles a
+program takes without running the simulator or any tensor math.  The
+program is walked in execution order: scalar registers are constant-
+propagated (npu_model.scheduler's shadow register file), so branches whose
+operands are known are resolved and loops run for their real trip counts;
+every executed instruction is timed by static_timing.TimingModel (in-order
+dispatch, `delay`, EXU occupancy, DMA queue and wait flags, bank interlocks).
+
+A branch on an unknown register (e.g. a value loaded from memory) is taken
+to fall through and counted in ProgramEstimate.unresolved_branches; the
+estimate is then only a guide.  compare_with_simulation() runs both and
+reports the error, which scripts/estimate_accuracy.py tracks for the whole
+program registry.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from .configs.isa_definition import PIPELINE_LATENCY
+from .hardware.config import HardwareConfig
+from .isa import Instruction, is_control_flow
+from .scheduler import CONTROL_FLOW_DELAY_SLOTS, ScalarShadow, run_program
+from .software.program import Program
+from .static_timing import TimingModel
+
+DEFAULT_MAX_INSTRUCTIONS = 10_000_000
+
+
+@dataclass
+class ProgramEstimate:
+    cycles: int
+    instructions: int
+    """ Dynamic instruction count. """
+    busy: dict[str, int] = field(default_factory=dict)
+    """ Occupied cycles per execution unit. """
+    bank_conflicts: int = 0
+    """ Dispatches that found an MRF register or VMEM bank still held. """
+    unresolved_branches: int = 0
+    """ Branches on unknown registers, assumed not taken. """
+
+    @property
+    def exact_control_flow(self) -> bool:
+        return self.unresolved_branches == 0
+
+
+@dataclass
+class EstimateAccuracy:
+    estimate: ProgramEstimate
+    simulated: int
+
+    @property
+    def error(self) -> float:
+        """Relative error of the estimate against the simulated cycle count."""
+        return (self.estimate.cycles - self.simulated) / self.simulated if self.simulated else 0.0
+
+
+class _ControlShadow(ScalarShadow):
+    """Scalar shadow that also takes the redirects of executed branches and jumps."""
+
+    pc = 0
+    npc: int | None = None
+
+    def set_npc(self, npc: int) -> None:
+        self.npc = npc
+
+
+def _branch_target(shadow: _ControlShadow, insn: Instruction, index: int) -> int | None:
+    """
+    Index fetch continues at after the delay slots, or None if not taken.
+
+    Raises:
+        LookupError: if the branch reads a register whose value is unknown.
+    """
+    reads = [getattr(insn, reg) for reg in ("rs1", "rs2") if hasattr(insn, reg)]
+    if insn.mnemonic != "jal" and any(int(reg) not in shadow.known for reg in reads):
+        raise LookupError
+    # exec() sees the PC of the instruction PIPELINE_LATENCY slots later
+    shadow.pc = (index + PIPELINE_LATENCY) * 4
+    shadow.npc = None
+    insn.exec(shadow)  # type: ignore[arg-type]
+    return None if shadow.npc is None else shadow.npc // 4
+
+
+def estimate_instructions(
+    instructions: list[Instruction],
+    hardware_config: HardwareConfig,
+    max_instructions: int = DEFAULT_MAX_INSTRUCTIONS,
+) -> ProgramEstimate:
+    """
+    Execution ends when it runs off the end of the program or at ecall /
+    ebreak.  Registers start at zero, as in a simulation without
+    randomize_init.
+
+    Raises:
+        ValueError: for jalr (computed jumps cannot be followed), a jump out
+            of the program, or more than max_instructions executed.
+    """
+    cfg = hardware_config.arch_state_config
+    # the register file starts zeroed
+    shadow = _ControlShadow(cfg, dict.fromkeys(range(cfg.num_x_registers), 0))
+    model = TimingModel(hardware_config, shadow)
+    executed = 0
+    conflicts = 0
+    unresolved = 0
+    index = 0
+    redirect: tuple[int, int] | None = None
+    """ (instructions left in the delay slots, target index). """
+    while 0 <= index < len(instructions):
+        if executed >= max_instructions:
+            raise ValueError(f"Estimate stopped after {max_instructions} instructions; does the program terminate?")
+        insn = instructions[index]
+        if insn.mnemonic == "jalr":
+            raise ValueError(f"Instruction {index}: jalr targets cannot be estimated statically")
+
+        target: int | None = None
+        if is_control_flow(insn):
+            try:
+                target = _branch_target(shadow, insn, index)
+            except LookupError:
+                unresolved += 1
+            if target is not None and not 0 <= target <= len(instructions):
+                raise ValueError(f"Branch at instruction {index} leaves the program")
+
+        dispatch = model.dispatch(insn, index)
+        conflicts += len(dispatch.conflicts)
+        executed += 1
+        if insn.mnemonic in ("ecall", "ebreak"):
+            # the core halts as soon as they execute, in-flight work or not
+            return ProgramEstimate(dispatch.complete, executed, dict(model.busy), conflicts, unresolved)
+
+        if redirect is not None:
+            slots, pending = redirect
+            redirect = (slots - 1, pending) if slots > 1 else None
+            index = pending if slots == 1 else index + 1
+        elif target is not None:
+            redirect = (CONTROL_FLOW_DELAY_SLOTS, target)
+            index += 1
+        else:
+            index += 1
+        if redirect is not None and index >= len(instructions):
+            index = redirect[1]
+            redirect = None
+
+    return ProgramEstimate(model.cycles, executed, dict(model.busy), conflicts, unresolved)
+
+
+def estimate_program(
+    program: Program,
+    hardware_config: HardwareConfig,
+    max_instructions: int = DEFAULT_MAX_INSTRUCTIONS,
+) -> ProgramEstimate:
+    """Static cycle estimate of a program (see estimate_instructions)."""
+    return estimate_instructions(program.instructions, hardware_config, max_instructions)
+
+
+def compare_with_simulation(
+    program: Program,
+    hardware_config: HardwareConfig,
+    max_cycles: int = 1_000_000,
+) -> EstimateAccuracy:
+    estimate = estimate_program(program, hardware_config)
+    sim = run_program(program, hardware_config, getattr(program, "kernel_max_cycles", max_cycles))
+    try:
+        simulated = sim.get_stats().cycles
+    finally:
+        sim.close()
+    return EstimateAccuracy(estimate, simulated)
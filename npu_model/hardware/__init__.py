@@ -6,6 +6,7 @@ from .exu import (
     ScalarExecutionUnit,
 )
 from .mxu import MatrixExecutionUnitInner, MatrixExecutionUnitSystolic
+from .vpu import VectorExecutionUnit, PipelinedVectorExecutionUnit
 from .dma import DmaExecutionUnit
 from .bank_conflict import BankConflictChecker, BankConflictError
 
@@ -17,6 +18,8 @@ __all__ = [
     "ScalarExecutionUnit",
     "MatrixExecutionUnitInner",
     "MatrixExecutionUnitSystolic",
+    "VectorExecutionUnit",
+    "PipelinedVectorExecutionUnit",
     "DmaExecutionUnit",
     "BankConflictChecker",
     "BankConflictError",
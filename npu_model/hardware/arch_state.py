@@ -1,3 +1,5 @@
+from typing import Callable
+
 import torch
 from ..logging.logger import Logger
 from .config import ArchStateConfig
@@ -21,6 +23,8 @@ class ArchState:
         self.vmem: torch.Tensor = torch.zeros(self.cfg.vmem_size, dtype=torch.uint8)
         self.xrf: list[int] = [0] * self.cfg.num_x_registers
         self.csrf: list[int] = [0] * self.cfg.num_csrs
+        # CSRs whose reads are served by a callback instead of csrf (perf counters)
+        self.csr_read_hooks: dict[int, Callable[[], int]] = {}
         self.mrf: list[torch.Tensor] = [
             torch.zeros(self.cfg.mrf_depth * self.cfg.mrf_width, dtype=torch.uint8)
             for _ in range(self.cfg.num_m_registers)
@@ -61,6 +65,7 @@ class ArchState:
         self.vmem = torch.empty(0, dtype=torch.uint8)
         self.xrf = []
         self.csrf = []
+        self.csr_read_hooks = {}
         self.erf = []
         self.mrf = []
         self.wb = {}
@@ -186,6 +191,8 @@ class ArchState:
             self.logger.log_arch_value("erf", rd, value & 0xFF)
 
     def write_csrf(self, rd: int, value: int) -> None:
+        if rd in self.csr_read_hooks:
+            return  # read-only counter
         if rd < len(self.csrf) and self.csrf[rd] == value:
             return
         self.csrf[rd] = value
@@ -199,6 +206,9 @@ class ArchState:
         return self.xrf[rs]
 
     def read_csrf(self, rs: int) -> int:
+        hook = self.csr_read_hooks.get(rs)
+        if hook is not None:
+            return hook()
         return self.csrf[rs]
 
     def write_mrf_u8(self, vd: int, value: torch.Tensor) -> None:
@@ -3,14 +3,21 @@ Bank conflict detection for tensor register file (MRF) and VMEM.
 
 Tensor registers and VMEM are implemented as banked SRAMs.  Simultaneous
 accesses to the same bank by multiple in-flight instructions constitute a
-bank conflict and must be avoided by software.  The performance model raises
-BankConflictError when such a conflict is detected.
+bank conflict.  How a conflict is handled depends on the checker policy
+(HardwareConfig.bank_conflict_policy):
+
+  - "raise": conflicts must be avoided by software; the performance model
+             raises BankConflictError when one is detected.
+  - "stall": the conflicting instruction waits in front of its execution
+             unit until the banks are free, like hardware arbitration.  The
+             cycles lost are recorded per bank.
 
 Bank mappings used by this checker:
   - MRF : one bank per tensor register (register index == bank index).
   - VMEM: 32-byte banks aligned to the DMA / tensor-transfer granularity.
 """
 
+from collections import defaultdict
 from typing import TYPE_CHECKING
 from npu_model.isa import VRType
 from ..isa_types import MatrixReg, WeightBuffer, Accumulator
@@ -29,6 +36,8 @@ if TYPE_CHECKING:
 VMEM_BANK_BYTES: int = 32
 """Granularity of VMEM banks in bytes (matches DMA / vload / vstore alignment)."""
 
+BANK_CONFLICT_POLICIES: tuple[str, ...] = ("raise", "stall")
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -165,31 +174,90 @@ class BankConflictError(RuntimeError):
 class BankConflictChecker:
     """
     Tracks which SRAM banks are currently in use by in-flight instructions
-    and raises BankConflictError when a new instruction would access the
-    same bank as an already-in-flight instruction.
+    and raises BankConflictError (or, with the "stall" policy, refuses the
+    acquisition) when a new instruction would access the same bank as an
+    already-in-flight instruction.
 
     Usage (per execution unit):
         # When an instruction starts executing:
-        self.arch_state.conflict_checker.acquire_mrf(banks, label)
-        self.arch_state.conflict_checker.acquire_vmem(banks, label)
+        if not self.arch_state.conflict_checker.acquire(label, mrf=..., vmem=...):
+            return  # banks busy: leave the uop with the IDU and retry next cycle
 
         # When the instruction completes:
         self.arch_state.conflict_checker.release_mrf(banks)
         self.arch_state.conflict_checker.release_vmem(banks)
     """
 
-    def __init__(self) -> None:
+    def __init__(self, policy: str = "raise") -> None:
+        if policy not in BANK_CONFLICT_POLICIES:
+            raise ValueError(
+                f"Unknown bank conflict policy '{policy}', expected one of {BANK_CONFLICT_POLICIES}"
+            )
+        self.policy = policy
         self._mrf_in_use: dict[int, str] = {}
         self._vmem_in_use: dict[int, str] = {}
         # Add tracking for MXU buffers
         self._weight_buf_in_use: dict[int, str] = {}
         self._acc_buf_in_use: dict[int, str] = {}
+        # Cycles an instruction waited on each (resource, bank) ("stall" policy)
+        self.stall_cycles: defaultdict[tuple[str, int], int] = defaultdict(int)
 
     def reset(self) -> None:
         self._mrf_in_use.clear()
         self._vmem_in_use.clear()
         self._weight_buf_in_use.clear()
         self._acc_buf_in_use.clear()
+        self.stall_cycles.clear()
+
+    @property
+    def stalls_on_conflict(self) -> bool:
+        return self.policy == "stall"
+
+    def acquire(
+        self,
+        label: str,
+        *,
+        mrf: frozenset[int] = frozenset(),
+        vmem: frozenset[int] = frozenset(),
+        weight_buf: frozenset[int] = frozenset(),
+        acc_buf: frozenset[int] = frozenset(),
+    ) -> bool:
+        """
+        Acquire all the banks an instruction needs, or none of them.
+
+        With the "raise" policy a conflict raises BankConflictError and this
+        always returns True.  With the "stall" policy a conflict acquires
+        nothing, charges one stall cycle to every conflicting bank and
+        returns False; the caller retries on a later cycle.
+        """
+        if self.stalls_on_conflict:
+            conflicts = [
+                (resource, bank)
+                for resource, in_use, banks in (
+                    ("mrf", self._mrf_in_use, mrf),
+                    ("vmem", self._vmem_in_use, vmem),
+                    ("weight_buf", self._weight_buf_in_use, weight_buf),
+                    ("acc_buf", self._acc_buf_in_use, acc_buf),
+                )
+                for bank in banks
+                if bank in in_use
+            ]
+            if conflicts:
+                for key in conflicts:
+                    self.stall_cycles[key] += 1
+                return False
+        self.acquire_mrf(mrf, label)
+        self.acquire_vmem(vmem, label)
+        self.acquire_weight_buf(weight_buf, label)
+        self.acquire_acc_buf(acc_buf, label)
+        return True
+
+    def stall_cycles_by_resource(self) -> dict[str, int]:
+        """Stall cycles summed over the banks of each resource kind."""
+        totals: defaultdict[str, int] = defaultdict(int)
+        for (resource, _), cycles in self.stall_cycles.items():
+            totals[resource] += cycles
+        return dict(totals)
 
     # ------------------------------------------------------------------
     # MRF
@@ -41,6 +41,7 @@ class HardwareConfig:
     mxu1_matmul_latency_cycles: int = 32
     vpu_simple_op_latency_cycles: int = 4
     vpu_non_pipelineable_op_latency_cycles: int = 16
+    vpu_max_in_flight: int = 8
     xlu_transform_latency_cycles: int = 4
     offchip_link_width_bits: int = 32
     offchip_link_core_cycles_per_beat: int = 2
@@ -48,3 +49,11 @@ class HardwareConfig:
     vmem_bus_width_bits: int = 512
     vmem_bus_core_cycles_per_beat: int = 1
     vmem_bytes_per_cycle: int = 64
+    imem_model: str = "ideal"
+    imem_size_bytes: int = 16 * 1024
+    icache_line_bytes: int = 64
+    icache_ways: int = 2
+    icache_miss_latency_cycles: int = 4
+    bank_conflict_policy: str = "raise"
+    """ "raise": bank conflicts and dispatch to a busy unit are errors.
+        "stall": conflicting instructions wait for their banks / unit (interlocks). """
@@ -6,12 +6,16 @@ from npu_model.software.instruction import Uop
 from npu_model.logging.logger import Logger, LaneType
 from npu_model.hardware.arch_state import ArchState
 from npu_model.hardware.stage_data import StageData
+from npu_model.hardware.bank_conflict import BankConflictChecker
 
 from .hardware import Module
 from .config import HardwareConfig
 from .ifu import InstructionFetch
+from .imem import InstructionMemory
 from .idu import InstructionDecode
 from .exu import ExecutionUnit
+from .cycle_accounting import CycleAccounting
+from .perf_counters import PerfCounters
 
 from .exu import ScalarExecutionUnit  # type: ignore # noqa: F401, F403
 from .mxu import (
@@ -19,7 +23,7 @@ from .mxu import (
     MatrixExecutionUnitSystolic, # type: ignore 
 )  # noqa: F401, F403
 from .dma import DmaExecutionUnit  # type: ignore # noqa: F401, F403
-from .vpu import VectorExecutionUnit  # type: ignore # noqa: F401, F403
+from .vpu import VectorExecutionUnit, PipelinedVectorExecutionUnit  # type: ignore # noqa: F401, F403
 from .lsu import LoadStoreUnit  # type: ignore # noqa: F401, F403 
 
 
@@ -48,6 +52,9 @@ class Core(Module):
             config=self.config.arch_state_config,
             logger=self.logger,
         )
+        self.arch_state.conflict_checker = BankConflictChecker(
+            self.config.bank_conflict_policy
+        )
 
         # Create execution units (each gets logger reference)
         self.exus: List[ExecutionUnit] = []
@@ -63,19 +70,33 @@ class Core(Module):
                 )
             )
 
+        # Instruction memory in front of the IFU (None models ideal fetch)
+        self.imem: InstructionMemory | None = None
+        if self.config.imem_model != "ideal":
+            self.imem = InstructionMemory(self.config)
+
         # Create pipeline components (each gets logger reference)
         self.ifu = InstructionFetch(
             width=self.config.fetch_width,
             logger=self.logger,
             arch_state=self.arch_state,
+            imem=self.imem,
         )
         self.idu = InstructionDecode(
             exus=self.exus,
             logger=self.logger,
             arch_state=self.arch_state,
             isa=self.config.isa,
+            width=self.config.fetch_width,
         )
 
+        # Attributes every cycle to a CPI stack category
+        self.cycle_accounting = CycleAccounting()
+
+        # Performance counters, readable by programs through the CSR file
+        self.perf_counters = PerfCounters(self)
+        self.perf_counters.install(self.arch_state)
+
         self.ignore_runtime_errors = False
         self.runtime_error_reporter: Callable[[str, Exception], None] | None = None
 
@@ -94,6 +115,7 @@ class Core(Module):
         self.idu.reset()
         for exu in self.exus:
             exu.reset()
+        self.cycle_accounting.reset()
         # self.cycle_count = 0
         self.total_completed = 0
 
@@ -102,9 +124,10 @@ class Core(Module):
         Execute one cycle.
         Tick in reverse pipeline order (downstream first):
         2. EXUs claim and consume from DIU outputs
-        1. IDU claims from IFU and dispatches to EXU outputs
-        3. IFU fetches new instructions (if not stalled)
+        1. IDU claims a fetch group from IFU and dispatches up to fetch_width uops
+        3. IFU fetches up to fetch_width new instructions (if not stalled)
         4. Log cycle advancement
+        5. Attribute the cycle to a CPI stack category
 
         Each downstream stage claims from the previous stage's output.
         If a stage's output isn't claimed, it will stall on the next tick.
@@ -143,6 +166,9 @@ class Core(Module):
                 raise
             self._recover_ifu_fault()
 
+        # 5. Cycle accounting
+        self.cycle_accounting.record(self.idu, self.ifu)
+
     def is_finished(self) -> bool:
         """Check if execution is complete."""
         if self.arch_state.halted:
@@ -189,8 +215,9 @@ class Core(Module):
             setattr(exu, "_complete_count", 0)
 
     def _recover_idu_fault(self) -> None:
-        self.idu.uop = None
+        self.idu.bundle = []
         self.idu.force_unstall()
+        self.ifu.clear_redirect()
         for output in self.idu.outputs.values():
             output.reset()
 
@@ -0,0 +1,148 @@
+"""
+Cycle accounting (CPI stack).
+
+Every simulated cycle is attributed to exactly one category, judged from the
+in-order dispatch point (the IDU), which is where the program either makes
+progress or waits:
+
+  - issue        : at least one uop was dispatched
+  - delay_slot   : only control-flow delay-slot nops were dispatched
+  - delay        : the IDU is counting down a `delay`
+  - dma_wait     : the IDU is blocked on a dma.wait.chN flag
+  - structural   : the IDU waits for a busy EXU to accept its previous uop
+                   (only with the "stall" bank conflict policy)
+  - control_flow : the IDU is empty because fetch waits for a branch/jump
+  - fetch        : the IDU is empty because fetch is refilling or filling
+  - drain        : everything has been dispatched, EXUs are finishing
+
+Cycles are also attributed to the PC and mnemonic of the responsible
+instruction.  Alongside the stack, the IFU cycles spent holding an unclaimed
+fetch group and per-EXU busy / idle cycles are reported.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..software.instruction import Uop
+    from .exu import ExecutionUnit
+    from .idu import InstructionDecode
+    from .ifu import InstructionFetch
+
+
+class CycleCategory(StrEnum):
+    ISSUE = "issue"
+    DELAY_SLOT = "delay_slot"
+    DELAY = "delay"
+    DMA_WAIT = "dma_wait"
+    STRUCTURAL = "structural"
+    CONTROL_FLOW = "control_flow"
+    FETCH = "fetch"
+    DRAIN = "drain"
+
+
+class FetchState(StrEnum):
+    """Why the IFU produced no fetch group in a cycle."""
+
+    REFILL = "refill"
+    REDIRECT = "redirect"
+    FINISHED = "finished"
+
+
+@dataclass
+class CpiStack:
+    cycles: int
+    instructions: int
+    categories: dict[str, int]
+    """ Cycles per category; sums to `cycles`. """
+    by_pc: dict[int, dict[str, int]]
+    """ Cycles per category for each responsible PC. """
+    by_mnemonic: dict[str, dict[str, int]]
+    """ Cycles per category for each responsible mnemonic. """
+    mnemonic_at_pc: dict[int, str] = field(default_factory=dict)
+    ifu_output_stall_cycles: int = 0
+    """ Cycles the IFU held a fetch group the IDU had not claimed. """
+    exu_busy_cycles: dict[str, int] = field(default_factory=dict)
+    exu_idle_cycles: dict[str, int] = field(default_factory=dict)
+
+    def cpi(self) -> dict[str, float]:
+        """Cycles per retired instruction, split by category."""
+        if self.instructions == 0:
+            return {category: 0.0 for category in self.categories}
+        return {
+            category: cycles / self.instructions
+            for category, cycles in self.categories.items()
+        }
+
+
+class CycleAccounting:
+    """Attributes each cycle to a CycleCategory; owned and driven by Core."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.cycles = 0
+        self.categories: dict[str, int] = {category.value: 0 for category in CycleCategory}
+        self.by_pc: defaultdict[int, defaultdict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.by_mnemonic: defaultdict[str, defaultdict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self.mnemonic_at_pc: dict[int, str] = {}
+        self.ifu_output_stall_cycles = 0
+        self._previous_fetch_state: FetchState | None = None
+        self._previous_fetch_pc = 0
+
+    def record(self, idu: "InstructionDecode", ifu: "InstructionFetch") -> None:
+        """Attribute the cycle that just completed (call after the IFU tick)."""
+        self.cycles += 1
+        category = idu.cycle_category
+        uop = idu.cycle_uop
+        pc: int | None = None
+        mnemonic: str | None = None
+        if category is None:
+            # The IDU had nothing to claim: explain it by what fetch did last cycle.
+            state = self._previous_fetch_state
+            if state == FetchState.FINISHED:
+                category = CycleCategory.DRAIN
+            elif state == FetchState.REDIRECT:
+                category = CycleCategory.CONTROL_FLOW
+            else:
+                category = CycleCategory.FETCH
+                pc = self._previous_fetch_pc
+        if uop is not None:
+            pc = uop.pc
+            mnemonic = uop.insn.mnemonic
+        elif category == CycleCategory.CONTROL_FLOW and ifu.pending_pc_reader is not None:
+            reader: Uop = ifu.pending_pc_reader
+            pc = reader.pc
+            mnemonic = reader.insn.mnemonic
+
+        self.categories[category] += 1
+        if pc is not None:
+            self.by_pc[pc][category] += 1
+            if mnemonic is not None:
+                self.mnemonic_at_pc[pc] = mnemonic
+        if mnemonic is not None:
+            self.by_mnemonic[mnemonic][category] += 1
+
+        if ifu.is_stalled:
+            self.ifu_output_stall_cycles += 1
+        self._previous_fetch_state = ifu.fetch_state
+        self._previous_fetch_pc = ifu.arch_state.pc
+
+    def stack(self, instructions: int, exus: "list[ExecutionUnit]") -> CpiStack:
+        """Snapshot the accumulated counters."""
+        return CpiStack(
+            cycles=self.cycles,
+            instructions=instructions,
+            categories=dict(self.categories),
+            by_pc={pc: dict(counts) for pc, counts in self.by_pc.items()},
+            by_mnemonic={name: dict(counts) for name, counts in self.by_mnemonic.items()},
+            mnemonic_at_pc=dict(self.mnemonic_at_pc),
+            ifu_output_stall_cycles=self.ifu_output_stall_cycles,
+            exu_busy_cycles={exu.name: exu.busy_cycles for exu in exus},
+            exu_idle_cycles={exu.name: self.cycles - exu.busy_cycles for exu in exus},
+        )
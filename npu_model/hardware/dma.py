@@ -88,6 +88,7 @@ class DmaExecutionUnit(ExecutionUnit):
         self._pending_completions: list[Uop] = []
         self._total_instructions = 0
         self._busy_cycles = 0
+        self._bytes_moved = 0
 
     def tick(self, idu_output: StageData[Uop | None]) -> None:
         self.cycle += 1
@@ -96,6 +97,7 @@ class DmaExecutionUnit(ExecutionUnit):
             if not (is_scalar_itype(uop.insn) or isinstance(uop.insn, RType)):
                 raise ValueError("Invalid Instruction format provided to DMA.")
 
+            uop.complete_cycle = self.cycle
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id, cycle=self.cycle)
             self.logger.log_retire(uop.id)
             # clear the flag
@@ -128,43 +130,45 @@ class DmaExecutionUnit(ExecutionUnit):
                 mnemonic = uop.insn.mnemonic
                 label = f"{self.name}:{mnemonic}"
                 banks = vmem_accesses(uop.insn, self.arch_state)
-                self.arch_state.conflict_checker.acquire_vmem(banks, label)
-                self._in_flight_vmem_banks.append(banks)
-                # tag instruction with execution delay
-                if mnemonic == "dma.config.ch<N>":
-                    # Config is a control op; keep it fixed-latency.
-                    uop.execute_delay = 1
-                else:
-                    nbytes = self._bytes_for_dma_uop(uop)
-                    uop.execute_delay = max(
-                        1,
-                        dma_transfer_cycles(self.config, nbytes),
-                    )
-                self.in_flight.append(uop)
-                self._total_instructions += 1
-
-                # claim the uop from the DIU
-                # I think this needs to happen here since our entire goal
-                # with doing this is to not block. Not 100% sure.
-                idu_output.claim()
-
-                # Log: End dispatch
-                self.logger.log_stage_end(
-                    uop.id,
-                    "D",
-                    lane=LaneType.DIU.value,
-                    cycle=self.cycle,
-                )
-
-                if len(self.in_flight) == 1:
-                    # Log: start execute
-                    self.logger.log_stage_start(
+                # with the "stall" policy, busy banks leave the uop with the IDU
+                if self.arch_state.conflict_checker.acquire(label, vmem=banks):
+                    self._in_flight_vmem_banks.append(banks)
+                    # tag instruction with execution delay
+                    if mnemonic == "dma.config.ch<N>":
+                        # Config is a control op; keep it fixed-latency.
+                        uop.execute_delay = 1
+                    else:
+                        nbytes = self._bytes_for_dma_uop(uop)
+                        self._bytes_moved += nbytes
+                        uop.execute_delay = max(
+                            1,
+                            dma_transfer_cycles(self.config, nbytes),
+                        )
+                    self.in_flight.append(uop)
+                    self._total_instructions += 1
+
+                    # claim the uop from the DIU
+                    # I think this needs to happen here since our entire goal
+                    # with doing this is to not block. Not 100% sure.
+                    idu_output.claim()
+
+                    # Log: End dispatch
+                    self.logger.log_stage_end(
                         uop.id,
-                        "E",
-                        lane=self.lane_id,
+                        "D",
+                        lane=LaneType.DIU.value,
                         cycle=self.cycle,
                     )
 
+                    if len(self.in_flight) == 1:
+                        # Log: start execute
+                        self.logger.log_stage_start(
+                            uop.id,
+                            "E",
+                            lane=self.lane_id,
+                            cycle=self.cycle,
+                        )
+
         # Track if EXU was busy
         if self.is_busy():
             self._busy_cycles += 1
@@ -174,7 +178,7 @@ class DmaExecutionUnit(ExecutionUnit):
             self.in_flight[0].execute_delay -= 1
             if self.in_flight[0].execute_delay <= 0:
                 # execute the instruction
-                self.in_flight[0].insn.exec(self.arch_state)
+                self.execute(self.in_flight[0])
                 self._complete_count = 1
                 # Release acquired VMEM banks before retiring the instruction.
                 self.arch_state.conflict_checker.release_vmem(
@@ -188,6 +192,7 @@ class DmaExecutionUnit(ExecutionUnit):
     def flush_completions(self) -> None:
         """Flush any pending completions (call at end of simulation)."""
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle + 1
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id)
             self.logger.log_retire(uop.id)
         self._pending_completions = []
@@ -215,3 +220,8 @@ class DmaExecutionUnit(ExecutionUnit):
     def busy_cycles(self) -> int:
         """Number of cycles the EXU was busy."""
         return self._busy_cycles
+
+    @property
+    def bytes_moved(self) -> int:
+        """Bytes transferred between DRAM and VMEM."""
+        return self._bytes_moved
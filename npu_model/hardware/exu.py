@@ -5,7 +5,8 @@ from .stage_data import StageData
 from ..logging.logger import Logger, LaneType
 from ..hardware.arch_state import ArchState
 from ..software.instruction import Uop
-from ..isa import EXU
+from ..isa import EXU, reads_pc
+from ..configs.isa_definition import PIPELINE_LATENCY
 from ..hardware.config import HardwareConfig
 
 
@@ -61,6 +62,10 @@ class ExecutionUnit(Module):
         """Flush any pending completions (call at end of simulation)."""
         pass
 
+    def execute(self, uop: Uop) -> None:
+        """Apply the architectural effects of *uop*."""
+        uop.insn.exec(self.arch_state)
+
     @property
     @abstractmethod
     def has_in_flight(self) -> bool:
@@ -141,6 +146,7 @@ class ScalarExecutionUnit(ExecutionUnit):
         self.cycle += 1
         # Log deferred completions from last cycle
         if self._pending_completion_uop is not None:
+            self._pending_completion_uop.complete_cycle = self.cycle
             self.logger.log_stage_end(
                 self._pending_completion_uop.id,
                 "E",
@@ -180,11 +186,37 @@ class ScalarExecutionUnit(ExecutionUnit):
             self._busy_cycles += uop.insn.mnemonic != "delay"
             self._complete_count = 1
             # execute the instruction and modify the arch state
+            self.execute(uop)
+
+    def execute(self, uop: Uop) -> None:
+        if reads_pc(uop.insn):
+            self._exec_pc_relative(uop)
+        else:
             uop.insn.exec(self.arch_state)
 
+    def _exec_pc_relative(self, uop: Uop) -> None:
+        """
+        Execute a branch, jump or auipc.
+
+        The ISA defines the PC seen by these instructions as their own address
+        plus PIPELINE_LATENCY delay slots, independent of how far ahead the
+        fetch unit currently is.  The resulting fetch target is recorded on
+        the uop for the IFU.
+        """
+        state = self.arch_state
+        fetch_pc, fetch_npc = state.pc, state.npc
+        state.pc = uop.pc + PIPELINE_LATENCY * 4
+        state.npc = state.pc + 4
+        try:
+            uop.insn.exec(state)
+            uop.next_pc = state.npc
+        finally:
+            state.pc, state.npc = fetch_pc, fetch_npc
+
     def flush_completions(self) -> None:
         """Flush any pending completions (call at end of simulation)."""
         if self._pending_completion_uop is not None:
+            self._pending_completion_uop.complete_cycle = self.cycle + 1
             self.logger.log_stage_end(
                 self._pending_completion_uop.id,
                 "E",
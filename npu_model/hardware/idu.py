@@ -3,8 +3,10 @@ from .hardware import Module
 from .stage_data import StageData
 from typing import TYPE_CHECKING
 from .exu import ExecutionUnit
+from .cycle_accounting import CycleCategory
+from .bank_conflict import vmem_accesses
 from ..logging.logger import Logger, LaneType
-from ..isa import IsaSpec, is_scalar_itype, RType, SBType, UJType
+from ..isa import IsaSpec, is_scalar_itype, is_control_flow, RType
 from ..configs.isa_definition import (
     DELAY,
     DMA_WAIT_CH0,
@@ -31,6 +33,9 @@ class InstructionDecode(Module):
     Logs dispatch events (end F, start D) to Kanata trace.
 
     Uses StageData for both input (claimed from IFU) and output (per-EXU).
+    Claims a whole fetch group at a time and dispatches up to `width`
+    instructions per cycle, in program order, each to a different EXU.
+    Dispatch stops at the first instruction that cannot go this cycle.
     When stalled, ends D stage early - gap in trace shows stall period.
     """
 
@@ -40,92 +45,141 @@ class InstructionDecode(Module):
         logger: Logger,
         isa: type[IsaSpec],
         arch_state: ArchState,
+        width: int = 1,
     ) -> None:
         self.exus = exus
         self.logger = logger
         self.isa = isa
         self.arch_state = arch_state
-        self.uop = None  # the current uop in flight
+        self.width = width
+        self.bundle: list[Uop] = []  # claimed uops not yet dispatched, in program order
         self.lane_id = 1
         self.cycle = 0
         # Build a mapping from EXU type to EXU instances
         self.exu_map: dict[EXU, ExecutionUnit] = {}
         for exu in exus:
-            exu_name = exu.__class__.__name__
-            self.exu_map[EXU(exu_name)] = exu
+            self.exu_map[self._exu_type(exu)] = exu
         self.reset()
 
+    @staticmethod
+    def _exu_type(exu: ExecutionUnit) -> EXU:
+        """Map an EXU instance to the EXU type it serves (variants subclass a base unit)."""
+        exu_types = {member.value for member in EXU}
+        for cls in type(exu).__mro__:
+            if cls.__name__ in exu_types:
+                return EXU(cls.__name__)
+        raise ValueError(f"{type(exu).__name__} does not implement a known EXU type")
+
     def reset(self) -> None:
         # Per-EXU output stage data
         self.outputs: dict[ExecutionUnit, StageData[Uop | None]] = {
             exu: StageData(None) for exu in self.exus
         }
+        self.bundle = []
         self._stalled = False
         self._control_flow_delay_slots_remaining = 0
+        # issue_slot_histogram[n] counts cycles in which n uops were dispatched
+        self.issue_slot_histogram: list[int] = [0] * (self.width + 1)
+        # What the IDU did this cycle, for cycle accounting (None: nothing to dispatch)
+        self.cycle_category: CycleCategory | None = None
+        self.cycle_uop: Uop | None = None
+        # Dispatched uops with their unit and VMEM banks, for critical-path
+        # analysis (None: not recorded)
+        self.dispatch_log: list[tuple[Uop, str, frozenset[int]]] | None = None
+        # Cycles dispatch waited on each busy EXU ("stall" bank conflict policy)
+        self.structural_stall_cycles: dict[str, int] = {exu.name: 0 for exu in self.exus}
 
     def is_finished(self) -> bool:
         """Check if DIU is finished."""
-        return self.uop is None and all(
+        return not self.bundle and all(
             not output.is_valid() for output in self.outputs.values()
         )
 
-    def tick(self, ifu_output: StageData[Uop | None]) -> None:
+    def tick(self, ifu_output: StageData[list[Uop]]) -> None:
         """
         Dispatch fetched instructions to their target execution units.
         Logs: E (end F stage), S (start D stage)
         When stalled, ends D stage early to show gap.
         """
         self.cycle += 1
-        # check if we currently have a uop in flight
-        if self.uop is not None:
-
-            # check for dispatch delay
-            if self.uop.dispatch_delay > 0:
-                self.uop.dispatch_delay -= 1
-                return
-
-            if self.check_backpressure(self.uop):
+        self.cycle_category = None
+        self.cycle_uop = None
+        if not self.bundle:
+            bundle = ifu_output.claim()
+            if not bundle:
+                self.issue_slot_histogram[0] += 1
                 return
 
-            # dispatch uop
-            self.dispatch()
-            self._stalled = False
-
-        else:
-            uop = ifu_output.claim()
-            if uop is None:
-                return
+            for uop in bundle:
+                if self._is_control_flow_delay_slot_violation(uop):
+                    raise RuntimeError(
+                        f"Illegal control-flow instruction '{uop.insn.mnemonic}' decoded "
+                        f"in a delay-slot position on cycle {self.cycle}"
+                    )
+                uop.delay_slot = self._control_flow_delay_slots_remaining > 0
+                self._consume_delay_slot_if_needed()
 
-            if self._is_control_flow_delay_slot_violation(uop):
-                raise RuntimeError(
-                    f"Illegal control-flow instruction '{uop.insn.mnemonic}' decoded "
-                    f"in a delay-slot position on cycle {self.cycle}"
+                self.logger.log_stage_end(
+                    uop.id, "F", lane=LaneType.IFU.value, cycle=self.cycle
+                )
+                self.logger.log_stage_start(
+                    uop.id, "D", lane=LaneType.DIU.value, cycle=self.cycle
                 )
-            self._consume_delay_slot_if_needed()
 
-            self.logger.log_stage_end(
-                uop.id, "F", lane=LaneType.IFU.value, cycle=self.cycle
-            )
-            self.logger.log_stage_start(
-                uop.id, "D", lane=LaneType.DIU.value, cycle=self.cycle
-            )
+                # Tag instruction with dispatch delay.
+                if uop.dispatch_delay == 0 and isinstance(uop.insn, DELAY):
+                    uop.dispatch_delay = uop.insn.imm
 
-            # Tag instruction with dispatch delay.
-            if uop.dispatch_delay == 0 and isinstance(uop.insn, DELAY):
-                uop.dispatch_delay = uop.insn.imm
+                if self._is_control_flow_instruction(uop):
+                    self._control_flow_delay_slots_remaining = 2
+            self.bundle = bundle
 
-            if self._is_control_flow_instruction(uop):
-                self._control_flow_delay_slots_remaining = 2
-            self.uop = uop
+        issued = 0
+        only_delay_slot_nops = True
+        used_exus: set[ExecutionUnit] = set()
+        while self.bundle and issued < self.width:
+            uop = self.bundle[0]
 
+            # check for dispatch delay
             if uop.dispatch_delay > 0:
-                self.uop.dispatch_delay -= 1
+                uop.dispatch_delay -= 1
                 self._stalled = True
-                return
-            else:
-                if self.check_backpressure(uop):
-                    return
-                self.dispatch()
+                if issued == 0:
+                    self.cycle_category = CycleCategory.DELAY
+                    self.cycle_uop = uop
+                break
+
+            # one uop per EXU per cycle; later uops wait to preserve order
+            target_exu = self.exu_map.get(uop.insn.exu)
+            if not self._is_dma_wait(uop) and target_exu in used_exus:
+                break
+
+            if self.check_backpressure(uop):
+                if issued == 0:
+                    self.cycle_category = (
+                        CycleCategory.DMA_WAIT
+                        if self._is_dma_wait(uop)
+                        else CycleCategory.STRUCTURAL
+                    )
+                    self.cycle_uop = uop
+                break
+
+            # dispatch uop
+            self.dispatch(uop)
+            self.bundle.pop(0)
+            if target_exu is not None:
+                used_exus.add(target_exu)
+            if issued == 0:
+                self.cycle_uop = uop
+            only_delay_slot_nops = only_delay_slot_nops and uop.delay_slot and self._is_nop(uop)
+            issued += 1
+            self._stalled = False
+
+        if issued > 0:
+            self.cycle_category = (
+                CycleCategory.DELAY_SLOT if only_delay_slot_nops else CycleCategory.ISSUE
+            )
+        self.issue_slot_histogram[issued] += 1
 
     @property
     def is_stalled(self) -> bool:
@@ -135,46 +189,65 @@ class InstructionDecode(Module):
     def force_unstall(self) -> None:
         self._stalled = False
 
-    def dispatch(self) -> None:
-        assert self.uop is not None
-        assert self.uop.dispatch_delay == 0
+    @property
+    def issue_slot_utilization(self) -> float:
+        """Fraction of dispatch slots (cycles * width) that carried a uop."""
+        cycles = sum(self.issue_slot_histogram)
+        if cycles == 0:
+            return 0.0
+        issued = sum(n * count for n, count in enumerate(self.issue_slot_histogram))
+        return issued / (cycles * self.width)
+
+    def dispatch(self, uop: Uop) -> None:
+        assert uop.dispatch_delay == 0
+        uop.dispatch_cycle = self.cycle
         # Prepare empty outputs for this cycle
 
-        if (
-            isinstance(self.uop.insn, DMA_WAIT_CH0)
-            or isinstance(self.uop.insn, DMA_WAIT_CH1)
-            or isinstance(self.uop.insn, DMA_WAIT_CH2)
-            or isinstance(self.uop.insn, DMA_WAIT_CH3)
-            or isinstance(self.uop.insn, DMA_WAIT_CH4)
-            or isinstance(self.uop.insn, DMA_WAIT_CH5)
-            or isinstance(self.uop.insn, DMA_WAIT_CH6)
-            or isinstance(self.uop.insn, DMA_WAIT_CH7)
-        ):
+        if self._is_dma_wait(uop):
+            uop.complete_cycle = self.cycle
+            if self.dispatch_log is not None:
+                self.dispatch_log.append((uop, "IDU", frozenset()))
             self.logger.log_stage_end(
-                self.uop.id, "D", lane=LaneType.DIU.value, cycle=self.cycle + 1
+                uop.id, "D", lane=LaneType.DIU.value, cycle=self.cycle + 1
             )
-            self.uop = None
             return
 
-        target_exu = self.exu_map[self.uop.insn.exu]
-        self.outputs[target_exu].prepare(self.uop)
+        target_exu = self.exu_map[uop.insn.exu]
+        if self.dispatch_log is not None:
+            self.dispatch_log.append(
+                (uop, target_exu.name, vmem_accesses(uop.insn, self.arch_state))
+            )
+        self.outputs[target_exu].prepare(uop)
 
         # if we dispatched a DMA instruction, set flag as busy here
-        if self.uop.insn.exu == EXU.DMA and (
-            is_scalar_itype(self.uop.insn) or isinstance(self.uop.insn, RType)
+        if uop.insn.exu == EXU.DMA and (
+            is_scalar_itype(uop.insn) or isinstance(uop.insn, RType)
         ):
             assert not self.arch_state.check_flag(
-                self.uop.insn.funct3
-            ), f"Flag {self.uop.insn.funct3} is already set, erroneous program"
-            self.arch_state.set_flag(self.uop.insn.funct3)
-        self.uop = None
+                uop.insn.funct3
+            ), f"Flag {uop.insn.funct3} is already set, erroneous program"
+            self.arch_state.set_flag(uop.insn.funct3)
+
+    def _is_dma_wait(self, uop: Uop) -> bool:
+        return isinstance(
+            uop.insn,
+            (
+                DMA_WAIT_CH0,
+                DMA_WAIT_CH1,
+                DMA_WAIT_CH2,
+                DMA_WAIT_CH3,
+                DMA_WAIT_CH4,
+                DMA_WAIT_CH5,
+                DMA_WAIT_CH6,
+                DMA_WAIT_CH7,
+            ),
+        )
 
-    def claim_uop(self, ifu_output: StageData[Uop | None]) -> None:
-        """Claim a new uop from IFU"""
-        assert self.uop is None
+    def _is_nop(self, uop: Uop) -> bool:
+        return getattr(uop.insn, "rd", None) == 0 and uop.insn.mnemonic == "addi"
 
     def _is_control_flow_instruction(self, uop: Uop) -> bool:
-        return isinstance(uop.insn, (SBType, UJType)) or uop.insn.mnemonic == "jalr"
+        return is_control_flow(uop.insn)
 
     def _is_control_flow_delay_slot_violation(self, uop: Uop) -> bool:
         return (
@@ -187,16 +260,7 @@ class InstructionDecode(Module):
             self._control_flow_delay_slots_remaining -= 1
 
     def check_backpressure(self, uop: Uop) -> bool:
-        if (
-            isinstance(uop.insn, DMA_WAIT_CH0)
-            or isinstance(uop.insn, DMA_WAIT_CH1)
-            or isinstance(uop.insn, DMA_WAIT_CH2)
-            or isinstance(uop.insn, DMA_WAIT_CH3)
-            or isinstance(uop.insn, DMA_WAIT_CH4)
-            or isinstance(uop.insn, DMA_WAIT_CH5)
-            or isinstance(uop.insn, DMA_WAIT_CH6)
-            or isinstance(uop.insn, DMA_WAIT_CH7)
-        ):
+        if self._is_dma_wait(uop):
             if self.arch_state.check_flag(uop.insn.funct3):
                 self._stalled = True
                 return True
@@ -207,6 +271,11 @@ class InstructionDecode(Module):
         if self.outputs[target_exu].should_stall():
             # Don't end D stage - keep it active to show instruction is waiting
             # The D stage will end when we actually dispatch
+            if self.arch_state.conflict_checker.stalls_on_conflict:
+                # Interlocked: wait for the unit to take its previous uop.
+                self.structural_stall_cycles[target_exu.name] += 1
+                self._stalled = True
+                return True
             raise RuntimeError(
                 f"Backpressure detected in IDU when running uop {uop.id} {str(uop.insn)} on cycle {self.cycle}"
             )
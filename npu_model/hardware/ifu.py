@@ -4,6 +4,9 @@ from ..software.program import Program
 from ..software.instruction import Uop
 from ..logging.logger import Logger, LaneType
 from ..hardware.arch_state import ArchState
+from ..isa import reads_pc
+from .imem import InstructionMemory
+from .cycle_accounting import FetchState
 
 class InstructionFetch(Module):
     """
@@ -20,21 +23,39 @@ class InstructionFetch(Module):
         width: int,
         logger: Logger,
         arch_state: ArchState,
+        imem: InstructionMemory | None = None,
     ) -> None:
         self.width = width
         self.logger = logger
         self.arch_state = arch_state
+        self.imem = imem
         self.program: Program | None = None
         self.cycle = 0
         self.reset()
 
     def load_program(self, program: Program):
+        if self.imem is not None:
+            self.imem.load_program(program)
         self.program = program
 
     def reset(self) -> None:
-        self.output: StageData[Uop | None] = StageData(None)
+        self.output: StageData[list[Uop]] = StageData([])
         self.arch_state.set_pc(0)
         self._stalled = False
+        # Last fetched PC-relative instruction (branch, jump, auipc) that
+        # has not yet executed, and how many delay slots follow it so far.
+        self._pc_reader: Uop | None = None
+        self._pc_reader_slots = 0
+        # Cycles left until the instruction memory returns a missing line
+        self._refill_remaining = 0
+        # PC whose missing line is being refilled; fetching it again once the
+        # line arrives is the same access, not a hit
+        self._refilled_pc: int | None = None
+        self._fetch_stall_cycles = 0
+        # Why the last tick produced no fetch group (None: fetched or output stalled)
+        self.fetch_state: FetchState | None = None
+        if self.imem is not None:
+            self.imem.reset()
 
     def is_finished(self) -> bool:
         """Check if all instructions have been fetched."""
@@ -44,18 +65,31 @@ class InstructionFetch(Module):
 
     def tick(self) -> None:
         """
-        Fetch instructions from the program.
+        Fetch up to `width` instructions from the program.
+
+        A fetch group ends after the first delay slot of a PC-relative
+        instruction (branch, jump, auipc).  The second delay slot is fetched
+        once that instruction has executed, followed by the fetch target it
+        resolved to.
         """
         if self.program == None:
             raise RuntimeError("Attempted to tick while no program is loaded.")
 
         self.cycle += 1
+        self.fetch_state = None
+        # Wait for an instruction memory refill to complete
+        if self._refill_remaining > 0:
+            self._refill_remaining -= 1
+            if self._refill_remaining > 0:
+                self._fetch_stall_cycles += 1
+                self.fetch_state = FetchState.REFILL
+                return
+
         # Stall if downstream hasn't claimed our output
         if self.output.should_stall():
             if not self._stalled:
                 # Just started stalling - end F stage for waiting insns
-                uop = self.output.peek()
-                if uop is not None:
+                for uop in self.output.peek():
                     self.logger.log_stage_end(
                         uop.id, "F", lane=LaneType.IFU.value, cycle=self.cycle
                     )
@@ -64,25 +98,78 @@ class InstructionFetch(Module):
 
         self._stalled = False
 
-        # Nothing more to fetch
-        if self.program.is_finished(self.arch_state.pc):
-            self.output.prepare(None)
-            return
-
-        fetched_instruction = self.program.get_instruction(self.arch_state.pc)
-
-        uop = Uop(fetched_instruction)
+        group: list[Uop] = []
+        pc = self.arch_state.pc
+        refilled, self._refilled_pc = self._refilled_pc, None
+        while len(group) < self.width:
+            last_delay_slot = self._pc_reader is not None and self._pc_reader_slots == 1
+            if last_delay_slot and self._pc_reader.next_pc is None:
+                # wait for the PC-relative instruction to execute
+                self.fetch_state = FetchState.REDIRECT
+                break
+
+            # Nothing more to fetch
+            if self.program.is_finished(pc):
+                self.fetch_state = FetchState.FINISHED
+                break
+
+            if pc == refilled:
+                refilled = None
+            elif self.imem is not None:
+                refill_cycles = self.imem.access(pc)
+                if refill_cycles > 0:
+                    self._refill_remaining = refill_cycles
+                    self._refilled_pc = pc
+                    if not group:
+                        self._fetch_stall_cycles += 1
+                    self.fetch_state = FetchState.REFILL
+                    break
+
+            uop = Uop(self.program.get_instruction(pc), pc=pc)
+            uop.fetch_cycle = self.cycle
+            group.append(uop)
+
+            # Log instruction and start fetch stage
+            self.logger.log_insn(uop.id, str(uop.insn))
+            self.logger.log_stage_start(
+                uop.id, "F", lane=LaneType.IFU.value, cycle=self.cycle
+            )
+
+            if last_delay_slot:
+                assert self._pc_reader is not None and self._pc_reader.next_pc is not None
+                pc = self._pc_reader.next_pc
+                self._pc_reader = None
+                continue
+            if self._pc_reader is not None:
+                self._pc_reader_slots += 1
+            elif reads_pc(uop.insn):
+                self._pc_reader = uop
+                self._pc_reader_slots = 0
+            pc += 4
+
+        if group:
+            self.fetch_state = None
+        self.output.prepare(group)
 
-        # Log instruction and start fetch stage
-        self.logger.log_insn(uop.id, str(uop.insn))
-        self.logger.log_stage_start(
-            uop.id, "F", lane=LaneType.IFU.value, cycle=self.cycle
-        )
+        # set the program counter to the next instruction, only if we did not stall
+        self.arch_state.set_pc(pc)
 
-        self.output.prepare(uop)
+    @property
+    def pending_pc_reader(self) -> Uop | None:
+        """The fetched branch / jump / auipc whose resolution fetch is waiting on."""
+        if self._pc_reader is not None and self._pc_reader_slots == 1:
+            return self._pc_reader
+        return None
 
-        # set the program counter to the next instruction, only if we did not stall
-        self.arch_state.set_pc(self.arch_state.npc)
+    @property
+    def fetch_stall_cycles(self) -> int:
+        """Cycles in which fetch was blocked on an instruction memory refill."""
+        return self._fetch_stall_cycles
+
+    def clear_redirect(self) -> None:
+        """Stop waiting on a PC-relative instruction that will never execute."""
+        self._pc_reader = None
+        self._pc_reader_slots = 0
 
     @property
     def is_stalled(self) -> bool:
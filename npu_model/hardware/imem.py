@@ -0,0 +1,99 @@
+"""
+Instruction memory model.
+
+The IFU reads instructions through an InstructionMemory when the hardware
+configuration selects a non-ideal model:
+  - "ideal": every fetch hits (no InstructionMemory is created).
+  - "sram" : the whole program is preloaded into an I-SRAM of
+             imem_size_bytes; programs that do not fit are rejected.
+  - "cache": a set-associative I-cache of imem_size_bytes with
+             icache_line_bytes lines and icache_ways ways (LRU).  Misses
+             refill one line from DRAM over the off-chip link used by the
+             DMA engine, plus a fixed icache_miss_latency_cycles.
+
+Link contention with in-flight DMA transfers is not modeled.
+"""
+
+from ..software.program import Program
+from .config import HardwareConfig
+from .dma import dma_offchip_cycles
+
+IMEM_MODELS = ("ideal", "sram", "cache")
+
+
+class InstructionMemory:
+    """I-SRAM / I-cache in front of the instruction fetch unit."""
+
+    def __init__(self, config: HardwareConfig) -> None:
+        if config.imem_model not in IMEM_MODELS:
+            raise ValueError(
+                f"Unknown imem_model '{config.imem_model}', expected one of {IMEM_MODELS}"
+            )
+        self.config = config
+        self.model = config.imem_model
+        self.size_bytes = config.imem_size_bytes
+        self.line_bytes = config.icache_line_bytes
+        self.ways = config.icache_ways
+        if self.model == "cache":
+            lines = self.size_bytes // self.line_bytes
+            if lines == 0 or lines % self.ways != 0:
+                raise ValueError(
+                    f"I-cache of {self.size_bytes} bytes cannot hold {self.ways} ways "
+                    f"of {self.line_bytes}-byte lines"
+                )
+            self.num_sets = lines // self.ways
+        else:
+            self.num_sets = 0
+        self.refill_cycles = config.icache_miss_latency_cycles + dma_offchip_cycles(
+            config, self.line_bytes
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        # Per set, resident line tags ordered from least to most recently used.
+        self._sets: list[list[int]] = [[] for _ in range(self.num_sets)]
+        self.accesses = 0
+        self.misses = 0
+        self.refill_bytes = 0
+
+    def load_program(self, program: Program) -> None:
+        """Check that a program fits when it has to be fully resident."""
+        program_bytes = len(program) * 4
+        if self.model == "sram" and program_bytes > self.size_bytes:
+            raise ValueError(
+                f"Program of {program_bytes} bytes does not fit in "
+                f"{self.size_bytes}-byte instruction SRAM"
+            )
+
+    def access(self, addr: int) -> int:
+        """
+        Look up the instruction at byte address *addr*.
+
+        Returns 0 on a hit, otherwise the number of cycles until the line
+        has been refilled.  The line is installed immediately; the caller
+        is expected to wait out the returned latency before fetching it.
+        """
+        self.accesses += 1
+        if self.model != "cache":
+            return 0
+
+        line = addr // self.line_bytes
+        ways = self._sets[line % self.num_sets]
+        if line in ways:
+            ways.remove(line)
+            ways.append(line)
+            return 0
+
+        self.misses += 1
+        self.refill_bytes += self.line_bytes
+        if len(ways) == self.ways:
+            ways.pop(0)
+        ways.append(line)
+        return self.refill_cycles
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of fetches that hit."""
+        if self.accesses == 0:
+            return 0.0
+        return 1.0 - self.misses / self.accesses
@@ -76,6 +76,7 @@ class LoadStoreUnit(ExecutionUnit):
         self.cycle += 1
         # Log deferred completions from last cycle
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id, cycle=self.cycle)
             self.logger.log_retire(uop.id)
 
@@ -93,20 +94,20 @@ class LoadStoreUnit(ExecutionUnit):
                 vmem_banks = vmem_accesses(uop.insn, self.arch_state)
 
                 checker = self.arch_state.conflict_checker
-                checker.acquire_mrf(mrf_banks, label)
-                checker.acquire_vmem(vmem_banks, label)
-                self._in_flight_mrf_banks = mrf_banks
-                self._in_flight_vmem_banks = vmem_banks
-
-                uop.execute_delay = self._get_latency(uop)
-                self.in_flight = uop
-                self._total_instructions += 1
-                self.logger.log_stage_end(
-                    uop.id, "D", lane=LaneType.DIU.value, cycle=self.cycle
-                )
-                self.logger.log_stage_start(
-                    uop.id, "E", lane=self.lane_id, cycle=self.cycle
-                )
+                # with the "stall" policy, busy banks leave the uop with the IDU
+                if checker.acquire(label, mrf=mrf_banks, vmem=vmem_banks):
+                    self._in_flight_mrf_banks = mrf_banks
+                    self._in_flight_vmem_banks = vmem_banks
+
+                    uop.execute_delay = self._get_latency(uop)
+                    self.in_flight = uop
+                    self._total_instructions += 1
+                    self.logger.log_stage_end(
+                        uop.id, "D", lane=LaneType.DIU.value, cycle=self.cycle
+                    )
+                    self.logger.log_stage_start(
+                        uop.id, "E", lane=self.lane_id, cycle=self.cycle
+                    )
 
         # Track if EXU was busy
         if self.is_busy():
@@ -115,7 +116,7 @@ class LoadStoreUnit(ExecutionUnit):
         if self.in_flight is not None:
             self.in_flight.execute_delay -= 1
             if self.in_flight.execute_delay <= 0:
-                self.in_flight.insn.exec(self.arch_state)
+                self.execute(self.in_flight)
 
                 checker = self.arch_state.conflict_checker
                 checker.release_mrf(self._in_flight_mrf_banks)
@@ -131,6 +132,7 @@ class LoadStoreUnit(ExecutionUnit):
     def flush_completions(self) -> None:
         """Flush any pending completions (call at end of simulation)."""
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle + 1
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id)
             self.logger.log_retire(uop.id)
         self._pending_completions = []
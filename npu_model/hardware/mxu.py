@@ -4,7 +4,7 @@ from ..hardware.arch_state import ArchState
 from ..software.instruction import Uop
 from ..isa import EXU
 from .stage_data import StageData
-from .config import HardwareConfig
+from .config import ArchStateConfig, HardwareConfig
 from .bank_conflict import mrf_accesses, weight_buffer_accesses, acc_buffer_accesses
 
 
@@ -40,6 +40,19 @@ MXU_OP_LATENCIES = {
     "vmatpop.bf16.acc.mxu1": 32,
 }
 
+
+def mxu_op_macs(mnemonic: str, cfg: ArchStateConfig) -> int:
+    """
+    Multiply-accumulates performed by one MXU operation.
+
+    A matmul multiplies an (mrf_depth x mrf_width) FP8 tile by a weight tile
+    holding wb_width FP8 values (mrf_width x wb_width / mrf_width).
+    """
+    if mnemonic.startswith("vmatmul"):
+        return cfg.mrf_depth * cfg.wb_width
+    return 0
+
+
 class MatrixExecutionUnitSystolic(ExecutionUnit):
     """MXU0: Execution unit for matrix operations."""
 
@@ -72,6 +85,7 @@ class MatrixExecutionUnitSystolic(ExecutionUnit):
         self._pending_completions: list[Uop] = []
         self._total_instructions = 0
         self._busy_cycles = 0
+        self._macs = 0
 
     def _execution_latency(self, uop: Uop) -> int:
         return MXU_OP_LATENCIES.get(uop.insn.mnemonic, 32)
@@ -80,6 +94,7 @@ class MatrixExecutionUnitSystolic(ExecutionUnit):
         self.cycle += 1
         # Log deferred completions from last cycle
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id, cycle=self.cycle)
             self.logger.log_retire(uop.id)
 
@@ -102,30 +117,31 @@ class MatrixExecutionUnitSystolic(ExecutionUnit):
                 weight_banks = weight_buffer_accesses(uop.insn)
                 acc_banks = acc_buffer_accesses(uop.insn)
 
-                self.arch_state.conflict_checker.acquire_mrf(mrf_banks, label)
-                self.arch_state.conflict_checker.acquire_weight_buf(weight_banks, label)
-                self.arch_state.conflict_checker.acquire_acc_buf(acc_banks, label)
-
-                self._in_flight_mrf_banks = mrf_banks
-                self._in_flight_weight_banks = weight_banks
-                self._in_flight_acc_banks = acc_banks
-
-                uop.execute_delay = self._execution_latency(uop)
-                self.in_flight = uop
-                self._total_instructions += 1
-                # Log: end dispatch, start execute
-                self.logger.log_stage_end(
-                    uop.id,
-                    "D",
-                    lane=LaneType.DIU.value,
-                    cycle=self.cycle,
-                )
-                self.logger.log_stage_start(
-                    uop.id,
-                    "E",
-                    lane=self.lane_id,
-                    cycle=self.cycle,
-                )
+                # with the "stall" policy, busy banks leave the uop with the IDU
+                if self.arch_state.conflict_checker.acquire(
+                    label, mrf=mrf_banks, weight_buf=weight_banks, acc_buf=acc_banks
+                ):
+                    self._in_flight_mrf_banks = mrf_banks
+                    self._in_flight_weight_banks = weight_banks
+                    self._in_flight_acc_banks = acc_banks
+
+                    uop.execute_delay = self._execution_latency(uop)
+                    self.in_flight = uop
+                    self._total_instructions += 1
+                    self._macs += mxu_op_macs(uop.insn.mnemonic, self.arch_state.cfg)
+                    # Log: end dispatch, start execute
+                    self.logger.log_stage_end(
+                        uop.id,
+                        "D",
+                        lane=LaneType.DIU.value,
+                        cycle=self.cycle,
+                    )
+                    self.logger.log_stage_start(
+                        uop.id,
+                        "E",
+                        lane=self.lane_id,
+                        cycle=self.cycle,
+                    )
 
         # Track if EXU was busy
         if self.is_busy():
@@ -136,7 +152,7 @@ class MatrixExecutionUnitSystolic(ExecutionUnit):
             self.in_flight.execute_delay -= 1
             if self.in_flight.execute_delay <= 0:
                 # execute the instruction
-                self.in_flight.insn.exec(self.arch_state)
+                self.execute(self.in_flight)
                 self._complete_count = 1
 
                 # Release acquired MRF/acc/weight banks before retiring the instruction.
@@ -160,6 +176,7 @@ class MatrixExecutionUnitSystolic(ExecutionUnit):
     def flush_completions(self) -> None:
         """Flush any pending completions (call at end of simulation)."""
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle + 1
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id)
             self.logger.log_retire(uop.id)
         self._pending_completions = []
@@ -188,6 +205,11 @@ class MatrixExecutionUnitSystolic(ExecutionUnit):
         """Number of cycles the EXU was busy."""
         return self._busy_cycles
 
+    @property
+    def macs(self) -> int:
+        """Multiply-accumulates performed."""
+        return self._macs
+
 
 class MatrixExecutionUnitInner(ExecutionUnit):
     """MXU1: Execution unit for matrix operations."""
@@ -221,6 +243,7 @@ class MatrixExecutionUnitInner(ExecutionUnit):
         self._pending_completions: list[Uop] = []
         self._total_instructions = 0
         self._busy_cycles = 0
+        self._macs = 0
 
     def _execution_latency(self, uop: Uop) -> int:
         return MXU_OP_LATENCIES[uop.insn.mnemonic]
@@ -229,6 +252,7 @@ class MatrixExecutionUnitInner(ExecutionUnit):
         self.cycle += 1
         # Log deferred completions from last cycle
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id, cycle=self.cycle)
             self.logger.log_retire(uop.id)
 
@@ -251,30 +275,31 @@ class MatrixExecutionUnitInner(ExecutionUnit):
                 weight_banks = weight_buffer_accesses(uop.insn)
                 acc_banks = acc_buffer_accesses(uop.insn)
 
-                self.arch_state.conflict_checker.acquire_mrf(mrf_banks, label)
-                self.arch_state.conflict_checker.acquire_weight_buf(weight_banks, label)
-                self.arch_state.conflict_checker.acquire_acc_buf(acc_banks, label)
-
-                self._in_flight_mrf_banks = mrf_banks
-                self._in_flight_weight_banks = weight_banks
-                self._in_flight_acc_banks = acc_banks
-
-                uop.execute_delay = self._execution_latency(uop)
-                self.in_flight = uop
-                self._total_instructions += 1
-                # Log: end dispatch, start execute
-                self.logger.log_stage_end(
-                    uop.id,
-                    "D",
-                    lane=LaneType.DIU.value,
-                    cycle=self.cycle,
-                )
-                self.logger.log_stage_start(
-                    uop.id,
-                    "E",
-                    lane=self.lane_id,
-                    cycle=self.cycle,
-                )
+                # with the "stall" policy, busy banks leave the uop with the IDU
+                if self.arch_state.conflict_checker.acquire(
+                    label, mrf=mrf_banks, weight_buf=weight_banks, acc_buf=acc_banks
+                ):
+                    self._in_flight_mrf_banks = mrf_banks
+                    self._in_flight_weight_banks = weight_banks
+                    self._in_flight_acc_banks = acc_banks
+
+                    uop.execute_delay = self._execution_latency(uop)
+                    self.in_flight = uop
+                    self._total_instructions += 1
+                    self._macs += mxu_op_macs(uop.insn.mnemonic, self.arch_state.cfg)
+                    # Log: end dispatch, start execute
+                    self.logger.log_stage_end(
+                        uop.id,
+                        "D",
+                        lane=LaneType.DIU.value,
+                        cycle=self.cycle,
+                    )
+                    self.logger.log_stage_start(
+                        uop.id,
+                        "E",
+                        lane=self.lane_id,
+                        cycle=self.cycle,
+                    )
 
         # Track if EXU was busy
         if self.is_busy():
@@ -285,7 +310,7 @@ class MatrixExecutionUnitInner(ExecutionUnit):
             self.in_flight.execute_delay -= 1
             if self.in_flight.execute_delay <= 0:
                 # execute the instruction
-                self.in_flight.insn.exec(self.arch_state)
+                self.execute(self.in_flight)
                 self._complete_count = 1
                 # Release acquired MRF/acc/weight banks before retiring the instruction.
                 self.arch_state.conflict_checker.release_mrf(self._in_flight_mrf_banks)
@@ -308,6 +333,7 @@ class MatrixExecutionUnitInner(ExecutionUnit):
     def flush_completions(self) -> None:
         """Flush any pending completions (call at end of simulation)."""
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle + 1
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id)
             self.logger.log_retire(uop.id)
         self._pending_completions = []
@@ -335,3 +361,8 @@ class MatrixExecutionUnitInner(ExecutionUnit):
     def busy_cycles(self) -> int:
         """Number of cycles the EXU was busy."""
         return self._busy_cycles
+
+    @property
+    def macs(self) -> int:
+        """Multiply-accumulates performed."""
+        return self._macs
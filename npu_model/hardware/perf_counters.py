@@ -0,0 +1,93 @@
+"""
+Architectural performance counters.
+
+The core exposes a set of 64-bit counters as read-only CSRs (addresses in
+npu_model.isa_types) so kernels can measure regions of themselves with
+`csrr`:
+
+  - cycle            : cycles elapsed since reset
+  - instret          : instructions retired
+  - dmabytes         : bytes moved by all DMA units
+  - stallcycles      : cycles in which the IDU dispatched nothing
+  - dmawaitcycles    : cycles the IDU was blocked on a dma.wait
+  - fetchstallcycles : cycles the IDU was empty waiting on fetch or a redirect
+  - exubusyN         : busy cycles of the N-th execution unit
+
+Counters are not stored in the CSR file; each read is served from the state
+the core already keeps (cycle accounting, EXU statistics).  A counter read
+returns its value at the start of the cycle in which the csr instruction
+executes.  Writes to counter CSRs are ignored.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+from ..isa_types import (
+    CSR_CYCLE,
+    CSR_DMA_BYTES,
+    CSR_DMA_WAIT_CYCLES,
+    CSR_EXU_BUSY_BASE,
+    CSR_FETCH_STALL_CYCLES,
+    CSR_HIGH_HALF_OFFSET,
+    CSR_INSTRET,
+    CSR_STALL_CYCLES,
+    NUM_EXU_BUSY_CSRS,
+)
+from .cycle_accounting import CycleCategory
+
+if TYPE_CHECKING:
+    from .arch_state import ArchState
+    from .core import Core
+
+_MASK32 = 0xFFFF_FFFF
+
+
+class PerfCounters:
+    """Performance counters of one Core, readable through its CSR file."""
+
+    def __init__(self, core: Core) -> None:
+        self.core = core
+        self.counters: dict[int, Callable[[], int]] = {
+            CSR_CYCLE: self.cycle,
+            CSR_INSTRET: self.instret,
+            CSR_DMA_BYTES: self.dma_bytes,
+            CSR_STALL_CYCLES: self.stall_cycles,
+            CSR_DMA_WAIT_CYCLES: self.dma_wait_cycles,
+            CSR_FETCH_STALL_CYCLES: self.fetch_stall_cycles,
+        }
+        for index, exu in enumerate(core.exus[:NUM_EXU_BUSY_CSRS]):
+            self.counters[CSR_EXU_BUSY_BASE + index] = lambda exu=exu: exu.busy_cycles
+
+    def install(self, arch_state: ArchState) -> None:
+        """Serve reads of the counter CSRs of *arch_state* from this object."""
+        for addr, counter in self.counters.items():
+            arch_state.csr_read_hooks[addr] = lambda counter=counter: counter() & _MASK32
+            arch_state.csr_read_hooks[addr + CSR_HIGH_HALF_OFFSET] = (
+                lambda counter=counter: (counter() >> 32) & _MASK32
+            )
+
+    def cycle(self) -> int:
+        return self.core.cycle_accounting.cycles
+
+    def instret(self) -> int:
+        return self.core.total_completed
+
+    def dma_bytes(self) -> int:
+        return sum(getattr(exu, "bytes_moved", 0) for exu in self.core.exus)
+
+    def stall_cycles(self) -> int:
+        categories = self.core.cycle_accounting.categories
+        dispatched = categories[CycleCategory.ISSUE] + categories[CycleCategory.DELAY_SLOT]
+        return self.core.cycle_accounting.cycles - dispatched
+
+    def dma_wait_cycles(self) -> int:
+        return self.core.cycle_accounting.categories[CycleCategory.DMA_WAIT]
+
+    def fetch_stall_cycles(self) -> int:
+        categories = self.core.cycle_accounting.categories
+        return categories[CycleCategory.FETCH] + categories[CycleCategory.CONTROL_FLOW]
+
+    def snapshot(self) -> dict[int, int]:
+        """Current (full 64-bit) value of every counter, keyed by CSR address."""
+        return {addr: counter() for addr, counter in self.counters.items()}
@@ -6,7 +6,7 @@ from ..hardware.arch_state import ArchState
 from ..software.instruction import Uop
 from ..isa import EXU
 from .stage_data import StageData
-from .config import HardwareConfig
+from .config import ArchStateConfig, HardwareConfig
 from .bank_conflict import mrf_accesses, vmem_accesses
 
 
@@ -51,6 +51,47 @@ VPU_OP_LATENCIES = {
     "vtrpose.xlu": 66,
 }
 
+# Op classes used by the pipelined VPU to pick an initiation interval.
+# Reductions and iterative (transcendental / reciprocal) ops hold their
+# functional unit for several cycles; transposes go through the XLU.
+VPU_NON_PIPELINEABLE_OPS = frozenset(
+    {
+        "vredsum.bf16",
+        "vredmin.bf16",
+        "vredmax.bf16",
+        "vredsum.row.bf16",
+        "vredmin.row.bf16",
+        "vredmax.row.bf16",
+        "vrecip.bf16",
+        "vexp.bf16",
+        "vexp2.bf16",
+        "vsin.bf16",
+        "vcos.bf16",
+        "vtanh.bf16",
+        "vlog2.bf16",
+        "vsqrt.bf16",
+    }
+)
+VPU_TRANSFORM_OPS = frozenset({"vtrpose.xlu"})
+# Ops that only move or materialize data and do no element arithmetic.
+VPU_DATA_MOVEMENT_OPS = frozenset({"vli.all", "vli.row", "vli.col", "vli.one", "vmov", "vtrpose.xlu"})
+
+
+def vpu_op_element_ops(mnemonic: str, cfg: ArchStateConfig) -> int:
+    """Element operations performed by one VPU op on a BF16 tile (a register pair)."""
+    if mnemonic in VPU_DATA_MOVEMENT_OPS:
+        return 0
+    return cfg.mrf_depth * cfg.mrf_width
+
+
+def vpu_op_class(mnemonic: str) -> str:
+    """Return the pipeline op class ("simple", "non_pipelineable" or "transform")."""
+    if mnemonic in VPU_NON_PIPELINEABLE_OPS:
+        return "non_pipelineable"
+    if mnemonic in VPU_TRANSFORM_OPS:
+        return "transform"
+    return "simple"
+
 
 class VectorExecutionUnit(ExecutionUnit):
     """Execution unit for vector operations."""
@@ -83,6 +124,7 @@ class VectorExecutionUnit(ExecutionUnit):
         self._pending_completions: list[Uop] = []
         self._total_instructions = 0
         self._busy_cycles = 0
+        self._element_ops = 0
 
     def _execution_latency(self, uop: Uop) -> int:
         mnemonic = uop.insn.mnemonic
@@ -92,6 +134,7 @@ class VectorExecutionUnit(ExecutionUnit):
         self.cycle += 1
         # Log deferred completions from last cycle
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id, cycle=self.cycle)
             self.logger.log_retire(uop.id)
 
@@ -112,27 +155,28 @@ class VectorExecutionUnit(ExecutionUnit):
                 mrf_banks = mrf_accesses(uop.insn)
                 vmem_banks = vmem_accesses(uop.insn, self.arch_state)
                 checker = self.arch_state.conflict_checker
-                checker.acquire_mrf(mrf_banks, label)
-                checker.acquire_vmem(vmem_banks, label)
-                self._in_flight_mrf_banks = mrf_banks
-                self._in_flight_vmem_banks = vmem_banks
-                # tag instruction with execution delay
-                uop.execute_delay = self._execution_latency(uop)
-                self.in_flight = uop
-                self._total_instructions += 1
-                # Log: end dispatch, start execute
-                self.logger.log_stage_end(
-                    uop.id,
-                    "D",
-                    lane=LaneType.DIU.value,
-                    cycle=self.cycle,
-                )
-                self.logger.log_stage_start(
-                    uop.id,
-                    "E",
-                    lane=self.lane_id,
-                    cycle=self.cycle,
-                )
+                # with the "stall" policy, busy banks leave the uop with the IDU
+                if checker.acquire(label, mrf=mrf_banks, vmem=vmem_banks):
+                    self._in_flight_mrf_banks = mrf_banks
+                    self._in_flight_vmem_banks = vmem_banks
+                    # tag instruction with execution delay
+                    uop.execute_delay = self._execution_latency(uop)
+                    self.in_flight = uop
+                    self._total_instructions += 1
+                    self._element_ops += vpu_op_element_ops(uop.insn.mnemonic, self.arch_state.cfg)
+                    # Log: end dispatch, start execute
+                    self.logger.log_stage_end(
+                        uop.id,
+                        "D",
+                        lane=LaneType.DIU.value,
+                        cycle=self.cycle,
+                    )
+                    self.logger.log_stage_start(
+                        uop.id,
+                        "E",
+                        lane=self.lane_id,
+                        cycle=self.cycle,
+                    )
 
         # Track if EXU was busy
         if self.is_busy():
@@ -143,7 +187,7 @@ class VectorExecutionUnit(ExecutionUnit):
             self.in_flight.execute_delay -= 1
             if self.in_flight.execute_delay <= 0:
                 # execute the instruction
-                self.in_flight.insn.exec(self.arch_state)
+                self.execute(self.in_flight)
                 self._complete_count = 1
                 # Release acquired banks before retiring the instruction.
                 checker = self.arch_state.conflict_checker
@@ -160,6 +204,7 @@ class VectorExecutionUnit(ExecutionUnit):
     def flush_completions(self) -> None:
         """Flush any pending completions (call at end of simulation)."""
         for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle + 1
             self.logger.log_stage_end(uop.id, "E", lane=self.lane_id)
             self.logger.log_retire(uop.id)
         self._pending_completions = []
@@ -187,3 +232,146 @@ class VectorExecutionUnit(ExecutionUnit):
     def busy_cycles(self) -> int:
         """Number of cycles the EXU was busy."""
         return self._busy_cycles
+
+    @property
+    def element_ops(self) -> int:
+        """BF16 element operations performed."""
+        return self._element_ops
+
+
+class PipelinedVectorExecutionUnit(VectorExecutionUnit):
+    """
+    Pipelined execution unit for vector operations.
+
+    Unlike VectorExecutionUnit, several operations may be in flight at once.
+    A new operation can enter the pipeline once the initiation interval of the
+    previously issued operation has elapsed:
+      - simple element-wise ops:  config.vpu_simple_op_latency_cycles
+      - non-pipelineable ops:     config.vpu_non_pipelineable_op_latency_cycles
+      - XLU transforms:           config.xlu_transform_latency_cycles
+
+    Latency is still taken from VPU_OP_LATENCIES, so operations complete out
+    of issue order.  Operations are claimed from the DIU as soon as they
+    enter the pipeline.  Overlapping operations hold
+    their MRF / VMEM banks for their whole latency, so structural hazards
+    between them are reported by the bank conflict checker.
+    """
+
+    def reset(self) -> None:
+        super().reset()
+        self.in_flight: list[Uop] = []  # type: ignore[assignment]
+        self._in_flight_banks: dict[int, tuple[frozenset[int], frozenset[int]]] = {}
+        self._issue_cooldown = 0
+        self._issue_stall_cycles = 0
+        self._peak_in_flight = 0
+
+    def initiation_interval(self, uop: Uop) -> int:
+        """Cycles before another operation may enter the pipeline after *uop*."""
+        assert self.config is not None
+        op_class = vpu_op_class(uop.insn.mnemonic)
+        if op_class == "non_pipelineable":
+            interval = self.config.vpu_non_pipelineable_op_latency_cycles
+        elif op_class == "transform":
+            interval = self.config.xlu_transform_latency_cycles
+        else:
+            interval = self.config.vpu_simple_op_latency_cycles
+        return max(1, min(interval, self._execution_latency(uop)))
+
+    def tick(self, idu_output: StageData[Uop | None]) -> None:
+        assert self.config is not None
+        self.cycle += 1
+        # Log deferred completions from last cycle
+        for uop in self._pending_completions:
+            uop.complete_cycle = self.cycle
+            self.logger.log_stage_end(uop.id, "E", lane=self.lane_id, cycle=self.cycle)
+            self.logger.log_retire(uop.id)
+
+        self._pending_completions = []
+
+        self._complete_count = 0
+
+        if self._issue_cooldown > 0:
+            self._issue_cooldown -= 1
+
+        uop = idu_output.peek()
+        if uop is not None:
+            if self._issue_cooldown > 0 or len(self.in_flight) >= self.config.vpu_max_in_flight:
+                # Issue port still occupied by an earlier operation.
+                self._issue_stall_cycles += 1
+            else:
+                assert uop.insn.exu == EXU.VECTOR, "Non-vector instruction passed to Vector Unit."
+                label = f"{self.name}:{uop.insn.mnemonic}"
+                mrf_banks = mrf_accesses(uop.insn)
+                vmem_banks = vmem_accesses(uop.insn, self.arch_state)
+                checker = self.arch_state.conflict_checker
+                if not checker.acquire(label, mrf=mrf_banks, vmem=vmem_banks):
+                    # Banks held by an earlier operation ("stall" policy).
+                    self._issue_stall_cycles += 1
+                else:
+                    self._in_flight_banks[uop.id] = (mrf_banks, vmem_banks)
+                    # tag instruction with execution delay
+                    uop.execute_delay = self._execution_latency(uop)
+                    self._issue_cooldown = self.initiation_interval(uop)
+                    self.in_flight.append(uop)
+                    self._peak_in_flight = max(self._peak_in_flight, len(self.in_flight))
+                    self._total_instructions += 1
+                    self._element_ops += vpu_op_element_ops(uop.insn.mnemonic, self.arch_state.cfg)
+                    # claim the uop from the DIU so the next one can be dispatched
+                    idu_output.claim()
+                    # Log: end dispatch, start execute
+                    self.logger.log_stage_end(
+                        uop.id,
+                        "D",
+                        lane=LaneType.DIU.value,
+                        cycle=self.cycle,
+                    )
+                    self.logger.log_stage_start(
+                        uop.id,
+                        "E",
+                        lane=self.lane_id,
+                        cycle=self.cycle,
+                    )
+
+        # Track if EXU was busy
+        if self.is_busy():
+            self._busy_cycles += 1
+
+        # Advance every in-flight operation.  Ops complete as their own
+        # latency elapses, so a short op can finish before an older long one;
+        # the banks they hold keep dependent ops from overlapping them.
+        still_in_flight: list[Uop] = []
+        for in_flight in self.in_flight:
+            in_flight.execute_delay -= 1
+            if in_flight.execute_delay > 0:
+                still_in_flight.append(in_flight)
+                continue
+            # execute the instruction
+            self.execute(in_flight)
+            self._complete_count += 1
+            # Release acquired banks before retiring the instruction.
+            mrf_banks, vmem_banks = self._in_flight_banks.pop(in_flight.id)
+            checker = self.arch_state.conflict_checker
+            checker.release_mrf(mrf_banks)
+            checker.release_vmem(vmem_banks)
+            # Defer completion logging to next tick
+            self._pending_completions.append(in_flight)
+        self.in_flight = still_in_flight
+
+    def is_busy(self) -> bool:
+        """Check if the EXU is busy."""
+        return len(self.in_flight) > 0
+
+    @property
+    def has_in_flight(self) -> bool:
+        """Check if there are any in-flight instructions."""
+        return len(self.in_flight) > 0
+
+    @property
+    def issue_stall_cycles(self) -> int:
+        """Cycles an operation waited in the DIU output for the issue port."""
+        return self._issue_stall_cycles
+
+    @property
+    def peak_in_flight(self) -> int:
+        """Largest number of operations in flight at the same time."""
+        return self._peak_in_flight
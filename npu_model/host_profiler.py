@@ -0,0 +1,131 @@
+"""
+Host-side self-profiling of the simulator.
+
+HostProfiler.attach(core) wraps the bound methods of one Core instance with
+perf_counter_ns accumulators; nothing is wrapped (and nothing is paid) when
+profiling is not requested.  Wrapped regions:
+
+  - core          : Core.tick bookkeeping outside the regions below
+  - ifu / idu     : InstructionFetch.tick / InstructionDecode.tick
+  - exu:<name>    : each ExecutionUnit.tick
+  - exec:<mn>     : ExecutionUnit.execute, per mnemonic (the tensor math)
+  - bank_conflict : BankConflictChecker acquire / release calls
+  - logger        : Logger.log_* calls (including trace event writes)
+
+Regions nest, so each one reports both inclusive time and exclusive ("self")
+time with nested regions subtracted.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .hardware.core import Core
+
+LOGGER_METHODS = (
+    "log_cycle",
+    "log_insn",
+    "log_retire",
+    "log_stage_start",
+    "log_stage_end",
+    "log_dependency",
+    "log_arch_value",
+)
+BANK_CHECKER_METHODS = (
+    "acquire",
+    "release_mrf",
+    "release_vmem",
+    "release_weight_buf",
+    "release_acc_buf",
+)
+
+
+@dataclass
+class HostRegion:
+    name: str
+    calls: int
+    inclusive_ns: int
+    exclusive_ns: int
+
+
+class HostProfiler:
+    """Accumulates host wall time per simulator component."""
+
+    def __init__(self) -> None:
+        self.calls: defaultdict[str, int] = defaultdict(int)
+        self.inclusive_ns: defaultdict[str, int] = defaultdict(int)
+        self.exclusive_ns: defaultdict[str, int] = defaultdict(int)
+        # time spent in nested regions, one accumulator per open region
+        self._children_ns: list[int] = []
+
+    def reset(self) -> None:
+        # cleared in place: the installed wrappers hold references to these
+        self.calls.clear()
+        self.inclusive_ns.clear()
+        self.exclusive_ns.clear()
+        self._children_ns.clear()
+
+    def attach(self, core: Core) -> None:
+        """Instrument the components of *core*."""
+        self._wrap(core, "tick", "core")
+        self._wrap(core.ifu, "tick", "ifu")
+        self._wrap(core.idu, "tick", "idu")
+        for exu in core.exus:
+            self._wrap(exu, "tick", f"exu:{exu.name}")
+            self._wrap(exu, "execute", lambda uop: f"exec:{uop.insn.mnemonic}")
+        checker = core.arch_state.conflict_checker
+        for method in BANK_CHECKER_METHODS:
+            self._wrap(checker, method, "bank_conflict")
+        for method in LOGGER_METHODS:
+            self._wrap(core.logger, method, "logger")
+
+    def _wrap(self, obj: Any, method: str, region: str | Callable[..., str]) -> None:
+        fn = getattr(obj, method)
+        calls = self.calls
+        inclusive = self.inclusive_ns
+        exclusive = self.exclusive_ns
+        children = self._children_ns
+
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            name = region if isinstance(region, str) else region(*args, **kwargs)
+            children.append(0)
+            start = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                nested = children.pop()
+                calls[name] += 1
+                inclusive[name] += elapsed
+                exclusive[name] += elapsed - nested
+                if children:
+                    children[-1] += elapsed
+
+        setattr(obj, method, wrapped)
+
+    @property
+    def total_ns(self) -> int:
+        """Host time spent inside Core.tick."""
+        return self.inclusive_ns.get("core", 0)
+
+    def regions(self) -> list[HostRegion]:
+        """All regions, largest exclusive time first."""
+        return sorted(
+            (
+                HostRegion(name, self.calls[name], self.inclusive_ns[name], self.exclusive_ns[name])
+                for name in self.calls
+            ),
+            key=lambda region: region.exclusive_ns,
+            reverse=True,
+        )
+
+    def components(self) -> dict[str, int]:
+        """Exclusive time per component, with per-mnemonic exec time folded into "exec"."""
+        totals: defaultdict[str, int] = defaultdict(int)
+        for name, ns in self.exclusive_ns.items():
+            totals["exec" if name.startswith("exec:") else name] += ns
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
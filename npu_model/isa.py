@@ -1,14 +1,10 @@
-from typing import TYPE_CHECKING, TypeIs, Any, cast
+from typing import TYPE_CHECKING, TypeIs, Any, ClassVar, cast
 from abc import ABC, abstractmethod
+from npu_model.codec import Codec, Field, compile_codec, field, register
 from npu_model.isa_types import *
 if TYPE_CHECKING:
     from npu_model.hardware.arch_state import ArchState
 
-# Utility functions for assembly
-def _mask(val: int, bits: int):
-    """returns the first `bits` bits of `val`"""
-    return val & ((1 << bits) - 1)
-
 class IsaSpec:
     operations: dict[str,type[Instruction]] = {}
     R: dict[str,type[RType]] = {}
@@ -27,13 +23,16 @@ class Instruction(ABC):
     opcode: Opcode = NotImplemented
     exu: EXU       = NotImplemented
 
+    fields: ClassVar[tuple[Field, ...]] = ()
+    """ Bit layout of the format; compiled into `codec` for every instruction. """
+    codec: ClassVar[Codec] = NotImplemented
+
     def __str__(self):
         values = [str(v) for v in self.__dict__.values()]
         return f"{self.mnemonic} {', '.join(values)}"
 
-    @abstractmethod
     def to_bytecode(self) -> int:
-        raise NotImplementedError()
+        return self.codec.encode_instruction(self)
 
     @abstractmethod
     def exec(
@@ -53,6 +52,8 @@ class Instruction(ABC):
         
         if instr:
             IsaSpec.operations[cls.mnemonic] = cls
+            cls.codec = compile_codec(cls, cls.fields)
+            register(cls.codec)
         return super().__init_subclass__()
 
 class RType(Instruction, instr=False):
@@ -62,23 +63,14 @@ class RType(Instruction, instr=False):
     rs1: ScalarReg = ScalarReg(0)
     rs2: ScalarReg = ScalarReg(0)
 
-
-    def to_bytecode(self):
-        funct7_b = _mask(self.funct7, 7)
-        rd_b = _mask(self.rd, 5)
-        rs1_b = _mask(self.rs1, 5)
-        rs2_b = _mask(self.rs2, 5)
-        opcode_b = _mask(self.opcode, 7)
-        funct3_b = _mask(self.funct3, 3)
-
-        return (
-            (funct7_b << 25)
-            | (rs2_b << 20)
-            | (rs1_b << 15)
-            | (funct3_b << 12)
-            | (rd_b << 7)
-            | opcode_b
-        )
+    fields = (
+        field("opcode", 7, 0),
+        field("rd", 5, 7),
+        field("funct3", 3, 12),
+        field("rs1", 5, 15),
+        field("rs2", 5, 20),
+        field("funct7", 7, 25),
+    )
 
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, funct3: Funct3L, funct7: Funct7L, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
@@ -93,17 +85,16 @@ class IType[RD: (ScalarReg, ExponentReg) = ScalarReg, IMM: (Imm12, SBImm12) = Im
     rs1: ScalarReg         = ScalarReg(0)
     imm: IMM
 
-    def to_bytecode(self):
-        rd = self.rd if hasattr(self, 'rd') else 0
-        rd = self.imm if hasattr(self, 'imm') else 0
-        rd_b = _mask(rd, 5)
-        rs1_b = _mask(self.rs1, 5)
-        opcode_b = _mask(self.opcode, 7)
-        imm_b = _mask(self.imm, 12)
-        funct3_b = _mask(self.funct3, 3)
-
-        return (imm_b << 20) | (rs1_b << 15) | (funct3_b << 12) | (rd_b << 7) | opcode_b
-    
+    fields = (
+        field("opcode", 7, 0),
+        field("rd", 5, 7),
+        field("funct3", 3, 12),
+        field("rs1", 5, 15),
+        field("imm", 12, 20, signed=True),
+        # imm[11:5] of shifts (srai), which take a 5-bit shamt
+        field("UPPER_IMM", 7, 25),
+    )
+
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, funct3: Funct3L, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
         cls.funct3 = Funct3(funct3)
@@ -116,28 +107,14 @@ class SType(Instruction, instr=False):
     rs2: ScalarReg    = ScalarReg(0)
     imm: Imm12        = Imm12(0)
 
-    def to_bytecode(self):
-        imm_b = _mask(self.imm, 12)
-
-        # RISC-V Standard Split:
-        # imm_high = bits 11 down to 5
-        # imm_low  = bits 4 down to 0
-        imm_high = (imm_b >> 5) & 0x7F
-        imm_low = imm_b & 0x1F
-
-        rs2_b = _mask(self.rs2, 5)
-        rs1_b = _mask(self.rs1, 5)
-        funct3_b = _mask(self.funct3, 3)
-        opcode_b = _mask(self.opcode, 7)
-
-        return (
-            (imm_high << 25)
-            | (rs2_b << 20)
-            | (rs1_b << 15)
-            | (funct3_b << 12)
-            | (imm_low << 7)
-            | opcode_b
-        )
+    # RISC-V Standard Split: imm[11:5] at bits 31:25, imm[4:0] at bits 11:7
+    fields = (
+        field("opcode", 7, 0),
+        field("funct3", 3, 12),
+        field("rs1", 5, 15),
+        field("rs2", 5, 20),
+        Field("imm", ((0, 5, 7), (5, 7, 25)), signed=True),
+    )
 
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, funct3: Funct3L, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
@@ -151,32 +128,15 @@ class SBType(Instruction, instr=False):
     rs2: ScalarReg    = ScalarReg(0)
     imm: SBImm12      = SBImm12(0)
 
-    def to_bytecode(self):
-        # Branch immediates are 13 bits (bit 0 is always 0)
-        imm_b = _mask(self.imm, 13)
-        
-        # Extract bits exactly per the RISC-V ISA spec
-        imm12    = (imm_b >> 12) & 0x1    # bit 12
-        imm11    = (imm_b >> 11) & 0x1    # bit 11
-        imm10_5  = (imm_b >> 5)  & 0x3F   # bits 10:5 (6 bits)
-        imm4_1   = (imm_b >> 1)  & 0xF    # bits 4:1  (4 bits)
-
-        rs2_b    = _mask(self.rs2, 5)
-        rs1_b    = _mask(self.rs1, 5)
-        funct3_b = _mask(self.funct3, 3)
-        opcode_b = _mask(self.opcode, 7)
-
-        return (
-            (imm12 << 31)    |
-            (imm10_5 << 25)  |
-            (rs2_b << 20)    |
-            (rs1_b << 15)    |
-            (funct3_b << 12) |
-            (imm4_1 << 8)    | # bits 4:1 go to bits 11:8
-            (imm11 << 7)     | # bit 11 goes to bit 7
-            opcode_b
-        )
-    
+    # Branch immediates are 13 bits (bit 0 is always 0), split per the RISC-V ISA spec
+    fields = (
+        field("opcode", 7, 0),
+        field("funct3", 3, 12),
+        field("rs1", 5, 15),
+        field("rs2", 5, 20),
+        Field("imm", ((11, 1, 7), (1, 4, 8), (5, 6, 25), (12, 1, 31)), signed=True),
+    )
+
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, funct3: Funct3L, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
         cls.funct3 = Funct3(funct3)
@@ -187,12 +147,11 @@ class UType(Instruction, instr=False):
     rd: ScalarReg = ScalarReg(0)
     imm: Imm20    = Imm20(0)
 
-    def to_bytecode(self):
-        imm_b = _mask(self.imm, 20)
-        rd_b = _mask(self.rd, 5)
-        opcode_b = _mask(self.opcode, 7)
-
-        return (imm_b << 12) | (rd_b << 7) | opcode_b
+    fields = (
+        field("opcode", 7, 0),
+        field("rd", 5, 7),
+        field("imm", 20, 12),
+    )
 
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
@@ -203,24 +162,13 @@ class UJType(Instruction, instr=False):
     rd: ScalarReg = ScalarReg(0)
     imm: Imm20    = Imm20(0)
 
-    def to_bytecode(self):
-        imm_b = _mask(self.imm, 21)
-        imm19_b = (imm_b >> 20) & 1
-        imm110_b = (imm_b >> 1) & 0x3FF
-        imm11_b = (imm_b >> 11) & 1
-        imm1219_b = (imm_b >> 12) & 0xFF
-        rd_b = _mask(self.rd, 5)
-        opcode_b = _mask(self.opcode, 7)
-
-        return (
-            (imm19_b << 31)
-            | (imm110_b << 21)
-            | (imm11_b << 20)
-            | (imm1219_b << 12)
-            | (rd_b << 7)
-            | opcode_b
-        )
-    
+    # 21-bit byte offset (bit 0 is always 0): imm[20|10:1|11|19:12] at bits 31:12
+    fields = (
+        field("opcode", 7, 0),
+        field("rd", 5, 7),
+        Field("imm", ((12, 8, 12), (11, 1, 20), (1, 10, 21), (20, 1, 31)), signed=True),
+    )
+
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
         IsaSpec.UJ[mnemonic] = cls
@@ -232,15 +180,14 @@ class VLSType(Instruction, instr=False):
     rs1: ScalarReg = ScalarReg(0)
     imm: Imm12     = Imm12(0)
 
-    def to_bytecode(self):
-        imm_b = _mask(self.imm, 12)
-        rs1_b = _mask(self.rs1, 5)
-        funct2_b = _mask(self.funct2, 2)
-        vd_b = _mask(self.vd, 6)
-        opcode_b = _mask(self.opcode, 7)
+    fields = (
+        field("opcode", 7, 0),
+        field("vd", 6, 7),
+        field("funct2", 2, 13),
+        field("rs1", 5, 15),
+        field("imm", 12, 20, signed=True),
+    )
 
-        return (imm_b << 20) | (rs1_b << 15) | (funct2_b << 13) | (vd_b << 7) | opcode_b
-    
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, funct2: Funct2L, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
         cls.funct2 = Funct2(funct2)
@@ -254,25 +201,16 @@ class VRType[VD: (MatrixReg,Accumulator,WeightBuffer) = MatrixReg, VS2: (MatrixR
     vs2: VS2
     vd:  VD
 
-    def to_bytecode(self):
-        vs1 = self.vs1 if hasattr(self, 'vs1') else (self.es1 if hasattr(self, 'es1') else 0)
-        vs2 = self.vs2 if hasattr(self, 'vs2') else 0
-        vd  = self.vd  if hasattr(self, 'vd')  else 0
-
-        funct7_b = _mask(self.funct7, 7) # Bits 31:25
-        vs2_b    = _mask(vs2, 5)          # Bits 24:20 (5 bits)
-        vs1_b    = _mask(vs1, 7)          # Bits 19:13 (7 bits)
-        vd_b     = _mask(vd, 6)           # Bits 12:7  (6 bits)
-        opcode_b = _mask(self.opcode, 7)  # Bits 6:0
-
-        return (
-            (funct7_b << 25) | 
-            (vs2_b << 19)    | # Fixed: Shift 20 puts vs2 in 24:20
-            (vs1_b << 13)    | # Fixed: Shift 13 puts vs1 in 19:13
-            (vd_b << 7)      | 
-            opcode_b
-        )
-        
+    # vs1 and es1 share bits 18:13
+    fields = (
+        field("opcode", 7, 0),
+        field("vd", 6, 7),
+        field("vs1", 6, 13),
+        field("es1", 6, 13),
+        field("vs2", 6, 19),
+        field("funct7", 7, 25),
+    )
+
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, funct7: Funct7L, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
         cls.funct7 = Funct7(funct7)
@@ -284,13 +222,12 @@ class VIType(Instruction, instr=False):
     vd: MatrixReg  = MatrixReg(0)
     imm: Imm16     = Imm16(0)
 
-    def to_bytecode(self):
-        imm_b = _mask(self.imm, 16)
-        funct3_b = _mask(self.funct3, 2)
-        vd_b = _mask(self.vd, 6)
-        opcode_b = _mask(self.opcode, 7)
-
-        return (imm_b << 16) | (funct3_b << 13) | (vd_b << 7) | opcode_b
+    fields = (
+        field("opcode", 7, 0),
+        field("vd", 6, 7),
+        field("funct3", 2, 13),
+        field("imm", 16, 16),
+    )
 
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, funct3: Funct3L, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
@@ -304,14 +241,13 @@ class CSRType(Instruction, instr=False):
     rd: ScalarReg  = ScalarReg(0)
     imm: Imm12     = Imm12(0)
 
-    def to_bytecode(self):
-        imm_b = _mask(self.imm, 12)
-        rs1_b = _mask(self.rs1, 5)
-        funct3_b = _mask(self.funct3, 3)
-        rd_b = _mask(self.rd, 5)
-        opcode_b = _mask(self.opcode, 7)
-
-        return (imm_b << 20) | (rs1_b << 15) | (funct3_b << 12) | (rd_b << 7) | opcode_b
+    fields = (
+        field("opcode", 7, 0),
+        field("rd", 5, 7),
+        field("funct3", 3, 12),
+        field("rs1", 5, 15),
+        field("imm", 12, 20),
+    )
 
     def __init_subclass__(cls, exu: EXU, opcode: OpcodeL, funct3: Funct3L, mnemonic: str | None = None) -> None:
         mnemonic = mnemonic if mnemonic != None else cls.__name__.lower().replace("_",".")
@@ -332,6 +268,14 @@ def is_scalar_itype(insn: Instruction) -> TypeIs[IType[ScalarReg]]:
 def is_exponent_itype(insn: Instruction) -> TypeIs[IType[ExponentReg]]:
     return isinstance(insn, IType) and hasattr(cast(IType[Any], insn), 'rd') and is_exponent_reg(cast(IType[Any], insn).rd)
 
+def is_control_flow(insn: Instruction) -> bool:
+    """Branches and jumps: they redirect fetch after PIPELINE_LATENCY delay slots."""
+    return isinstance(insn, (SBType, UJType)) or insn.mnemonic == "jalr"
+
+def reads_pc(insn: Instruction) -> bool:
+    """Instructions whose result depends on the fetch PC at the time they execute."""
+    return is_control_flow(insn) or insn.mnemonic == "auipc"
+
 # Global registry accumulating decode table rows
 # FIXME: Not typed but idk the type.
 _decode_table: list[dict[Any, Any]] = []
@@ -64,6 +64,9 @@ class BoundedInt(int):
 
     fmt: str = ""
 
+    strict_lint = False
+    """ Set when lint() also rejects some in-range ints, so __new__ cannot skip it. """
+
     def is_signed(self) -> bool:
         return self.lower_bound <= self < self.signed_upper_bound
 
@@ -114,6 +117,10 @@ class BoundedInt(int):
         ]
 
     def __new__(cls, val: int | str):
+        # in-range ints (decoded or built by programs) need none of lint's diagnostics
+        if isinstance(val, int) and not cls.strict_lint and cls.lower_bound <= val < cls.upper_bound:
+            return super().__new__(cls, val)
+
         if len(err := cls.lint(val)) != 0:
             raise ExceptionGroup(f"{cls.__name__} failed to initialize:", err)
 
@@ -407,6 +414,7 @@ class SBImm12(BoundedInt):
     signed_upper_bound = 2048  # remember, top of range is exclusive
     upper_bound = 4096
     fmt = "sbimm12"
+    strict_lint = True
 
     @classmethod
     def lint(cls, val: str | int, role: str = "", tok_idx: int = 0) -> list[AsmError]:
@@ -462,6 +470,63 @@ class Imm32(BoundedInt):
     upper_bound = 4294967296
     fmt = "imm32"
 
+# Performance counter CSRs (read-only, in the RISC-V user counter space).
+# Every counter is 64 bits wide: the address reads the low 32 bits and
+# address + CSR_HIGH_HALF_OFFSET the high 32 bits (cycle / cycleh, ...).
+CSR_CYCLE = 0xC00
+CSR_INSTRET = 0xC02
+CSR_DMA_BYTES = 0xC03
+CSR_STALL_CYCLES = 0xC04
+CSR_DMA_WAIT_CYCLES = 0xC05
+CSR_FETCH_STALL_CYCLES = 0xC06
+CSR_EXU_BUSY_BASE = 0xC10  # + index of the execution unit in the core config
+NUM_EXU_BUSY_CSRS = 16
+CSR_HIGH_HALF_OFFSET = 0x80
+
+PERF_COUNTER_CSRS: dict[str, int] = {
+    "cycle": CSR_CYCLE,
+    "instret": CSR_INSTRET,
+    "dmabytes": CSR_DMA_BYTES,
+    "stallcycles": CSR_STALL_CYCLES,
+    "dmawaitcycles": CSR_DMA_WAIT_CYCLES,
+    "fetchstallcycles": CSR_FETCH_STALL_CYCLES,
+    **{f"exubusy{i}": CSR_EXU_BUSY_BASE + i for i in range(NUM_EXU_BUSY_CSRS)},
+}
+PERF_COUNTER_CSRS.update(
+    {f"{name}h": addr + CSR_HIGH_HALF_OFFSET for name, addr in list(PERF_COUNTER_CSRS.items())}
+)
+
+
+class CsrAddr(BoundedInt):
+    """
+    Represents a 12-bit CSR address.
+
+    Accepts an integer in the range (0-4095) or the name of a performance
+    counter CSR (see PERF_COUNTER_CSRS), e.g. "cycle" or "exubusy2".
+    """
+
+    lower_bound = 0
+    unsigned_lower_bound = 0
+    signed_upper_bound = 4096
+    upper_bound = 4096
+    fmt = "csr"
+
+    @classmethod
+    def autocomplete(cls) -> list[str]:
+        return list(PERF_COUNTER_CSRS)
+
+    @classmethod
+    def lint(cls, val: str | int, role: str = "", tok_idx: int = 0) -> list[AsmError]:
+        if isinstance(val, str) and val.lower() in PERF_COUNTER_CSRS:
+            return []
+        return super().lint(val, role, tok_idx)
+
+    def __new__(cls, val: int | str):
+        if isinstance(val, str) and val.lower() in PERF_COUNTER_CSRS:
+            val = PERF_COUNTER_CSRS[val.lower()]
+        return super().__new__(cls, val)
+
+
 class Named():
     """
     Represents a typed value with a specific name, for use in human-readable instruction patterns.
@@ -0,0 +1,24 @@
+from .attention import AttentionVariant, build_attention
+from .builder import KernelBuilder, VmemAllocator, VmemBuffer
+from .elementwise import ELEMENTWISE_OPS, build_elementwise
+from .library import attention_program, elementwise_program, gemm_program
+from .matmul import MatmulVariant, build_matmul, double_buffered_matmul
+from .overlap import OverlapReport, measure_overlap
+
+__all__ = [
+    "AttentionVariant",
+    "build_attention",
+    "KernelBuilder",
+    "VmemAllocator",
+    "VmemBuffer",
+    "ELEMENTWISE_OPS",
+    "build_elementwise",
+    "attention_program",
+    "elementwise_program",
+    "gemm_program",
+    "MatmulVariant",
+    "build_matmul",
+    "double_buffered_matmul",
+    "OverlapReport",
+    "measure_overlap",
+]
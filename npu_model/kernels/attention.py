@@ -0,0 +1,298 @@
+"""
+Fused (flash) attention: O = softmax(Q @ K^T * scale) @ V per 32-row Q-block,
+for Q_ROWS and K_SEQ multiples of 32 and HEAD_DIM a multiple of 32.
+
+Uses the column-blocked bf16 DRAM layout of
+configs/programs/parameterized_fused_attention.py, one [32, HEAD_DIM] tile
+per Q-block (Q, O) or K-tile (K^T, V) stored as HEAD_DIM / 16 [32, 16]
+blocks, and the same online softmax: every K-tile updates the running row
+max m, row sum l and output O of the Q-block in the MRF, and O / l is
+stored once all K-tiles are folded in.
+
+With double buffering K^T and V get a pair of VMEM buffers on a pair of DMA
+channels each and the next K-tile (of the next Q-block after the last
+one) is in flight while the current one is consumed:
+
+    K^T  ch0 / ch1    V  ch2 / ch3    Q, scale  ch4    O  ch5 / ch6
+
+The scores S = Q @ K^T and the products exp(S - m) @ V may go to different
+MXUs (AttentionVariant), so the next tile's scores overlap this tile's
+value products.  Instructions are emitted in dependency order and timed by
+npu_model.scheduler.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..configs.isa_definition import (
+    SELI,
+    VADD_BF16,
+    VEXP_BF16,
+    VLI_ALL,
+    VLOAD,
+    VMAXIMUM_BF16,
+    VMOV,
+    VMUL_BF16,
+    VPACK_BF16_FP8,
+    VRECIP_BF16,
+    VREDMAX_ROW_BF16,
+    VREDSUM_ROW_BF16,
+    VSTORE,
+    VSUB_BF16,
+)
+from ..hardware.config import HardwareConfig
+from ..software.instruction import acc, e, m, w
+from .builder import KernelBuilder
+from .matmul import _MXU_OPS
+
+TILE = 32
+BLOCK_BYTES = TILE * (TILE // 2) * 2  # one [32, 16] bf16 block, 1 KB
+SCALE_BYTES = BLOCK_BYTES
+
+KT_CHANNELS = (0, 1)
+VT_CHANNELS = (2, 3)
+Q_CHANNEL = 4
+OUT_CHANNELS = (5, 6)
+
+# bf16 -100.0, the initial running max
+NEG_INIT = 0xC2C8
+
+# per-tile scratch registers, relative to the end of the persistent ones
+_KT_BF16, _KT_FP8, _VT_BF16, _VT_FP8 = 0, 2, 4, 6
+_SCORES, _SCALED, _EXP_DIFF, _M_NEW = 8, 10, 12, 14
+_EXPS, _EXPS_FP8, _VC, _L_DECAY, _L_SUM = 16, 18, 20, 22, 24
+_SCRATCH_REGS = 26
+
+
+@dataclass(frozen=True)
+class AttentionVariant:
+    """One schedule of the fused attention kernel."""
+
+    score_mxu: int = 0
+    """ MXU computing Q @ K^T. """
+    value_mxu: int = 1
+    """ MXU computing exp(S - m) @ V. """
+    double_buffer: bool = True
+    """ Prefetch the next K-tile into a second pair of buffers. """
+
+    @property
+    def label(self) -> str:
+        return f"qk{self.score_mxu}/pv{self.value_mxu}/{'double' if self.double_buffer else 'single'}"
+
+
+@dataclass(frozen=True)
+class _Registers:
+    """MRF layout for a head dimension of 32 * heads."""
+
+    heads: int
+
+    @property
+    def q(self) -> int:
+        return 0
+
+    @property
+    def scale(self) -> int:
+        # pairs start on even registers
+        return self.heads + self.heads % 2
+
+    @property
+    def m_prev(self) -> int:
+        return self.scale + 2
+
+    @property
+    def l_prev(self) -> int:
+        return self.m_prev + 2
+
+    def o(self, j: int) -> int:
+        return self.l_prev + 2 + 2 * j
+
+    def t(self, offset: int) -> int:
+        return self.o(self.heads) + offset
+
+    @property
+    def count(self) -> int:
+        return self.t(_SCRATCH_REGS)
+
+
+def build_attention(
+    q_rows: int,
+    k_seq: int,
+    hardware_config: HardwareConfig,
+    head_dim: int = 64,
+    dram_q: int = 0,
+    dram_kt: int | None = None,
+    dram_vt: int | None = None,
+    dram_scale: int | None = None,
+    dram_out: int | None = None,
+    variant: AttentionVariant = AttentionVariant(),
+) -> KernelBuilder:
+    """
+    Emit a fused attention kernel, unscheduled.
+
+    K^T, V, the [32, 16] scale block and O default to the packed layout
+    after Q, in that order.
+
+    Raises:
+        ValueError: if a dimension is not a multiple of 32, the variant
+            names an MXU that does not exist, the buffers do not fit in VMEM
+            or the head dimension needs more matrix registers than there are.
+    """
+    if any(dim <= 0 or dim % TILE for dim in (q_rows, k_seq, head_dim)):
+        raise ValueError(
+            f"Q_ROWS, K_SEQ and HEAD_DIM must be positive multiples of {TILE}, got {q_rows}, {k_seq}, {head_dim}"
+        )
+    if variant.score_mxu not in _MXU_OPS or variant.value_mxu not in _MXU_OPS:
+        raise ValueError(f"MXUs must be 0 or 1, got {variant.label}")
+    heads = head_dim // TILE
+    regs = _Registers(heads)
+    num_m_registers = hardware_config.arch_state_config.num_m_registers
+    if regs.count > num_m_registers:
+        raise ValueError(
+            f"HEAD_DIM={head_dim} needs {regs.count} matrix registers, only {num_m_registers} available"
+        )
+    q_blocks, k_tiles = q_rows // TILE, k_seq // TILE
+    tile_bytes = TILE * head_dim * 2
+    dram_kt = dram_q + q_blocks * tile_bytes if dram_kt is None else dram_kt
+    dram_vt = dram_kt + k_tiles * tile_bytes if dram_vt is None else dram_vt
+    dram_scale = dram_vt + k_tiles * tile_bytes if dram_scale is None else dram_scale
+    dram_out = dram_scale + SCALE_BYTES if dram_out is None else dram_out
+
+    slots = 2 if variant.double_buffer else 1
+    builder = KernelBuilder(hardware_config)
+    q_buf = builder.vmem.allocate("Q", tile_bytes)
+    scale_buf = builder.vmem.allocate("scale", SCALE_BYTES)
+    kt_bufs = [builder.vmem.allocate(f"KT{i}", tile_bytes) for i in range(slots)]
+    vt_bufs = [builder.vmem.allocate(f"VT{i}", tile_bytes) for i in range(slots)]
+    out_bufs = [builder.vmem.allocate(f"O{i}", tile_bytes) for i in range(slots)]
+    builder.config_dma([*KT_CHANNELS[:slots], *VT_CHANNELS[:slots], Q_CHANNEL, *OUT_CHANNELS[:slots]])
+    num_weights = hardware_config.arch_state_config.num_wb_registers
+    pushes = dict.fromkeys(_MXU_OPS, 0)
+
+    def t(offset: int) -> int:
+        return regs.t(offset)
+
+    def vload_pair(reg: int, addr: int, block: int) -> None:
+        """Load blocks *block* and *block* + 1 of the tile at *addr* into a pair."""
+        base = builder.li(addr)
+        builder.emit(
+            VLOAD(vd=m(reg), imm=block * BLOCK_BYTES >> 5, rs1=base),
+            VLOAD(vd=m(reg + 1), imm=(block + 1) * BLOCK_BYTES >> 5, rs1=base),
+        )
+
+    def matmul(mxu: int, accumulator: int, activations: int, weights_bf16: int, first: bool) -> None:
+        """Quantize a bf16 weight pair, push it and multiply into *accumulator*."""
+        push, op, op_acc, _ = _MXU_OPS[mxu]
+        fp8 = weights_bf16 + 2
+        weights = w(pushes[mxu] % num_weights)
+        pushes[mxu] += 1
+        builder.emit(
+            VPACK_BF16_FP8(vd=m(fp8), vs2=m(weights_bf16), es1=e(0)),
+            push(vd=weights, vs1=m(fp8)),
+            (op if first else op_acc)(vd=acc(accumulator), vs1=m(activations), vs2=weights),
+        )
+
+    def pop(mxu: int, accumulator: int, dst: int) -> None:
+        builder.emit(_MXU_OPS[mxu][3](vd=m(dst), vs2=acc(accumulator)))
+
+    # a separate accumulator keeps the value products off the scores' when
+    # both are on one MXU
+    score_acc = 0
+    value_acc = 1 if variant.value_mxu == variant.score_mxu else 0
+
+    builder.emit(SELI(rd=e(0), imm=1))
+    builder.dma_load(Q_CHANNEL, scale_buf.addr, dram_scale, SCALE_BYTES)
+    builder.dma_wait(Q_CHANNEL)
+    base = builder.li(scale_buf.addr)
+    builder.emit(
+        VLOAD(vd=m(regs.scale), imm=0, rs1=base),
+        VLOAD(vd=m(regs.scale + 1), imm=0, rs1=base),
+    )
+
+    steps = [(qb, k) for qb in range(q_blocks) for k in range(k_tiles)]
+
+    def load_kv(step: int) -> None:
+        _, k = steps[step]
+        slot = step % slots
+        builder.dma_load(KT_CHANNELS[slot], kt_bufs[slot].addr, dram_kt + k * tile_bytes, tile_bytes)
+        builder.dma_load(VT_CHANNELS[slot], vt_bufs[slot].addr, dram_vt + k * tile_bytes, tile_bytes)
+
+    step = 0
+    for qb in range(q_blocks):
+        builder.dma_load(Q_CHANNEL, q_buf.addr, dram_q + qb * tile_bytes, tile_bytes)
+        builder.dma_wait(Q_CHANNEL)
+        for i in range(heads):
+            vload_pair(t(_KT_BF16), q_buf.addr, 2 * i)
+            builder.emit(VPACK_BF16_FP8(vd=m(regs.q + i), vs2=m(t(_KT_BF16)), es1=e(0)))
+        builder.emit(
+            VLI_ALL(vd=m(regs.m_prev), imm=NEG_INIT),
+            VLI_ALL(vd=m(regs.m_prev + 1), imm=NEG_INIT),
+            VLI_ALL(vd=m(regs.l_prev), imm=0),
+            VLI_ALL(vd=m(regs.l_prev + 1), imm=0),
+        )
+        for j in range(2 * heads):
+            builder.emit(VLI_ALL(vd=m(regs.o(0) + j), imm=0))
+
+        for _ in range(k_tiles):
+            slot = step % slots
+            if step == 0 or not variant.double_buffer:
+                load_kv(step)
+            if variant.double_buffer and step + 1 < len(steps):
+                load_kv(step + 1)
+
+            # S = Q @ K^T, accumulated over the head dimension
+            builder.dma_wait(KT_CHANNELS[slot])
+            for i in range(heads):
+                vload_pair(t(_KT_BF16), kt_bufs[slot].addr, 2 * i)
+                matmul(variant.score_mxu, score_acc, regs.q + i, t(_KT_BF16), first=i == 0)
+            pop(variant.score_mxu, score_acc, t(_SCORES))
+
+            # online softmax: m' = max(m, rowmax(S)); O *= exp(m - m')
+            builder.emit(
+                VMUL_BF16(vd=m(t(_SCALED)), vs1=m(t(_SCORES)), vs2=m(regs.scale)),
+                VREDMAX_ROW_BF16(vd=m(t(_EXP_DIFF)), vs1=m(t(_SCALED))),
+                VMAXIMUM_BF16(vd=m(t(_M_NEW)), vs1=m(regs.m_prev), vs2=m(t(_EXP_DIFF))),
+                VSUB_BF16(vd=m(t(_EXP_DIFF)), vs1=m(regs.m_prev), vs2=m(t(_M_NEW))),
+                VEXP_BF16(vd=m(t(_EXP_DIFF)), vs1=m(t(_EXP_DIFF))),
+            )
+            for j in range(heads):
+                builder.emit(VMUL_BF16(vd=m(regs.o(j)), vs1=m(regs.o(j)), vs2=m(t(_EXP_DIFF))))
+            builder.emit(
+                VSUB_BF16(vd=m(t(_EXPS)), vs1=m(t(_SCALED)), vs2=m(t(_M_NEW))),
+                VEXP_BF16(vd=m(t(_EXPS)), vs1=m(t(_EXPS))),
+                VPACK_BF16_FP8(vd=m(t(_EXPS_FP8)), vs2=m(t(_EXPS)), es1=e(0)),
+            )
+
+            # O += exp(S - m') @ V, one 32-column slice of the head at a time
+            builder.dma_wait(VT_CHANNELS[slot])
+            for j in range(heads):
+                vload_pair(t(_VT_BF16), vt_bufs[slot].addr, 2 * j)
+                matmul(variant.value_mxu, value_acc, t(_EXPS_FP8), t(_VT_BF16), first=True)
+                pop(variant.value_mxu, value_acc, t(_VC))
+                builder.emit(VADD_BF16(vd=m(regs.o(j)), vs1=m(regs.o(j)), vs2=m(t(_VC))))
+
+            # l = exp(m - m') * l + rowsum(exp(S - m')); m = m'
+            builder.emit(
+                VMUL_BF16(vd=m(t(_L_DECAY)), vs1=m(t(_EXP_DIFF)), vs2=m(regs.l_prev)),
+                VREDSUM_ROW_BF16(vd=m(t(_L_SUM)), vs1=m(t(_EXPS))),
+                VADD_BF16(vd=m(regs.l_prev), vs1=m(t(_L_DECAY)), vs2=m(t(_L_SUM))),
+                VMOV(vd=m(regs.m_prev), vs1=m(t(_M_NEW))),
+                VMOV(vd=m(regs.m_prev + 1), vs1=m(t(_M_NEW) + 1)),
+            )
+            step += 1
+
+        # O / l
+        builder.emit(VRECIP_BF16(vd=m(t(_L_DECAY)), vs1=m(regs.l_prev)))
+        for j in range(heads):
+            builder.emit(VMUL_BF16(vd=m(regs.o(j)), vs1=m(regs.o(j)), vs2=m(t(_L_DECAY))))
+        out_slot = qb % slots
+        channel = OUT_CHANNELS[out_slot]
+        if channel in builder.outstanding:
+            builder.dma_wait(channel)
+        base = builder.li(out_bufs[out_slot].addr)
+        for j in range(2 * heads):
+            builder.emit(VSTORE(vd=m(regs.o(0) + j), imm=j * BLOCK_BYTES >> 5, rs1=base))
+        builder.dma_store(channel, dram_out + qb * tile_bytes, out_bufs[out_slot].addr, tile_bytes)
+
+    builder.drain()
+    return builder
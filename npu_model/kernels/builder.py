@@ -0,0 +1,147 @@
+"""
+Helpers for generating kernels in Python instead of writing assembly.
+
+KernelBuilder collects instructions in dependency order without delays;
+build() hands them to npu_model.scheduler, which reorders them and inserts
+the delays the hardware needs.  Addresses are materialized into scalar
+registers taken round-robin from a scratch pool, so consecutive transfers
+do not serialize on a shared register.
+
+VmemAllocator hands out VMEM buffers and raises if a kernel's working set
+does not fit.  The builder also tracks which DMA channels have a transfer
+that was not waited on yet (a channel holds one at a time) and the size of
+every transfer, for analytical estimates of the kernel.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from ..configs import isa_definition  # noqa: F401  (registers the DMA instructions)
+from ..hardware.bank_conflict import VMEM_BANK_BYTES
+from ..hardware.config import HardwareConfig
+from ..isa import Instruction, IsaSpec
+from ..isa_types import ScalarReg
+from ..scheduler import schedule_instructions
+from ..software.instruction import x
+from ..util.converter import expand_li
+
+# Scratch registers used for addresses and sizes (x0 is hardwired, x1-x4 are
+# left to the caller).
+SCRATCH_REGISTERS: tuple[int, ...] = tuple(range(5, 32))
+
+# DMA channels available to a kernel.
+NUM_DMA_CHANNELS = 8
+
+
+@dataclass
+class VmemBuffer:
+    name: str
+    addr: int
+    nbytes: int
+
+    @property
+    def end(self) -> int:
+        return self.addr + self.nbytes
+
+
+@dataclass
+class VmemAllocator:
+    """Bump allocator over VMEM; every buffer starts on a bank boundary."""
+
+    capacity: int
+    base: int = 0x2000
+    """ First byte handed out (VMEM below it is left to scalar data). """
+    buffers: list[VmemBuffer] = field(default_factory=list)
+
+    @property
+    def used(self) -> int:
+        return (self.buffers[-1].end if self.buffers else self.base) - self.base
+
+    def allocate(self, name: str, nbytes: int) -> VmemBuffer:
+        start = self.buffers[-1].end if self.buffers else self.base
+        start = -(-start // VMEM_BANK_BYTES) * VMEM_BANK_BYTES
+        if start + nbytes > self.capacity:
+            raise ValueError(
+                f"VMEM capacity exceeded allocating {name} ({nbytes} B at {start:#x}); "
+                f"{self.capacity - self.base} B available, working set is "
+                f"{start + nbytes - self.base} B"
+            )
+        buffer = VmemBuffer(name, start, nbytes)
+        self.buffers.append(buffer)
+        return buffer
+
+
+class KernelBuilder:
+    """Accumulates the instructions of a generated kernel."""
+
+    def __init__(self, hardware_config: HardwareConfig) -> None:
+        self.hardware_config = hardware_config
+        self.vmem = VmemAllocator(hardware_config.arch_state_config.vmem_size)
+        self.instructions: list[Instruction] = []
+        self.transfer_bytes: list[int] = []
+        """ Size of every DMA transfer, in program order. """
+        self.outstanding: set[int] = set()
+        """ Channels with a transfer that has not been waited on. """
+        self._next_scratch = 0
+
+    def emit(self, *instructions: Instruction) -> None:
+        self.instructions.extend(instructions)
+
+    def scratch(self) -> ScalarReg:
+        reg = SCRATCH_REGISTERS[self._next_scratch % len(SCRATCH_REGISTERS)]
+        self._next_scratch += 1
+        return x(reg)
+
+    def li(self, value: int, reg: ScalarReg | None = None) -> ScalarReg:
+        """Load *value* into *reg* (a fresh scratch register by default)."""
+        reg = self.scratch() if reg is None else reg
+        self.emit(*expand_li(int(reg), value))
+        return reg
+
+    def config_dma(self, channels: range | list[int]) -> None:
+        """Configure the DMA base of each channel and wait for it to apply."""
+        for channel in channels:
+            self.emit(
+                _dma_op("config", channel)(rs1=x(0)),
+                _dma_op("wait", channel)(),
+            )
+
+    def dma_load(self, channel: int, vmem_addr: int, dram_addr: int, nbytes: int) -> None:
+        op = self._transfer_op("load", channel, nbytes)
+        vmem, dram, size = self.li(vmem_addr), self.li(dram_addr), self.li(nbytes)
+        self.emit(op(rd=vmem, rs1=dram, rs2=size))
+
+    def dma_store(self, channel: int, dram_addr: int, vmem_addr: int, nbytes: int) -> None:
+        op = self._transfer_op("store", channel, nbytes)
+        dram, vmem, size = self.li(dram_addr), self.li(vmem_addr), self.li(nbytes)
+        self.emit(op(rd=dram, rs1=vmem, rs2=size))
+
+    def dma_wait(self, channel: int) -> None:
+        self.emit(_dma_op("wait", channel)())
+        self.outstanding.discard(channel)
+
+    def drain(self) -> None:
+        """Wait for every outstanding transfer."""
+        for channel in sorted(self.outstanding):
+            self.dma_wait(channel)
+
+    def _transfer_op(self, kind: str, channel: int, nbytes: int) -> type[Instruction]:
+        op = _dma_op(kind, channel)
+        if channel in self.outstanding:
+            raise ValueError(f"DMA channel {channel} already has a transfer in flight; wait on it first")
+        self.outstanding.add(channel)
+        self.transfer_bytes.append(nbytes)
+        return op
+
+    def build(self, schedule: bool = True) -> list[Instruction]:
+        """The kernel's instructions, scheduled with minimal delays by default."""
+        if not schedule:
+            return list(self.instructions)
+        return schedule_instructions(self.instructions, self.hardware_config)
+
+
+def _dma_op(kind: str, channel: int) -> type[Instruction]:
+    if not 0 <= channel < NUM_DMA_CHANNELS:
+        raise ValueError(f"DMA channel {channel} out of range 0-{NUM_DMA_CHANNELS - 1}")
+    return IsaSpec.operations[f"dma.{kind}.ch{channel}"]
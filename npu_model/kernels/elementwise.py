@@ -0,0 +1,129 @@
+"""
+Elementwise bf16 kernels: C = A <op> B for M×N multiples of 32.
+
+Uses the tiled DRAM layout of configs/programs/parameterized_elementwise_*.py:
+32×32 bf16 tiles (2 KB, two 32×16 halves) in row-major tile order, tile t
+of A at dram_a + t * 2 KB, of B at dram_b + t * 2 KB and of C at
+dram_c + t * 2 KB.
+
+With double buffering every operand gets a pair of VMEM buffers on a pair
+of DMA channels and the next tile's A and B transfers are issued before
+the current tile is consumed:
+
+    A  ch0 / ch1    B  ch2 / ch3    C  ch4 / ch5
+
+Consecutive tiles use disjoint MRF registers (m0-m7, m8-m15), so the
+scheduler can overlap one tile's vector op with the next tile's vloads.
+"""
+
+from __future__ import annotations
+
+from ..configs.isa_definition import VADD_BF16, VLOAD, VMUL_BF16, VRECIP_BF16, VSTORE, VSUB_BF16
+from ..hardware.config import HardwareConfig
+from ..isa import Instruction
+from ..software.instruction import m
+from .builder import KernelBuilder
+
+TILE = 32
+TILE_BYTES_BF16 = TILE * TILE * 2  # 2 KB, both halves
+HALF_BYTES = TILE_BYTES_BF16 // 2
+
+A_CHANNELS = (0, 1)
+B_CHANNELS = (2, 3)
+C_CHANNELS = (4, 5)
+
+# MRF layout per tile (offset by 8 on odd tiles): A pair, B pair, C pair,
+# 1/B pair for div
+A_REGS = 0
+B_REGS = 2
+C_REGS = 4
+RECIP_REGS = 6
+TILE_REG_STRIDE = 8
+
+ELEMENTWISE_OPS = ("add", "sub", "mul", "div")
+
+_VECTOR_OPS: dict[str, type[Instruction]] = {"add": VADD_BF16, "sub": VSUB_BF16, "mul": VMUL_BF16}
+
+
+def build_elementwise(
+    op: str,
+    M: int,
+    N: int,
+    hardware_config: HardwareConfig,
+    dram_a: int = 0,
+    dram_b: int | None = None,
+    dram_c: int | None = None,
+    double_buffer: bool = True,
+) -> KernelBuilder:
+    """
+    Emit an M×N elementwise bf16 kernel, unscheduled.
+
+    div is vrecip.bf16 followed by vmul.bf16, as there is no divide
+    instruction.  dram_b and dram_c default to the packed layout right
+    after A and B.
+
+    Raises:
+        ValueError: for an unknown op or a dimension that is not a multiple
+            of 32.
+    """
+    if op not in ELEMENTWISE_OPS:
+        raise ValueError(f"op must be one of {', '.join(ELEMENTWISE_OPS)}, got {op!r}")
+    if any(dim <= 0 or dim % TILE for dim in (M, N)):
+        raise ValueError(f"M and N must be positive multiples of {TILE}, got {M}×{N}")
+    tiles = (M // TILE) * (N // TILE)
+    dram_b = dram_a + M * N * 2 if dram_b is None else dram_b
+    dram_c = dram_b + M * N * 2 if dram_c is None else dram_c
+
+    slots = 2 if double_buffer else 1
+    builder = KernelBuilder(hardware_config)
+    a_bufs = [builder.vmem.allocate(f"A{i}", TILE_BYTES_BF16) for i in range(slots)]
+    b_bufs = [builder.vmem.allocate(f"B{i}", TILE_BYTES_BF16) for i in range(slots)]
+    c_bufs = [builder.vmem.allocate(f"C{i}", TILE_BYTES_BF16) for i in range(slots)]
+    builder.config_dma([*A_CHANNELS[:slots], *B_CHANNELS[:slots], *C_CHANNELS[:slots]])
+
+    def load(t: int) -> None:
+        slot = t % slots
+        builder.dma_load(A_CHANNELS[slot], a_bufs[slot].addr, dram_a + t * TILE_BYTES_BF16, TILE_BYTES_BF16)
+        builder.dma_load(B_CHANNELS[slot], b_bufs[slot].addr, dram_b + t * TILE_BYTES_BF16, TILE_BYTES_BF16)
+
+    def vload_pair(reg: int, addr: int) -> None:
+        base = builder.li(addr)
+        builder.emit(
+            VLOAD(vd=m(reg), imm=0, rs1=base),
+            VLOAD(vd=m(reg + 1), imm=HALF_BYTES >> 5, rs1=base),
+        )
+
+    for t in range(tiles):
+        slot = t % slots
+        if t == 0 or not double_buffer:
+            load(t)
+        if double_buffer and t + 1 < tiles:
+            load(t + 1)
+        regs = (t % 2) * TILE_REG_STRIDE
+        a, b, c = regs + A_REGS, regs + B_REGS, regs + C_REGS
+        builder.dma_wait(A_CHANNELS[slot])
+        vload_pair(a, a_bufs[slot].addr)
+        builder.dma_wait(B_CHANNELS[slot])
+        vload_pair(b, b_bufs[slot].addr)
+
+        if op == "div":
+            recip = regs + RECIP_REGS
+            builder.emit(
+                VRECIP_BF16(vd=m(recip), vs1=m(b)),
+                VMUL_BF16(vd=m(c), vs1=m(a), vs2=m(recip)),
+            )
+        else:
+            builder.emit(_VECTOR_OPS[op](vd=m(c), vs1=m(a), vs2=m(b)))
+
+        channel = C_CHANNELS[slot]
+        if channel in builder.outstanding:
+            builder.dma_wait(channel)
+        base = builder.li(c_bufs[slot].addr)
+        builder.emit(
+            VSTORE(vd=m(c), imm=0, rs1=base),
+            VSTORE(vd=m(c + 1), imm=HALF_BYTES >> 5, rs1=base),
+        )
+        builder.dma_store(channel, dram_c + t * TILE_BYTES_BF16, c_bufs[slot].addr, TILE_BYTES_BF16)
+
+    builder.drain()
+    return builder
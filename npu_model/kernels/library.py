@@ -0,0 +1,90 @@
+"""
+Generated kernels packaged as runnable programs.
+
+gemm_program, attention_program and elementwise_program generate the kernel
+for one shape (build_matmul, build_attention, build_elementwise), schedule
+it, and attach random inputs in the kernel's DRAM layout together with the
+golden result of the reference model the hand-written
+configs/programs/parameterized_* kernels are checked against.  The result
+runs in the simulator or any sweep like a registered Program, so a new
+model shape needs a call here rather than a new assembly file.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from ..hardware.config import HardwareConfig
+from ..isa import Instruction
+from ..software.program import InstantiableProgram
+from .attention import AttentionVariant, build_attention
+from .elementwise import ELEMENTWISE_OPS, build_elementwise
+from .matmul import MatmulVariant, build_matmul
+
+if TYPE_CHECKING:
+    import torch
+
+# the tolerance of the hand-written fused attention kernels
+ATTENTION_TOLERANCE = (5e-2, 5e-2)
+
+
+def _program(
+    instructions: list[Instruction],
+    regions: list[tuple[int, torch.Tensor]],
+    golden: tuple[int, torch.Tensor],
+) -> InstantiableProgram:
+    program = InstantiableProgram(instructions)
+    program.memory_regions = regions
+    program.golden_result = golden
+    return program
+
+
+def gemm_program(
+    M: int,
+    K: int,
+    N: int,
+    hardware_config: HardwareConfig,
+    variant: MatmulVariant = MatmulVariant(),
+    seed: int = 0,
+) -> InstantiableProgram:
+    """An M×K×N fp8 matmul with random inputs and its golden result."""
+    # imported here: the program configs import the hardware, which must load first
+    from ..configs.programs.parameterized_matmul import _make_program
+
+    instructions = build_matmul(M, K, N, hardware_config, variant=variant).build()
+    return _program(instructions, *_make_program(M, K, N, seed))
+
+
+def attention_program(
+    q_rows: int,
+    k_seq: int,
+    hardware_config: HardwareConfig,
+    head_dim: int = 64,
+    variant: AttentionVariant = AttentionVariant(),
+    seed: int = 0,
+) -> InstantiableProgram:
+    """Fused attention over q_rows queries and k_seq keys with random inputs."""
+    from ..configs.programs.parameterized_fused_attention import _make_attn_program
+
+    instructions = build_attention(q_rows, k_seq, hardware_config, head_dim, variant=variant).build()
+    program = _program(instructions, *_make_attn_program(q_rows, k_seq, seed, HEAD_DIM=head_dim))
+    program.kernel_tolerance = ATTENTION_TOLERANCE
+    return program
+
+
+def elementwise_program(
+    op: str,
+    M: int,
+    N: int,
+    hardware_config: HardwareConfig,
+    double_buffer: bool = True,
+    seed: int = 0,
+) -> InstantiableProgram:
+    """An M×N bf16 add, sub, mul or div with random inputs and its golden result."""
+    if op not in ELEMENTWISE_OPS:
+        raise ValueError(f"op must be one of {', '.join(ELEMENTWISE_OPS)}, got {op!r}")
+    configs = import_module(f"..configs.programs.parameterized_elementwise_{op}", __package__)
+
+    instructions = build_elementwise(op, M, N, hardware_config, double_buffer=double_buffer).build()
+    return _program(instructions, *configs._make_program(M, N, seed))
@@ -0,0 +1,260 @@
+"""
+Double-buffered tiled matmul: C = A @ B for M×K×N multiples of 32.
+
+Uses the tiled DRAM layout of configs/programs/parameterized_matmul.py:
+A tile (m, k) at dram_a + (m * K_tiles + k) KB, B tile (k, n) at
+dram_b + (k * N_tiles + n) KB and C tile (m, n) at dram_c + (m * N_tiles + n)
+* 2 KB as two 32×16 bf16 halves.
+
+One operand is cached in the MRF a group of tiles at a time while the other
+streams past it tile by tile (MatmulVariant picks which, the group size and
+the MXUs).  Every stream gets a pair of VMEM buffers on a pair of DMA
+channels, so the transfer for the next tile is in flight while the current
+one is consumed:
+
+    cached  K_tiles × group KB per group    ch2 / ch3
+    stream  one 1 KB transfer per step      ch0 / ch1
+    C       one 2 KB store per output tile  ch4 / ch5
+
+Instructions are emitted in dependency order and timed by
+npu_model.scheduler, which overlaps the prefetches with the vload /
+vmatpush / vmatmul chain of the current tile.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..configs.isa_definition import (
+    VLOAD,
+    VMATMUL_ACC_MXU0,
+    VMATMUL_ACC_MXU1,
+    VMATMUL_MXU0,
+    VMATMUL_MXU1,
+    VMATPOP_BF16_ACC_MXU0,
+    VMATPOP_BF16_ACC_MXU1,
+    VMATPUSH_WEIGHT_MXU0,
+    VMATPUSH_WEIGHT_MXU1,
+    VSTORE,
+)
+from ..hardware.config import HardwareConfig
+from ..isa import Instruction
+from ..software.instruction import acc, m, w
+from .builder import KernelBuilder
+
+TILE = 32
+TILE_BYTES_FP8 = TILE * TILE          # 1 KB
+TILE_BYTES_BF16 = 2 * TILE_BYTES_FP8  # 2 KB, both halves
+
+STREAM_CHANNELS = (0, 1)
+CACHE_CHANNELS = (2, 3)
+C_CHANNELS = (4, 5)
+
+# MRF layout: m0-m3 hold streamed tiles, m4-m7 two popped C tiles, the
+# cached group (double-buffered) from m8 on
+STREAM_REGS = 0
+NUM_STREAM_REGS = 4
+C_REGS = 4
+CACHE_REGS = 8
+
+# accumulators per MXU
+NUM_ACCUMULATORS = 2
+
+_MXU_OPS = {
+    0: (VMATPUSH_WEIGHT_MXU0, VMATMUL_MXU0, VMATMUL_ACC_MXU0, VMATPOP_BF16_ACC_MXU0),
+    1: (VMATPUSH_WEIGHT_MXU1, VMATMUL_MXU1, VMATMUL_ACC_MXU1, VMATPOP_BF16_ACC_MXU1),
+}
+
+
+@dataclass(frozen=True)
+class MatmulVariant:
+    """One schedule of the tiled matmul."""
+
+    order: str = "mn"
+    """ "mn": groups of A's M-tiles stay in the MRF while B tiles stream past;
+        "nm": groups of B's N-tiles stay in the MRF while A tiles stream past. """
+    reuse: int = 1
+    """ Tiles per cached group: each streamed tile is used this many times,
+        accumulating that many output tiles at once on its MXU. """
+    mxus: tuple[int, ...] = (1,)
+    """ MXUs the streamed tiles are dealt to, round-robin. """
+
+    @property
+    def label(self) -> str:
+        return f"{self.order}/reuse{self.reuse}/mxu{'+'.join(map(str, self.mxus))}"
+
+
+def build_matmul(
+    M: int,
+    K: int,
+    N: int,
+    hardware_config: HardwareConfig,
+    dram_a: int = 0,
+    dram_b: int | None = None,
+    dram_c: int | None = None,
+    variant: MatmulVariant = MatmulVariant(),
+) -> KernelBuilder:
+    """
+    Emit an M×K×N fp8 matmul with ping-pong DMA buffers, unscheduled.
+
+    dram_b and dram_c default to the packed layout right after A and B.
+
+    Raises:
+        ValueError: if a dimension is not a multiple of 32, the variant is
+            invalid, the buffers do not fit in VMEM or two cached groups do
+            not fit in the MRF.
+    """
+    if any(dim <= 0 or dim % TILE for dim in (M, K, N)):
+        raise ValueError(f"M, K and N must be positive multiples of {TILE}, got {M}×{K}×{N}")
+    if variant.order not in ("mn", "nm"):
+        raise ValueError(f"order must be 'mn' or 'nm', got {variant.order!r}")
+    if not 1 <= variant.reuse <= NUM_ACCUMULATORS:
+        raise ValueError(f"reuse must be between 1 and {NUM_ACCUMULATORS}, got {variant.reuse}")
+    if not variant.mxus or any(mxu not in _MXU_OPS for mxu in variant.mxus):
+        raise ValueError(f"mxus must name MXU 0 and/or 1, got {variant.mxus}")
+    m_tiles, k_tiles, n_tiles = M // TILE, K // TILE, N // TILE
+    dram_b = dram_a + M * K if dram_b is None else dram_b
+    dram_c = dram_b + K * N if dram_c is None else dram_c
+
+    mn = variant.order == "mn"
+    cached_tiles, stream_tiles = (m_tiles, n_tiles) if mn else (n_tiles, m_tiles)
+    group = min(variant.reuse, cached_tiles)
+    num_m_registers = hardware_config.arch_state_config.num_m_registers
+    if CACHE_REGS + 2 * group * k_tiles > num_m_registers:
+        raise ValueError(
+            f"{variant.label} at K={K} needs {CACHE_REGS + 2 * group * k_tiles} matrix "
+            f"registers, only {num_m_registers} available"
+        )
+    num_weights = hardware_config.arch_state_config.num_wb_registers
+
+    builder = KernelBuilder(hardware_config)
+    cache_bufs = [builder.vmem.allocate(f"cache{i}", group * k_tiles * TILE_BYTES_FP8) for i in range(2)]
+    stream_bufs = [builder.vmem.allocate(f"stream{i}", TILE_BYTES_FP8) for i in range(2)]
+    c_bufs = [builder.vmem.allocate(f"C{i}", TILE_BYTES_BF16) for i in range(2)]
+    builder.config_dma([*STREAM_CHANNELS, *CACHE_CHANNELS, *C_CHANNELS])
+
+    groups = [list(range(g, min(g + group, cached_tiles))) for g in range(0, cached_tiles, group)]
+
+    def cache_transfers(g: int) -> list[tuple[int, int, int]]:
+        """(vmem, dram, nbytes) of the transfers that fill group g's buffer."""
+        buf, tiles = cache_bufs[g % 2], groups[g]
+        if mn:
+            # the K-tiles of consecutive M-tiles are contiguous in A
+            nbytes = len(tiles) * k_tiles * TILE_BYTES_FP8
+            return [(buf.addr, dram_a + tiles[0] * k_tiles * TILE_BYTES_FP8, nbytes)]
+        # one run of the group's N-tiles per K-tile of B
+        nbytes = len(tiles) * TILE_BYTES_FP8
+        return [
+            (buf.addr + kt * nbytes, dram_b + (kt * n_tiles + tiles[0]) * TILE_BYTES_FP8, nbytes)
+            for kt in range(k_tiles)
+        ]
+
+    def cache_offset(g: int, r: int, kt: int) -> int:
+        return ((r * k_tiles + kt) if mn else (kt * len(groups[g]) + r)) * TILE_BYTES_FP8
+
+    steps = [(g, s, kt) for g in range(len(groups)) for s in range(stream_tiles) for kt in range(k_tiles)]
+
+    def load_stream(step: int) -> None:
+        _, s, kt = steps[step]
+        dram = dram_b + (kt * n_tiles + s) * TILE_BYTES_FP8 if mn else dram_a + (s * k_tiles + kt) * TILE_BYTES_FP8
+        builder.dma_load(STREAM_CHANNELS[step % 2], stream_bufs[step % 2].addr, dram, TILE_BYTES_FP8)
+
+    cache_count = 0
+
+    def load_cache(transfer: tuple[int, int, int]) -> None:
+        nonlocal cache_count
+        channel = CACHE_CHANNELS[cache_count % 2]
+        if channel in builder.outstanding:
+            builder.dma_wait(channel)
+        builder.dma_load(channel, *transfer)
+        cache_count += 1
+
+    for transfer in cache_transfers(0):
+        load_cache(transfer)
+    load_stream(0)
+    pending: list[tuple[int, int, int]] = []
+    pushes = dict.fromkeys(variant.mxus, 0)
+    step = 0
+    tile = 0
+    for g, tiles in enumerate(groups):
+        for transfer in pending:
+            load_cache(transfer)
+        for channel in CACHE_CHANNELS:
+            if channel in builder.outstanding:
+                builder.dma_wait(channel)
+        # the next group's transfers go out one per step, between stream prefetches
+        pending = cache_transfers(g + 1) if g + 1 < len(groups) else []
+        base = builder.li(cache_bufs[g % 2].addr)
+        cached = [[CACHE_REGS + (g % 2) * group * k_tiles + r * k_tiles + kt for kt in range(k_tiles)]
+                  for r in range(len(tiles))]
+        for r in range(len(tiles)):
+            for kt in range(k_tiles):
+                builder.emit(VLOAD(vd=m(cached[r][kt]), imm=cache_offset(g, r, kt) >> 5, rs1=base))
+
+        for s in range(stream_tiles):
+            mxu = variant.mxus[s % len(variant.mxus)]
+            push, matmul, matmul_acc, pop = _MXU_OPS[mxu]
+            for kt in range(k_tiles):
+                if pending:
+                    load_cache(pending.pop(0))
+                if step + 1 < len(steps):
+                    load_stream(step + 1)
+                builder.dma_wait(STREAM_CHANNELS[step % 2])
+                streamed = m(STREAM_REGS + step % NUM_STREAM_REGS)
+                base = builder.li(stream_bufs[step % 2].addr)
+                builder.emit(VLOAD(vd=streamed, imm=0, rs1=base))
+                op = matmul if kt == 0 else matmul_acc
+                if mn:
+                    weights = w(pushes[mxu] % num_weights)
+                    pushes[mxu] += 1
+                    builder.emit(push(vd=weights, vs1=streamed))
+                    for r in range(len(tiles)):
+                        builder.emit(op(vd=acc(r), vs1=m(cached[r][kt]), vs2=weights))
+                else:
+                    for r in range(len(tiles)):
+                        weights = w(pushes[mxu] % num_weights)
+                        pushes[mxu] += 1
+                        builder.emit(
+                            push(vd=weights, vs1=m(cached[r][kt])),
+                            op(vd=acc(r), vs1=streamed, vs2=weights),
+                        )
+                step += 1
+
+            for r, cached_tile in enumerate(tiles):
+                mt, nt = (cached_tile, s) if mn else (s, cached_tile)
+                pair = C_REGS + 2 * (tile % 2)
+                channel = C_CHANNELS[tile % 2]
+                builder.emit(pop(vd=m(pair), vs2=acc(r)))
+                if channel in builder.outstanding:
+                    builder.dma_wait(channel)
+                base = builder.li(c_bufs[tile % 2].addr)
+                builder.emit(
+                    VSTORE(vd=m(pair), imm=0, rs1=base),
+                    VSTORE(vd=m(pair + 1), imm=TILE_BYTES_FP8 >> 5, rs1=base),
+                )
+                builder.dma_store(
+                    channel,
+                    dram_c + (mt * n_tiles + nt) * TILE_BYTES_BF16,
+                    c_bufs[tile % 2].addr,
+                    TILE_BYTES_BF16,
+                )
+                tile += 1
+
+    builder.drain()
+    return builder
+
+
+def double_buffered_matmul(
+    M: int,
+    K: int,
+    N: int,
+    hardware_config: HardwareConfig,
+    dram_a: int = 0,
+    dram_b: int | None = None,
+    dram_c: int | None = None,
+    variant: MatmulVariant = MatmulVariant(),
+    schedule: bool = True,
+) -> list[Instruction]:
+    """Generate an M×K×N fp8 matmul with ping-pong DMA buffers (see build_matmul)."""
+    builder = build_matmul(M, K, N, hardware_config, dram_a, dram_b, dram_c, variant)
+    return builder.build(schedule=schedule)
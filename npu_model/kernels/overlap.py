@@ -0,0 +1,63 @@
+"""
+How well a kernel hides its DMA traffic behind matrix work.
+
+measure_overlap(sim) reads the activity timeline of a finished
+Simulation(record_timeline=True) and reports how many cycles the DMA
+engines and the MXUs were busy, and for how many of those cycles both were.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..hardware.dma import DmaExecutionUnit
+from ..hardware.mxu import MatrixExecutionUnitInner, MatrixExecutionUnitSystolic
+from ..simulation import Simulation
+
+
+@dataclass
+class OverlapReport:
+    cycles: int
+    dma_busy: int
+    """ Cycles in which some DMA engine was busy. """
+    mxu_busy: int
+    """ Cycles in which some MXU was busy. """
+    overlap: int
+    """ Cycles in which both were busy. """
+
+    @property
+    def exposed_dma(self) -> int:
+        """DMA cycles not hidden behind matrix work."""
+        return self.dma_busy - self.overlap
+
+    @property
+    def hidden_fraction(self) -> float:
+        return self.overlap / self.dma_busy if self.dma_busy else 0.0
+
+    def format(self) -> str:
+        return (
+            f"cycles {self.cycles:,}  DMA busy {self.dma_busy:,}  MXU busy {self.mxu_busy:,}  "
+            f"overlap {self.overlap:,} ({self.hidden_fraction:.1%} of DMA hidden)"
+        )
+
+
+def measure_overlap(sim: Simulation) -> OverlapReport:
+    """
+    Raises:
+        ValueError: if the simulation did not record a timeline.
+    """
+    timeline = sim.timeline
+    if timeline is None:
+        raise ValueError("measure_overlap needs a Simulation(record_timeline=True)")
+    dma = [exu.name for exu in sim.core.exus if isinstance(exu, DmaExecutionUnit)]
+    mxu = [
+        exu.name
+        for exu in sim.core.exus
+        if isinstance(exu, (MatrixExecutionUnitSystolic, MatrixExecutionUnitInner))
+    ]
+    return OverlapReport(
+        cycles=timeline.cycles,
+        dma_busy=int((timeline.active_counts(dma) > 0).sum()) if dma else 0,
+        mxu_busy=int((timeline.active_counts(mxu) > 0).sum()) if mxu else 0,
+        overlap=timeline.overlap_cycles(dma, mxu),
+    )
@@ -8,7 +8,7 @@ per-line/column diagnostics suitable for use in an LSP server.
 import re
 import sys
 from typing import cast, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import IntEnum
 from pathlib import Path
 
@@ -26,8 +26,10 @@ import npu_model.configs.isa_definition as _isa_def  # noqa: F401, E402 # type:
 from npu_model.isa import IsaSpec  # noqa: E402
 from npu_model.isa_types import (
     AsmError,  # noqa: E402
+    CsrAddr,  # noqa: E402
     ScalarReg,  # noqa: E402
 )
+from npu_model.util.preprocessor import AsmSyntaxError, SourceLine, preprocess, uses_directives  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Diagnostic model
@@ -136,9 +138,24 @@ def _lint_li(tokens: list[str], labels: list[str]) -> list[AsmError]:
     return errors
 
 
+def _lint_csrr(tokens: list[str], labels: list[str]) -> list[AsmError]:
+    if len(tokens) != 3:
+        return [
+            AsmError(
+                f"'csrr' expects 2 operands ({ScalarReg.fmt}<rd> csr), got {len(tokens) - 1}",
+                token_index=0,
+            )
+        ]
+    errors: list[AsmError] = []
+    errors.extend(ScalarReg.lint(tokens[1], role="rd", tok_idx=1))
+    errors.extend(CsrAddr.lint(tokens[2], role="csr", tok_idx=2))
+    return errors
+
+
 _PSEUDOS: dict[str, Callable[[list[str], list[str]], list[AsmError]]] = {
     "nop": _lint_nop,
     "li": _lint_li,
+    "csrr": _lint_csrr,
 }
 
 # ---------------------------------------------------------------------------
@@ -160,21 +177,16 @@ def _to_diagnostic(err: AsmError, lineno: int, toks: list[PosToken]) -> Diagnost
 # ---------------------------------------------------------------------------
 
 
-def lint_text(source: str) -> list[Diagnostic]:
+def _lint_labels(lines: list[str], origins: list[int] | None = None) -> list[Diagnostic]:
     """
-    Lint the full text of an NPU assembly file and return a (possibly empty)
-    list of Diagnostics sorted by (line, col_start).
+    Pass 1 — collect label definitions into SEEN_LABELS; flag duplicates
+    and bad names.  origins[i], if given, is the source line of lines[i].
     """
-    lines = source.splitlines()
     diags: list[Diagnostic] = []
-
-    # ------------------------------------------------------------------
-    # Pass 1 — collect label definitions; flag duplicates and bad names.
-    # ------------------------------------------------------------------
-    global SEEN_LABELS
     SEEN_LABELS.clear()
 
-    for lineno, raw in enumerate(lines):
+    for index, raw in enumerate(lines):
+        lineno = origins[index] if origins is not None else index
         stripped = _strip_comment(raw).strip()
         if not stripped or not _COLON_AT_END_RE.search(stripped):
             continue
@@ -195,43 +207,143 @@ def lint_text(source: str) -> list[Diagnostic]:
             )
         else:
             SEEN_LABELS[label_name] = lineno
+    return diags
 
-    labels = list(SEEN_LABELS.keys())
 
-    # ------------------------------------------------------------------
-    # Pass 2 — validate every instruction line.
-    # ------------------------------------------------------------------
-    for lineno, raw in enumerate(lines):
-        stripped = _strip_comment(raw).strip()
-        if not stripped or _COLON_AT_END_RE.search(stripped):
-            continue
+def _lint_instruction(raw: str, lineno: int, labels: list[str]) -> list[Diagnostic]:
+    """Pass 2 — validate one instruction line against the known labels."""
+    stripped = _strip_comment(raw).strip()
+    if not stripped or _COLON_AT_END_RE.search(stripped):
+        return []
 
-        toks = _tokenize(raw)
-        if not toks:
-            continue
+    toks = _tokenize(raw)
+    if not toks:
+        return []
 
-        plain = [t for t, _, _ in toks]
-        mnemonic = plain[0].lower()
+    plain = [t for t, _, _ in toks]
+    mnemonic = plain[0].lower()
 
-        if mnemonic in _PSEUDOS:
-            errors = _PSEUDOS[mnemonic](plain, labels)
-        elif mnemonic in IsaSpec.operations:
-            insn = IsaSpec.operations[mnemonic]
-            # For the same reason we have to cast in assembler oops.
-            errors = cast(Callable[[list[str],list[str]],list[AsmError]], insn.lint)(plain, labels) if hasattr(insn, 'lint') else []
-        else:
-            diags.append(
-                Diagnostic(
-                    lineno,
-                    toks[0][1],
-                    toks[0][2],
-                    f"Unknown mnemonic '{plain[0]}'",
-                )
+    if mnemonic in _PSEUDOS:
+        errors = _PSEUDOS[mnemonic](plain, labels)
+    elif mnemonic in IsaSpec.operations:
+        insn = IsaSpec.operations[mnemonic]
+        # For the same reason we have to cast in assembler oops.
+        errors = cast(Callable[[list[str],list[str]],list[AsmError]], insn.lint)(plain, labels) if hasattr(insn, 'lint') else []
+    else:
+        return [
+            Diagnostic(
+                lineno,
+                toks[0][1],
+                toks[0][2],
+                f"Unknown mnemonic '{plain[0]}'",
             )
-            continue
+        ]
 
-        for err in errors:
-            diags.append(_to_diagnostic(err, lineno, toks))
+    return [_to_diagnostic(err, lineno, toks) for err in errors]
+
+
+def _lint_expanded(lines: list[str]) -> list[Diagnostic]:
+    """
+    Lint a document with directives: the lines preprocess() expands it to
+    are linted, and each problem is reported on the source line it came
+    from (the macro invocation for the lines of a macro).
+    """
+
+    def whole_line(lineno: int, message: str) -> Diagnostic:
+        raw = _strip_comment(lines[lineno])
+        return Diagnostic(lineno, len(raw) - len(raw.lstrip()), len(raw.rstrip()), message)
+
+    def located(diag: Diagnostic, source_line: SourceLine) -> Diagnostic:
+        raw = lines[source_line.origin]
+        if source_line.expanded_from or _strip_comment(raw).strip() != source_line.text:
+            return replace(whole_line(source_line.origin, diag.message), severity=diag.severity)
+        indent = len(raw) - len(raw.lstrip())
+        return replace(diag, line=source_line.origin, col_start=diag.col_start + indent, col_end=diag.col_end + indent)
+
+    try:
+        expanded = preprocess(lines)
+    except AsmSyntaxError as exc:
+        return [whole_line(exc.line, exc.message)]
+
+    diags = _lint_labels([s.text for s in expanded], [s.origin for s in expanded])
+    labels = list(SEEN_LABELS.keys())
+    for source_line in expanded:
+        diags.extend(located(d, source_line) for d in _lint_instruction(source_line.text, 0, labels))
+    # a macro expanded many times repeats its problems
+    unique = {(d.line, d.col_start, d.message): d for d in diags}
+    return sorted(unique.values(), key=lambda d: (d.line, d.col_start))
+
+
+def lint_text(source: str) -> list[Diagnostic]:
+    """
+    Lint the full text of an NPU assembly file and return a (possibly empty)
+    list of Diagnostics sorted by (line, col_start).
+    """
+    lines = source.splitlines()
+    if uses_directives(lines):
+        return _lint_expanded(lines)
+    diags = _lint_labels(lines)
+    labels = list(SEEN_LABELS.keys())
+
+    for lineno, raw in enumerate(lines):
+        diags.extend(_lint_instruction(raw, lineno, labels))
 
     diags.sort(key=lambda d: (d.line, d.col_start))
     return diags
+
+
+# ---------------------------------------------------------------------------
+# Incremental linting
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _CachedLine:
+    diagnostics: list[Diagnostic]  # with line 0
+    symbols: frozenset[str]  # operand tokens, any of which may name a label
+
+
+class IncrementalLinter:
+    """
+    lint_text for one document that is re-linted after every edit.
+
+    Instruction diagnostics are cached by line content.  Label definitions
+    are re-scanned on every call (one regex per line); when the set of label
+    names changes, only the cached lines whose operands mention an added or
+    removed label are linted again.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[str, _CachedLine] = {}
+        self._labels: frozenset[str] = frozenset()
+        self.relinted = 0
+        """ Lines linted (cache misses) over the linter's lifetime. """
+
+    def lint(self, source: str) -> list[Diagnostic]:
+        lines = source.splitlines()
+        if uses_directives(lines):
+            # directives and macros change what every later line means
+            self._cache.clear()
+            return _lint_expanded(lines)
+        diags = _lint_labels(lines)
+        labels = list(SEEN_LABELS.keys())
+
+        changed = self._labels.symmetric_difference(labels)
+        if changed:
+            self._cache = {raw: line for raw, line in self._cache.items() if not line.symbols & changed}
+            self._labels = frozenset(labels)
+
+        cache: dict[str, _CachedLine] = {}
+        for lineno, raw in enumerate(lines):
+            line = cache.get(raw) or self._cache.get(raw)
+            if line is None:
+                self.relinted += 1
+                symbols = frozenset(t for t, _, _ in _tokenize(raw)[1:])
+                line = _CachedLine(_lint_instruction(raw, 0, labels), symbols)
+            cache[raw] = line
+            diags.extend(replace(d, line=lineno) for d in line.diagnostics)
+        # drop lines that are no longer in the document
+        self._cache = cache
+
+        diags.sort(key=lambda d: (d.line, d.col_start))
+        return diags
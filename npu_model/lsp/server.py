@@ -8,11 +8,15 @@ lsprotocol server.py` from the project root), or manually:
         "npu_model/npu_model/lsp/server.py"
 """
 
+import asyncio
+import importlib
 import logging
 import re
 import sys
+import threading
 from pathlib import Path
-from typing import cast
+from types import ModuleType
+from typing import TYPE_CHECKING, cast
 
 # ---------------------------------------------------------------------------
 # Bootstrap sys.path so `import npu_model` works.
@@ -26,11 +30,17 @@ _here = Path(__file__).resolve().parent
 if str(_here) not in sys.path:
     sys.path.insert(0, str(_here))
 
-from linter import Severity, SEEN_LABELS, lint_text
+from linter import Severity, SEEN_LABELS, IncrementalLinter
 from lsprotocol import types
 from pygls.lsp.server import LanguageServer
+from pygls.uris import from_fs_path, to_fs_path
+from workspace_index import ASM_SUFFIXES, Location, WorkspaceIndex
+
+if TYPE_CHECKING:
+    from npu_model.hardware.config import HardwareConfig
+    from npu_model.static_timing import BankConflict, BlockTiming, StaticTimer
 from npu_model.isa_patterns import InstructionPattern, x_rd
-from npu_model.isa_types import Named, Bundled, Imm32
+from npu_model.isa_types import Named, Bundled, Imm32, CsrAddr
 
 # ---------------------------------------------------------------------------
 # Global variables
@@ -39,6 +49,7 @@ from npu_model.isa_types import Named, Bundled, Imm32
 _PSEUDO_PARAMS: dict[str, list[Named]] = {
     "nop": [],
     "li": [x_rd, Named(Imm32, "32-bit immediate", "imm", False)],
+    "csrr": [x_rd, Named(CsrAddr, "csr")],
 }
 
 # ---------------------------------------------------------------------------
@@ -54,7 +65,7 @@ NPU_LS_VERSION = "0.1.0"
 server = LanguageServer(
     NPU_LS_NAME,
     NPU_LS_VERSION,
-    text_document_sync_kind=types.TextDocumentSyncKind.Full,
+    text_document_sync_kind=types.TextDocumentSyncKind.Incremental,
 )
 
 # ---------------------------------------------------------------------------
@@ -69,8 +80,38 @@ _SEVERITY_MAP = {
 }
 
 
+# Diagnostics are published this long after the last edit of a burst.
+DEBOUNCE_SECONDS = 0.15
+
+# One linter (and line cache) per open document.
+_linters: dict[str, IncrementalLinter] = {}
+_pending: dict[str, asyncio.TimerHandle] = {}
+
+# Labels and kernel users across the workspace; built once the client is up.
+_index: WorkspaceIndex | None = None
+
+# Static timing per open document (npu_model.static_timing).  It needs the
+# hardware model, and with it torch, so it is imported in the background once
+# the client is up rather than on the linter's import path; documents are
+# published without timing until it arrives and re-published then.
+_static_timing: ModuleType | None = None
+_timing_config: "HardwareConfig | None" = None
+_timers: dict[str, "StaticTimer"] = {}
+_timings: dict[str, list["BlockTiming"]] = {}
+
+
+def _path(uri: str) -> Path:
+    return Path(cast(str, to_fs_path(uri)))
+
+
 def _publish(ls: LanguageServer, uri: str, source: str) -> None:
-    results = lint_text(source)
+    _cancel_pending(uri)
+    if _index is not None:
+        _index.update(_path(uri), source)
+    if not uri.endswith(ASM_SUFFIXES):
+        # Python program configs are opened only for the workspace index
+        return
+    results = _linters.setdefault(uri, IncrementalLinter()).lint(source)
     lsp_diags: list[types.Diagnostic] = []
 
     for d in results:
@@ -86,26 +127,100 @@ def _publish(ls: LanguageServer, uri: str, source: str) -> None:
             )
         )
 
+    for conflict in _estimate(uri, source):
+        code = source.splitlines()[conflict.line]
+        lsp_diags.append(
+            types.Diagnostic(
+                range=types.Range(
+                    start=types.Position(line=conflict.line, character=len(code) - len(code.lstrip())),
+                    end=types.Position(line=conflict.line, character=len(code.split("#")[0].rstrip())),
+                ),
+                message=(
+                    f"Predicted bank conflict: {conflict.resource} is still in use by line "
+                    f"{conflict.holder + 1} until cycle {conflict.until}"
+                ),
+                severity=types.DiagnosticSeverity.Warning,
+                source=NPU_LS_NAME,
+            )
+        )
+
     ls.text_document_publish_diagnostics(
         types.PublishDiagnosticsParams(uri=uri, diagnostics=lsp_diags)
     )
     log.info("Published %d diagnostic(s) for %s", len(lsp_diags), uri)
 
 
+def _estimate(uri: str, source: str) -> list["BankConflict"]:
+    """Re-time the document's changed blocks; returns the predicted bank conflicts."""
+    if _static_timing is None or _timing_config is None:
+        return []
+    timer = _timers.get(uri)
+    if timer is None:
+        timer = _timers[uri] = _static_timing.StaticTimer(_timing_config)
+    blocks = _timings[uri] = timer.estimate(source)
+    return [conflict for block in blocks for conflict in block.conflicts]
+
+
+def _load_timing(ls: LanguageServer, loop: asyncio.AbstractEventLoop) -> None:
+    """Import static timing off the event loop, then re-publish the open documents with it."""
+    global _static_timing, _timing_config
+    try:
+        static_timing = importlib.import_module("npu_model.static_timing")
+        from npu_model.configs.hardware import DefaultHardwareConfig
+    except ImportError as exc:
+        log.warning("Static timing disabled: %s", exc)
+        return
+    # sys.modules holds the module while it is still importing, so it is
+    # only published here, once the import has finished
+    _timing_config = DefaultHardwareConfig()
+    _static_timing = static_timing
+    loop.call_soon_threadsafe(_publish_open, ls)
+
+
+def _publish_open(ls: LanguageServer) -> None:
+    for uri in list(_linters):
+        _publish_current(ls, uri)
+
+
 # ---------------------------------------------------------------------------
 # LSP event handlers
 # ---------------------------------------------------------------------------
 
 
+@server.feature(types.INITIALIZED)
+def initialized(ls: LanguageServer, params: types.InitializedParams) -> None:
+    global _index
+    root = Path(ls.workspace.root_path) if ls.workspace.root_path else _project_root
+    _index = WorkspaceIndex(root)
+    _index.build().add_done_callback(lambda _: log.info("Indexed workspace %s", root))
+    threading.Thread(target=_load_timing, args=(ls, asyncio.get_running_loop()), daemon=True).start()
+    for uri, doc in ls.workspace.text_documents.items():
+        _index.update(_path(uri), doc.source)
+
+
 @server.feature(types.TEXT_DOCUMENT_DID_OPEN)
 def did_open(ls: LanguageServer, params: types.DidOpenTextDocumentParams) -> None:
     _publish(ls, params.text_document.uri, params.text_document.text)
 
 
+def _cancel_pending(uri: str) -> None:
+    handle = _pending.pop(uri, None)
+    if handle is not None:
+        handle.cancel()
+
+
+def _publish_current(ls: LanguageServer, uri: str) -> None:
+    _pending.pop(uri, None)
+    _publish(ls, uri, ls.workspace.get_text_document(uri).source)
+
+
 @server.feature(types.TEXT_DOCUMENT_DID_CHANGE)
-def did_change(ls: LanguageServer, params: types.DidChangeTextDocumentParams) -> None:
-    if params.content_changes:
-        _publish(ls, params.text_document.uri, params.content_changes[-1].text)
+async def did_change(ls: LanguageServer, params: types.DidChangeTextDocumentParams) -> None:
+    # pygls has already applied the incremental edits to the workspace copy;
+    # lint once the burst of keystrokes settles.
+    uri = params.text_document.uri
+    _cancel_pending(uri)
+    _pending[uri] = asyncio.get_running_loop().call_later(DEBOUNCE_SECONDS, _publish_current, ls, uri)
 
 
 @server.feature(types.TEXT_DOCUMENT_DID_SAVE)
@@ -121,11 +236,157 @@ def did_save(ls: LanguageServer, params: types.DidSaveTextDocumentParams) -> Non
 
 @server.feature(types.TEXT_DOCUMENT_DID_CLOSE)
 def did_close(ls: LanguageServer, params: types.DidCloseTextDocumentParams) -> None:
+    _cancel_pending(params.text_document.uri)
+    _linters.pop(params.text_document.uri, None)
+    _timers.pop(params.text_document.uri, None)
+    _timings.pop(params.text_document.uri, None)
+    if _index is not None:
+        _index.close(_path(params.text_document.uri))
     ls.text_document_publish_diagnostics(
         types.PublishDiagnosticsParams(uri=params.text_document.uri, diagnostics=[])
     )
 
 
+@server.feature(types.WORKSPACE_DID_CHANGE_WATCHED_FILES)
+def did_change_watched_files(ls: LanguageServer, params: types.DidChangeWatchedFilesParams) -> None:
+    if _index is None:
+        return
+    for change in params.changes:
+        if change.type == types.FileChangeType.Deleted:
+            _index.remove(_path(change.uri))
+        else:
+            _index.update(_path(change.uri))
+
+
+# ---------------------------------------------------------------------------
+# Workspace navigation: go-to-definition, references, rename
+#
+# Labels resolve within their own file.  The file name in a Python
+# load_asm(ASM_FOLDER / "name.S") call resolves to the kernel, and renaming it
+# renames the kernel and every Program class that loads it.
+# ---------------------------------------------------------------------------
+
+
+def _range(loc: Location) -> types.Range:
+    return types.Range(
+        start=types.Position(line=loc.line, character=loc.col_start),
+        end=types.Position(line=loc.line, character=loc.col_end),
+    )
+
+
+def _location(loc: Location) -> types.Location:
+    return types.Location(uri=from_fs_path(str(loc.path)) or "", range=_range(loc))
+
+
+def _symbol_at(params: types.TextDocumentPositionParams) -> tuple[Path, str, str] | None:
+    if _index is None:
+        return None
+    path = _path(params.text_document.uri)
+    symbol = _index.symbol_at(path, params.position.line, params.position.character)
+    return None if symbol is None else (path, *symbol)
+
+
+@server.feature(types.TEXT_DOCUMENT_DEFINITION)
+def definition(ls: LanguageServer, params: types.DefinitionParams) -> types.Location | None:
+    symbol = _symbol_at(params)
+    if symbol is None or _index is None:
+        return None
+    path, kind, name = symbol
+    if kind == "label":
+        loc = _index.label_definition(path, name)
+        return None if loc is None else _location(loc)
+    kernel = _index.kernel_path(name)
+    if kernel is None:
+        return None
+    return _location(Location(kernel, 0, 0, 0))
+
+
+@server.feature(types.TEXT_DOCUMENT_REFERENCES)
+def references(ls: LanguageServer, params: types.ReferenceParams) -> list[types.Location] | None:
+    symbol = _symbol_at(params)
+    if symbol is None or _index is None:
+        return None
+    path, kind, name = symbol
+    if kind == "label":
+        locs = _index.label_references(path, name, params.context.include_declaration)
+    else:
+        locs = [ref.location for ref in _index.programs_using(name)]
+    return [_location(loc) for loc in locs]
+
+
+@server.feature(types.TEXT_DOCUMENT_RENAME)
+def rename(ls: LanguageServer, params: types.RenameParams) -> types.WorkspaceEdit | None:
+    symbol = _symbol_at(params)
+    if symbol is None or _index is None:
+        return None
+    path, kind, name = symbol
+    if kind == "label":
+        locs = _index.rename_label(path, name, params.new_name)
+        return types.WorkspaceEdit(
+            changes={
+                params.text_document.uri: [types.TextEdit(range=_range(loc), new_text=params.new_name) for loc in locs]
+            }
+        )
+
+    edits: dict[Path, list[types.TextEdit]] = {}
+    for loc in _index.rename_kernel(name, params.new_name):
+        edits.setdefault(loc.path, []).append(types.TextEdit(range=_range(loc), new_text=params.new_name))
+    changes: list[types.TextDocumentEdit | types.RenameFile] = [
+        types.TextDocumentEdit(
+            text_document=types.OptionalVersionedTextDocumentIdentifier(uri=from_fs_path(str(p)) or "", version=None),
+            edits=list(file_edits),
+        )
+        for p, file_edits in edits.items()
+    ]
+    kernel = _index.kernel_path(name)
+    if kernel is not None:
+        changes.append(
+            types.RenameFile(
+                old_uri=from_fs_path(str(kernel)) or "",
+                new_uri=from_fs_path(str(kernel.with_name(params.new_name))) or "",
+            )
+        )
+    return types.WorkspaceEdit(document_changes=changes)
+
+
+# ---------------------------------------------------------------------------
+# Inlay hints: static cycle estimates
+# ---------------------------------------------------------------------------
+
+
+def _timing_hint(line: str, lineno: int, label: str) -> types.InlayHint:
+    return types.InlayHint(
+        position=types.Position(line=lineno, character=len(line)),
+        label=label,
+        kind=types.InlayHintKind.Type,
+        padding_left=True,
+    )
+
+
+@server.feature(types.TEXT_DOCUMENT_INLAY_HINT)
+def inlay_hints(ls: LanguageServer, params: types.InlayHintParams) -> list[types.InlayHint]:
+    blocks = _timings.get(params.text_document.uri)
+    if not blocks:
+        return []
+    lines = ls.workspace.get_text_document(params.text_document.uri).lines
+    first, last = params.range.start.line, params.range.end.line
+    hints: list[types.InlayHint] = []
+    for block in blocks:
+        if block.end_line <= first or block.start_line > last or block.start_line >= len(lines):
+            continue
+        occupancy = " · ".join(f"{unit} {cycles}" for unit, cycles in sorted(block.busy.items()))
+        summary = f"block: {block.cycles} cycles" + (f" · {occupancy}" if occupancy else "")
+        hints.append(_timing_hint(lines[block.start_line].rstrip("\r\n"), block.start_line, summary))
+        for timing in block.lines:
+            if not first <= timing.line <= last or timing.line >= len(lines):
+                continue
+            label = f"@{timing.issue}→{timing.complete} {timing.unit}"
+            if timing.stall:
+                label += f" (stall {timing.stall}: {timing.reason})"
+            hints.append(_timing_hint(lines[timing.line].rstrip("\r\n"), timing.line, label))
+    return hints
+
+
 # ---------------------------------------------------------------------------
 # Completions
 # ---------------------------------------------------------------------------
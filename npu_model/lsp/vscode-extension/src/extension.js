@@ -80,9 +80,11 @@ function activate(context) {
   const clientOptions = {
     documentSelector: [
       { scheme: "file", language: "npu-asm" },
+      // program configs, for go-to-definition / rename of load_asm() kernels
+      { scheme: "file", language: "python", pattern: "**/configs/programs/*.py" },
     ],
     synchronize: {
-      fileEvents: workspace.createFileSystemWatcher("**/*.{S,s,asm}"),
+      fileEvents: workspace.createFileSystemWatcher("**/*.{S,s,asm,py}"),
     },
     middleware: {},
   };
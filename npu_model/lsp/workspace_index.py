@@ -0,0 +1,259 @@
+"""
+Workspace-wide symbol index for NPU assembly.
+
+Indexes every assembly file (.S / .s / .asm) under a root for the labels it
+defines and the operands that name them, and every Python file for the
+Program classes that load a kernel through load_asm(ASM_FOLDER / "name.S").
+Labels are local to their file, as in the assembler; kernels are matched to
+Python references by file name.
+
+The initial build parses files in a thread pool in the background; after
+that update() / remove() re-index single files as the editor or a file
+watcher reports changes.  While a file is open its editor buffer, not the
+copy on disk, is what gets indexed.  All lookups are dictionary hits.  Like
+linter.py this module has no LSP dependency.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ASM_SUFFIXES = (".S", ".s", ".asm")
+_SKIP_DIRS = {".git", ".venv", "venv", "node_modules", "__pycache__", ".mypy_cache", ".pytest_cache"}
+
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_.]*")
+_LABEL_DEF_RE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_.]*)\s*:\s*$")
+_LOAD_ASM_RE = re.compile(r"""load_asm\(\s*ASM_FOLDER\s*/\s*(['"])([^'"]+)\1\s*\)""")
+_CLASS_RE = re.compile(r"^class\s+([A-Za-z_][A-Za-z0-9_]*)")
+
+
+@dataclass(frozen=True)
+class Location:
+    path: Path
+    line: int  # 0-indexed
+    col_start: int
+    col_end: int
+
+
+@dataclass(frozen=True)
+class ProgramRef:
+    """A Python Program class loading a kernel; location spans the file name."""
+
+    class_name: str | None
+    asm_name: str
+    location: Location
+
+
+@dataclass
+class _AsmSymbols:
+    labels: dict[str, Location] = field(default_factory=dict)
+    references: dict[str, list[Location]] = field(default_factory=dict)
+    """ Identifier operands by name; those naming a label are its references. """
+    by_line: dict[int, list[tuple[Location, str]]] = field(default_factory=dict)
+    """ Label definitions and identifier operands per line, for position lookups. """
+
+
+def _strip_comment(raw: str) -> str:
+    idx = raw.find("#")
+    return raw[:idx] if idx >= 0 else raw
+
+
+def parse_asm(path: Path, text: str) -> _AsmSymbols:
+    symbols = _AsmSymbols()
+    for lineno, raw in enumerate(text.splitlines()):
+        code = _strip_comment(raw)
+        definition = _LABEL_DEF_RE.match(code)
+        if definition is not None:
+            location = Location(path, lineno, definition.start(1), definition.end(1))
+            symbols.labels.setdefault(definition.group(1), location)
+            symbols.by_line.setdefault(lineno, []).append((location, definition.group(1)))
+            continue
+        # skip the mnemonic; operands are separated by spaces and commas
+        operands = list(re.finditer(r"[^\s,]+", code))[1:]
+        for operand in operands:
+            ident = _IDENT_RE.fullmatch(operand.group())
+            if ident is None:
+                continue
+            location = Location(path, lineno, operand.start(), operand.end())
+            symbols.references.setdefault(operand.group(), []).append(location)
+            symbols.by_line.setdefault(lineno, []).append((location, operand.group()))
+    return symbols
+
+
+def parse_python(path: Path, text: str) -> list[ProgramRef]:
+    refs: list[ProgramRef] = []
+    class_name: str | None = None
+    for lineno, line in enumerate(text.splitlines()):
+        match = _CLASS_RE.match(line)
+        if match is not None:
+            class_name = match.group(1)
+        for load in _LOAD_ASM_RE.finditer(line):
+            location = Location(path, lineno, load.start(2), load.end(2))
+            refs.append(ProgramRef(class_name, Path(load.group(2)).name, location))
+    return refs
+
+
+class WorkspaceIndex:
+    """Labels of every kernel and the Program classes that load them."""
+
+    def __init__(self, root: Path, workers: int | None = None) -> None:
+        self.root = root
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._asm: dict[Path, _AsmSymbols] = {}
+        self._asm_by_name: dict[str, Path] = {}
+        self._python: dict[Path, list[ProgramRef]] = {}
+        self._users: dict[str, dict[Path, list[ProgramRef]]] = {}
+        """ Kernel file name -> Python file -> its references to the kernel. """
+        self._buffers: set[Path] = set()
+        """ Files indexed from an open editor buffer; disk updates skip them. """
+        self._ready: Future[None] = Future()
+
+    # ------------------------------------------------------------------
+    # Building and updating
+    # ------------------------------------------------------------------
+
+    def build(self) -> Future[None]:
+        """Index the whole root in the background; the future completes when done."""
+        thread = threading.Thread(target=self._build, name="npu-asm-index", daemon=True)
+        thread.start()
+        return self._ready
+
+    def wait(self, timeout: float | None = None) -> None:
+        self._ready.result(timeout)
+
+    def _build(self) -> None:
+        try:
+            paths = list(self._walk())
+            with ThreadPoolExecutor(max_workers=self._workers) as pool:
+                for path, parsed in zip(paths, pool.map(self._parse_file, paths)):
+                    if parsed is not None and path not in self._buffers:
+                        self._store(path, parsed)
+        except BaseException as exc:
+            self._ready.set_exception(exc)
+        else:
+            self._ready.set_result(None)
+
+    def _walk(self):
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+            for filename in filenames:
+                if filename.endswith(ASM_SUFFIXES) or filename.endswith(".py"):
+                    yield Path(dirpath) / filename
+
+    @staticmethod
+    def _parse_file(path: Path, text: str | None = None) -> _AsmSymbols | list[ProgramRef] | None:
+        if text is None:
+            try:
+                text = path.read_text(errors="replace")
+            except OSError:
+                return None
+        if path.suffix in ASM_SUFFIXES:
+            return parse_asm(path, text)
+        if path.suffix == ".py":
+            return parse_python(path, text)
+        return None
+
+    def update(self, path: Path, text: str | None = None) -> None:
+        """Re-index one file, from *text* if given (an open editor buffer) or from disk."""
+        if text is not None:
+            self._buffers.add(path)
+        elif path in self._buffers:
+            return
+        parsed = self._parse_file(path, text)
+        if parsed is None:
+            self.remove(path)
+        else:
+            self._store(path, parsed)
+
+    def close(self, path: Path) -> None:
+        """The editor buffer for *path* was closed; index the file on disk again."""
+        self._buffers.discard(path)
+        self.update(path)
+
+    def remove(self, path: Path) -> None:
+        with self._lock:
+            self._forget(path)
+
+    def _store(self, path: Path, parsed: _AsmSymbols | list[ProgramRef]) -> None:
+        with self._lock:
+            self._forget(path)
+            if isinstance(parsed, _AsmSymbols):
+                self._asm[path] = parsed
+                self._asm_by_name[path.name] = path
+            else:
+                self._python[path] = parsed
+                for ref in parsed:
+                    self._users.setdefault(ref.asm_name, {}).setdefault(path, []).append(ref)
+
+    def _forget(self, path: Path) -> None:
+        if self._asm.pop(path, None) is not None and self._asm_by_name.get(path.name) == path:
+            del self._asm_by_name[path.name]
+        for ref in self._python.pop(path, []):
+            users = self._users.get(ref.asm_name)
+            if users is not None:
+                users.pop(path, None)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def labels(self, path: Path) -> list[str]:
+        with self._lock:
+            symbols = self._asm.get(path)
+            return list(symbols.labels) if symbols is not None else []
+
+    def label_definition(self, path: Path, name: str) -> Location | None:
+        with self._lock:
+            symbols = self._asm.get(path)
+            return symbols.labels.get(name) if symbols is not None else None
+
+    def label_references(self, path: Path, name: str, include_definition: bool = True) -> list[Location]:
+        with self._lock:
+            symbols = self._asm.get(path)
+            if symbols is None or name not in symbols.labels:
+                return []
+            refs = list(symbols.references.get(name, []))
+            return [symbols.labels[name], *refs] if include_definition else refs
+
+    def kernel_path(self, asm_name: str) -> Path | None:
+        with self._lock:
+            return self._asm_by_name.get(asm_name)
+
+    def programs_using(self, asm_name: str) -> list[ProgramRef]:
+        with self._lock:
+            return [ref for refs in self._users.get(asm_name, {}).values() for ref in refs]
+
+    def symbol_at(self, path: Path, line: int, character: int) -> tuple[str, str] | None:
+        """("label", name) or ("kernel", file name) under a position, if any."""
+        with self._lock:
+            symbols = self._asm.get(path)
+            if symbols is not None:
+                for location, name in symbols.by_line.get(line, []):
+                    if location.col_start <= character <= location.col_end and name in symbols.labels:
+                        return ("label", name)
+                return None
+            for ref in self._python.get(path, []):
+                loc = ref.location
+                if loc.line == line and loc.col_start <= character <= loc.col_end:
+                    return ("kernel", ref.asm_name)
+            return None
+
+    def rename_label(self, path: Path, name: str, new_name: str) -> list[Location]:
+        """Every span to replace with *new_name* (labels are file-local)."""
+        if _IDENT_RE.fullmatch(new_name) is None:
+            raise ValueError(f"'{new_name}' is not a valid label name")
+        if new_name in self.labels(path):
+            raise ValueError(f"Label '{new_name}' is already defined in {path.name}")
+        return self.label_references(path, name)
+
+    def rename_kernel(self, asm_name: str, new_name: str) -> list[Location]:
+        """The load_asm() file names in Python to replace with *new_name*."""
+        if not new_name.endswith(ASM_SUFFIXES) or Path(new_name).name != new_name:
+            raise ValueError(f"'{new_name}' is not an assembly file name")
+        if self.kernel_path(new_name) is not None:
+            raise ValueError(f"A kernel named '{new_name}' already exists")
+        return [ref.location for ref in self.programs_using(asm_name)]
@@ -0,0 +1,202 @@
+"""
+Periodic metrics export during a simulation.
+
+Simulation(metrics_sinks=[...], metrics_interval=N) takes a MetricsSnapshot
+every N simulated cycles (and once more when the run ends) and hands it to
+each sink:
+
+  - JsonlMetricsSink       appends one JSON object per snapshot and flushes,
+                           so `tail -f` or scripts/watch_metrics.py can follow it
+  - PrometheusMetricsSink  atomically rewrites a text file in the Prometheus
+                           exposition format with the latest snapshot (e.g. for
+                           the node_exporter textfile collector)
+
+Nothing is accumulated in memory between snapshots.  A hung kernel shows up
+as `cycles_since_progress` growing while `instructions` stays flat.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence, TextIO
+
+if TYPE_CHECKING:
+    from .hardware.core import Core
+
+
+@dataclass
+class MetricsSnapshot:
+    cycle: int
+    instructions: int
+    ipc: float
+    exu_busy_cycles: dict[str, int]
+    exu_utilization: dict[str, float]
+    """ Busy fraction of each EXU since the start of the run. """
+    dma_bytes: int
+    host_seconds: float
+    """ Host wall time since the start of the run. """
+    cycles_per_second: float
+    """ Simulated cycles per host second over the last interval. """
+    cycles_since_progress: int
+    """ Simulated cycles since the retired instruction count last advanced. """
+    timestamp: float
+    """ Unix time at which the snapshot was taken. """
+    finished: bool = False
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+class MetricsSink(ABC):
+    """Receives periodic MetricsSnapshots from a running Simulation."""
+
+    @abstractmethod
+    def emit(self, snapshot: MetricsSnapshot) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlMetricsSink(MetricsSink):
+    """Append snapshots to a JSON Lines file, one line per snapshot."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file: TextIO | None = open(self.path, "w")
+
+    def emit(self, snapshot: MetricsSnapshot) -> None:
+        if self._file is None:
+            raise ValueError(f"Metrics sink {self.path} is closed.")
+        self._file.write(json.dumps(snapshot.to_dict()) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class PrometheusMetricsSink(MetricsSink):
+    """Keep a Prometheus text-format file holding the latest snapshot."""
+
+    def __init__(self, path: str | Path, prefix: str = "npu_sim") -> None:
+        self.path = Path(path)
+        self.prefix = prefix
+
+    def emit(self, snapshot: MetricsSnapshot) -> None:
+        p = self.prefix
+        lines = [
+            *_gauge(f"{p}_cycles", "Simulated cycles.", snapshot.cycle),
+            *_gauge(f"{p}_instructions_retired", "Instructions retired.", snapshot.instructions),
+            *_gauge(f"{p}_ipc", "Instructions per cycle.", snapshot.ipc),
+            *_gauge(f"{p}_dma_bytes", "Bytes moved by DMA.", snapshot.dma_bytes),
+            *_gauge(
+                f"{p}_cycles_per_second",
+                "Simulated cycles per host second over the last interval.",
+                snapshot.cycles_per_second,
+            ),
+            *_gauge(
+                f"{p}_cycles_since_progress",
+                "Simulated cycles since an instruction last retired.",
+                snapshot.cycles_since_progress,
+            ),
+            *_gauge(f"{p}_host_seconds", "Host wall time of the run.", snapshot.host_seconds),
+            *_gauge(f"{p}_finished", "1 once the run has ended.", int(snapshot.finished)),
+            *_gauge(
+                f"{p}_last_update_timestamp_seconds",
+                "Unix time of the snapshot.",
+                snapshot.timestamp,
+            ),
+            f"# HELP {p}_exu_busy_cycles Busy cycles per execution unit.",
+            f"# TYPE {p}_exu_busy_cycles gauge",
+            *(
+                f'{p}_exu_busy_cycles{{unit="{name}"}} {value}'
+                for name, value in snapshot.exu_busy_cycles.items()
+            ),
+            f"# HELP {p}_exu_utilization Busy fraction per execution unit.",
+            f"# TYPE {p}_exu_utilization gauge",
+            *(
+                f'{p}_exu_utilization{{unit="{name}"}} {value}'
+                for name, value in snapshot.exu_utilization.items()
+            ),
+        ]
+        # write-then-rename so readers never see a partial file
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
+
+
+def _gauge(name: str, help_text: str, value: float) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+
+class MetricsRecorder:
+    """Takes snapshots of a Core every `interval` cycles; owned by Simulation."""
+
+    def __init__(self, sinks: Sequence[MetricsSink], interval: int) -> None:
+        if interval <= 0:
+            raise ValueError(f"metrics interval must be positive, got {interval}")
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.reset()
+
+    def reset(self) -> None:
+        self._start = time.perf_counter()
+        self._last_time = self._start
+        self._last_cycle = 0
+        self._last_instructions = 0
+        self._progress_cycle = 0
+
+    def tick(self, cycle: int, core: Core) -> None:
+        """Call once per simulated cycle with the number of cycles run so far."""
+        if cycle % self.interval == 0:
+            self.emit(cycle, core)
+
+    def emit(self, cycle: int, core: Core, finished: bool = False) -> None:
+        now = time.perf_counter()
+        instructions = core.total_completed
+        if instructions != self._last_instructions:
+            self._progress_cycle = cycle
+        elapsed = now - self._last_time
+        busy = {exu.name: exu.busy_cycles for exu in core.exus}
+        snapshot = MetricsSnapshot(
+            cycle=cycle,
+            instructions=instructions,
+            ipc=instructions / cycle if cycle > 0 else 0.0,
+            exu_busy_cycles=busy,
+            exu_utilization={
+                name: cycles / cycle if cycle > 0 else 0.0 for name, cycles in busy.items()
+            },
+            dma_bytes=sum(getattr(exu, "bytes_moved", 0) for exu in core.exus),
+            host_seconds=now - self._start,
+            cycles_per_second=(cycle - self._last_cycle) / elapsed if elapsed > 0 else 0.0,
+            cycles_since_progress=cycle - self._progress_cycle,
+            timestamp=time.time(),
+            finished=finished,
+        )
+        self._last_time = now
+        self._last_cycle = cycle
+        self._last_instructions = instructions
+        for sink in self.sinks:
+            sink.emit(snapshot)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+def read_jsonl_snapshots(path: str | Path) -> list[MetricsSnapshot]:
+    """Parse the complete lines of a JsonlMetricsSink file (a trailing partial line is skipped)."""
+    snapshots: list[MetricsSnapshot] = []
+    with open(path) as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            snapshots.append(MetricsSnapshot(**json.loads(line)))
+    return snapshots
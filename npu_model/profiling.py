@@ -3,7 +3,10 @@
 Two main features:
   - print_utilization_report: per-EXU busy/idle/utilization table (idea 1)
   - print_timeline: ASCII activity timeline + overlap stats (idea 2)
-  - print_stats: both at once
+  - print_cpi_stack: where the cycles went, by category / PC / mnemonic
+  - print_critical_path: instructions and units on the critical path
+  - print_host_profile: host wall time per simulator component / mnemonic
+  - print_stats: all of the above
 """
 
 from __future__ import annotations
@@ -21,11 +24,45 @@ def print_utilization_report(sim: "Simulation") -> None:
     total = stats.cycles
 
     print(f"Utilization  ({total} total cycles, {stats.total_instructions} instructions, IPC {stats.ipc:.3f})")
-    print(f"  {'Unit':<14} {'Busy':>7} {'Idle':>7} {'Util':>7} {'Insns':>7}")
-    print(f"  {'-'*14} {'-'*7} {'-'*7} {'-'*7} {'-'*7}")
+    if stats.issue_slot_histogram:
+        histogram = "  ".join(
+            f"{n}:{count}" for n, count in enumerate(stats.issue_slot_histogram)
+        )
+        print(
+            f"  Issue slots: width {stats.issue_width}, "
+            f"{stats.issue_slot_utilization:.1%} used  (uops/cycle -> cycles  {histogram})"
+        )
+    imem = stats.imem_stats
+    if imem is not None:
+        print(
+            f"  Instruction memory ({imem.model}): {imem.accesses} fetches, {imem.misses} misses "
+            f"({imem.hit_rate:.1%} hit), {imem.refill_bytes} refill bytes, "
+            f"{imem.fetch_stall_cycles} fetch-stall cycles"
+        )
+    print(f"  {'Unit':<14} {'Busy':>7} {'Idle':>7} {'Util':>7} {'Insns':>7} {'Insn/Busy':>9}")
+    print(f"  {'-'*14} {'-'*7} {'-'*7} {'-'*7} {'-'*7} {'-'*9}")
     for name, s in stats.exu_stats.items():
         idle = total - s.busy_cycles
-        print(f"  {name:<14} {s.busy_cycles:>7} {idle:>7} {s.utilization:>6.1%} {s.instructions:>7}")
+        print(
+            f"  {name:<14} {s.busy_cycles:>7} {idle:>7} {s.utilization:>6.1%} {s.instructions:>7}"
+            f" {s.throughput:>9.3f}"
+        )
+    for exu in sim.core.exus if sim.core is not None else []:
+        peak = getattr(exu, "peak_in_flight", None)
+        if peak is not None:
+            print(
+                f"  {exu.name}: pipelined, peak {peak} in flight, "
+                f"{getattr(exu, 'issue_stall_cycles', 0)} issue-stall cycles"
+            )
+    structural = {name: n for name, n in stats.structural_stall_cycles.items() if n > 0}
+    if structural or stats.bank_stall_cycles:
+        print("  Interlock stalls (bank_conflict_policy='stall'):")
+        if structural:
+            detail = "  ".join(f"{name}:{n}" for name, n in structural.items())
+            print(f"    dispatch waiting on busy unit : {detail}")
+        if stats.bank_stall_cycles:
+            detail = "  ".join(f"{bank}:{n}" for bank, n in stats.bank_stall_cycles.items())
+            print(f"    unit waiting on busy bank     : {detail}")
     print()
 
 
@@ -36,32 +73,22 @@ def print_timeline(sim: "Simulation") -> None:
         print("No timeline data. Run with record_timeline=True.")
         return
 
-    exu_names = list(timeline[0].keys())
+    exu_names = timeline.names
     total_cycles = len(timeline)
     cycles_per_char = total_cycles / BAR_WIDTH
 
-    def _bar(name: str) -> str:
-        chars = []
-        for col in range(BAR_WIDTH):
-            lo = col * total_cycles // BAR_WIDTH
-            hi = max((col + 1) * total_cycles // BAR_WIDTH, lo + 1)
-            active = any(timeline[c][name] for c in range(lo, min(hi, total_cycles)))
-            chars.append("█" if active else "·")
-        return "".join(chars)
-
     print(f"Timeline  (1 char ≈ {cycles_per_char:.1f} cycles  █=active  ·=idle)")
     print()
     for name in exu_names:
-        busy_count = sum(1 for c in timeline if c[name])
-        pct = busy_count / total_cycles if total_cycles else 0.0
-        print(f"  {name:<12} │{_bar(name)}│ {pct:>5.1%}")
+        pct = timeline.busy_cycles(name) / total_cycles
+        print(f"  {name:<12} │{timeline.bar(name, BAR_WIDTH)}│ {pct:>5.1%}")
     print()
 
     # Concurrent unit counts per cycle
-    active_counts = [sum(1 for n in exu_names if timeline[c][n]) for c in range(total_cycles)]
-    overlap_2 = sum(1 for n in active_counts if n >= 2)
-    overlap_3 = sum(1 for n in active_counts if n >= 3)
-    peak = max(active_counts, default=0)
+    histogram = timeline.concurrency_histogram()
+    overlap_2 = int(histogram[2:].sum())
+    overlap_3 = int(histogram[3:].sum())
+    peak = max((n for n, count in enumerate(histogram) if count), default=0)
 
     print(f"  Peak concurrent units : {peak}")
     print(f"  ≥2 units simultaneous : {overlap_2:>6} / {total_cycles} cycles  ({overlap_2/total_cycles:.1%})")
@@ -69,17 +96,132 @@ def print_timeline(sim: "Simulation") -> None:
         print(f"  ≥3 units simultaneous : {overlap_3:>6} / {total_cycles} cycles  ({overlap_3/total_cycles:.1%})")
 
     # MXU vs VPU overlap specifically
-    mxu_names = [n for n in exu_names if "mxu" in n.lower()]
-    vpu_names = [n for n in exu_names if "vpu" in n.lower()]
+    mxu_names = [n for n in exu_names if "mxu" in n.lower() or "matrix" in n.lower()]
+    vpu_names = [n for n in exu_names if "vpu" in n.lower() or "vector" in n.lower()]
     if mxu_names and vpu_names:
-        mxu_active = [any(timeline[c][n] for n in mxu_names) for c in range(total_cycles)]
-        vpu_active = [any(timeline[c][n] for n in vpu_names) for c in range(total_cycles)]
-        both = sum(1 for m, v in zip(mxu_active, vpu_active) if m and v)
+        both = timeline.overlap_cycles(mxu_names, vpu_names)
         print(f"  MXU+VPU overlap       : {both:>6} / {total_cycles} cycles  ({both/total_cycles:.1%})")
     print()
 
 
+def print_cpi_stack(sim: "Simulation", top: int = 10) -> None:
+    """Print the CPI stack and the PCs / mnemonics responsible for lost cycles."""
+    stack = sim.get_stats().cpi_stack
+    if stack is None or stack.cycles == 0:
+        print("No cycle accounting data.")
+        return
+
+    cpi = stack.cpi()
+    print(f"CPI stack  ({stack.cycles} cycles, {stack.instructions} instructions)")
+    print(f"  {'Category':<14} {'Cycles':>8} {'Share':>7} {'CPI':>7}")
+    print(f"  {'-'*14} {'-'*8} {'-'*7} {'-'*7}")
+    for category, cycles in stack.categories.items():
+        print(
+            f"  {category:<14} {cycles:>8} {cycles / stack.cycles:>6.1%} {cpi[category]:>7.3f}"
+        )
+
+    def _lost(counts: dict[str, int]) -> int:
+        return sum(cycles for category, cycles in counts.items() if category != "issue")
+
+    by_pc = sorted(stack.by_pc.items(), key=lambda item: _lost(item[1]), reverse=True)
+    by_pc = [(pc, counts) for pc, counts in by_pc if _lost(counts) > 0][:top]
+    if by_pc:
+        print()
+        print("  Top PCs by non-issue cycles")
+        for pc, counts in by_pc:
+            mnemonic = stack.mnemonic_at_pc.get(pc, "?")
+            detail = "  ".join(
+                f"{category}:{cycles}"
+                for category, cycles in counts.items()
+                if category != "issue" and cycles > 0
+            )
+            print(f"    {pc:#06x} {mnemonic:<14} {_lost(counts):>8}  ({detail})")
+
+    by_mnemonic = sorted(stack.by_mnemonic.items(), key=lambda item: _lost(item[1]), reverse=True)
+    by_mnemonic = [(name, counts) for name, counts in by_mnemonic if _lost(counts) > 0][:top]
+    if by_mnemonic:
+        print()
+        print("  Top mnemonics by non-issue cycles")
+        for name, counts in by_mnemonic:
+            print(f"    {name:<20} {_lost(counts):>8}")
+
+    print()
+    print(f"  IFU output stalled   : {stack.ifu_output_stall_cycles:>6} cycles")
+    for name, busy in stack.exu_busy_cycles.items():
+        print(f"  {name:<20} : {busy:>6} busy, {stack.exu_idle_cycles[name]:>6} idle")
+    print()
+
+
+def print_critical_path(sim: "Simulation", top: int = 10) -> None:
+    """Print the instructions and units that determine total cycles."""
+    if not getattr(sim, "record_graph", False):
+        print("No execution graph. Run with record_graph=True.")
+        return
+    from npu_model.critical_path import analyze_critical_path
+
+    path = analyze_critical_path(sim)
+    if not path.segments:
+        print("No instructions were dispatched.")
+        return
+
+    kinds: dict[str, int] = {}
+    for segment in path.segments:
+        kinds[segment.kind] = kinds.get(segment.kind, 0) + segment.cycles
+    breakdown = "  ".join(f"{kind}:{cycles}" for kind, cycles in kinds.items())
+    print(
+        f"Critical path  ({path.length} cycles, {len(path.path)} of {len(path.nodes)} "
+        f"instructions; {breakdown})"
+    )
+    print(f"  {'PC':<8} {'Instruction':<20} {'Unit':<12} {'Execute':>8} {'Wait':>6} {'Count':>6}")
+    print(f"  {'-'*8} {'-'*20} {'-'*12} {'-'*8} {'-'*6} {'-'*6}")
+    for entry in path.instructions[:top]:
+        print(
+            f"  {entry.pc:#06x}   {entry.mnemonic:<20} {entry.unit:<12} "
+            f"{entry.execute_cycles:>8} {entry.wait_cycles:>6} {entry.occurrences:>6}"
+        )
+    print()
+    print(f"  {'Unit':<14} {'Critical':>9} {'Overlapped':>11}")
+    for name in dict.fromkeys([*path.unit_cycles, *path.overlapped_cycles]):
+        print(
+            f"  {name:<14} {path.unit_cycles.get(name, 0):>9} "
+            f"{path.overlapped_cycles.get(name, 0):>11}"
+        )
+    print()
+
+
+def print_host_profile(sim: "Simulation", top: int = 15) -> None:
+    """Print where the simulator itself spent host time."""
+    profiler = getattr(sim, "host_profiler", None)
+    if profiler is None or profiler.total_ns == 0:
+        print("No host profile. Run with profile_host=True.")
+        return
+
+    total = profiler.total_ns
+    cycles = getattr(sim, "cycle_count", 0)
+    per_cycle = f", {total / cycles / 1e3:.1f} us/cycle" if cycles else ""
+    print(f"Host profile  ({total / 1e6:.1f} ms in Core.tick{per_cycle})")
+    print(f"  {'Component':<20} {'Self ms':>9} {'Share':>7}")
+    print(f"  {'-'*20} {'-'*9} {'-'*7}")
+    for name, ns in profiler.components().items():
+        print(f"  {name:<20} {ns / 1e6:>9.2f} {ns / total:>6.1%}")
+
+    execs = [region for region in profiler.regions() if region.name.startswith("exec:")]
+    if execs:
+        print()
+        print(f"  {'Mnemonic':<20} {'Calls':>7} {'Self ms':>9} {'us/call':>8}")
+        print(f"  {'-'*20} {'-'*7} {'-'*9} {'-'*8}")
+        for region in execs[:top]:
+            print(
+                f"  {region.name[len('exec:'):]:<20} {region.calls:>7} "
+                f"{region.exclusive_ns / 1e6:>9.2f} {region.exclusive_ns / region.calls / 1e3:>8.1f}"
+            )
+    print()
+
+
 def print_stats(sim: "Simulation") -> None:
-    """Print utilization report followed by timeline."""
+    """Print utilization report, timeline, CPI stack and critical path."""
     print_utilization_report(sim)
     print_timeline(sim)
+    print_cpi_stack(sim)
+    if getattr(sim, "record_graph", False):
+        print_critical_path(sim)
@@ -0,0 +1,173 @@
+"""
+Roofline model joining measured simulator work with a speed-of-light bound.
+
+Each run is reduced to the work it actually performed (MXU multiply-
+accumulates, VPU element operations and DMA bytes, counted by the execution
+units) and placed on a roofline whose roofs come from the HardwareConfig:
+
+  - MXU roof : one (mrf_depth x mrf_width) x (wb_width / mrf_width) tile per
+               mxuN_matmul_latency_cycles, summed over the configured MXUs
+               (the same peak as npu_speed_of_light's 2 * NT * KT FLOPs/cycle)
+  - VPU roof : one BF16 tile per vpu_simple_op_latency_cycles per VPU
+  - DMA roof : the narrower of the off-chip link and the VMEM bus
+
+The speed-of-light cycle count assumes the three engines overlap perfectly,
+so it is the largest of the per-engine times; the engine that sets it is the
+bound.  The gap is measured cycles over speed-of-light cycles.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .hardware.config import HardwareConfig
+
+if TYPE_CHECKING:
+    from .simulation import Simulation
+
+MXU_UNIT_LATENCY_FIELDS = {
+    "MatrixExecutionUnitSystolic": "mxu0_matmul_latency_cycles",
+    "MatrixExecutionUnitInner": "mxu1_matmul_latency_cycles",
+}
+VPU_UNITS = ("VectorExecutionUnit", "PipelinedVectorExecutionUnit")
+
+
+@dataclass
+class RooflinePeaks:
+    mxu_macs_per_cycle: float
+    vpu_element_ops_per_cycle: float
+    dma_bytes_per_cycle: float
+
+    @property
+    def ridge_point(self) -> float:
+        """MACs per DMA byte above which the MXU roof, not bandwidth, bounds a kernel."""
+        if self.dma_bytes_per_cycle == 0:
+            return 0.0
+        return self.mxu_macs_per_cycle / self.dma_bytes_per_cycle
+
+
+def roofline_peaks(config: HardwareConfig) -> RooflinePeaks:
+    """Derive the compute and bandwidth roofs from a hardware configuration."""
+    cfg = config.arch_state_config
+    mxu = 0.0
+    vpu = 0.0
+    for unit in config.execution_units.values():
+        if unit in MXU_UNIT_LATENCY_FIELDS:
+            latency = getattr(config, MXU_UNIT_LATENCY_FIELDS[unit])
+            mxu += cfg.mrf_depth * cfg.wb_width / latency
+        elif unit in VPU_UNITS:
+            vpu += cfg.mrf_depth * cfg.mrf_width / config.vpu_simple_op_latency_cycles
+    offchip = config.offchip_link_width_bits / 8 / config.offchip_link_core_cycles_per_beat
+    vmem_bus = config.vmem_bus_width_bits / 8 / config.vmem_bus_core_cycles_per_beat
+    return RooflinePeaks(
+        mxu_macs_per_cycle=mxu,
+        vpu_element_ops_per_cycle=vpu,
+        dma_bytes_per_cycle=min(offchip, vmem_bus),
+    )
+
+
+def _engine_cycles(work: int, rate: float) -> float:
+    if work == 0:
+        return 0.0
+    if rate == 0:
+        return float("inf")
+    return work / rate
+
+
+@dataclass
+class RooflinePoint:
+    name: str
+    cycles: int
+    mxu_macs: int
+    vpu_element_ops: int
+    dma_bytes: int
+    peaks: RooflinePeaks
+
+    @property
+    def engine_cycles(self) -> dict[str, float]:
+        """Cycles each engine needs at its roof."""
+        return {
+            "mxu": _engine_cycles(self.mxu_macs, self.peaks.mxu_macs_per_cycle),
+            "vpu": _engine_cycles(self.vpu_element_ops, self.peaks.vpu_element_ops_per_cycle),
+            "dma": _engine_cycles(self.dma_bytes, self.peaks.dma_bytes_per_cycle),
+        }
+
+    @property
+    def sol_cycles(self) -> float:
+        return max(self.engine_cycles.values())
+
+    @property
+    def bound(self) -> str:
+        """Engine that sets the speed of light ("none" for a run with no counted work)."""
+        engines = self.engine_cycles
+        engine = max(engines, key=lambda name: engines[name])
+        return engine if engines[engine] > 0 else "none"
+
+    @property
+    def arithmetic_intensity(self) -> float | None:
+        """MXU MACs per DMA byte; None when no bytes were moved."""
+        if self.dma_bytes == 0:
+            return None
+        return self.mxu_macs / self.dma_bytes
+
+    @property
+    def achieved_macs_per_cycle(self) -> float:
+        return self.mxu_macs / self.cycles if self.cycles > 0 else 0.0
+
+    @property
+    def attainable_macs_per_cycle(self) -> float:
+        """Roofline ceiling at this kernel's arithmetic intensity."""
+        intensity = self.arithmetic_intensity
+        if intensity is None:
+            return self.peaks.mxu_macs_per_cycle
+        return min(self.peaks.mxu_macs_per_cycle, intensity * self.peaks.dma_bytes_per_cycle)
+
+    @property
+    def sol_fraction(self) -> float:
+        """Speed-of-light cycles over measured cycles (1.0 is at the roof)."""
+        if self.cycles == 0:
+            return 0.0
+        return min(self.sol_cycles / self.cycles, 1.0)
+
+
+def roofline_point(sim: Simulation, name: str) -> RooflinePoint:
+    """Place a finished simulation run on its hardware configuration's roofline."""
+    if sim.hardware_config is None:
+        raise ValueError("Attempted to build a roofline point without a hardware config.")
+    stats = sim.get_stats()
+    return RooflinePoint(
+        name=name,
+        cycles=stats.cycles,
+        mxu_macs=stats.mxu_macs,
+        vpu_element_ops=stats.vpu_element_ops,
+        dma_bytes=stats.dma_bytes,
+        peaks=roofline_peaks(sim.hardware_config),
+    )
+
+
+def print_roofline(points: list[RooflinePoint], peaks: RooflinePeaks) -> None:
+    """Print a roofline table, one row per kernel."""
+    print(
+        f"Roofs: MXU {peaks.mxu_macs_per_cycle:.1f} MAC/cycle, "
+        f"VPU {peaks.vpu_element_ops_per_cycle:.1f} elem/cycle, "
+        f"DMA {peaks.dma_bytes_per_cycle:.1f} B/cycle  (ridge {peaks.ridge_point:.1f} MAC/B)"
+    )
+    print(
+        f"  {'Kernel':<32} {'Cycles':>9} {'MACs':>11} {'VPU ops':>10} {'DMA B':>10} "
+        f"{'MAC/B':>7} {'MAC/cyc':>8} {'Roof':>8} {'SoL cyc':>9} {'Bound':>5} {'SoL %':>6}"
+    )
+    print(
+        f"  {'-'*32} {'-'*9} {'-'*11} {'-'*10} {'-'*10} "
+        f"{'-'*7} {'-'*8} {'-'*8} {'-'*9} {'-'*5} {'-'*6}"
+    )
+    for point in points:
+        intensity = point.arithmetic_intensity
+        intensity_text = "-" if intensity is None else f"{intensity:.2f}"
+        print(
+            f"  {point.name:<32} {point.cycles:>9} {point.mxu_macs:>11} "
+            f"{point.vpu_element_ops:>10} {point.dma_bytes:>10} {intensity_text:>7} "
+            f"{point.achieved_macs_per_cycle:>8.1f} {point.attainable_macs_per_cycle:>8.1f} "
+            f"{point.sol_cycles:>9.0f} {point.bound:>5} {point.sol_fraction:>6.1%}"
+        )
+    print()
@@ -0,0 +1,851 @@
+"""
+Instruction scheduling for kernel programs.
+
+Kernels are written with explicit `delay`s so that no instruction dispatches
+to a busy unit or touches a bank an in-flight instruction still holds.
+schedule_program(program, hardware_config) derives those delays instead: it
+reorders every basic block so VPU, MXU, LSU and DMA work overlaps, then
+inserts the minimal delays the new order needs.  The result is a new
+InstantiableProgram carrying the original memory regions and golden result;
+verify_schedule runs the original and the scheduled program and checks the
+scheduled one against the golden result.
+
+Dependencies inside a basic block (edges point forward in program order):
+  - mrf / vmem : instructions sharing an MRF register or VMEM bank (the bank
+                 model of hardware/bank_conflict.py) keep their order, and the
+                 later one dispatches once the earlier one has completed
+  - x / e regs : read-after-write, write-after-read and write-after-write on
+                 scalar and exponent registers, again until completion
+  - mxu        : operations on one MXU keep their order (its weight and
+                 accumulator buffers are internal state)
+  - dma        : transfers keep their order; dma.wait.chN follows the
+                 transfers of channel N, and later instructions touching their
+                 banks or registers depend on the wait instead of the transfer
+
+VMEM bank sets and transfer sizes depend on register values, so the scalar
+register file is constant-propagated through the program.  Accesses with
+unknown addresses are ordered against every other VMEM access; transfers of
+unknown size are not moved.
+
+Blocks are list-scheduled by critical path assuming single-issue dispatch and
+execution units that hold one instruction until it completes (the default
+configuration); with a pipelined VPU the schedule is still valid, just
+conservative.  Latencies come from the EXU latency tables, transfers are timed
+with dma_transfer_cycles.  dma.config, CSR accesses, fence, ecall / ebreak
+and waits on transfers issued in an earlier block are not moved.  Branches
+and jumps keep their two delay slots and have their offsets relocated.
+Programs using jalr, auipc or a linking jal depend on absolute instruction
+addresses and are rejected.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import io
+import os
+from dataclasses import dataclass, field
+from typing import Hashable
+
+import torch
+
+from .configs.isa_definition import DELAY
+from .hardware.bank_conflict import VMEM_BANK_BYTES, mrf_accesses, vmem_accesses
+from .hardware.config import ArchStateConfig, HardwareConfig
+from .hardware.dma import dma_transfer_cycles
+from .hardware.lsu import LSU_OP_LATENCIES
+from .hardware.mxu import MXU_OP_LATENCIES
+from .hardware.vpu import VPU_OP_LATENCIES
+from .isa import CSRType, Instruction, SBType, is_control_flow
+from .isa_patterns import (
+    ExponentOffsetLoad,
+    ScalarBaseOffsetStore,
+    ScalarComputeImm,
+    ScalarComputeReg,
+    ScalarComputeShamt,
+    ScalarImm,
+    ScalarOffsetLoad,
+    TensorBaseOffset,
+)
+from .isa_types import EXU, Bundled, ExponentReg, ScalarReg
+from .logging import LoggerConfig
+from .simulation import Simulation
+from .software.program import InstantiableProgram, Program
+
+# Units that keep an instruction in the IDU output until it completes, so the
+# next instruction for the unit cannot dispatch earlier.
+NON_PIPELINED_UNITS: frozenset[EXU] = frozenset(
+    {EXU.VECTOR, EXU.MATRIX_SYSTOLIC, EXU.MATRIX_INNER, EXU.LSU}
+)
+
+# Instructions that follow a branch or jump and execute before the redirect.
+CONTROL_FLOW_DELAY_SLOTS = 2
+
+# In-flight DMA instructions the DMA unit accepts before backpressuring.
+DMA_QUEUE_DEPTH = 8
+
+_MAX_DELAY = 2047
+_MATRIX_UNITS = (EXU.MATRIX_SYSTOLIC, EXU.MATRIX_INNER)
+_SCALAR_MEMORY_OPS = (ScalarOffsetLoad, ExponentOffsetLoad, ScalarBaseOffsetStore)
+_SCALAR_ALU_OPS = (ScalarComputeImm, ScalarComputeShamt, ScalarComputeReg, ScalarImm)
+_VMEM_ANY = ("vmem", "*")
+
+Key = Hashable
+
+
+def instruction_latency(insn: Instruction) -> int:
+    """Cycles from dispatch until an instruction completes and releases its banks."""
+    if insn.exu == EXU.VECTOR:
+        return VPU_OP_LATENCIES[insn.mnemonic]
+    if insn.exu in _MATRIX_UNITS:
+        return MXU_OP_LATENCIES.get(insn.mnemonic, 32)
+    if insn.exu == EXU.LSU:
+        return LSU_OP_LATENCIES[insn.mnemonic]
+    return 1
+
+
+def _is_nop(insn: Instruction) -> bool:
+    return (
+        insn.mnemonic == "addi"
+        and getattr(insn, "rd", None) == 0
+        and getattr(insn, "rs1", None) == 0
+        and getattr(insn, "imm", None) == 0
+    )
+
+
+def is_dma_transfer(insn: Instruction) -> bool:
+    return insn.mnemonic.startswith(("dma.load.ch", "dma.store.ch"))
+
+
+def is_dma_wait(insn: Instruction) -> bool:
+    return insn.mnemonic.startswith("dma.wait.ch")
+
+
+def _is_pinned(insn: Instruction) -> bool:
+    """Instructions that are never moved relative to their neighbours."""
+    return (
+        isinstance(insn, CSRType)
+        or insn.mnemonic.startswith("dma.config.ch")
+        or insn.mnemonic in ("fence", "ecall", "ebreak")
+    )
+
+
+def _sign_extend(value: int, bits: int) -> int:
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+
+def _branch_offset(insn: Instruction) -> int:
+    """Byte offset of a branch / jump target, decoded as its exec() does."""
+    return _sign_extend(int(insn.imm), 13 if isinstance(insn, SBType) else 20)
+
+
+def register_accesses(insn: Instruction) -> tuple[frozenset[Key], frozenset[Key]]:
+    """(reads, writes) of scalar ("x", n) and exponent ("e", n) registers."""
+    reads: set[Key] = set()
+    writes: set[Key] = set()
+    for param in getattr(type(insn), "params", []):
+        for named in (param.reg, param.imm) if isinstance(param, Bundled) else (param,):
+            if named.inner is ScalarReg:
+                reg = ("x", int(getattr(insn, named.repr)))
+                if reg[1] == 0:
+                    continue
+            elif named.inner is ExponentReg:
+                reg = ("e", int(getattr(insn, named.repr)))
+            else:
+                continue
+            # DMA transfers read their VMEM address from rd
+            if named.repr == "rd" and insn.exu != EXU.DMA:
+                writes.add(reg)
+            else:
+                reads.add(reg)
+    return frozenset(reads), frozenset(writes)
+
+
+# ---------------------------------------------------------------------------
+# Basic blocks
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Block:
+    start: int
+    end: int
+    """ Exclusive end index in the original program. """
+    branch: int | None = None
+    """ Index of the branch / jump ending the block, if any. """
+    target: int | None = None
+    """ Original index the branch / jump goes to. """
+    successors: list[int] = field(default_factory=list)
+    predecessors: list[int] = field(default_factory=list)
+
+
+def _branch_target(instructions: list[Instruction], index: int) -> int:
+    offset = _branch_offset(instructions[index])
+    if offset % 4:
+        raise ValueError(f"Branch at instruction {index} has a misaligned offset {offset}")
+    target = index + offset // 4
+    if not 0 <= target <= len(instructions):
+        raise ValueError(f"Branch at instruction {index} leaves the program (offset {offset})")
+    return target
+
+
+def _basic_blocks(instructions: list[Instruction]) -> list[_Block]:
+    n = len(instructions)
+    leaders = {0}
+    slots: set[int] = set()
+    for index, insn in enumerate(instructions):
+        if (
+            insn.mnemonic in ("jalr", "auipc")
+            or insn.mnemonic == "jal" and int(getattr(insn, "rd", 0)) != 0
+        ):
+            raise ValueError(
+                f"Cannot schedule '{insn.mnemonic}' at instruction {index}: "
+                "it depends on absolute instruction addresses"
+            )
+        if is_control_flow(insn):
+            if index + CONTROL_FLOW_DELAY_SLOTS >= n:
+                raise ValueError(f"Branch at instruction {index} is missing its delay slots")
+            leaders.add(_branch_target(instructions, index))
+            leaders.add(index + 1 + CONTROL_FLOW_DELAY_SLOTS)
+            slots.update(range(index + 1, index + 1 + CONTROL_FLOW_DELAY_SLOTS))
+    if leaders & slots:
+        raise ValueError(f"Branch target {min(leaders & slots)} lies in a delay slot")
+
+    starts = sorted(leader for leader in leaders if leader < n)
+    blocks = [_Block(start, end) for start, end in zip(starts, starts[1:] + [n])]
+    block_at = {block.start: b for b, block in enumerate(blocks)}
+    for b, block in enumerate(blocks):
+        for index in range(block.start, block.end):
+            if is_control_flow(instructions[index]):
+                block.branch = index
+                block.target = _branch_target(instructions, index)
+        if block.target is not None and block.target < n:
+            block.successors.append(block_at[block.target])
+        jumps = block.branch is not None and instructions[block.branch].mnemonic == "jal"
+        if not jumps and b + 1 < len(blocks):
+            block.successors.append(b + 1)
+    for b, block in enumerate(blocks):
+        for succ in set(block.successors):
+            blocks[succ].predecessors.append(b)
+    return blocks
+
+
+# ---------------------------------------------------------------------------
+# Scalar constant propagation (for VMEM bank sets and transfer sizes)
+# ---------------------------------------------------------------------------
+
+
+class ScalarShadow:
+    """Stand-in ArchState that evaluates scalar arithmetic on known registers."""
+
+    def __init__(self, cfg: ArchStateConfig, values: dict[int, int]) -> None:
+        self.cfg = cfg
+        self.xrf = [0] * cfg.num_x_registers
+        for reg, value in values.items():
+            self.xrf[reg] = value
+        self.known = set(values) | {0}
+
+    def read_xrf(self, rs: int) -> int:
+        return self.xrf[rs]
+
+    def write_xrf(self, rd: int, value: int) -> None:
+        if rd != 0:
+            self.xrf[rd] = value
+
+    def values(self) -> dict[int, int]:
+        return {reg: self.xrf[reg] for reg in self.known}
+
+    def vmem_banks(self, insn: Instruction) -> frozenset[int] | None:
+        """VMEM banks touched by *insn*, or None if its address is not known."""
+        if isinstance(insn, _SCALAR_MEMORY_OPS):
+            if insn.rs1 not in self.known:
+                return None
+            addr = self.xrf[insn.rs1] + _sign_extend(int(insn.imm), 12)
+            return frozenset({addr // VMEM_BANK_BYTES, (addr + 3) // VMEM_BANK_BYTES})
+        if isinstance(insn, TensorBaseOffset):
+            address_regs = (insn.rs1,)
+        elif is_dma_transfer(insn):
+            vmem_reg = insn.rd if insn.mnemonic.startswith("dma.load") else insn.rs1
+            address_regs = (vmem_reg, insn.rs2)
+        else:
+            return frozenset()
+        if any(reg not in self.known for reg in address_regs):
+            return None
+        return vmem_accesses(insn, self)  # type: ignore[arg-type]
+
+    def step(self, insn: Instruction, reads: frozenset[Key], writes: frozenset[Key]) -> None:
+        written = {reg for kind, reg in writes if kind == "x"}
+        evaluable = (
+            insn.exu == EXU.SCALAR
+            and isinstance(insn, _SCALAR_ALU_OPS)
+            and not isinstance(insn, CSRType)
+            and not is_control_flow(insn)
+            and all(reg in self.known for kind, reg in reads if kind == "x")
+        )
+        if evaluable:
+            insn.exec(self)  # type: ignore[arg-type]
+            self.known |= written
+        else:
+            self.known -= written
+
+
+def _propagate_constants(
+    instructions: list[Instruction],
+    blocks: list[_Block],
+    accesses: list[tuple[frozenset[Key], frozenset[Key]]],
+    cfg: ArchStateConfig,
+) -> tuple[list[frozenset[int] | None], list[int | None]]:
+    """Per-instruction VMEM bank set and DMA transfer size (None: unknown)."""
+    entry: list[dict[int, int] | None] = [None] * len(blocks)
+    entry[0] = {}
+    worklist = [0]
+    while worklist:
+        b = worklist.pop()
+        shadow = ScalarShadow(cfg, entry[b] or {})
+        for index in range(blocks[b].start, blocks[b].end):
+            shadow.step(instructions[index], *accesses[index])
+        out = shadow.values()
+        for succ in blocks[b].successors:
+            old = entry[succ]
+            new = out if old is None else {r: v for r, v in old.items() if out.get(r) == v}
+            if new != old:
+                entry[succ] = new
+                worklist.append(succ)
+
+    footprints: list[frozenset[int] | None] = [frozenset()] * len(instructions)
+    sizes: list[int | None] = [None] * len(instructions)
+    for b, block in enumerate(blocks):
+        shadow = ScalarShadow(cfg, entry[b] or {})
+        for index in range(block.start, block.end):
+            insn = instructions[index]
+            reads, writes = accesses[index]
+            footprints[index] = shadow.vmem_banks(insn)
+            if is_dma_transfer(insn) and insn.rs2 in shadow.known:
+                sizes[index] = shadow.xrf[insn.rs2]
+            shadow.step(insn, reads, writes)
+    return footprints, sizes
+
+
+# ---------------------------------------------------------------------------
+# Dependency graph
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Node:
+    insn: Instruction
+    latency: int
+    """ Dispatch-to-completion cycles; for transfers, until the data has moved. """
+    banks: frozenset[Key]
+    """ Exclusive resources: ("mrf", n), ("vmem", bank), ("mxu", unit). """
+    vmem_unknown: bool
+    reads: frozenset[Key]
+    writes: frozenset[Key]
+    transfer_cycles: int | None = None
+    """ Modeled time of a DMA transfer once it reaches the head of the queue. """
+    pinned: bool = False
+    preds: dict[int, int] = field(default_factory=dict)
+    """ Predecessor node -> minimum dispatch distance. """
+    succs: list[int] = field(default_factory=list)
+    priority: int = 0
+
+    @property
+    def touches_vmem(self) -> bool:
+        return self.vmem_unknown or any(key[0] == "vmem" for key in self.banks)
+
+    @property
+    def is_wait(self) -> bool:
+        return is_dma_wait(self.insn)
+
+    @property
+    def is_transfer(self) -> bool:
+        return is_dma_transfer(self.insn)
+
+    @property
+    def channel(self) -> int:
+        return int(getattr(self.insn, "funct3", 0))
+
+
+def _make_node(
+    insn: Instruction,
+    access: tuple[frozenset[Key], frozenset[Key]],
+    vmem: frozenset[int] | None,
+    nbytes: int | None,
+    config: HardwareConfig,
+) -> _Node:
+    banks: set[Key] = {("mrf", int(reg)) for reg in mrf_accesses(insn)}
+    banks |= {("vmem", bank) for bank in vmem or ()}
+    if insn.exu in _MATRIX_UNITS:
+        banks.add(("mxu", insn.exu))
+    node = _Node(
+        insn=insn,
+        latency=instruction_latency(insn),
+        banks=frozenset(banks),
+        vmem_unknown=vmem is None,
+        reads=access[0],
+        writes=access[1],
+        pinned=_is_pinned(insn),
+    )
+    if is_dma_transfer(insn):
+        if nbytes is None:
+            # a transfer that cannot be timed stays where it was written
+            node.pinned = True
+        else:
+            node.transfer_cycles = dma_transfer_cycles(config, nbytes)
+            node.latency = node.transfer_cycles + 1
+    return node
+
+
+def _build_graph(nodes: list[_Node]) -> None:
+    last_access: dict[Key, int] = {}
+    last_unknown_vmem: int | None = None
+    last_write: dict[Key, int] = {}
+    readers: dict[Key, list[int]] = {}
+    pending: dict[int, list[int]] = {}  # channel -> transfers not yet waited on
+    last_transfer: int | None = None
+    last_wait: dict[int, int] = {}
+
+    for i, node in enumerate(nodes):
+        preds = node.preds
+
+        def depend(j: int | None, distance: int | None = None) -> None:
+            if j is None:
+                return
+            distance = nodes[j].latency if distance is None else distance
+            preds[j] = max(preds.get(j, 0), distance)
+
+        for key in node.banks:
+            depend(last_access.get(key))
+        if node.vmem_unknown:
+            for key, j in last_access.items():
+                if key[0] == "vmem":
+                    depend(j)
+        if node.touches_vmem:
+            depend(last_unknown_vmem)
+        for key in node.reads:
+            depend(last_write.get(key))
+        for key in node.writes:
+            depend(last_write.get(key))
+            for j in readers.get(key, []):
+                depend(j)
+
+        if node.is_transfer:
+            depend(last_transfer, 1)
+            depend(last_wait.get(node.channel), 1)
+            last_transfer = i
+            pending.setdefault(node.channel, []).append(i)
+        elif node.is_wait:
+            transfers = pending.pop(node.channel, [])
+            if not transfers:
+                # waits on a transfer issued before this block
+                node.pinned = True
+            for j in transfers:
+                depend(j, 1)
+            # later users of the transferred banks and registers follow the wait
+            owned = set(transfers)
+            for key, j in last_access.items():
+                if j in owned:
+                    last_access[key] = i
+            if last_unknown_vmem in owned:
+                last_unknown_vmem = i
+            for key, js in readers.items():
+                readers[key] = [i if j in owned else j for j in js]
+            last_wait[node.channel] = i
+
+        for key in node.banks:
+            last_access[key] = i
+        if node.vmem_unknown:
+            last_unknown_vmem = i
+        for key in node.reads:
+            readers.setdefault(key, []).append(i)
+        for key in node.writes:
+            last_write[key] = i
+            readers[key] = []
+
+    for i, node in enumerate(nodes):
+        for j in node.preds:
+            nodes[j].succs.append(i)
+
+    # longest path to the end of the block; a transfer holds back its wait by
+    # the transfer time rather than by the 1-cycle dispatch distance
+    for i in range(len(nodes) - 1, -1, -1):
+        node = nodes[i]
+        node.priority = node.latency
+        for s in node.succs:
+            distance = node.latency if node.is_transfer and nodes[s].is_wait else nodes[s].preds[i]
+            node.priority = max(node.priority, distance + nodes[s].priority)
+
+
+# ---------------------------------------------------------------------------
+# List scheduling
+# ---------------------------------------------------------------------------
+
+
+def _delays(gap: int) -> list[Instruction]:
+    """Delays that hold back the next dispatch by *gap* cycles."""
+    delays: list[Instruction] = []
+    while gap > 0:
+        imm = min(gap - 1, _MAX_DELAY)
+        delays.append(DELAY(imm=imm))
+        gap -= imm + 1
+    return delays
+
+
+class _BlockScheduler:
+    """
+    Schedules one basic block.  Cycles count from the block's first dispatch
+    slot; `entry` holds how far into the block each resource may still be
+    busy with work from a predecessor block.
+
+    A dma.wait dispatches whenever its transfers are done, so it is timed
+    with a lower bound on their completion: everything after it can only
+    move later together, which keeps every constraint satisfied.  All other
+    timing is an upper bound.
+    """
+
+    def __init__(self, nodes: list[_Node], tail: int, entry: dict[Key, int]) -> None:
+        self.nodes = nodes
+        self.tail = tail
+        """ Index of the first node of the branch group (len(nodes) if none). """
+        self.entry = entry
+        self.dispatch: dict[int, int] = {}
+        self.dma_done: dict[int, int] = {}
+        self.dma_done_min: dict[int, int] = {}
+        self.dma_free = entry.get(("unit", EXU.DMA), 0)
+        self.dma_free_min = 0
+        self.dma_accepts: list[int] = []
+        self.channel_free: dict[int, int] = {
+            key[1]: cycles for key, cycles in entry.items() if key[0] == "channel"
+        }
+        self.unit_free: dict[EXU, int] = {
+            unit: entry.get(("unit", unit), 0) for unit in NON_PIPELINED_UNITS
+        }
+        self.cycle = 0
+        self.out: list[Instruction] = []
+        self.branch_position: int | None = None
+
+    def entry_ready(self, node: _Node) -> int:
+        entry = self.entry
+        ready = 0
+        for key in node.banks:
+            ready = max(ready, entry.get(key, 0))
+        if node.touches_vmem:
+            ready = max(ready, entry.get(_VMEM_ANY, 0))
+        if node.vmem_unknown:
+            ready = max([ready] + [t for key, t in entry.items() if key[0] == "vmem"])
+        for key in node.reads:
+            ready = max(ready, entry.get(("w",) + key, 0))
+        for key in node.writes:
+            ready = max(ready, entry.get(("w",) + key, 0), entry.get(("r",) + key, 0))
+        return ready
+
+    def earliest(self, i: int) -> int:
+        node = self.nodes[i]
+        ready = self.cycle
+        for j, distance in node.preds.items():
+            ready = max(ready, self.dispatch[j] + distance)
+            if j in self.dma_done and node.insn.exu != EXU.DMA:
+                # a queued transfer reads its registers and banks when it
+                # reaches the head of the queue, not when it dispatches
+                ready = max(ready, self.dma_done[j] + 1)
+        if node.is_wait:
+            # the flag clears the cycle after the last transfer completes
+            for j in node.preds:
+                ready = max(ready, self.dma_done_min.get(j, 0) + 1)
+            return ready
+        ready = max(ready, self.entry_ready(node))
+        if node.insn.exu == EXU.DMA:
+            ready = max(ready, self.channel_free.get(node.channel, 0))
+            if len(self.dma_accepts) >= DMA_QUEUE_DEPTH:
+                ready = max(ready, self.dma_accepts[-DMA_QUEUE_DEPTH] + 1)
+        if node.insn.exu in NON_PIPELINED_UNITS:
+            ready = max(ready, self.unit_free[node.insn.exu])
+        return ready
+
+    def place(self, i: int, cycle: int) -> None:
+        node = self.nodes[i]
+        # a dma.wait holds back dispatch by itself; anything else needs delays
+        if not node.is_wait:
+            self.out.extend(_delays(cycle - self.cycle))
+        if i >= self.tail and self.branch_position is None:
+            self.branch_position = len(self.out)
+        self.dispatch[i] = cycle
+        self.out.append(node.insn)
+        self.cycle = cycle + 1
+        if node.insn.exu in NON_PIPELINED_UNITS:
+            self.unit_free[node.insn.exu] = cycle + node.latency
+        if node.insn.exu == EXU.DMA and not node.is_wait:
+            transfer = node.transfer_cycles or 1
+            self.dma_free = max(cycle, self.dma_free) + transfer
+            self.dma_free_min = max(cycle, self.dma_free_min) + transfer
+            self.dma_done[i] = self.dma_free
+            self.dma_done_min[i] = self.dma_free_min
+            self.dma_accepts.append(self.dma_free)
+            self.channel_free[node.channel] = self.dma_free + 1
+
+    def pick(self, candidates: list[int]) -> tuple[int, int]:
+        nodes = self.nodes
+        earliest = {i: self.earliest(i) for i in candidates}
+        best = max(candidates, key=lambda i: (nodes[i].priority, -i))
+        ready = sorted(
+            (i for i in candidates if earliest[i] <= self.cycle),
+            key=lambda i: (-nodes[i].priority, i),
+        )
+        for i in ready:
+            unit = nodes[i].insn.exu
+            # don't occupy a unit the most critical instruction is about to need
+            if (
+                i != best
+                and unit == nodes[best].insn.exu
+                and unit in NON_PIPELINED_UNITS
+                and self.cycle + nodes[i].latency > earliest[best]
+            ):
+                continue
+            return i, earliest[i]
+        i = min(candidates, key=lambda i: (earliest[i], -nodes[i].priority, i))
+        return i, earliest[i]
+
+    def schedule_region(self, region: list[int]) -> None:
+        remaining = set(region)
+        while remaining:
+            candidates = [
+                i for i in remaining if all(j in self.dispatch for j in self.nodes[i].preds)
+            ]
+            i, cycle = self.pick(candidates)
+            self.place(i, cycle)
+            remaining.discard(i)
+
+    def schedule_tail(self) -> None:
+        """Place the branch and its delay slots back to back, as written."""
+        group = range(self.tail, len(self.nodes))
+        offsets: dict[int, int] = {}
+        offset = 0
+        start = self.cycle
+        for i in group:
+            node = self.nodes[i]
+            if isinstance(node.insn, DELAY):
+                offset += int(node.insn.imm)
+            offsets[i] = offset
+            offset += 1
+            ready = self.entry_ready(node)
+            for j, distance in node.preds.items():
+                if j < self.tail:
+                    ready = max(ready, self.dispatch[j] + distance)
+            if node.insn.exu in NON_PIPELINED_UNITS:
+                ready = max(ready, self.unit_free[node.insn.exu])
+            start = max(start, ready - offsets[i])
+        self.out.extend(_delays(start - self.cycle))
+        self.cycle = start
+        for i in group:
+            cycle = start + offsets[i]
+            if isinstance(self.nodes[i].insn, DELAY):
+                self.cycle = cycle
+            if self.earliest(i) > cycle and not self.nodes[i].is_wait:
+                raise ValueError(
+                    f"'{self.nodes[i].insn.mnemonic}' in a branch delay slot cannot meet "
+                    "its dependencies in place"
+                )
+            self.place(i, cycle)
+
+    def run(self) -> None:
+        region: list[int] = []
+        for i in range(self.tail):
+            if self.nodes[i].pinned:
+                self.schedule_region(region)
+                region = []
+                self.place(i, self.earliest(i))
+            else:
+                region.append(i)
+        self.schedule_region(region)
+        self.schedule_tail()
+
+    def exit_state(self) -> dict[Key, int]:
+        """Cycles after the block's last dispatch slot until each resource is free."""
+        ready = dict(self.entry)
+
+        def at_least(key: Key, cycle: int) -> None:
+            if cycle > ready.get(key, 0):
+                ready[key] = cycle
+
+        for i, cycle in self.dispatch.items():
+            node = self.nodes[i]
+            done = self.dma_done.get(i, cycle + node.latency)
+            for key in node.banks:
+                at_least(key, done)
+            if node.vmem_unknown:
+                at_least(_VMEM_ANY, done)
+            for key in node.reads:
+                at_least(("r",) + key, done)
+            for key in node.writes:
+                at_least(("w",) + key, done)
+        for unit, cycle in self.unit_free.items():
+            at_least(("unit", unit), cycle)
+        at_least(("unit", EXU.DMA), self.dma_free)
+        for channel, cycle in self.channel_free.items():
+            at_least(("channel", channel), cycle)
+        end = self.cycle
+        return {key: cycle - end for key, cycle in ready.items() if cycle > end}
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def schedule_instructions(
+    instructions: list[Instruction], hardware_config: HardwareConfig
+) -> list[Instruction]:
+    """
+    Reorder *instructions* block by block and insert the delays the new order
+    needs.  Existing delays and nops outside branch delay slots are dropped.
+
+    Raises:
+        ValueError: if the program cannot be scheduled (multi-issue dispatch,
+            absolute-address instructions or malformed control flow).
+    """
+    if hardware_config.fetch_width != 1:
+        raise ValueError(
+            f"Scheduling assumes single-issue dispatch, "
+            f"{hardware_config.name} has fetch_width {hardware_config.fetch_width}"
+        )
+    if not instructions:
+        return []
+    blocks = _basic_blocks(instructions)
+    accesses = [register_accesses(insn) for insn in instructions]
+    footprints, sizes = _propagate_constants(
+        instructions, blocks, accesses, hardware_config.arch_state_config
+    )
+
+    graphs: list[tuple[list[_Node], int]] = []
+    for block in blocks:
+        tail = block.end if block.branch is None else block.branch
+        body = [
+            index
+            for index in range(block.start, tail)
+            if not (isinstance(instructions[index], DELAY) or _is_nop(instructions[index]))
+        ]
+        nodes = [
+            _make_node(instructions[index], accesses[index], footprints[index], sizes[index], hardware_config)
+            for index in body + list(range(tail, block.end))
+        ]
+        _build_graph(nodes)
+        graphs.append((nodes, len(body)))
+
+    # resources still busy when control enters a block; entries only grow,
+    # but a loop that keeps queueing DMA work would grow them forever
+    entries: list[dict[Key, int]] = [{} for _ in blocks]
+    schedules: list[_BlockScheduler] = []
+    for b, (nodes, tail) in enumerate(graphs):
+        schedules.append(_BlockScheduler(nodes, tail, {}))
+        schedules[b].run()
+    for _ in range(8 * len(blocks) + 8):
+        changed = False
+        for b, block in enumerate(blocks):
+            entry = dict(entries[b])
+            for p in block.predecessors:
+                for key, cycles in schedules[p].exit_state().items():
+                    entry[key] = max(entry.get(key, 0), cycles)
+            if entry == entries[b]:
+                continue
+            entries[b] = entry
+            nodes, tail = graphs[b]
+            schedules[b] = _BlockScheduler(nodes, tail, entry)
+            schedules[b].run()
+            changed = True
+        if not changed:
+            break
+    else:
+        raise ValueError("Block entry timing did not converge (unbounded DMA queueing in a loop?)")
+
+    starts: list[int] = []
+    total = 0
+    for scheduler in schedules:
+        starts.append(total)
+        total += len(scheduler.out)
+    block_at = {block.start: b for b, block in enumerate(blocks)}
+
+    scheduled: list[Instruction] = []
+    for b, block in enumerate(blocks):
+        out = list(schedules[b].out)
+        position = schedules[b].branch_position
+        if block.target is not None and position is not None:
+            target = total if block.target == len(instructions) else starts[block_at[block.target]]
+            branch = copy.copy(out[position])
+            branch.imm = type(branch.imm)((target - (starts[b] + position)) * 4)
+            out[position] = branch
+        scheduled.extend(out)
+    return scheduled
+
+
+def schedule_program(program: Program, hardware_config: HardwareConfig) -> InstantiableProgram:
+    """Return a scheduled copy of *program* with its memory regions and golden result."""
+    scheduled = InstantiableProgram(schedule_instructions(list(program.instructions), hardware_config))
+    scheduled.memory_regions = list(program.memory_regions)
+    for attr in ("golden_result", "kernel_tolerance", "kernel_max_cycles"):
+        if hasattr(program, attr):
+            setattr(scheduled, attr, getattr(program, attr))
+    return scheduled
+
+
+@dataclass
+class ScheduleVerification:
+    original_cycles: int
+    scheduled_cycles: int
+    golden_match: bool | None
+    """ Whether the scheduled program reproduces the golden result (None: no golden). """
+    max_abs_error: float | None
+
+    @property
+    def cycles_saved(self) -> int:
+        return self.original_cycles - self.scheduled_cycles
+
+    @property
+    def speedup(self) -> float:
+        return self.original_cycles / self.scheduled_cycles if self.scheduled_cycles else 0.0
+
+
+def run_program(program: Program, hardware_config: HardwareConfig, max_cycles: int) -> Simulation:
+    """Simulate *program* quietly; the caller closes the returned simulation."""
+    sim = Simulation(
+        hardware_config=hardware_config,
+        logger_config=LoggerConfig(filename=os.devnull),
+        program=program,
+        verbose=False,
+    )
+    # the DMA unit prints every flag it clears
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.run(max_cycles=max_cycles)
+    return sim
+
+
+def verify_schedule(
+    original: Program,
+    scheduled: Program,
+    hardware_config: HardwareConfig,
+    max_cycles: int = 1_000_000,
+) -> ScheduleVerification:
+    """Simulate both programs and check the scheduled one against the golden result."""
+    sim = run_program(original, hardware_config, max_cycles)
+    original_cycles = sim.cycle_count
+    sim.close()
+
+    sim = run_program(scheduled, hardware_config, max_cycles)
+    golden_match: bool | None = None
+    max_abs_error: float | None = None
+    golden = getattr(original, "golden_result", None)
+    if golden is not None:
+        base, expected = golden
+        size = expected.numel() * expected.element_size()
+        actual = sim.core.arch_state.read_dram(base, size).view(expected.dtype).reshape(expected.shape)
+        rtol, atol = getattr(original, "kernel_tolerance", (1e-2, 1e-2))
+        golden_match = torch.allclose(actual.float(), expected.float(), rtol=rtol, atol=atol)
+        max_abs_error = (actual.float() - expected.float()).abs().max().item()
+    result = ScheduleVerification(
+        original_cycles=original_cycles,
+        scheduled_cycles=sim.cycle_count,
+        golden_match=golden_match,
+        max_abs_error=max_abs_error,
+    )
+    sim.close()
+    return result
@@ -1,8 +1,13 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import sys
+from typing import Sequence
 from npu_model.hardware.config import HardwareConfig
 from npu_model.logging import LoggerConfig, Logger
 from npu_model.hardware import Core
+from npu_model.hardware.cycle_accounting import CpiStack
+from npu_model.host_profiler import HostProfiler
+from npu_model.metrics import MetricsRecorder, MetricsSink
+from npu_model.timeline import Timeline
 from npu_model.software import Program
 
 @dataclass
@@ -10,6 +15,18 @@ class ExecutionUnitStatistics:
     instructions: int
     busy_cycles: int
     utilization: float
+    throughput: float = 0.0
+    """ Sustained throughput: instructions started per busy cycle. """
+
+@dataclass
+class InstructionMemoryStatistics:
+    model: str
+    accesses: int
+    misses: int
+    hit_rate: float
+    refill_bytes: int
+    fetch_stall_cycles: int
+    """ Cycles in which the IFU waited on an instruction memory refill. """
 
 @dataclass
 class SimulationStatistics:
@@ -18,6 +35,25 @@ class SimulationStatistics:
     ipc: float
     runtime_errors: int
     exu_stats: dict[str, ExecutionUnitStatistics]
+    issue_width: int = 1
+    issue_slot_utilization: float = 0.0
+    """ Fraction of dispatch slots (cycles * issue_width) that carried a uop. """
+    issue_slot_histogram: list[int] = field(default_factory=list)
+    """ issue_slot_histogram[n] is the number of cycles in which n uops were dispatched. """
+    imem_stats: "InstructionMemoryStatistics | None" = None
+    """ Instruction memory statistics; None when fetch is modeled as ideal. """
+    cpi_stack: "CpiStack | None" = None
+    """ Per-category cycle attribution (see hardware/cycle_accounting.py). """
+    mxu_macs: int = 0
+    """ Multiply-accumulates performed by all MXUs. """
+    vpu_element_ops: int = 0
+    """ BF16 element operations performed by all VPUs. """
+    dma_bytes: int = 0
+    """ Bytes moved between DRAM and VMEM by all DMA engines. """
+    bank_stall_cycles: dict[str, int] = field(default_factory=dict)
+    """ Cycles instructions waited on each busy bank, e.g. "mrf[4]" ("stall" policy only). """
+    structural_stall_cycles: dict[str, int] = field(default_factory=dict)
+    """ Cycles dispatch waited on each busy execution unit ("stall" policy only). """
 
 
 class Simulation:
@@ -29,6 +65,10 @@ class Simulation:
         verbose: bool = True,
         ignore_runtime_errors: bool = False,
         record_timeline: bool = False,
+        record_graph: bool = False,
+        profile_host: bool = False,
+        metrics_sinks: Sequence[MetricsSink] = (),
+        metrics_interval: int = 10000,
     ):
         """
         Create a simple NPU hardware configuration.
@@ -47,7 +87,8 @@ class Simulation:
         self.verbose = verbose
         self.ignore_runtime_errors = ignore_runtime_errors
         self.record_timeline = record_timeline
-        self.timeline: list[dict[str, bool]] | None = None
+        self.record_graph = record_graph
+        self.timeline: Timeline | None = None
         self.runtime_errors: list[tuple[int, str, str]] = []
 
         # Create logger for trace output
@@ -68,12 +109,23 @@ class Simulation:
         self.core.ignore_runtime_errors = ignore_runtime_errors
         self.core.runtime_error_reporter = self._report_runtime_error
 
+        # Periodic metrics snapshots (see npu_model/metrics.py)
+        self.metrics: MetricsRecorder | None = None
+        if metrics_sinks:
+            self.metrics = MetricsRecorder(metrics_sinks, metrics_interval)
+
+        # Host wall-time instrumentation; nothing is wrapped when disabled
+        self.host_profiler: HostProfiler | None = None
+        if profile_host:
+            self.host_profiler = HostProfiler()
+            self.host_profiler.attach(self.core)
+
         self.core.load_program(self.program)
         if self.verbose:
             print(f"Program loaded with {len(self.program)} instructions")
 
             print("\nHardware configured:")
-            print("  - Fetch width: 1 instruction/cycle (in-order)")
+            print(f"  - Fetch width: {hardware_config.fetch_width} instruction/cycle (in-order)")
             print(f"  - Execution units: {[str(exu) for exu in self.core.exus]}")
             print(f"  - Trace output: {self.logger_config.filename}")
             print(f"  - Bypass runtime errors: {self.ignore_runtime_errors}")
@@ -92,23 +144,34 @@ class Simulation:
             raise ValueError("Attempted to run without a logger.")
 
         self.core.reset()
+        if self.record_graph:
+            self.core.idu.dispatch_log = []
+        if self.host_profiler is not None:
+            self.host_profiler.reset()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.reset()
 
         self.cycle_count = 0
 
+        timeline = None
         if self.record_timeline:
-            self.timeline = []
-            prev_busy = {exu.name: exu.busy_cycles for exu in self.core.exus}
+            timeline = Timeline(exu.name for exu in self.core.exus)
+            self.timeline = timeline
 
         while not self.core.is_finished() and self.cycle_count < max_cycles:
             self.core.tick()
             self.cycle_count += 1
 
-            if self.record_timeline:
-                cur_busy = {exu.name: exu.busy_cycles for exu in self.core.exus}
-                self.timeline.append(
-                    {name: cur_busy[name] > prev_busy[name] for name in prev_busy}
-                )
-                prev_busy = cur_busy
+            if timeline is not None:
+                timeline.record(self.core.exus)
+            if metrics is not None:
+                metrics.tick(self.cycle_count, self.core)
+
+        if timeline is not None:
+            timeline.finish()
+        if metrics is not None:
+            metrics.emit(self.cycle_count, self.core, finished=True)
 
         # Flush any pending completions in EXUs
         self.core.stop()
@@ -127,6 +190,17 @@ class Simulation:
             print(f"{'Instructions Completed':<30} {stats.total_instructions:>15}")
             print(f"{'IPC (Instr per Cycle)':<30} {stats.ipc:>15.3f}")
             print(f"{'Suppressed Runtime Errors':<30} {stats.runtime_errors:>15}")
+            print(f"{'Issue Slot Utilization':<30} {stats.issue_slot_utilization:>15.1%}")
+            if stats.imem_stats is not None:
+                print(f"{'I-Mem Hit Rate':<30} {stats.imem_stats.hit_rate:>15.1%}")
+                print(f"{'Fetch Stall Cycles (I-Mem)':<30} {stats.imem_stats.fetch_stall_cycles:>15}")
+
+            if stats.cpi_stack is not None:
+                print("\nCPI Stack")
+                print("-" * 45)
+                cpi = stats.cpi_stack.cpi()
+                for category, cycles in stats.cpi_stack.categories.items():
+                    print(f"  {category:<28} {cycles:>8} {cpi[category]:>6.3f}")
 
             print("\nExecution Unit Utilization")
             print("-" * 45)
@@ -135,6 +209,7 @@ class Simulation:
                 print(f"    Instructions: {exu_stats.instructions}")
                 print(f"    Busy Cycles:  {exu_stats.busy_cycles}")
                 print(f"    Utilization:  {exu_stats.utilization:.1%}")
+                print(f"    Throughput:   {exu_stats.throughput:.3f} instr/busy cycle")
 
             print("\nFinal register contents")
             print(f"XRF: {self.core.arch_state.xrf}")
@@ -146,6 +221,9 @@ class Simulation:
             print("Open with Perfetto (https://ui.perfetto.dev)")
 
     def close(self) -> None:
+        if self.metrics is not None:
+            self.metrics.close()
+            self.metrics = None
         if self.core is not None:
             self.core.close()
             self.core = None
@@ -169,9 +247,36 @@ class Simulation:
                 else 0.0
             ),
             runtime_errors=len(self.runtime_errors),
-            exu_stats={}
+            exu_stats={},
+            issue_width=self.core.idu.width,
+            issue_slot_utilization=self.core.idu.issue_slot_utilization,
+            issue_slot_histogram=list(self.core.idu.issue_slot_histogram),
+            cpi_stack=self.core.cycle_accounting.stack(
+                self.core.total_completed, self.core.exus
+            ),
+            mxu_macs=sum(getattr(exu, "macs", 0) for exu in self.core.exus),
+            vpu_element_ops=sum(getattr(exu, "element_ops", 0) for exu in self.core.exus),
+            dma_bytes=sum(getattr(exu, "bytes_moved", 0) for exu in self.core.exus),
+            bank_stall_cycles={
+                f"{resource}[{bank}]": cycles
+                for (resource, bank), cycles in sorted(
+                    self.core.arch_state.conflict_checker.stall_cycles.items()
+                )
+            },
+            structural_stall_cycles=dict(self.core.idu.structural_stall_cycles),
         )
 
+        imem = self.core.imem
+        if imem is not None:
+            stats.imem_stats = InstructionMemoryStatistics(
+                model=imem.model,
+                accesses=imem.accesses,
+                misses=imem.misses,
+                hit_rate=imem.hit_rate,
+                refill_bytes=imem.refill_bytes,
+                fetch_stall_cycles=self.core.ifu.fetch_stall_cycles,
+            )
+
         for exu in self.core.exus:
             stats.exu_stats[exu.name] = ExecutionUnitStatistics(
                 instructions= exu.total_instructions,
@@ -179,6 +284,9 @@ class Simulation:
                 utilization=(
                     exu.busy_cycles / self.cycle_count if self.cycle_count > 0 else 0.0
                 ),
+                throughput=(
+                    exu.total_instructions / exu.busy_cycles if exu.busy_cycles > 0 else 0.0
+                ),
             )
 
         return stats
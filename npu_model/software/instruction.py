@@ -85,12 +85,25 @@ class Uop():
 
     _next_id: int = 0
 
-    def __init__(self, insn: Instruction) -> None:
+    def __init__(self, insn: Instruction, pc: int = -1) -> None:
         self.id = Uop._next_id
         Uop._next_id += 1
         self.insn = insn
+        self.pc = pc
+        """the address the instruction was fetched from"""
+        self.delay_slot: bool = False
+        """whether the instruction sits in a control-flow delay slot"""
+        self.next_pc: int | None = None
+        """for PC-relative instructions: where fetch continues after the delay slots, set on execution"""
 
         self.dispatch_delay: int = 0
         """the number of dispatch stalling cycles left"""
         self.execute_delay: int = 0
-        """the number of execute stalling cycles left"""
\ No newline at end of file
+        """the number of execute stalling cycles left"""
+
+        self.fetch_cycle: int | None = None
+        """the cycle the instruction was fetched"""
+        self.dispatch_cycle: int | None = None
+        """the cycle the IDU dispatched the instruction"""
+        self.complete_cycle: int | None = None
+        """the cycle the instruction's results became visible"""
\ No newline at end of file
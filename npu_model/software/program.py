@@ -1,8 +1,16 @@
-import torch
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Sequence
 
+from ..codec import classify, decode_operands, encode_program, validate_program
+from ..util.lazy_import import lazy_import
 from .instruction import Instruction
 
+if TYPE_CHECKING:
+    import numpy as np
+    import torch
+else:
+    np = lazy_import("numpy")
+
 ASM_FOLDER = Path("./npu_model/configs/programs/asm/")
 
 class Program:
@@ -30,12 +38,118 @@ class Program:
         return pc >= len(self.instructions) * 4
 
     def assemble(self) -> list[int]:
-        bytecode: list[int] = []
-        for instr in self.instructions:
-            bytecode.append(instr.to_bytecode())
-        return bytecode
+        return encode_program(self.instructions).tolist()
 
 
 class InstantiableProgram(Program):
     def __init__(self, instructions: list[Instruction]):
         self.instructions = instructions
+
+
+class EncodedProgram(Program):
+    """
+    A program stored as machine code: a uint32 word per instruction and the
+    index of its instruction class.  Operands are decoded a whole class at
+    a time on the first fetch, and Instruction objects are only built for
+    the instructions fetched.
+
+    Large generated kernels take a few bytes per instruction instead of an
+    object per operand, and pickle as three arrays, which is what sweeps
+    send to their worker processes.  The class column keeps instructions
+    that share an encoding apart (dma.config.chN x0 is dma.wait.chN).
+    """
+
+    def __init__(
+        self,
+        words: Sequence[int] | np.ndarray,
+        classes: Sequence[type[Instruction]] | None = None,
+        kinds: Sequence[int] | np.ndarray | None = None,
+    ) -> None:
+        """
+        *classes* and *kinds* (classes[kinds[i]] is the class of words[i])
+        default to decoding the words.
+
+        Raises:
+            ValueError: if a word matches no instruction.
+        """
+        self.words = np.asarray(words, dtype=np.uint32)
+        if classes is None or kinds is None:
+            kinds, codecs = classify(self.words)
+            classes = [codec.cls for codec in codecs]
+        self.classes = tuple(classes)
+        self.kinds = np.asarray(kinds, dtype=np.uint16)
+        self._operands: np.ndarray | None = None
+        self._fetched: list[Instruction | None] = [None] * len(self.words)
+
+    @classmethod
+    def from_instructions(cls, instructions: Sequence[Instruction]) -> EncodedProgram:
+        """
+        Raises:
+            ValueError: if an operand does not survive encoding.
+        """
+        if problems := validate_program(instructions):
+            index, message = problems[0]
+            raise ValueError(f"Instruction {index} cannot be encoded: {message}")
+        classes: dict[type[Instruction], int] = {}
+        kinds = [classes.setdefault(type(insn), len(classes)) for insn in instructions]
+        return cls(encode_program(instructions), list(classes), kinds)
+
+    @classmethod
+    def from_program(cls, program: Program) -> EncodedProgram:
+        """*program* encoded, with its memory regions and kernel attributes."""
+        encoded = cls.from_instructions(program.instructions)
+        encoded.memory_regions = list(program.memory_regions)
+        for attr in ("golden_result", "kernel_tolerance", "kernel_max_cycles"):
+            if hasattr(program, attr):
+                setattr(encoded, attr, getattr(program, attr))
+        return encoded
+
+    @property
+    def instructions(self) -> list[Instruction]:  # type: ignore[override]
+        """Every instruction, materialized."""
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __getitem__(self, idx: int) -> Instruction:
+        insn = self._fetched[idx]
+        if insn is None:
+            if self._operands is None:
+                codecs = [c.codec for c in self.classes]
+                self._operands = decode_operands(self.words, self.kinds, codecs)
+            codec = self.classes[self.kinds[idx]].codec
+            insn = self._fetched[idx] = codec.build(*self._operands[idx, : len(codec.operands)].tolist())
+        return insn
+
+    def get_instruction(self, pc: int) -> Instruction:
+        return self[pc // 4]
+
+    def is_finished(self, pc: int) -> bool:
+        return pc >= len(self.words) * 4
+
+    def assemble(self) -> list[int]:
+        return self.words.tolist()
+
+    def replaced(self, index: int, insn: Instruction) -> EncodedProgram:
+        """A copy with instruction *index* replaced by *insn*."""
+        classes = list(self.classes)
+        if type(insn) not in classes:
+            classes.append(type(insn))
+        words, kinds = self.words.copy(), self.kinds.copy()
+        words[index] = encode_program([insn])[0]
+        kinds[index] = classes.index(type(insn))
+        program = EncodedProgram(words, classes, kinds)
+        program.__dict__.update({k: v for k, v in self.__dict__.items() if k not in program.__dict__})
+        return program
+
+    def __getstate__(self) -> dict[str, Any]:
+        # decoded operands and fetched instructions are rebuilt on demand
+        state = dict(self.__dict__)
+        state["_operands"] = None
+        state["_fetched"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._fetched = [None] * len(self.words)
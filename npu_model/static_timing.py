@@ -0,0 +1,349 @@
+"""
+Static timing of assembly as written.
+
+StaticTimer(hardware_config).estimate(source) times every basic block of a
+kernel without simulating it, for editor feedback: when each instruction
+dispatches and completes, how long each execution unit is occupied, and
+which instructions would touch an MRF register or VMEM bank that an
+in-flight instruction still holds (a bank conflict).
+
+The model is the one npu_model.scheduler schedules against: single-issue
+in-order dispatch, `delay` immediates stall dispatch, VPU / MXU / LSU hold an
+instruction until it completes, latencies come from the EXU latency tables
+and DMA transfers queue on the DMA engine and take dma_transfer_cycles.
+Bank conflicts are timed as interlocks (the "stall" policy).  VMEM addresses
+and transfer sizes come from constant-propagating the scalar registers along
+the text, so a loop body is timed as its first iteration.  Cycles are
+relative to the start of each block; a dma.wait on a transfer issued in an
+earlier block is assumed to be satisfied.
+
+Blocks are cached on their text and the register values entering them, so
+after an edit only the edited block, and later blocks whose entry values
+changed, are timed again.
+
+A kernel that uses directives (.equ, macros, %hi / %lo) is timed as
+preprocess() expands it, and each result is reported on the source line the
+instruction came from; for a macro, that is the invocation.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field, replace
+
+from .configs.isa_definition import DELAY
+from .hardware.bank_conflict import mrf_accesses
+from .hardware.config import HardwareConfig
+from .hardware.dma import dma_transfer_cycles
+from .isa import Instruction, IsaSpec, SBType, UJType
+from .isa_types import EXU
+from .scheduler import (
+    CONTROL_FLOW_DELAY_SLOTS,
+    NON_PIPELINED_UNITS,
+    ScalarShadow,
+    instruction_latency,
+    is_dma_transfer,
+    is_dma_wait,
+    register_accesses,
+)
+from .util.converter import parse_tokens, strip_comment, tokenize
+from .util.preprocessor import AsmSyntaxError, preprocess, uses_directives
+
+UNIT_NAMES: dict[EXU, str] = {
+    EXU.SCALAR: "scalar",
+    EXU.VECTOR: "VPU",
+    EXU.MATRIX_SYSTOLIC: "MXU0",
+    EXU.MATRIX_INNER: "MXU1",
+    EXU.LSU: "LSU",
+    EXU.DMA: "DMA",
+}
+
+
+@dataclass(frozen=True)
+class LineTiming:
+    line: int
+    """ 0-indexed source line. """
+    unit: str
+    issue: int
+    """ Dispatch cycle of the line's first instruction. """
+    complete: int
+    """ Completion cycle of its last instruction. """
+    stall: int
+    """ Cycles dispatch waited past in-order issue (busy unit, bank, dma.wait). """
+    reason: str = ""
+
+
+@dataclass(frozen=True)
+class BankConflict:
+    line: int
+    resource: str
+    """ e.g. "m3" or "VMEM bank 12". """
+    holder: int
+    """ Line of the in-flight instruction holding the bank. """
+    until: int
+    """ Cycle the bank is released. """
+
+
+@dataclass
+class BlockTiming:
+    start_line: int
+    end_line: int
+    """ Exclusive. """
+    cycles: int
+    busy: dict[str, int] = field(default_factory=dict)
+    """ Occupied cycles per execution unit. """
+    lines: list[LineTiming] = field(default_factory=list)
+    conflicts: list[BankConflict] = field(default_factory=list)
+
+    def shifted(self, offset: int) -> BlockTiming:
+        return replace(
+            self,
+            start_line=self.start_line + offset,
+            end_line=self.end_line + offset,
+            lines=[replace(t, line=t.line + offset) for t in self.lines],
+            conflicts=[replace(c, line=c.line + offset, holder=c.holder + offset) for c in self.conflicts],
+        )
+
+
+def _is_control_flow(mnemonic: str) -> bool:
+    op = IsaSpec.operations.get(mnemonic)
+    return mnemonic == "jalr" or (isinstance(op, type) and issubclass(op, (SBType, UJType)))
+
+
+def _split_blocks(lines: list[str]) -> list[tuple[int, int]]:
+    """(start, end) line ranges: blocks start at labels and after a branch's delay slots."""
+    bounds: list[tuple[int, int]] = []
+    start = 0
+    after_branch: int | None = None
+    for lineno, raw in enumerate(lines):
+        code = strip_comment(raw)
+        if code.endswith(":"):
+            if lineno > start:
+                bounds.append((start, lineno))
+            start, after_branch = lineno, None
+            continue
+        tokens = tokenize(code)
+        if not tokens:
+            continue
+        if after_branch is not None:
+            after_branch -= 1
+        elif _is_control_flow(tokens[0].lower()):
+            after_branch = CONTROL_FLOW_DELAY_SLOTS
+        if after_branch == 0:
+            bounds.append((start, lineno + 1))
+            start, after_branch = lineno + 1, None
+    if start < len(lines):
+        bounds.append((start, len(lines)))
+    return bounds
+
+
+def _labels(lines: list[str]) -> list[str]:
+    return [code[:-1].strip() for code in map(strip_comment, lines) if code.endswith(":")]
+
+
+def _resource(key: tuple[str, int]) -> str:
+    return f"m{key[1]}" if key[0] == "mrf" else f"VMEM bank {key[1]}"
+
+
+@dataclass
+class Dispatch:
+    issue: int
+    complete: int
+    stall: int
+    """ Cycles past in-order issue the instruction waited. """
+    reason: str
+    conflicts: list[tuple[str, int, int]]
+    """ (resource, holder tag, release cycle) of each bank it found held. """
+
+
+class TimingModel:
+    """
+    In-order dispatch timing of an instruction stream (see the module docstring).
+
+    dispatch() is called in execution order; tags identify instructions in
+    the conflicts reported (source lines, program indices).  The scalar
+    shadow is stepped through every instruction to track VMEM addresses
+    and transfer sizes.
+    """
+
+    def __init__(self, hardware_config: HardwareConfig, shadow: ScalarShadow) -> None:
+        self.hardware_config = hardware_config
+        self.shadow = shadow
+        self.cycle = 0
+        """ Earliest cycle the next instruction can dispatch. """
+        self.end = 0
+        self.busy: Counter[str] = Counter()
+        self._unit_free: dict[EXU, int] = {}
+        self._dma_free = 0
+        self._channel_done: dict[int, int] = {}
+        self._holds: dict[tuple[str, int], tuple[int, int]] = {}
+        """ Bank -> (release cycle, holder tag). """
+
+    @property
+    def cycles(self) -> int:
+        return max(self.cycle, self.end)
+
+    def dispatch(self, insn: Instruction, tag: int) -> Dispatch:
+        shadow = self.shadow
+        earliest = self.cycle + (int(insn.imm) if isinstance(insn, DELAY) else 0)
+        waits: list[tuple[int, str]] = []
+        if is_dma_wait(insn):
+            waits.append((self._channel_done.get(int(insn.funct3), 0), "dma.wait"))
+        elif insn.exu in NON_PIPELINED_UNITS:
+            waits.append((self._unit_free.get(insn.exu, 0), f"{UNIT_NAMES[insn.exu]} busy"))
+        ready = max([earliest, *(t for t, _ in waits)])
+
+        conflicts: list[tuple[str, int, int]] = []
+        keys: set[tuple[str, int]] = {("mrf", int(reg)) for reg in mrf_accesses(insn)}
+        keys |= {("vmem", bank) for bank in shadow.vmem_banks(insn) or ()}
+        for key in sorted(keys):
+            until, holder = self._holds.get(key, (0, tag))
+            if until > ready:
+                conflicts.append((_resource(key), holder, until))
+                waits.append((until, f"{_resource(key)} held"))
+
+        issue, reason = earliest, ""
+        for t, why in waits:
+            if t > issue:
+                issue, reason = t, why
+
+        if is_dma_transfer(insn) and int(insn.rs2) in shadow.known:
+            start = max(issue + 1, self._dma_free)
+            complete = self._dma_free = start + dma_transfer_cycles(self.hardware_config, shadow.xrf[int(insn.rs2)])
+            self._channel_done[int(insn.funct3)] = complete
+            self.busy[UNIT_NAMES[EXU.DMA]] += complete - start
+        else:
+            complete = issue + instruction_latency(insn)
+            if insn.exu in UNIT_NAMES and not is_dma_wait(insn):
+                self.busy[UNIT_NAMES[insn.exu]] += complete - issue
+        if insn.exu in NON_PIPELINED_UNITS:
+            self._unit_free[insn.exu] = complete
+        for key in keys:
+            self._holds[key] = (complete, tag)
+
+        self.cycle = issue + 1
+        self.end = max(self.end, complete)
+        shadow.step(insn, *register_accesses(insn))
+        return Dispatch(issue, complete, issue - earliest, reason, conflicts)
+
+
+def time_block(
+    lines: list[str],
+    labels: list[str],
+    hardware_config: HardwareConfig,
+    entry: dict[int, int],
+) -> tuple[BlockTiming, dict[int, int]]:
+    """
+    Time one block; line numbers are relative to its first line.
+
+    Returns the timing and the known scalar register values leaving it.
+    Lines that do not assemble are skipped (the linter reports them).
+    """
+    model = TimingModel(hardware_config, ScalarShadow(hardware_config.arch_state_config, entry))
+    timings: list[LineTiming] = []
+    conflicts: list[BankConflict] = []
+
+    for lineno, raw in enumerate(lines):
+        tokens = tokenize(raw)
+        if not tokens or strip_comment(raw).endswith(":"):
+            continue
+        try:
+            instructions = parse_tokens(tokens, lambda s: 0 if s in labels else int(s, 0), labels, raw)
+        except (ValueError, ExceptionGroup):
+            continue
+
+        dispatches = [model.dispatch(insn, lineno) for insn in instructions]
+        for d in dispatches:
+            conflicts.extend(BankConflict(lineno, resource, holder, until) for resource, holder, until in d.conflicts)
+        if dispatches:
+            last = instructions[-1]
+            unit = "IDU" if is_dma_wait(last) else UNIT_NAMES.get(last.exu, str(last.exu))
+            stalled = [d for d in dispatches if d.stall]
+            timings.append(
+                LineTiming(
+                    lineno,
+                    unit,
+                    dispatches[0].issue,
+                    dispatches[-1].complete,
+                    sum(d.stall for d in dispatches),
+                    stalled[-1].reason if stalled else "",
+                )
+            )
+
+    timing = BlockTiming(0, len(lines), model.cycles, dict(model.busy), timings, conflicts)
+    return timing, model.shadow.values()
+
+
+# block text, the document's labels, register values entering the block
+_BlockKey = tuple[tuple[str, ...], tuple[str, ...], frozenset[tuple[int, int]]]
+
+
+def _at_origins(block: BlockTiming, origins: list[int]) -> BlockTiming:
+    """
+    A block timed on preprocess() output, reported on the source lines its
+    lines came from.  The lines of one macro invocation or .rept body line
+    merge into one LineTiming: first issue, last completion, total stall.
+    """
+    merged: dict[int, LineTiming] = {}
+    for timing in block.lines:
+        line = origins[timing.line]
+        prev = merged.get(line)
+        if prev is None:
+            merged[line] = replace(timing, line=line)
+        else:
+            merged[line] = replace(
+                timing,
+                line=line,
+                issue=prev.issue,
+                complete=max(prev.complete, timing.complete),
+                stall=prev.stall + timing.stall,
+                reason=timing.reason or prev.reason,
+            )
+    conflicts = [replace(c, line=origins[c.line], holder=origins[c.holder]) for c in block.conflicts]
+    return replace(
+        block,
+        start_line=origins[block.start_line],
+        end_line=origins[block.end_line - 1] + 1,
+        lines=list(merged.values()),
+        conflicts=list(dict.fromkeys(conflicts)),
+    )
+
+
+class StaticTimer:
+    """Times a document block by block, reusing blocks that did not change."""
+
+    def __init__(self, hardware_config: HardwareConfig) -> None:
+        self.hardware_config = hardware_config
+        self._cache: dict[_BlockKey, tuple[BlockTiming, dict[int, int]]] = {}
+        self.retimed = 0
+        """ Blocks timed (cache misses) so far. """
+
+    def estimate(self, source: str) -> list[BlockTiming]:
+        lines = source.splitlines()
+        if not uses_directives(lines):
+            return self._estimate(lines)
+        try:
+            expanded = preprocess(lines)
+        except AsmSyntaxError:
+            return []  # the linter reports it
+        origins = [s.origin for s in expanded]
+        return [_at_origins(block, origins) for block in self._estimate([s.text for s in expanded])]
+
+    def _estimate(self, lines: list[str]) -> list[BlockTiming]:
+        labels = tuple(_labels(lines))
+        entry: dict[int, int] = {}
+        blocks: list[BlockTiming] = []
+        cache: dict[_BlockKey, tuple[BlockTiming, dict[int, int]]] = {}
+        for start, end in _split_blocks(lines):
+            text = tuple(lines[start:end])
+            key = (text, labels, frozenset(entry.items()))
+            hit = self._cache.get(key)
+            if hit is None:
+                hit = time_block(list(text), list(labels), self.hardware_config, entry)
+                self.retimed += 1
+            cache[key] = hit
+            timing, entry = hit
+            blocks.append(timing.shifted(start))
+        # keep only the blocks of the current text
+        self._cache = cache
+        return blocks
@@ -0,0 +1,169 @@
+"""
+Compact per-unit activity timeline.
+
+Simulation(record_timeline=True) records, for every execution unit, the
+half-open cycle intervals [start, end) in which the unit was busy.  Intervals
+are appended to stdlib arrays as they close, so a run costs a few bytes per
+busy/idle transition rather than a dict per cycle.
+
+Analysis (busy masks, concurrency counts, overlap, ASCII bars) is vectorized
+with NumPy, and timelines round-trip through .npz files via save / load.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .hardware.exu import ExecutionUnit
+
+
+class Timeline:
+    """Run-length encoded busy intervals for a fixed set of units."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names: list[str] = list(names)
+        self.cycles = 0
+        self._starts = [array("q") for _ in self.names]
+        self._ends = [array("q") for _ in self.names]
+        # start of the currently open interval per unit, -1 when idle
+        self._open = [-1] * len(self.names)
+        self._prev_busy = [0] * len(self.names)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(self, exus: Sequence[ExecutionUnit]) -> None:
+        """Record one cycle: a unit was active if its busy_cycles advanced."""
+        cycle = self.cycles
+        for index, exu in enumerate(exus):
+            busy = exu.busy_cycles
+            if busy != self._prev_busy[index]:
+                self._prev_busy[index] = busy
+                if self._open[index] < 0:
+                    self._open[index] = cycle
+            elif self._open[index] >= 0:
+                self._starts[index].append(self._open[index])
+                self._ends[index].append(cycle)
+                self._open[index] = -1
+        self.cycles = cycle + 1
+
+    def finish(self) -> None:
+        """Close intervals that are still open at the end of the run."""
+        for index, start in enumerate(self._open):
+            if start >= 0:
+                self._starts[index].append(start)
+                self._ends[index].append(self.cycles)
+                self._open[index] = -1
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self.cycles
+
+    def __getitem__(self, cycle: int) -> dict[str, bool]:
+        """Per-unit activity in one cycle."""
+        if cycle < 0:
+            cycle += self.cycles
+        if not 0 <= cycle < self.cycles:
+            raise IndexError(f"cycle {cycle} outside timeline of {self.cycles} cycles")
+        active: dict[str, bool] = {}
+        for index, name in enumerate(self.names):
+            starts = self._starts[index]
+            pos = bisect_right(starts, cycle) - 1
+            active[name] = pos >= 0 and cycle < self._ends[index][pos]
+        return active
+
+    def intervals(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """Busy interval starts and (exclusive) ends of one unit."""
+        index = self.names.index(name)
+        return (
+            np.asarray(self._starts[index], dtype=np.int64),
+            np.asarray(self._ends[index], dtype=np.int64),
+        )
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+
+    def _edges(self, name: str) -> np.ndarray:
+        starts, ends = self.intervals(name)
+        edges = np.zeros(self.cycles + 1, dtype=np.int32)
+        # intervals of one unit never touch, so starts / ends are unique
+        edges[starts] += 1
+        edges[ends] -= 1
+        return edges
+
+    def mask(self, name: str) -> np.ndarray:
+        """Boolean busy mask of one unit, one entry per cycle."""
+        return np.cumsum(self._edges(name)[:-1]) > 0
+
+    def busy_cycles(self, name: str) -> int:
+        starts, ends = self.intervals(name)
+        return int((ends - starts).sum())
+
+    def active_counts(self, names: Iterable[str] | None = None) -> np.ndarray:
+        """Number of busy units in each cycle."""
+        edges = np.zeros(self.cycles + 1, dtype=np.int32)
+        for name in self.names if names is None else names:
+            edges += self._edges(name)
+        return np.cumsum(edges[:-1])
+
+    def concurrency_histogram(self) -> np.ndarray:
+        """histogram[n] is the number of cycles in which n units were busy."""
+        return np.bincount(self.active_counts(), minlength=len(self.names) + 1)
+
+    def overlap_cycles(self, group_a: Iterable[str], group_b: Iterable[str]) -> int:
+        """Cycles in which some unit of group_a and some unit of group_b were both busy."""
+        group_a, group_b = list(group_a), list(group_b)
+        if not group_a or not group_b:
+            return 0
+        return int(((self.active_counts(group_a) > 0) & (self.active_counts(group_b) > 0)).sum())
+
+    def bar(self, name: str, width: int, active: str = "█", idle: str = "·") -> str:
+        """ASCII bar of *width* columns; a column is active if any of its cycles was busy."""
+        if self.cycles == 0:
+            return ""
+        columns = np.arange(width)
+        lo = columns * self.cycles // width
+        hi = np.minimum(np.maximum((columns + 1) * self.cycles // width, lo + 1), self.cycles)
+        busy_prefix = np.concatenate(([0], np.cumsum(self.mask(name))))
+        busy = busy_prefix[hi] - busy_prefix[lo] > 0
+        return "".join(np.where(busy, active, idle))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write the timeline to a compressed .npz file."""
+        lengths = [len(starts) for starts in self._starts]
+        np.savez_compressed(
+            path,
+            names=np.array(self.names),
+            cycles=np.array(self.cycles, dtype=np.int64),
+            offsets=np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+            starts=np.concatenate([np.asarray(s, dtype=np.int64) for s in self._starts] or [[]]),
+            ends=np.concatenate([np.asarray(e, dtype=np.int64) for e in self._ends] or [[]]),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Timeline":
+        """Read a timeline written by save()."""
+        with np.load(path) as data:
+            timeline = cls(str(name) for name in data["names"])
+            timeline.cycles = int(data["cycles"])
+            offsets = data["offsets"]
+            for index in range(len(timeline.names)):
+                lo, hi = offsets[index], offsets[index + 1]
+                timeline._starts[index] = array("q", data["starts"][lo:hi].tolist())
+                timeline._ends[index] = array("q", data["ends"][lo:hi].tolist())
+        return timeline
@@ -0,0 +1,153 @@
+"""
+Batch assembly of .S kernels into .bin / .hex images.
+
+assemble_batch(sources, bin_dir, hex_dir) assembles many files in one
+process pool instead of one interpreter per file.  An output is rewritten
+only when it is stale: a manifest in bin_dir records, per source path
+relative to bin_dir, the sha256 of its text together with the assembler's
+own sources (ISA definitions and the parser), so editing either
+re-assembles.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..codec import encode_program
+from .converter import load_asm
+
+MANIFEST_NAME = ".assemble_manifest.json"
+
+_PACKAGE = Path(__file__).resolve().parent.parent
+# sources whose changes alter the encoding of every kernel
+_TOOLCHAIN_FILES = (
+    _PACKAGE / "codec.py",
+    _PACKAGE / "isa.py",
+    _PACKAGE / "isa_patterns.py",
+    _PACKAGE / "isa_types.py",
+    _PACKAGE / "configs" / "isa_definition.py",
+    _PACKAGE / "util" / "converter.py",
+    _PACKAGE / "util" / "preprocessor.py",
+)
+
+
+@dataclass
+class AssembleResult:
+    source: Path
+    words: int
+    seconds: float
+    """ Time spent parsing, encoding and writing; 0 when skipped. """
+    skipped: bool = False
+    """ True if the outputs were up to date. """
+    error: str = ""
+
+
+def write_hex(path: str | Path, code: list[int]) -> None:
+    with open(path, "w") as f:
+        for word in code:
+            f.write(f"{word & 0xFFFFFFFF:08x}\n")
+
+
+def write_bin(path: str | Path, code: list[int]) -> None:
+    with open(path, "wb") as f:
+        for word in code:
+            f.write(struct.pack("<I", word & 0xFFFFFFFF))
+
+
+def toolchain_digest() -> str:
+    digest = hashlib.sha256()
+    for path in _TOOLCHAIN_FILES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def source_digest(source: Path, toolchain: str) -> str:
+    return hashlib.sha256(toolchain.encode() + source.read_bytes()).hexdigest()
+
+
+def _manifest_key(source: Path, manifest_dir: Path | None) -> str:
+    # relative to the manifest, so same-named kernels in different
+    # directories keep separate entries wherever the batch is run from
+    if manifest_dir is None:
+        return source.name
+    return Path(os.path.relpath(source.resolve(), manifest_dir.resolve())).as_posix()
+
+
+def _assemble_one(source: Path, bin_path: Path | None, hex_path: Path | None) -> AssembleResult:
+    start = time.perf_counter()
+    # any failure, including writing the outputs, belongs to this file only
+    try:
+        code = encode_program(load_asm(source)).tolist()
+        if bin_path is not None:
+            write_bin(bin_path, code)
+        if hex_path is not None:
+            write_hex(hex_path, code)
+    except Exception as exc:
+        return AssembleResult(source, 0, time.perf_counter() - start, error=f"{type(exc).__name__}: {exc}")
+    return AssembleResult(source, len(code), time.perf_counter() - start)
+
+
+def assemble_batch(
+    sources: list[Path],
+    bin_dir: Path | None,
+    hex_dir: Path | None,
+    workers: int | None = None,
+    force: bool = False,
+) -> list[AssembleResult]:
+    """
+    Assemble *sources* into bin_dir/<name>.bin and hex_dir/<name>.hex.
+
+    Files whose outputs exist and whose digest matches the manifest are
+    skipped unless *force*.  Results are in the order of *sources*.
+    """
+    manifest_dir = bin_dir or hex_dir
+    manifest_path = None if manifest_dir is None else manifest_dir / MANIFEST_NAME
+    manifest: dict[str, str] = {}
+    if manifest_path is not None and manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+    for directory in (bin_dir, hex_dir):
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    toolchain = toolchain_digest()
+    keys = {source: _manifest_key(source, manifest_dir) for source in sources}
+    results: dict[Path, AssembleResult] = {}
+    jobs: list[tuple[Path, Path | None, Path | None]] = []
+    digests: dict[Path, str] = {}
+    for source in sources:
+        bin_path = None if bin_dir is None else bin_dir / f"{source.stem}.bin"
+        hex_path = None if hex_dir is None else hex_dir / f"{source.stem}.hex"
+        digests[source] = source_digest(source, toolchain)
+        outputs_exist = all(p is None or p.exists() for p in (bin_path, hex_path))
+        if not force and outputs_exist and manifest.get(keys[source]) == digests[source]:
+            results[source] = AssembleResult(source, 0, 0.0, skipped=True)
+        else:
+            jobs.append((source, bin_path, hex_path))
+
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    pool: Executor | None = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if pool is None:
+            done = [_assemble_one(*job) for job in jobs]
+        else:
+            done = list(pool.map(_assemble_one, *zip(*jobs))) if jobs else []
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    for result in done:
+        results[result.source] = result
+        if result.error:
+            manifest.pop(keys[result.source], None)
+        else:
+            manifest[keys[result.source]] = digests[result.source]
+    if manifest_path is not None and done:
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    return [results[source] for source in sources]
@@ -1,13 +1,14 @@
 import re
-from typing import TextIO, List, cast
+from typing import Callable, TextIO, List, cast
 from pathlib import Path
 
 from ..software.instruction import Instruction, x
 from ..software.program import InstantiableProgram
 from ..isa import IsaSpec
 from ..isa_patterns import InstructionPattern
-from ..configs.isa_definition import ADDI, LUI
-from ..isa_types import ScalarReg
+from ..configs.isa_definition import ADDI, CSRRS, LUI
+from ..isa_types import Bundled, CsrAddr, Named, RegBase, ScalarReg
+from .preprocessor import SourceLine, hi, lo, preprocess, strip_comment
 
 def parse_reg(s: str):
     s = s.strip().rstrip(",").lower()
@@ -30,10 +31,7 @@ def expand_li(rd: int, value: int) -> List[Instruction]:
         return [
             ADDI(rd=ScalarReg(rd), rs1=x(0), imm=(v & 0xFFF))
         ]
-    lo12 = v & 0xFFF
-    if lo12 & 0x800:
-        lo12 -= 0x1000
-    hi20 = ((v - lo12) >> 12) & 0xFFFFF
+    lo12, hi20 = lo(v), hi(v)
     if lo12 == 0:
         return [LUI(rd=ScalarReg(rd), imm=hi20)]
     return [
@@ -41,27 +39,56 @@ def expand_li(rd: int, value: int) -> List[Instruction]:
         ADDI(rd=ScalarReg(rd), rs1=ScalarReg(rd), imm=(lo12 & 0xFFF))
     ]
 
-def strip_comment(line: str):
-    idx = line.find("#")
-    return line[:idx].strip() if idx >= 0 else line.strip()
-
-
 def tokenize(line: str):
     return [t.rstrip(',') for t in re.split(r"[\s,]+", strip_comment(line)) if t]
 
+def parse_tokens(
+    tokens: list[str], resolve: Callable[[str], int], labels: list[str], line: str = ""
+) -> list[Instruction]:
+    """
+    Instructions for one tokenized source line; `li` may expand to two.
+
+    resolve maps a label or number operand to its immediate.
+    """
+    mnemonic = tokens[0].lower()
+
+    # Handle pseudoinstructions
+    if mnemonic == "nop" and len(tokens) == 1:
+        return [ADDI(x(0), x(0), 0)]
+    if mnemonic == "li" and len(tokens) == 3:
+        return expand_li(parse_reg(tokens[1]), int(tokens[2], 0))
+    if mnemonic == "csrr" and len(tokens) == 3:
+        return [CSRRS(rd=ScalarReg(parse_reg(tokens[1])), rs1=x(0), imm=int(CsrAddr(tokens[2])))]
+    try:
+        # mnemonic should be lowercase
+        tokens[0] = tokens[0].lower()
+        instr = cast(InstructionPattern, IsaSpec.operations[mnemonic])
+
+        if len(err := instr.lint(tokens, labels=labels)) != 0:
+            raise ExceptionGroup(f"Error assembling isntr: {", ".join(tokens)}", err)
+
+        return [cast(Instruction, instr.from_asm(tokens, resolve))]
+    except KeyError:
+        raise ValueError(f"Invalid mnemonic provided: {line or ' '.join(tokens)}")
+
+
 def stream_to_instrs(source: TextIO) -> list[Instruction]:
-    lines: list[str] = []
+    """
+    Assemble a kernel; directives, macros and expressions are expanded first
+    (see npu_model.util.preprocessor).
+
+    Raises:
+        AsmSyntaxError: for a malformed directive, macro or expression.
+        ValueError, ExceptionGroup: for an instruction that does not
+            assemble; a note on the exception gives its source line.
+    """
+    lines: list[SourceLine] = preprocess(source)
     labels: dict[str, int] = {}
     addr: int = 0
 
     # Pass 1: Figure out where labels are
-    for raw_line in source:
-        line = strip_comment(raw_line)
-
-        if not line:
-            pass
-
-        lines.append(line)
+    for source_line in lines:
+        line = source_line.text
         if line.endswith(":"):
             labels[line[:-1].strip()] = addr
         else:
@@ -71,7 +98,7 @@ def stream_to_instrs(source: TextIO) -> list[Instruction]:
                     if len(tokens) > 2:
                         addr += len(expand_li(0, int(tokens[2], 0)))
                     else:
-                        raise ValueError(f"Malformed Instruction: {line}")
+                        raise ValueError(f"Malformed Instruction: line {source_line.origin + 1}: {line}")
                 else:
                     addr += 1
 
@@ -84,7 +111,8 @@ def stream_to_instrs(source: TextIO) -> list[Instruction]:
             return (labels[s] - pc) * 4
         return int(s, 0)
 
-    for line in lines:
+    for source_line in lines:
+        line = source_line.text
         if line.endswith(":"):
             continue
 
@@ -92,29 +120,13 @@ def stream_to_instrs(source: TextIO) -> list[Instruction]:
         if not tokens:
             continue
 
-        mnemonic = tokens[0].lower()
-
-        # Handle pseudoinstructions
-        if mnemonic == "nop" and len(tokens) == 1:
-            instructions.append(ADDI(x(0), x(0), 0))
-            pc += 1
-        elif mnemonic == "li" and len(tokens) == 3:
-            e = expand_li(parse_reg(tokens[1]), int(tokens[2], 0))
-            instructions.extend(e)
-            pc += len(e)
-        else:
-            try:
-                # mnemonic should be lowercase
-                tokens[0] = tokens[0].lower()
-                instr = cast(InstructionPattern, IsaSpec.operations[mnemonic])
-
-                if len(err := instr.lint(tokens, labels=list(labels.keys()))) != 0:
-                    raise ExceptionGroup(f"Error assembling isntr: {", ".join(tokens)}", err)
-
-                instructions.append(cast(Instruction, instr.from_asm(tokens, resolve)))
-                pc += 1
-            except KeyError:
-                raise ValueError(f"Invalid mnemonic provided: {line}")
+        try:
+            parsed = parse_tokens(tokens, resolve, list(labels.keys()), line)
+        except (ValueError, ExceptionGroup) as exc:
+            exc.add_note(f"at line {source_line.origin + 1}: {line}")
+            raise
+        instructions.extend(parsed)
+        pc += len(parsed)
     
     return instructions
 
@@ -123,4 +135,22 @@ def load_asm(source: Path):
         return stream_to_instrs(f)
 
 def input_to_program(source: TextIO):
-    return InstantiableProgram(stream_to_instrs(source))
\ No newline at end of file
+    return InstantiableProgram(stream_to_instrs(source))
+
+
+def _format_operand(insn: Instruction, named: Named) -> str:
+    value = int(getattr(insn, named.repr))
+    if issubclass(named.inner, RegBase):
+        return f"{named.inner.fmt}{value}"
+    return str(value)
+
+
+def format_instruction(insn: Instruction) -> str:
+    """Render an instruction as assembly that stream_to_instrs parses back to it."""
+    operands: list[str] = []
+    for param in cast(InstructionPattern, insn).params:
+        if isinstance(param, Bundled):
+            operands.append(f"{_format_operand(insn, param.imm)}({_format_operand(insn, param.reg)})")
+        else:
+            operands.append(_format_operand(insn, param))
+    return f"{insn.mnemonic} {', '.join(operands)}" if operands else insn.mnemonic
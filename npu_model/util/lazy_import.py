@@ -0,0 +1,26 @@
+"""
+Deferred imports of heavy optional modules.
+
+lazy_import("torch") returns a stand-in module that imports the real one on
+first attribute access, so modules that only need torch inside function
+bodies (the `exec` of every instruction) can be imported by the assembler,
+linter and language server without paying for torch.
+"""
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Any
+
+
+class _LazyModule(ModuleType):
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self.__name__)
+        # copy the namespace so later lookups no longer come through here
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """*name* if it is already imported, otherwise a module that imports it on first use."""
+    return sys.modules.get(name) or _LazyModule(name)
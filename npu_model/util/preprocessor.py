@@ -0,0 +1,342 @@
+"""
+Assembler directives, macros and constant expressions.
+
+preprocess(source) expands a kernel into plain assembly, one SourceLine per
+instruction or label, before converter.stream_to_instrs parses it:
+
+    .equ NAME, expr          define a constant (.set is the same); a later
+                             .equ may redefine it, e.g. a counter in a .rept
+    .macro name a, b=4       define a macro up to .endm; in its body \\a is
+    ...                      the argument and \\@ a number unique to each
+    .endm                    expansion, for labels
+    .rept count              repeat the lines up to .endr
+    ...
+    .endr
+    .irp r, 0, 1, 2          repeat the lines up to .endr once per value,
+    ...                      with \\r the value (m\\r is m0, m1, m2; \\()
+    .endr                    ends a parameter name: \\r\\()x)
+    name x1, 8               expand a macro
+
+Operands that are expressions over integers and constants are evaluated:
++ - * / % << >> & | ^ ~ with C precedence, parentheses, and %hi(expr) /
+%lo(expr), which split a 32-bit value the way `li` does, so
+`lui rd, %hi(v)` followed by `addi rd, rd, %lo(v)` loads v.  Labels are
+resolved PC-relative after expansion and cannot appear in expressions.
+
+Every SourceLine records the source line its text came from and the lines
+of the macro invocations it was expanded by, so errors point at the source.
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import Iterable
+
+MAX_EXPANSION_DEPTH = 64
+
+_DIRECTIVE_RE = re.compile(r"^(\S+)\s*(.*)$")
+_PARAM_RE = re.compile(r"\\(\w+|@)")
+_HI_LO_RE = re.compile(r"%(hi|lo)\s*\(")
+_BUNDLED_RE = re.compile(r"^(.*)\(\s*(x\d+)\s*\)$")
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+_SYMBOL_RE = re.compile(r"^[A-Za-z_]\w*$")
+
+
+class AsmSyntaxError(ValueError):
+    def __init__(self, message: str, line: int) -> None:
+        super().__init__(f"line {line + 1}: {message}")
+        self.message = message
+        self.line = line
+        """ 0-indexed source line. """
+
+
+@dataclass(frozen=True)
+class SourceLine:
+    text: str
+    """ The expanded line: an instruction or a label, without its comment. """
+    line: int
+    """ 0-indexed line the text comes from (in a macro body for expanded lines). """
+    expanded_from: tuple[int, ...] = ()
+    """ Lines of the macro invocations that produced it, outermost first. """
+
+    @property
+    def origin(self) -> int:
+        """The line to report problems on: the outermost macro invocation, or the line itself."""
+        return self.expanded_from[0] if self.expanded_from else self.line
+
+
+@dataclass
+class _Macro:
+    name: str
+    params: list[tuple[str, str | None]]
+    """ (name, default) """
+    body: list[tuple[str, int]]
+    """ (text, line) """
+
+
+def hi(value: int) -> int:
+    """Upper 20 bits of *value* for lui, compensating for %lo's sign."""
+    return ((value - lo(value)) >> 12) & 0xFFFFF
+
+
+def lo(value: int) -> int:
+    """Lower 12 bits of *value*, sign-extended as addi reads them."""
+    low = value & 0xFFF
+    return low - 0x1000 if low & 0x800 else low
+
+
+def strip_comment(line: str) -> str:
+    idx = line.find("#")
+    return line[:idx].strip() if idx >= 0 else line.strip()
+
+
+def split_operands(text: str) -> list[str]:
+    """Split *text* at the commas outside parentheses."""
+    operands: list[str] = []
+    depth, start = 0, 0
+    for i, ch in enumerate(text):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            operands.append(text[start:i].strip())
+            start = i + 1
+    operands.append(text[start:].strip())
+    return [op for op in operands if op] if len(operands) > 1 or operands[0] else []
+
+
+_BINARY = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.LShift: lambda a, b: a << b,
+    ast.RShift: lambda a, b: a >> b,
+    ast.BitAnd: lambda a, b: a & b,
+    ast.BitOr: lambda a, b: a | b,
+    ast.BitXor: lambda a, b: a ^ b,
+}
+_UNARY = {ast.USub: lambda a: -a, ast.UAdd: lambda a: a, ast.Invert: lambda a: ~a}
+_FUNCTIONS = {"__hi": hi, "__lo": lo}
+
+
+def _parse(expr: str) -> ast.expr | None:
+    """The expression's syntax tree, or None if it is not one."""
+    try:
+        return ast.parse(_HI_LO_RE.sub(r"__\1(", expr.strip()), mode="eval").body
+    except SyntaxError:
+        return None
+
+
+def _eval(node: ast.expr, symbols: dict[str, int]) -> int:
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value
+    if isinstance(node, ast.Name):
+        if node.id not in symbols:
+            raise ValueError(f"Unknown symbol '{node.id}'")
+        return symbols[node.id]
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        return _UNARY[type(node.op)](_eval(node.operand, symbols))
+    if isinstance(node, ast.BinOp) and type(node.op) in (ast.Div, ast.Mod):
+        a, b = _eval(node.left, symbols), _eval(node.right, symbols)
+        if b == 0:
+            raise ValueError("Division by zero")
+        # C semantics: the quotient truncates toward zero
+        quotient = abs(a) // abs(b) * (1 if (a < 0) == (b < 0) else -1)
+        return quotient if isinstance(node.op, ast.Div) else a - quotient * b
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+        return _BINARY[type(node.op)](_eval(node.left, symbols), _eval(node.right, symbols))
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _FUNCTIONS
+        and len(node.args) == 1
+        and not node.keywords
+    ):
+        return _FUNCTIONS[node.func.id](_eval(node.args[0], symbols))
+    raise ValueError(f"Unsupported expression '{ast.unparse(node)}'")
+
+
+def evaluate(expr: str, symbols: dict[str, int]) -> int:
+    """
+    The value of a constant expression.
+
+    Raises:
+        ValueError: for a malformed expression or an unknown symbol.
+    """
+    node = _parse(expr)
+    if node is None:
+        raise ValueError(f"Malformed expression '{expr.strip()}'")
+    return _eval(node, symbols)
+
+
+def _is_literal(token: str) -> bool:
+    try:
+        int(token, 0)
+    except ValueError:
+        return False
+    return True
+
+
+def _operand(token: str, symbols: dict[str, int]) -> str:
+    """*token* with its expression evaluated; registers, labels and literals are kept."""
+    if _is_literal(token) or (_IDENTIFIER_RE.match(token) and token not in symbols):
+        return token
+    if bundled := _BUNDLED_RE.match(token):
+        offset, reg = bundled.groups()
+        return f"{_operand(offset.strip(), symbols) if offset.strip() else 0}({reg})"
+    return str(evaluate(token, symbols))
+
+
+def substitute(code: str, symbols: dict[str, int]) -> str:
+    """
+    An instruction line with every operand expression evaluated.
+
+    Operands may also be separated by whitespace alone, as the assembler
+    always accepted, as long as each one is a single token.
+
+    Raises:
+        ValueError: for a malformed expression or an unknown symbol.
+    """
+    match = _DIRECTIVE_RE.match(code)
+    if match is None or code.endswith(":"):
+        return code
+    mnemonic, rest = match.groups()
+    tokens: list[str] = []
+    for operand in split_operands(rest):
+        tokens.extend([operand] if _parse(operand) or _BUNDLED_RE.match(operand) else operand.split())
+    operands = [_operand(t, symbols) for t in tokens]
+    return code if operands == tokens else " ".join([mnemonic, ", ".join(operands)])
+
+
+_OPENERS = {".endm": (".macro",), ".endr": (".rept", ".irp")}
+
+
+def _bind(lines: list[tuple[str, int]], values: dict[str, str]) -> list[tuple[str, int]]:
+    """*lines* with the parameters in *values* substituted; others are left for enclosing blocks."""
+
+    def bind(match: re.Match[str]) -> str:
+        return values.get(match.group(1), match.group())
+
+    return [(_PARAM_RE.sub(bind, text), line) for text, line in lines]
+
+
+@dataclass
+class _Expander:
+    symbols: dict[str, int] = field(default_factory=dict)
+    macros: dict[str, _Macro] = field(default_factory=dict)
+    out: list[SourceLine] = field(default_factory=list)
+    expansions: int = 0
+
+    def _block(self, lines: list[tuple[str, int]], start: int, closer: str) -> int:
+        """Index of the line closing the block opened at *start*."""
+        openers = _OPENERS[closer]
+        depth = 0
+        for i in range(start, len(lines)):
+            word = strip_comment(lines[i][0]).lower().split(maxsplit=1)[:1]
+            if word and word[0] in openers:
+                depth += 1
+            elif word == [closer]:
+                depth -= 1
+                if depth == 0:
+                    return i
+        opener = strip_comment(lines[start][0]).split(maxsplit=1)[0]
+        raise AsmSyntaxError(f"'{opener}' without '{closer}'", lines[start][1])
+
+    def _define(self, args: str, lineno: int, body: list[tuple[str, int]]) -> None:
+        name, params = (re.split(r"[\s,]+", args, maxsplit=1) + [""])[:2]
+        if not _IDENTIFIER_RE.match(name):
+            raise AsmSyntaxError(f"Invalid macro name '{name}'", lineno)
+        parsed: list[tuple[str, str | None]] = []
+        for param in split_operands(params):
+            pname, eq, default = (s.strip() for s in param.partition("="))
+            if not re.fullmatch(r"\w+", pname):
+                raise AsmSyntaxError(f"Invalid macro parameter '{param}'", lineno)
+            parsed.append((pname, default if eq else None))
+        self.macros[name.lower()] = _Macro(name, parsed, body)
+
+    def _expand_macro(self, macro: _Macro, args: list[str], lineno: int, stack: tuple[int, ...]) -> None:
+        if len(stack) >= MAX_EXPANSION_DEPTH:
+            raise AsmSyntaxError(f"Macro '{macro.name}' expands more than {MAX_EXPANSION_DEPTH} levels deep", lineno)
+        if len(args) > len(macro.params):
+            raise AsmSyntaxError(f"Macro '{macro.name}' takes {len(macro.params)} arguments, got {len(args)}", lineno)
+        values: dict[str, str] = {"@": str(self.expansions)}
+        for i, (pname, default) in enumerate(macro.params):
+            value = args[i] if i < len(args) else default
+            if value is None:
+                raise AsmSyntaxError(f"Macro '{macro.name}' is missing argument '{pname}'", lineno)
+            values[pname] = value
+        self.expansions += 1
+        self.run(_bind(macro.body, values), (*stack, lineno))
+
+    def run(self, lines: list[tuple[str, int]], stack: tuple[int, ...] = ()) -> None:
+        i = 0
+        while i < len(lines):
+            text, lineno = lines[i]
+            code = strip_comment(text)
+            match = _DIRECTIVE_RE.match(code)
+            i += 1
+            if match is None:
+                continue
+            word, args = match.groups()
+            directive = word.lower()
+            try:
+                if directive in (".equ", ".set"):
+                    operands = split_operands(args)
+                    if len(operands) != 2 or not _SYMBOL_RE.match(operands[0]):
+                        raise AsmSyntaxError(f"'{word}' expects a name and a value", lineno)
+                    self.symbols[operands[0]] = evaluate(operands[1], self.symbols)
+                elif directive == ".macro":
+                    end = self._block(lines, i - 1, ".endm")
+                    self._define(args, lineno, lines[i:end])
+                    i = end + 1
+                elif directive == ".rept":
+                    end = self._block(lines, i - 1, ".endr")
+                    count = evaluate(args, self.symbols)
+                    if count < 0:
+                        raise AsmSyntaxError(f"'.rept' count {count} is negative", lineno)
+                    for _ in range(count):
+                        self.run(lines[i:end], stack)
+                    i = end + 1
+                elif directive == ".irp":
+                    end = self._block(lines, i - 1, ".endr")
+                    name, values = (re.split(r"[\s,]+", args, maxsplit=1) + [""])[:2]
+                    if not re.fullmatch(r"\w+", name):
+                        raise AsmSyntaxError(f"'{word}' expects a parameter name", lineno)
+                    for value in split_operands(values):
+                        self.run(_bind(lines[i:end], {name: value}), stack)
+                    i = end + 1
+                elif directive.startswith("."):
+                    raise AsmSyntaxError(f"Unknown or unmatched directive '{word}'", lineno)
+                elif directive in self.macros:
+                    self._expand_macro(self.macros[directive], split_operands(args), lineno, stack)
+                elif unbound := _PARAM_RE.search(code):
+                    raise AsmSyntaxError(f"Unknown macro parameter '{unbound.group()}'", lineno)
+                else:
+                    code = substitute(code.replace("\\()", ""), self.symbols)
+                    self.out.append(SourceLine(code, lineno, stack))
+            except ValueError as exc:
+                error = exc if isinstance(exc, AsmSyntaxError) else AsmSyntaxError(str(exc), lineno)
+                # the innermost expansion names every macro invocation
+                if stack and not getattr(error, "__notes__", None):
+                    error.add_note("expanded from line " + ", line ".join(str(n + 1) for n in reversed(stack)))
+                raise error from None
+
+
+def preprocess(source: str | Iterable[str]) -> list[SourceLine]:
+    """
+    Expand directives and macros and evaluate expressions.
+
+    Raises:
+        AsmSyntaxError: for a malformed directive, macro invocation or
+            expression.
+    """
+    lines = source.splitlines() if isinstance(source, str) else [line.rstrip("\n") for line in source]
+    expander = _Expander()
+    expander.run([(text, lineno) for lineno, text in enumerate(lines)])
+    return expander.out
+
+
+def uses_directives(lines: Iterable[str]) -> bool:
+    """Whether any line is a directive, i.e. whether the text needs preprocess()."""
+    return any(strip_comment(line).startswith(".") for line in lines)
@@ -8,16 +8,18 @@ Usage:
 Options:
     -p, --program   Program
     --out-hex       Output File (hex)
-    --out-hex       Output File (binary)
+    --out-bin       Output File (binary)
+
+To assemble many files at once, use scripts/assemble_batch.py.
 """
 
 import argparse
 import npu_model
-import struct
 
 from npu_model.configs.programs import *  # noqa: F401, F403
 from npu_model.configs.hardware import *  # noqa: F401, F403
 from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.util.assembler import write_bin, write_hex
 from npu_model.util.converter import input_to_program
 
 def main():
@@ -67,15 +69,11 @@ Examples:
     code = program.assemble()
 
     if args.out_hex:
-        with open(args.out_hex, "w") as f:
-            for word in code:
-                f.write(f"{word & 0xFFFFFFFF:08x}\n")
+        write_hex(args.out_hex, code)
         print(f"Wrote {len(code)} words to {args.out_hex}")
 
     if args.out_bin:
-        with open(args.out_bin, "wb") as f:
-            for word in code:
-                f.write(struct.pack("<I", word & 0xFFFFFFFF))
+        write_bin(args.out_bin, code)
         print(f"Wrote {len(code)} words ({len(code) * 4} bytes) to {args.out_bin}")
 
     if not args.out_hex and not args.out_bin:
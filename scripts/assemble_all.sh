@@ -1,13 +1,9 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-ASM_DIR="npu_model/configs/programs/asm"
-BIN_DIR="npu_model/configs/programs/bin"
-HEX_DIR="npu_model/configs/programs/hex"
-
-for f in "$ASM_DIR"/*.S; do
-    name=$(basename "$f" .S)
-    uv run scripts/assemble.py -p "$f" \
-        --out-bin "$BIN_DIR/$name.bin" \
-        --out-hex "$HEX_DIR/$name.hex"
-done
+# Assembles every kernel in one process; only stale outputs are rewritten.
+exec uv run scripts/assemble_batch.py \
+    npu_model/configs/programs/asm \
+    --bin-dir npu_model/configs/programs/bin \
+    --hex-dir npu_model/configs/programs/hex \
+    "$@"
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+NPU Performance Model - Batch Assembler
+
+Assembles a directory of .S files, or a list of files, in one process with a
+worker pool.  Outputs are only rewritten when the source (or the assembler
+itself) changed since the last run.
+
+Usage:
+    uv run scripts/assemble_batch.py [sources ...] [options]
+
+    sources  .S files or directories of them
+             (default: npu_model/configs/programs/asm)
+
+Options:
+    --bin-dir        Output directory for .bin files (default: npu_model/configs/programs/bin)
+    --hex-dir        Output directory for .hex files (default: npu_model/configs/programs/hex)
+    --workers        Parallel workers (default: number of CPUs)
+    --force          Re-assemble every file
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from npu_model.util.assembler import assemble_batch
+
+PROGRAMS = Path("npu_model/configs/programs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Assemble many NPU kernels at once.")
+    parser.add_argument("sources", nargs="*", type=Path, default=[PROGRAMS / "asm"],
+                        help=".S files or directories of them")
+    parser.add_argument("--bin-dir", type=Path, default=PROGRAMS / "bin")
+    parser.add_argument("--hex-dir", type=Path, default=PROGRAMS / "hex")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parallel workers (default: number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="Re-assemble every file")
+    args = parser.parse_args()
+
+    sources: list[Path] = []
+    for path in args.sources:
+        if path.is_dir():
+            sources.extend(sorted(path.glob("*.S")))
+        elif path.exists():
+            sources.append(path)
+        else:
+            print(f"Source not found: {path}")
+            raise SystemExit(1)
+
+    start = time.perf_counter()
+    results = assemble_batch(sources, args.bin_dir, args.hex_dir,
+                             workers=args.workers, force=args.force)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if result.error:
+            print(f"  FAILED  {result.source}: {result.error}")
+        elif not result.skipped:
+            print(f"  {result.seconds * 1000:7.1f} ms  {result.words:>5} words  {result.source}")
+    built = sum(not r.skipped and not r.error for r in results)
+    skipped = sum(r.skipped for r in results)
+    failed = sum(bool(r.error) for r in results)
+    print(f"{built} assembled, {skipped} up to date, {failed} failed in {elapsed:.2f} s")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+NPU Performance Model - Kernel Autotuner
+
+Generates every schedule of the tiled matmul (loop order, cached group size,
+MXU assignment) or of fused attention (MXU per matmul, buffering) for each
+requested shape, prunes them with an analytical bound, simulates the
+survivors in parallel and records the fastest in a JSON tuning database.
+Shapes already in the database are not re-tuned.
+
+Usage:
+    uv run scripts/autotune.py MxKxN [MxKxN ...] [options]
+    uv run scripts/autotune.py --kernel attention QxK[xD] [QxK[xD] ...] [options]
+
+Options:
+    --kernel         matmul (shapes MxKxN, the default) or attention (shapes
+                     Q_ROWSxK_SEQ with an optional xHEAD_DIM, default 64)
+    --db             Tuning database path (default: reports/tuning_db.json)
+    --keep           Variants to simulate per shape (default: 4)
+    --workers        Parallel simulations (default: number of CPUs)
+    --hardware       HardwareConfig class name
+    -o, --output     Write the best kernel of the last shape as assembly
+"""
+
+import argparse
+from pathlib import Path
+
+# hardware must be imported before programs to avoid circular import
+import npu_model.hardware  # noqa: F401
+import npu_model.configs.hardware as hw_configs
+from npu_model.autotune import TuningDatabase, tune_attention, tune_matmul
+from npu_model.util.converter import format_instruction
+
+
+def _shape(text: str) -> tuple[int, ...]:
+    try:
+        return tuple(int(dim) for dim in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected dimensions joined by 'x', got {text!r}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Autotune generated NPU kernels.")
+    parser.add_argument("shapes", nargs="+", type=_shape,
+                        help="Shapes as MxKxN (matmul) or QxK[xD] (attention)")
+    parser.add_argument("--kernel", choices=("matmul", "attention"), default="matmul")
+    parser.add_argument("--db", default="reports/tuning_db.json", help="Tuning database path")
+    parser.add_argument("--keep", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parallel simulations (default: number of CPUs)")
+    parser.add_argument("--hardware", default="DefaultHardwareConfig",
+                        help="HardwareConfig class name")
+    parser.add_argument("-o", "--output", metavar="PATH",
+                        help="Write the best kernel of the last shape as assembly")
+    args = parser.parse_args()
+
+    hw_cls = getattr(hw_configs, args.hardware, None)
+    if hw_cls is None:
+        print(f"Unknown hardware config '{args.hardware}'.")
+        raise SystemExit(1)
+    hardware_config = hw_cls()
+
+    Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+    database = TuningDatabase(args.db)
+    result = None
+    for shape in args.shapes:
+        name = "x".join(map(str, shape))
+        try:
+            if args.kernel == "matmul" and len(shape) == 3:
+                result = tune_matmul(*shape, hardware_config, database=database,
+                                     keep=args.keep, workers=args.workers)
+            elif args.kernel == "attention" and len(shape) in (2, 3):
+                q_rows, k_seq, *head_dim = shape
+                result = tune_attention(q_rows, k_seq, hardware_config, *head_dim, database=database,
+                                        keep=args.keep, workers=args.workers)
+            else:
+                print(f"Cannot tune {name}: wrong number of dimensions for {args.kernel}")
+                raise SystemExit(1)
+        except ValueError as exc:
+            print(f"Cannot tune {name}: {exc}")
+            raise SystemExit(1)
+        source = "database" if result.cached else f"{len(result.candidates)} variants"
+        print(f"{result.key}: {result.variant.label}, {result.cycles:,} cycles ({source})")
+        for candidate in result.candidates:
+            simulated = "pruned" if candidate.cycles is None and not candidate.error else (
+                candidate.error or f"{candidate.cycles:,}")
+            print(f"    {candidate.variant.label:<20} bound {candidate.estimate:>9,}  "
+                  f"predicted {candidate.predicted or 0:>9,}  simulated {simulated}")
+
+    if args.output and result is not None:
+        Path(args.output).write_text(
+            "".join(format_instruction(insn) + "\n" for insn in result.program.instructions)
+        )
+        print(f"Kernel: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+NPU Performance Model - Static Estimate Accuracy
+
+Compares the static cycle estimate (npu_model.estimator) of every program in
+the registry (or the ones named) with its simulated cycle count.
+
+Usage:
+    uv run scripts/estimate_accuracy.py [programs ...] [options]
+
+Options:
+    --hardware       HardwareConfig class name (default: DefaultHardwareConfig)
+    --max-cycles     Maximum cycles to simulate per program
+    --max-error      Exit non-zero if any estimate is off by more than this
+                     fraction of the simulated cycles (e.g. 0.25)
+"""
+
+import argparse
+
+# hardware must be imported before programs to avoid circular import
+import npu_model.hardware  # noqa: F401
+import npu_model.configs.programs as programs
+import npu_model.configs.hardware as hw_configs
+from npu_model.estimator import EstimateAccuracy, compare_with_simulation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Static estimate vs. simulation for NPU kernels.")
+    parser.add_argument("programs", nargs="*", help="Program class names (default: all)")
+    parser.add_argument("--hardware", default="DefaultHardwareConfig",
+                        help="HardwareConfig class name")
+    parser.add_argument("--max-cycles", type=int, default=200000)
+    parser.add_argument("--max-error", type=float, default=None,
+                        help="Fail if |estimate - simulated| / simulated exceeds this")
+    args = parser.parse_args()
+
+    hw_cls = getattr(hw_configs, args.hardware, None)
+    if hw_cls is None:
+        print(f"Unknown hardware config '{args.hardware}'.")
+        raise SystemExit(1)
+
+    names = args.programs or sorted(getattr(programs, "__all__", []))
+    results: list[tuple[str, EstimateAccuracy]] = []
+    print(f"Hardware: {args.hardware}")
+    print(f"{'program':<44} {'estimate':>10} {'simulated':>10} {'error':>8}  notes")
+    for name in names:
+        program_cls = getattr(programs, name, None)
+        if program_cls is None:
+            print(f"Unknown program '{name}', skipping.")
+            continue
+        try:
+            accuracy = compare_with_simulation(program_cls(), hw_cls(), args.max_cycles)
+        except Exception as exc:
+            print(f"{name:<44} failed ({type(exc).__name__}: {exc})")
+            continue
+        results.append((name, accuracy))
+        estimate = accuracy.estimate
+        notes = "" if estimate.exact_control_flow else f"{estimate.unresolved_branches} unresolved branches"
+        print(
+            f"{name:<44} {estimate.cycles:>10,} {accuracy.simulated:>10,} "
+            f"{accuracy.error:>+8.1%}  {notes}"
+        )
+
+    if results:
+        mean = sum(abs(a.error) for _, a in results) / len(results)
+        worst_name, worst = max(results, key=lambda r: abs(r[1].error))
+        print(f"\nmean |error| {mean:.1%}, worst {worst_name} ({worst.error:+.1%})")
+        if args.max_error is not None and abs(worst.error) > args.max_error:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+NPU Performance Model - Matmul DMA Overlap
+
+Generates a double-buffered M×K×N matmul with npu_model.kernels, runs it next
+to the hand-written 64×64×64 kernel (ParameterizedMatmulProgram) and reports
+how many DMA cycles each hides behind the MXUs.
+
+Usage:
+    uv run scripts/matmul_overlap.py [options]
+
+Options:
+    -M, -K, -N       Matrix dimensions, multiples of 32 (default: 64)
+    --order          mn (cache A, stream B) or nm (cache B, stream A) (default: mn)
+    --reuse          Tiles per cached group, 1 or 2 (default: 1)
+    --mxus           MXUs to deal streamed tiles to, e.g. 1 or 0,1 (default: 1)
+    --max-cycles     Maximum cycles to simulate each kernel
+    --hardware       HardwareConfig class name
+    -o, --output     Write the generated kernel as assembly to this file
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+# hardware must be imported before programs to avoid circular import
+import npu_model.hardware  # noqa: F401
+import npu_model.configs.hardware as hw_configs
+from npu_model.configs.programs.parameterized_matmul import (
+    ParameterizedMatmulProgram,
+    _make_program,
+)
+from npu_model.kernels import MatmulVariant, double_buffered_matmul, measure_overlap
+from npu_model.logging import LoggerConfig
+from npu_model.simulation import Simulation
+from npu_model.software.program import InstantiableProgram, Program
+from npu_model.util.converter import format_instruction
+
+
+def _run(program: Program, hardware_config, max_cycles: int) -> Simulation:
+    sim = Simulation(
+        hardware_config=hardware_config,
+        logger_config=LoggerConfig(filename=os.devnull),
+        program=program,
+        verbose=False,
+        record_timeline=True,
+    )
+    sim.run(max_cycles=max_cycles)
+    if not sim.core.is_finished():
+        print(f"{type(program).__name__} did not finish within {max_cycles:,} cycles")
+        raise SystemExit(1)
+    return sim
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare DMA/MXU overlap of matmul kernels.")
+    parser.add_argument("-M", type=int, default=64)
+    parser.add_argument("-K", type=int, default=64)
+    parser.add_argument("-N", type=int, default=64)
+    parser.add_argument("--order", default="mn", choices=("mn", "nm"))
+    parser.add_argument("--reuse", type=int, default=1)
+    parser.add_argument("--mxus", default="1", help="Comma-separated MXU indices")
+    parser.add_argument("--max-cycles", type=int, default=1_000_000)
+    parser.add_argument("--hardware", default="DefaultHardwareConfig",
+                        help="HardwareConfig class name")
+    parser.add_argument("-o", "--output", metavar="PATH",
+                        help="Write the generated kernel as assembly to this file")
+    args = parser.parse_args()
+
+    hw_cls = getattr(hw_configs, args.hardware, None)
+    if hw_cls is None:
+        print(f"Unknown hardware config '{args.hardware}'.")
+        raise SystemExit(1)
+    hardware_config = hw_cls()
+
+    try:
+        variant = MatmulVariant(
+            order=args.order,
+            reuse=args.reuse,
+            mxus=tuple(int(mxu) for mxu in args.mxus.split(",")),
+        )
+        instructions = double_buffered_matmul(args.M, args.K, args.N, hardware_config, variant=variant)
+    except ValueError as exc:
+        print(f"Cannot generate the kernel: {exc}")
+        raise SystemExit(1)
+    generated = InstantiableProgram(instructions)
+    generated.memory_regions = _make_program(args.M, args.K, args.N, seed=0)[0]
+
+    if args.output:
+        Path(args.output).write_text("".join(format_instruction(insn) + "\n" for insn in instructions))
+        print(f"Kernel      : {args.output}")
+
+    runs = [(f"{variant.label} {args.M}x{args.K}x{args.N}", generated)]
+    if (args.M, args.K, args.N) == (64, 64, 64):
+        runs.insert(0, ("hand-written 64x64x64", ParameterizedMatmulProgram()))
+    for label, program in runs:
+        sim = _run(program, hardware_config, args.max_cycles)
+        print(f"{label:<28}: {measure_overlap(sim).format()}")
+        sim.close()
+
+
+if __name__ == "__main__":
+    main()
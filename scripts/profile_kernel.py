@@ -13,6 +13,11 @@ Options:
     --max-cycles     Maximum cycles to simulate
     --hardware       HardwareConfig class name
     --list           List all available Python programs and exit
+    --profile-host   Also report where the simulator spends host time
+    --timeline-npz   Save the per-unit activity timeline to an .npz file
+    --metrics-jsonl  Stream periodic metrics snapshots to a JSON Lines file
+    --metrics-prom   Keep a Prometheus text file with the latest metrics snapshot
+    --metrics-interval  Simulated cycles between metrics snapshots (default: 10000)
 """
 
 import argparse
@@ -23,8 +28,9 @@ import npu_model.hardware  # noqa: F401
 import npu_model.configs.programs as programs
 import npu_model.configs.hardware as hw_configs
 from npu_model.logging import LoggerConfig
+from npu_model.metrics import JsonlMetricsSink, MetricsSink, PrometheusMetricsSink
 from npu_model.simulation import Simulation
-from npu_model.profiling import print_stats
+from npu_model.profiling import print_host_profile, print_stats
 from npu_model.util.converter import load_asm
 from npu_model.software.program import InstantiableProgram
 
@@ -39,6 +45,16 @@ def main() -> None:
                         help="HardwareConfig class name")
     parser.add_argument("--list", action="store_true",
                         help="List all available programs and exit")
+    parser.add_argument("--profile-host", action="store_true",
+                        help="Report host wall time per simulator component and mnemonic")
+    parser.add_argument("--timeline-npz", metavar="PATH",
+                        help="Save the per-unit activity timeline to an .npz file")
+    parser.add_argument("--metrics-jsonl", metavar="PATH",
+                        help="Stream periodic metrics snapshots to a JSON Lines file")
+    parser.add_argument("--metrics-prom", metavar="PATH",
+                        help="Keep a Prometheus text file with the latest metrics snapshot")
+    parser.add_argument("--metrics-interval", type=int, default=10000,
+                        help="Simulated cycles between metrics snapshots (default: 10000)")
     args = parser.parse_args()
 
     if args.list or args.program is None:
@@ -74,15 +90,30 @@ def main() -> None:
         print(f"Hardware: {args.hardware}")
         print()
 
+        sinks: list[MetricsSink] = []
+        if args.metrics_jsonl:
+            sinks.append(JsonlMetricsSink(args.metrics_jsonl))
+        if args.metrics_prom:
+            sinks.append(PrometheusMetricsSink(args.metrics_prom))
+
         sim = Simulation(
             hardware_config=hw_cls(),
             logger_config=LoggerConfig(filename=args.output),
             program=prog,
             verbose=False,
             record_timeline=True,
+            record_graph=True,
+            profile_host=args.profile_host,
+            metrics_sinks=sinks,
+            metrics_interval=args.metrics_interval,
         )
         sim.run(max_cycles=args.max_cycles)
         print_stats(sim)
+        if args.profile_host:
+            print_host_profile(sim)
+        if args.timeline_npz and sim.timeline is not None:
+            sim.timeline.save(args.timeline_npz)
+            print(f"Timeline: {args.timeline_npz}")
         print(f"Trace   : {args.output}  (open at https://ui.perfetto.dev or https://www.speedscope.app)")
     finally:
         if sim is not None:
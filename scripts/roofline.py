@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+NPU Performance Model - Roofline Report
+
+Runs every program in the registry (or the ones named) and places each on
+the roofline of the selected hardware configuration.
+
+Usage:
+    uv run scripts/roofline.py [programs ...] [options]
+
+Options:
+    --hardware       HardwareConfig class name (default: DefaultHardwareConfig)
+    --max-cycles     Maximum cycles to simulate per program
+    --csv            Also write the table to a CSV file
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import tempfile
+
+# hardware must be imported before programs to avoid circular import
+import npu_model.hardware  # noqa: F401
+import npu_model.configs.programs as programs
+import npu_model.configs.hardware as hw_configs
+from npu_model.logging import LoggerConfig
+from npu_model.roofline import RooflinePoint, print_roofline, roofline_peaks, roofline_point
+from npu_model.simulation import Simulation
+
+
+def _run(name: str, hw_cls, max_cycles: int) -> RooflinePoint:
+    program = getattr(programs, name)()
+    with tempfile.TemporaryDirectory() as tmp:
+        sim = Simulation(
+            hardware_config=hw_cls(),
+            logger_config=LoggerConfig(filename=os.path.join(tmp, "trace.json")),
+            program=program,
+            verbose=False,
+        )
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                sim.run(max_cycles=getattr(program, "kernel_max_cycles", max_cycles))
+            return roofline_point(sim, name)
+        finally:
+            sim.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Roofline report for NPU kernels.")
+    parser.add_argument("programs", nargs="*", help="Program class names (default: all)")
+    parser.add_argument("--hardware", default="DefaultHardwareConfig",
+                        help="HardwareConfig class name")
+    parser.add_argument("--max-cycles", type=int, default=200000)
+    parser.add_argument("--csv", help="Write the table to this CSV file")
+    args = parser.parse_args()
+
+    hw_cls = getattr(hw_configs, args.hardware, None)
+    if hw_cls is None:
+        print(f"Unknown hardware config '{args.hardware}'.")
+        raise SystemExit(1)
+
+    names = args.programs or sorted(getattr(programs, "__all__", []))
+    points: list[RooflinePoint] = []
+    for name in names:
+        if getattr(programs, name, None) is None:
+            print(f"Unknown program '{name}', skipping.")
+            continue
+        try:
+            points.append(_run(name, hw_cls, args.max_cycles))
+        except Exception as exc:
+            print(f"{name}: failed ({type(exc).__name__}: {exc})")
+
+    print(f"Hardware: {args.hardware}")
+    print_roofline(points, roofline_peaks(hw_cls()))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([
+                "kernel", "cycles", "mxu_macs", "vpu_element_ops", "dma_bytes",
+                "arithmetic_intensity", "sol_cycles", "bound", "sol_fraction",
+            ])
+            for point in points:
+                writer.writerow([
+                    point.name, point.cycles, point.mxu_macs, point.vpu_element_ops,
+                    point.dma_bytes, point.arithmetic_intensity, point.sol_cycles,
+                    point.bound, point.sol_fraction,
+                ])
+        print(f"Wrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+NPU Performance Model - Kernel Scheduler
+
+Reorders a kernel to overlap MXU, VPU, DMA and LSU work, replaces its
+hand-written delays with the minimal ones the new order needs, and checks
+the result against the golden output in the simulator.
+
+Usage:
+    uv run scripts/schedule_kernel.py [program] [options]
+
+    program  can be a Python program class name (e.g. SmolVLAFusedAttentionProgram)
+             or a path to an assembly file (e.g. npu_model/configs/programs/asm/smolvla_gelu_tanh.S)
+
+Options:
+    -o, --output     Write the scheduled kernel as assembly to this file
+    --max-cycles     Maximum cycles to simulate each version
+    --hardware       HardwareConfig class name
+    --no-verify      Only schedule; skip simulating the two versions
+"""
+
+import argparse
+from pathlib import Path
+
+# hardware must be imported before programs to avoid circular import
+import npu_model.hardware  # noqa: F401
+import npu_model.configs.programs as programs
+import npu_model.configs.hardware as hw_configs
+from npu_model.scheduler import schedule_program, verify_schedule
+from npu_model.software.program import InstantiableProgram
+from npu_model.util.converter import format_instruction, load_asm
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Schedule an NPU kernel.")
+    parser.add_argument("program", help="Program class name or .S file path")
+    parser.add_argument("-o", "--output", metavar="PATH",
+                        help="Write the scheduled kernel as assembly to this file")
+    parser.add_argument("--max-cycles", type=int, default=200000)
+    parser.add_argument("--hardware", default="DefaultHardwareConfig",
+                        help="HardwareConfig class name")
+    parser.add_argument("--no-verify", action="store_true",
+                        help="Skip simulating the original and scheduled kernels")
+    args = parser.parse_args()
+
+    hw_cls = getattr(hw_configs, args.hardware, None)
+    if hw_cls is None:
+        print(f"Unknown hardware config '{args.hardware}'.")
+        raise SystemExit(1)
+
+    asm_path = Path(args.program)
+    if asm_path.suffix == ".S":
+        if not asm_path.exists():
+            print(f"Assembly file not found: {asm_path}")
+            raise SystemExit(1)
+        prog = InstantiableProgram(load_asm(asm_path))
+    else:
+        prog_cls = getattr(programs, args.program, None)
+        if prog_cls is None:
+            print(f"Unknown program '{args.program}'.")
+            raise SystemExit(1)
+        prog = prog_cls()
+
+    hardware_config = hw_cls()
+    try:
+        scheduled = schedule_program(prog, hardware_config)
+    except ValueError as exc:
+        print(f"Cannot schedule {args.program}: {exc}")
+        raise SystemExit(1)
+
+    delays = sum(insn.mnemonic == "delay" for insn in scheduled.instructions)
+    print(f"Program     : {args.program}")
+    print(f"Instructions: {len(prog.instructions)} -> {len(scheduled.instructions)} ({delays} delays)")
+
+    if args.output:
+        Path(args.output).write_text(
+            "".join(format_instruction(insn) + "\n" for insn in scheduled.instructions)
+        )
+        print(f"Scheduled   : {args.output}")
+
+    if args.no_verify:
+        return
+    result = verify_schedule(prog, scheduled, hardware_config, max_cycles=args.max_cycles)
+    print(f"Cycles      : {result.original_cycles:,} -> {result.scheduled_cycles:,} "
+          f"({result.cycles_saved:+,} saved, {result.speedup:.2f}x)")
+    if result.golden_match is None:
+        print("Golden      : none")
+    else:
+        status = "match" if result.golden_match else "MISMATCH"
+        print(f"Golden      : {status} (max abs error {result.max_abs_error:.6f})")
+        if not result.golden_match:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+NPU Performance Model - Delay Tuner
+
+Shrinks every `delay` in a kernel to the smallest immediate for which the
+kernel still finishes without bank conflicts and matches its golden result,
+simulating candidate values in parallel.
+
+Usage:
+    uv run scripts/tune_delays.py [program] [options]
+
+    program  can be a Python program class name (e.g. SmolVLAGeluTanhProgram)
+             or a path to an assembly file (e.g. npu_model/configs/programs/asm/smolvla_gelu_tanh.S)
+
+Options:
+    -o, --output     Write the tightened kernel as assembly to this file
+    --max-cycles     Maximum cycles to simulate the untuned kernel
+    --hardware       HardwareConfig class name
+    --workers        Parallel simulations (default: number of CPUs)
+"""
+
+import argparse
+from pathlib import Path
+
+# hardware must be imported before programs to avoid circular import
+import npu_model.hardware  # noqa: F401
+import npu_model.configs.programs as programs
+import npu_model.configs.hardware as hw_configs
+from npu_model.delay_tuner import minimize_delays
+from npu_model.software.program import InstantiableProgram
+from npu_model.util.converter import format_instruction, load_asm
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Minimize the delays of an NPU kernel.")
+    parser.add_argument("program", help="Program class name or .S file path")
+    parser.add_argument("-o", "--output", metavar="PATH",
+                        help="Write the tightened kernel as assembly to this file")
+    parser.add_argument("--max-cycles", type=int, default=None)
+    parser.add_argument("--hardware", default="DefaultHardwareConfig",
+                        help="HardwareConfig class name")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parallel simulations (default: number of CPUs)")
+    args = parser.parse_args()
+
+    hw_cls = getattr(hw_configs, args.hardware, None)
+    if hw_cls is None:
+        print(f"Unknown hardware config '{args.hardware}'.")
+        raise SystemExit(1)
+
+    asm_path = Path(args.program)
+    if asm_path.suffix == ".S":
+        if not asm_path.exists():
+            print(f"Assembly file not found: {asm_path}")
+            raise SystemExit(1)
+        prog = InstantiableProgram(load_asm(asm_path))
+    else:
+        prog_cls = getattr(programs, args.program, None)
+        if prog_cls is None:
+            print(f"Unknown program '{args.program}'.")
+            raise SystemExit(1)
+        prog = prog_cls()
+
+    try:
+        result = minimize_delays(prog, hw_cls(), max_cycles=args.max_cycles, workers=args.workers)
+    except ValueError as exc:
+        print(f"Cannot tune {args.program}: {exc}")
+        raise SystemExit(1)
+
+    print(f"Program    : {args.program}")
+    print(f"Simulations: {result.simulations}")
+    print()
+    print(f"{'Index':>6}  {'Delay':>6}  {'Tuned':>6}")
+    for change in result.changes:
+        print(f"{change.index:>6}  {change.original:>6}  {change.tuned:>6}")
+    print()
+    print(f"Cycles     : {result.original_cycles:,} -> {result.tuned_cycles:,} "
+          f"({result.cycles_saved:,} saved)")
+
+    if args.output:
+        Path(args.output).write_text(
+            "".join(format_instruction(insn) + "\n" for insn in result.program.instructions)
+        )
+        print(f"Tightened  : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+NPU Performance Model - Metrics Watcher
+
+Follows a metrics file written by a running simulation (profile_kernel.py
+--metrics-jsonl, or any Simulation with a JsonlMetricsSink) and prints
+simulator throughput as snapshots arrive.  Exits with status 2 if the kernel
+looks hung: no instruction retired for --hang-cycles simulated cycles, or no
+new snapshot for --stale-seconds of host time.
+
+Usage:
+    uv run scripts/watch_metrics.py metrics.jsonl [options]
+
+Options:
+    --hang-cycles    Simulated cycles without retirement that count as a hang (default: 100000)
+    --stale-seconds  Host seconds without a new snapshot that count as a hang (default: 60)
+    --poll           Seconds between polls of the file (default: 1.0)
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from npu_model.metrics import MetricsSnapshot
+
+
+def _format(snapshot: MetricsSnapshot) -> str:
+    busiest = max(snapshot.exu_utilization.items(), key=lambda item: item[1], default=("-", 0.0))
+    return (
+        f"cycle {snapshot.cycle:>12,}  instr {snapshot.instructions:>10,}  "
+        f"ipc {snapshot.ipc:5.3f}  {snapshot.cycles_per_second:>10,.0f} cyc/s  "
+        f"dma {snapshot.dma_bytes:>12,} B  busiest {busiest[0]} {busiest[1]:.0%}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Watch simulator metrics snapshots.")
+    parser.add_argument("path", help="JSON Lines file written by JsonlMetricsSink")
+    parser.add_argument("--hang-cycles", type=int, default=100000)
+    parser.add_argument("--stale-seconds", type=float, default=60.0)
+    parser.add_argument("--poll", type=float, default=1.0)
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    while not path.exists():
+        time.sleep(args.poll)
+
+    last_seen = time.time()
+    partial = ""
+    with open(path) as f:
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                if time.time() - last_seen > args.stale_seconds:
+                    print(f"No snapshot for {args.stale_seconds:.0f}s; simulator stalled or killed.")
+                    raise SystemExit(2)
+                time.sleep(args.poll)
+                continue
+            partial += chunk
+            if not partial.endswith("\n"):
+                continue
+            snapshot = MetricsSnapshot(**json.loads(partial))
+            partial = ""
+            last_seen = time.time()
+            print(_format(snapshot))
+            if snapshot.finished:
+                print(f"Finished after {snapshot.host_seconds:.1f}s host time.")
+                return
+            if snapshot.cycles_since_progress >= args.hang_cycles:
+                print(
+                    f"No instruction retired for {snapshot.cycles_since_progress:,} cycles; "
+                    "kernel looks hung."
+                )
+                raise SystemExit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,39 @@ import tempfile
 from contextlib import nullcontext, redirect_stdout
 from dataclasses import replace
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Sequence
 import gc
 
 import torch
 
+from npu_model.configs.isa_definition import ADDI, DELAY, VLI_ALL, VMATPUSH_WEIGHT_MXU0
+from npu_model.isa import Instruction
 from npu_model.logging import LoggerConfig
+from npu_model.metrics import MetricsSink
 from npu_model.simulation import Simulation
+from npu_model.software import Program, m, w, x
 
 
 _ACTIVE_SIMULATIONS: list[Simulation] = []
 
 
+class SerialProgram(Program):
+    """Independent VPU work written after an MXU push, with conservative delays."""
+
+    instructions: list[Instruction] = [
+        VLI_ALL(vd=m(0), imm=0x3F80),
+        DELAY(imm=64),
+        VMATPUSH_WEIGHT_MXU0(vd=w(0), vs1=m(0)),
+        DELAY(imm=31),
+        VLI_ALL(vd=m(2), imm=0x4000),
+        DELAY(imm=64),
+        VLI_ALL(vd=m(3), imm=0x4040),
+        DELAY(imm=64),
+        ADDI(rd=x(1), rs1=x(0), imm=1),
+    ]
+    memory_regions: list[tuple[int, torch.Tensor]] = []
+
+
 def cleanup_tracked_simulations() -> None:
     while _ACTIVE_SIMULATIONS:
         sim = _ACTIVE_SIMULATIONS.pop()
@@ -33,6 +54,10 @@ def run_simulation(
     randomize_init: bool = False,
     init_seed: int = 42,
     record_timeline: bool = False,
+    record_graph: bool = False,
+    profile_host: bool = False,
+    metrics_sinks: Sequence[MetricsSink] = (),
+    metrics_interval: int = 10000,
 ) -> Simulation:
     simulation_hardware_config = hardware_config
     if randomize_init:
@@ -57,6 +82,10 @@ def run_simulation(
             verbose=verbose,
             ignore_runtime_errors=ignore_runtime_errors,
             record_timeline=record_timeline,
+            record_graph=record_graph,
+            profile_host=profile_host,
+            metrics_sinks=metrics_sinks,
+            metrics_interval=metrics_interval,
         )
         _ACTIVE_SIMULATIONS.append(sim)
         if before_run is not None:
@@ -1,7 +1,9 @@
 import io
+import json
 
 from npu_model.configs.isa_definition import *  # noqa: F401, F403
-from npu_model.util.converter import input_to_program
+from npu_model.util.assembler import MANIFEST_NAME, assemble_batch
+from npu_model.util.converter import input_to_program, load_asm
 
 
 def test_li_expands_to_valid_addi_and_lui_addi_sequences() -> None:
@@ -98,3 +100,73 @@ def test_matrix_transfer_and_matmul_parse_correctly() -> None:
     assert mul.vd == 0
     assert mul.vs1 == 5
     assert mul.vs2 == 0
+
+
+def test_csrr_reads_perf_counters_by_name_or_address() -> None:
+    program = input_to_program(
+        io.StringIO(
+            """
+            csrr x5, cycle
+            csrr x6, 0xC82
+            """
+        )
+    )
+
+    cycle, instreth = program.instructions
+    assert isinstance(cycle, CSRRS)
+    assert (cycle.rd, cycle.rs1, cycle.imm) == (5, 0, 0xC00)
+    assert isinstance(instreth, CSRRS)
+    assert instreth.imm == 0xC82
+
+
+def test_batch_assembler_matches_program_assemble_and_skips_fresh_outputs(tmp_path) -> None:
+    source = tmp_path / "kernel.S"
+    source.write_text("li x3, 0x12345\naddi x4, x3, 1\n")
+    bin_dir, hex_dir = tmp_path / "bin", tmp_path / "hex"
+
+    (first,) = assemble_batch([source], bin_dir, hex_dir, workers=1)
+    assert not first.skipped and not first.error
+    expected = [insn.to_bytecode() & 0xFFFFFFFF for insn in load_asm(source)]
+    assert first.words == len(expected)
+    assert (hex_dir / "kernel.hex").read_text().split() == [f"{word:08x}" for word in expected]
+    assert (bin_dir / "kernel.bin").stat().st_size == 4 * len(expected)
+
+    (second,) = assemble_batch([source], bin_dir, hex_dir, workers=1)
+    assert second.skipped
+
+    source.write_text("addi x4, x0, 1\n")
+    (third,) = assemble_batch([source], bin_dir, hex_dir, workers=1)
+    assert not third.skipped and third.words == 1
+
+
+def test_batch_assembler_reports_errors_per_file(tmp_path) -> None:
+    good, bad = tmp_path / "good.S", tmp_path / "bad.S"
+    good.write_text("addi x1, x0, 1\n")
+    bad.write_text("notaninstruction x1\n")
+    results = assemble_batch([good, bad], tmp_path / "bin", None, workers=2)
+    assert not results[0].error
+    assert "Invalid mnemonic" in results[1].error
+
+
+def test_batch_assembler_records_any_failure_per_file(tmp_path) -> None:
+    good, bad = tmp_path / "good.S", tmp_path / "bad.S"
+    good.write_text("addi x1, x0, 1\n")
+    bad.write_text("addi x2, x0, 2\n")
+    (tmp_path / "bin" / "bad.bin").mkdir(parents=True)  # the output cannot be written
+
+    results = assemble_batch([good, bad], tmp_path / "bin", None, workers=1)
+    assert not results[0].error
+    assert results[1].error.startswith("IsADirectoryError")
+
+
+def test_batch_assembler_manifest_tells_same_named_sources_apart(tmp_path) -> None:
+    first, second = tmp_path / "a" / "kernel.S", tmp_path / "b" / "kernel.S"
+    for source, text in ((first, "addi x1, x0, 1\n"), (second, "addi x1, x0, 2\n")):
+        source.parent.mkdir()
+        source.write_text(text)
+    bin_dir = tmp_path / "bin"
+
+    assemble_batch([first], bin_dir, None, workers=1)
+    assemble_batch([second], bin_dir, None, workers=1)
+    manifest = json.loads((bin_dir / MANIFEST_NAME).read_text())
+    assert sorted(manifest) == ["../a/kernel.S", "../b/kernel.S"]
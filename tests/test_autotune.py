@@ -0,0 +1,59 @@
+import torch
+
+from npu_model.autotune import TuningDatabase, estimate_cycles, tune_attention, tune_matmul
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.kernels import AttentionVariant, MatmulVariant, build_matmul
+from npu_model.kernels.library import ATTENTION_TOLERANCE
+from tests.helpers import read_dram_tensor, run_simulation
+
+
+def test_estimate_is_a_lower_bound_on_the_simulated_cycles() -> None:
+    config = DefaultHardwareConfig()
+    result = tune_matmul(64, 64, 64, config, keep=3, workers=1)
+
+    simulated = [c for c in result.candidates if c.cycles is not None]
+    assert len(simulated) == 3
+    assert all(c.estimate <= c.cycles for c in simulated)
+    assert result.cycles == min(c.cycles for c in simulated)
+
+    sim = run_simulation(result.program, config, max_cycles=1_000_000)
+    base, expected = result.program.golden_result
+    assert (read_dram_tensor(sim, base, expected) == expected).all()
+
+
+def test_database_memoizes_the_best_variant(tmp_path) -> None:
+    config = DefaultHardwareConfig()
+    path = tmp_path / "tuning.json"
+    first = tune_matmul(32, 64, 64, config, database=TuningDatabase(path), keep=2, workers=1)
+    assert not first.cached
+
+    second = tune_matmul(32, 64, 64, config, database=TuningDatabase(path))
+    assert second.cached
+    assert second.variant == first.variant
+    assert second.cycles == first.cycles
+    assert second.candidates == []
+
+
+def test_attention_tuning_checks_the_winner_and_memoizes_it(tmp_path) -> None:
+    config = DefaultHardwareConfig()
+    path = tmp_path / "tuning.json"
+    result = tune_attention(32, 64, config, head_dim=32, database=TuningDatabase(path), keep=2, workers=1)
+
+    assert isinstance(result.variant, AttentionVariant)
+    assert len(result.candidates) == 8
+    assert result.cycles == min(c.cycles for c in result.candidates if c.cycles is not None)
+    sim = run_simulation(result.program, config, max_cycles=1_000_000)
+    base, expected = result.program.golden_result
+    rtol, atol = ATTENTION_TOLERANCE
+    assert torch.allclose(read_dram_tensor(sim, base, expected).float(), expected.float(), rtol=rtol, atol=atol)
+
+    cached = tune_attention(32, 64, config, head_dim=32, database=TuningDatabase(path))
+    assert cached.cached and cached.variant == result.variant
+
+
+def test_reuse_halves_the_streamed_traffic() -> None:
+    config = DefaultHardwareConfig()
+    single = build_matmul(128, 64, 64, config, variant=MatmulVariant(reuse=1))
+    paired = build_matmul(128, 64, 64, config, variant=MatmulVariant(reuse=2))
+    assert sum(paired.transfer_bytes) < sum(single.transfer_bytes)
+    assert estimate_cycles(paired) <= estimate_cycles(single)
@@ -3,9 +3,9 @@ from typing import List, Tuple
 import pytest
 import torch
 
-from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.hardware import DefaultHardwareConfig, InterlockedHardwareConfig
 from npu_model.configs.isa_definition import *  # noqa: F401, F403
-from npu_model.hardware.bank_conflict import BankConflictError
+from npu_model.hardware.bank_conflict import BankConflictChecker, BankConflictError
 from npu_model.isa import Instruction
 from npu_model.software import Program, acc, m, w, x
 from tests.helpers import run_simulation
@@ -131,3 +131,47 @@ def test_conflicting_programs_fail(program: Program, expected_exception) -> None
 )
 def test_non_conflicting_programs_execute(program: Program) -> None:
     run_simulation(program, DefaultHardwareConfig(), max_cycles=500)
+
+
+@pytest.mark.parametrize(
+    ("program", "bank", "waiting_unit"),
+    [
+        (_MrfConflictProgram(), "mrf[0]", "Matrix0"),
+        (_VmemConflictProgram(), "vmem[0]", "LSU"),
+    ],
+    ids=["MrfBankConflict", "VmemBankConflict"],
+)
+def test_stall_policy_waits_for_busy_banks(program: Program, bank: str, waiting_unit: str) -> None:
+    sim = run_simulation(program, InterlockedHardwareConfig(), max_cycles=5000)
+    stats = sim.get_stats()
+
+    assert stats.exu_stats[waiting_unit].instructions == 1
+    assert stats.bank_stall_cycles[bank] > 0
+
+
+@pytest.mark.parametrize(
+    "program",
+    [_WeightBufConflictProgram(), _AccBufConflictProgram()],
+    ids=["WeightBufSchedulingViolation", "AccBufSchedulingViolation"],
+)
+def test_stall_policy_waits_for_busy_units(program: Program) -> None:
+    sim = run_simulation(program, InterlockedHardwareConfig(), max_cycles=5000)
+    stats = sim.get_stats()
+
+    assert stats.total_instructions == len(program.instructions)
+    assert stats.structural_stall_cycles["Matrix0"] > 0
+    assert stats.cpi_stack is not None
+    assert stats.cpi_stack.categories["structural"] == stats.structural_stall_cycles["Matrix0"]
+
+
+def test_stall_policy_acquires_all_banks_or_none() -> None:
+    checker = BankConflictChecker("stall")
+
+    assert checker.acquire("a", mrf=frozenset({1}), vmem=frozenset({3}))
+    assert not checker.acquire("b", mrf=frozenset({2}), vmem=frozenset({3}))
+    assert checker.acquire("c", mrf=frozenset({2}))
+    assert dict(checker.stall_cycles) == {("vmem", 3): 1}
+    assert checker.stall_cycles_by_resource() == {"vmem": 1}
+
+    with pytest.raises(ValueError):
+        BankConflictChecker("ignore")
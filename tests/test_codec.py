@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from npu_model.codec import Codec, decode_program, decode_word, encode_program, validate_program
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.isa import Instruction, IsaSpec
+from npu_model.software import m, x
+
+
+# dma.config.chN x0 has the encoding of dma.wait.chN, which decodes first
+_ALIASES = {f"dma.config.ch{n}": f"dma.wait.ch{n}" for n in range(8)}
+
+
+def _decodes_as(insn: Instruction) -> type[Instruction]:
+    if insn.mnemonic in _ALIASES and not any(vars(insn).values()):
+        return IsaSpec.operations[_ALIASES[insn.mnemonic]]
+    return type(insn)
+
+
+def _operands(codec: Codec) -> list[list[int]]:
+    """Smallest and largest value each operand's field takes back unchanged."""
+    low: list[int] = []
+    high: list[int] = []
+    for f, typ in zip(codec.operands, codec.types):
+        if f.signed:
+            low.append(max(typ.lower_bound, -(1 << (f.width - 1))))
+            high.append(min(typ.upper_bound, 1 << (f.width - 1)) - 2)
+        else:
+            low.append(0)
+            high.append(min(typ.upper_bound, 1 << f.width) - 1)
+    return [low, high]
+
+
+def _samples() -> list[Instruction]:
+    return [
+        cls.codec.build(*values)
+        for cls in IsaSpec.operations.values()
+        for values in _operands(cls.codec)
+    ]
+
+
+@pytest.mark.parametrize("mnemonic", sorted(IsaSpec.operations))
+def test_every_mnemonic_round_trips(mnemonic: str) -> None:
+    codec = IsaSpec.operations[mnemonic].codec
+    for values in _operands(codec):
+        insn = codec.build(*values)
+        word = insn.to_bytecode()
+        assert 0 <= word < 1 << 32
+        assert word == codec.encode(*values)
+        decoded = decode_word(word)
+        assert decoded.to_bytecode() == word
+        assert type(decoded) is _decodes_as(insn)
+        if type(decoded) is type(insn):
+            assert vars(decoded) == vars(insn)
+
+
+def test_program_encoding_matches_instruction_encoding() -> None:
+    instructions = _samples()
+    words = encode_program(instructions)
+    assert words.dtype == np.uint32
+    assert words.tolist() == [insn.to_bytecode() for insn in instructions]
+
+    decoded = decode_program(words)
+    assert [type(insn) for insn in decoded] == [_decodes_as(insn) for insn in instructions]
+    assert encode_program(decoded).tolist() == words.tolist()
+    assert validate_program(instructions) == []
+
+
+def test_constant_fields_tell_instructions_apart() -> None:
+    assert ADDI(rd=x(1), rs1=x(2), imm=5).to_bytecode() == (5 << 20) | (2 << 15) | (1 << 7) | 0b0010011
+    srai = SRAI(rd=x(1), rs1=x(2), imm=3).to_bytecode()
+    assert srai ^ SRLI(rd=x(1), rs1=x(2), imm=3).to_bytecode() == 0b0100000 << 25
+    assert (ECALL().to_bytecode(), EBREAK().to_bytecode()) == (0x00000073, 0x00100073)
+    # the upper half of the matrix registers keeps its top bit
+    assert decode_word(VADD_BF16(vd=m(2), vs1=m(4), vs2=m(40)).to_bytecode()).vs2 == 40
+
+
+def test_unencodable_operands_are_reported_not_raised() -> None:
+    program = [ADDI(rd=x(1), rs1=x(0), imm=1), JAL(rd=x(1), imm=6), JAL(rd=x(1), imm=7)]
+    assert validate_program(program) == [(2, "jal: imm has bits its encoding cannot hold")]
+
+    with pytest.raises(ValueError, match="not a valid instruction"):
+        decode_program([program[0].to_bytecode(), 0x0000007F | (0x7F << 25)])
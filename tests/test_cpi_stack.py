@@ -0,0 +1,69 @@
+from typing import List, Tuple
+
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.hardware.cycle_accounting import CycleCategory
+from npu_model.isa import Instruction
+from npu_model.software import Program, x
+from tests.helpers import run_simulation
+
+
+class _DelayProgram(Program):
+    instructions: list[Instruction] = [
+        ADDI(rd=x(1), rs1=x(0), imm=1),
+        DELAY(imm=6),
+        ADDI(rd=x(2), rs1=x(0), imm=2),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+class _DmaWaitProgram(Program):
+    instructions: list[Instruction] = [
+        ADDI(rd=x(2), rs1=x(0), imm=1024),
+        DMA_CONFIG_CH0(rs1=x(0)),
+        DMA_WAIT_CH0(),
+        DMA_LOAD_CH0(rd=x(0), rs1=x(0), rs2=x(2)),
+        DMA_WAIT_CH0(),
+        ADDI(rd=x(3), rs1=x(0), imm=3),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = [
+        (0, torch.zeros(1024, dtype=torch.uint8)),
+    ]
+
+
+def test_cpi_stack_accounts_for_every_cycle() -> None:
+    sim = run_simulation(_DelayProgram(), DefaultHardwareConfig(), max_cycles=500)
+    stack = sim.get_stats().cpi_stack
+
+    assert stack is not None
+    assert stack.cycles == sim.cycle_count
+    assert sum(stack.categories.values()) == sim.cycle_count
+    assert stack.categories[CycleCategory.ISSUE] == 3
+    assert stack.instructions == 3
+    assert sum(stack.cpi().values()) == sim.cycle_count / 3
+
+
+def test_delay_cycles_are_attributed_to_the_delay_pc() -> None:
+    sim = run_simulation(_DelayProgram(), DefaultHardwareConfig(), max_cycles=500)
+    stack = sim.get_stats().cpi_stack
+
+    assert stack is not None
+    assert stack.categories[CycleCategory.DELAY] == 6
+    assert stack.by_pc[4][CycleCategory.DELAY] == 6
+    assert stack.mnemonic_at_pc[4] == "delay"
+    assert stack.by_mnemonic["delay"][CycleCategory.DELAY] == 6
+
+
+def test_dma_wait_cycles_are_reported() -> None:
+    sim = run_simulation(_DmaWaitProgram(), DefaultHardwareConfig(), max_cycles=2000)
+    stack = sim.get_stats().cpi_stack
+
+    assert sim.core.arch_state.xrf[3] == 3
+    assert stack is not None
+    assert stack.categories[CycleCategory.DMA_WAIT] > 0
+    waits = [stack.by_pc[pc].get(CycleCategory.DMA_WAIT, 0) for pc in (8, 16)]
+    assert waits[1] > 0
+    assert sum(waits) == stack.categories[CycleCategory.DMA_WAIT]
+    assert sum(stack.categories.values()) == sim.cycle_count
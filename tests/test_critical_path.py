@@ -0,0 +1,72 @@
+from typing import List, Tuple
+
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.critical_path import InstructionNode, analyze_critical_path, find_critical_path
+from npu_model.isa import Instruction
+from npu_model.software import Program, x
+from tests.helpers import run_simulation
+
+
+class _DmaWaitProgram(Program):
+    instructions: list[Instruction] = [
+        ADDI(rd=x(2), rs1=x(0), imm=1024),
+        DMA_CONFIG_CH0(rs1=x(0)),
+        DMA_WAIT_CH0(),
+        DMA_LOAD_CH0(rd=x(0), rs1=x(0), rs2=x(2)),
+        ADDI(rd=x(4), rs1=x(0), imm=4),
+        DMA_WAIT_CH0(),
+        ADDI(rd=x(3), rs1=x(0), imm=3),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = [
+        (0, torch.zeros(1024, dtype=torch.uint8)),
+    ]
+
+
+def _node(index: int, unit: str, dispatch: int, complete: int, preds) -> InstructionNode:
+    return InstructionNode(
+        index=index,
+        uop_id=index,
+        pc=4 * index,
+        mnemonic=f"op{index}",
+        unit=unit,
+        fetch=dispatch,
+        dispatch=dispatch,
+        complete=complete,
+        preds=preds,
+    )
+
+
+def test_critical_path_follows_latest_arriving_edge() -> None:
+    nodes = [
+        _node(0, "Matrix0", 1, 20, []),
+        _node(1, "Scalar0", 2, 4, [(0, "order")]),
+        _node(2, "Vector0", 21, 25, [(1, "order"), (0, "mrf")]),
+    ]
+    path = find_critical_path(nodes)
+
+    assert path.length == 25
+    assert [node.index for node in path.path] == [0, 2]
+    assert sum(segment.cycles for segment in path.segments) == 25
+    assert path.instructions[0].mnemonic == "op0"
+    assert path.instructions[0].execute_cycles == 19
+    assert path.unit_cycles == {"Matrix0": 19, "Vector0": 4}
+    assert path.overlapped_cycles == {"Scalar0": 2}
+
+
+def test_dma_transfer_is_on_the_critical_path() -> None:
+    sim = run_simulation(
+        _DmaWaitProgram(), DefaultHardwareConfig(), max_cycles=2000, record_graph=True
+    )
+    path = analyze_critical_path(sim)
+
+    assert len(path.nodes) == len(_DmaWaitProgram.instructions)
+    assert any(segment.edge == "flag" for segment in path.segments)
+    assert [node.mnemonic for node in path.path][-2:] == ["dma.wait.ch0", "addi"]
+    top = path.instructions[0]
+    assert top.mnemonic == "dma.load.ch0"
+    assert top.unit == "DMA0"
+    assert next(iter(path.unit_cycles)) == "DMA0"
+    assert path.length <= sim.cycle_count + 1
@@ -0,0 +1,43 @@
+from typing import List, Tuple
+
+import pytest
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.delay_tuner import minimize_delays
+from npu_model.hardware.bank_conflict import BankConflictError
+from npu_model.isa import Instruction
+from npu_model.software import Program, m, w, x
+from npu_model.software.program import InstantiableProgram
+from tests.helpers import run_simulation
+
+
+class _PaddedProgram(Program):
+    instructions: list[Instruction] = [
+        VLI_ALL(vd=m(0), imm=0x3F80),
+        DELAY(imm=200),
+        VMATPUSH_WEIGHT_MXU0(vd=w(0), vs1=m(0)),
+        DELAY(imm=100),
+        ADDI(rd=x(1), rs1=x(0), imm=1),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+def test_delays_shrink_to_the_bank_conflict_boundary() -> None:
+    config = DefaultHardwareConfig()
+    result = minimize_delays(_PaddedProgram(), config, max_cycles=2000, workers=2)
+
+    assert [change.index for change in result.changes] == [1, 3]
+    assert result.changes[1].tuned == 0
+    tuned = result.changes[0].tuned
+    assert 0 < tuned < 200
+    assert result.cycles_saved > 200 - tuned
+
+    sim = run_simulation(result.program, config, max_cycles=2000)
+    assert sim.core.arch_state.read_xrf(1) == 1
+
+    tighter = list(result.program.instructions)
+    tighter[1] = DELAY(imm=tuned - 1)
+    with pytest.raises(BankConflictError):
+        run_simulation(InstantiableProgram(tighter), config, max_cycles=2000)
@@ -0,0 +1,66 @@
+import pickle
+
+import pytest
+import torch
+
+from npu_model.codec import decode_program
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.configs.programs.matmul import MatmulProgram
+from npu_model.software import x
+from npu_model.software.program import EncodedProgram, InstantiableProgram
+from tests.helpers import read_dram_tensor, run_simulation
+
+
+def _key(insn) -> tuple[str, int]:
+    return insn.mnemonic, insn.to_bytecode()
+
+
+def test_instructions_survive_encoding() -> None:
+    program = MatmulProgram()
+    encoded = EncodedProgram.from_program(program)
+
+    assert len(encoded) == len(program)
+    assert encoded.assemble() == program.assemble()
+    assert [_key(i) for i in encoded.instructions] == [_key(i) for i in program.instructions]
+    # dma.config.chN x0 has dma.wait.chN's encoding, but keeps its class
+    assert any(insn.mnemonic.startswith("dma.config") for insn in encoded.instructions)
+    # without the class column it decodes like any machine code
+    decoded = EncodedProgram(encoded.words).instructions
+    assert [_key(i) for i in decoded] == [_key(i) for i in decode_program(encoded.words)]
+
+
+def test_instructions_are_built_on_fetch() -> None:
+    encoded = EncodedProgram.from_instructions([ADDI(rd=x(i), rs1=x(0), imm=i) for i in range(1, 9)])
+
+    assert encoded.get_instruction(12) is encoded[3]
+    assert sum(insn is not None for insn in encoded._fetched) == 1
+    assert (encoded[3].rd, encoded[3].rs1, encoded[3].imm) == (4, 0, 4)
+    assert encoded.is_finished(32) and not encoded.is_finished(28)
+
+
+def test_pickles_without_its_instructions() -> None:
+    instructions = [ADDI(rd=x(1), rs1=x(1), imm=i % 2048) for i in range(20_000)]
+    encoded = EncodedProgram.from_instructions(instructions)
+    encoded[0]
+
+    payload = pickle.dumps(encoded)
+    assert len(payload) < len(pickle.dumps(InstantiableProgram(instructions))) // 5
+    restored = pickle.loads(payload)
+    assert _key(restored[19_999]) == _key(instructions[19_999])
+
+
+def test_unencodable_instructions_are_rejected() -> None:
+    with pytest.raises(ValueError, match="Instruction 1 cannot be encoded: jal"):
+        EncodedProgram.from_instructions([ADDI(rd=x(1), rs1=x(0), imm=1), JAL(rd=x(0), imm=3)])
+
+
+def test_simulates_like_the_original() -> None:
+    program = MatmulProgram()
+    config = DefaultHardwareConfig()
+    reference = run_simulation(program, config, max_cycles=20_000)
+    sim = run_simulation(EncodedProgram.from_program(program), config, max_cycles=20_000)
+
+    assert sim.get_stats().cycles == reference.get_stats().cycles
+    base, golden = program.golden_result
+    assert torch.allclose(read_dram_tensor(sim, base, golden).float(), golden.float(), rtol=1e-2, atol=1e-2)
@@ -0,0 +1,37 @@
+import pytest
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.estimator import compare_with_simulation, estimate_instructions
+from npu_model.software import x
+from tests.helpers import SerialProgram
+
+
+def test_loops_run_their_constant_trip_count() -> None:
+    instructions = [
+        ADDI(rd=x(1), rs1=x(0), imm=3),
+        ADDI(rd=x(1), rs1=x(1), imm=-1),  # loop:
+        BNE(rs1=x(1), rs2=x(0), imm=-4),
+        ADDI(rd=x(3), rs1=x(3), imm=1),  # delay slot 1
+        ADDI(rd=x(4), rs1=x(4), imm=1),  # delay slot 2
+    ]
+    estimate = estimate_instructions(instructions, DefaultHardwareConfig())
+    assert estimate.instructions == 1 + 3 * 4
+    assert estimate.cycles == 13
+    assert estimate.exact_control_flow
+
+
+def test_runaway_loops_are_rejected() -> None:
+    instructions = [
+        JAL(rd=x(0), imm=0),
+        ADDI(rd=x(0), rs1=x(0), imm=0),
+        ADDI(rd=x(0), rs1=x(0), imm=0),
+    ]
+    with pytest.raises(ValueError, match="terminate"):
+        estimate_instructions(instructions, DefaultHardwareConfig(), max_instructions=100)
+
+
+def test_estimate_tracks_the_simulation() -> None:
+    accuracy = compare_with_simulation(SerialProgram(), DefaultHardwareConfig(), max_cycles=2000)
+    assert accuracy.estimate.busy["VPU"] == 3 * 65
+    assert abs(accuracy.error) < 0.15
@@ -0,0 +1,71 @@
+from typing import List, Tuple
+
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.host_profiler import HostProfiler
+from npu_model.isa import Instruction
+from npu_model.software import Program, m, x
+from tests.helpers import run_simulation
+
+
+class _MixedProgram(Program):
+    instructions: list[Instruction] = [
+        ADDI(rd=x(1), rs1=x(0), imm=1),
+        VLI_ALL(vd=m(0), imm=0x3F80),
+        ADDI(rd=x(2), rs1=x(1), imm=1),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+class _Outer:
+    def __init__(self, inner: "_Inner") -> None:
+        self.inner = inner
+
+    def run(self) -> int:
+        return self.inner.work(3) + self.inner.work(4)
+
+
+class _Inner:
+    def work(self, n: int) -> int:
+        return sum(range(n))
+
+
+def test_nested_regions_split_inclusive_and_exclusive_time() -> None:
+    inner = _Inner()
+    outer = _Outer(inner)
+    profiler = HostProfiler()
+    profiler._wrap(outer, "run", "outer")
+    profiler._wrap(inner, "work", lambda n: f"work:{n}")
+
+    assert outer.run() == 3 + 6
+    assert profiler.calls == {"outer": 1, "work:3": 1, "work:4": 1}
+    nested = profiler.inclusive_ns["work:3"] + profiler.inclusive_ns["work:4"]
+    assert profiler.exclusive_ns["outer"] == profiler.inclusive_ns["outer"] - nested
+
+    profiler.reset()
+    outer.run()
+    assert profiler.calls["outer"] == 1
+
+
+def test_simulation_host_profile_covers_components() -> None:
+    sim = run_simulation(
+        _MixedProgram(), DefaultHardwareConfig(), max_cycles=500, profile_host=True
+    )
+    profiler = sim.host_profiler
+    assert profiler is not None
+
+    assert profiler.calls["core"] == sim.cycle_count
+    assert profiler.calls["exec:addi"] == 2
+    assert profiler.calls["exec:vli.all"] == 1
+    for component in ("core", "ifu", "idu", "exu:Scalar0", "exu:Vector0", "logger", "exec"):
+        assert component in profiler.components()
+    assert sum(profiler.exclusive_ns.values()) >= profiler.total_ns > 0
+
+
+def test_host_profiling_is_off_by_default() -> None:
+    sim = run_simulation(_MixedProgram(), DefaultHardwareConfig(), max_cycles=500)
+
+    assert sim.host_profiler is None
+    assert "tick" not in vars(sim.core)
@@ -0,0 +1,89 @@
+from typing import List, Tuple
+
+import pytest
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig, ICacheHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.hardware.dma import dma_offchip_cycles
+from npu_model.hardware.imem import InstructionMemory
+from npu_model.isa import Instruction
+from npu_model.software import Program, x
+from npu_model.software.program import InstantiableProgram
+from tests.helpers import run_simulation
+
+
+class _TinyCacheConfig(DefaultHardwareConfig):
+    imem_model: str = "cache"
+    imem_size_bytes: int = 128
+    icache_line_bytes: int = 32
+    icache_ways: int = 2
+
+
+class _TinySramConfig(DefaultHardwareConfig):
+    imem_model: str = "sram"
+    imem_size_bytes: int = 8
+
+
+class _LoopProgram(Program):
+    instructions: list[Instruction] = [
+        ADDI(rd=x(1), rs1=x(0), imm=0),
+        ADDI(rd=x(2), rs1=x(0), imm=4),
+        ADDI(rd=x(1), rs1=x(1), imm=1),  # loop:
+        BLT(rs1=x(1), rs2=x(2), imm=-4),
+        ADDI(rd=x(3), rs1=x(3), imm=1),  # delay slot 1
+        ADDI(rd=x(4), rs1=x(4), imm=1),  # delay slot 2
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+def test_icache_hits_misses_and_lru_eviction() -> None:
+    config = _TinyCacheConfig()
+    imem = InstructionMemory(config)
+    refill = config.icache_miss_latency_cycles + dma_offchip_cycles(config, 32)
+
+    assert imem.access(0) == refill
+    assert imem.access(4) == 0
+    assert imem.access(64) == refill  # same set, second way
+    assert imem.access(0) == 0  # line 0 becomes most recently used
+    assert imem.access(128) == refill  # evicts line 64
+    assert imem.access(0) == 0
+    assert imem.access(64) == refill
+    assert imem.misses == 4
+    assert imem.refill_bytes == 4 * 32
+
+
+def test_isram_rejects_programs_that_do_not_fit() -> None:
+    imem = InstructionMemory(_TinySramConfig())
+    imem.load_program(InstantiableProgram([ADDI(rd=x(1), rs1=x(0), imm=1)] * 2))
+    with pytest.raises(ValueError, match="does not fit"):
+        imem.load_program(InstantiableProgram([ADDI(rd=x(1), rs1=x(0), imm=1)] * 3))
+
+
+def test_cold_icache_miss_delays_fetch() -> None:
+    ideal = run_simulation(_LoopProgram(), DefaultHardwareConfig(), max_cycles=500)
+    cached = run_simulation(_LoopProgram(), ICacheHardwareConfig(), max_cycles=500)
+
+    assert cached.core.arch_state.xrf[1:5] == ideal.core.arch_state.xrf[1:5]
+    assert ideal.get_stats().imem_stats is None
+
+    imem_stats = cached.get_stats().imem_stats
+    assert imem_stats is not None
+    assert imem_stats.misses == 1
+    assert imem_stats.fetch_stall_cycles > 0
+    assert cached.cycle_count == ideal.cycle_count + imem_stats.fetch_stall_cycles
+
+
+class _OneInstructionLineConfig(_TinyCacheConfig):
+    icache_line_bytes: int = 4
+
+
+def test_refilled_fetch_counts_as_one_access() -> None:
+    program = InstantiableProgram([ADDI(rd=x(1), rs1=x(1), imm=1)] * 8)
+    sim = run_simulation(program, _OneInstructionLineConfig(), max_cycles=2000)
+
+    imem_stats = sim.get_stats().imem_stats
+    assert imem_stats is not None
+    assert sim.core.arch_state.read_xrf(1) == 8
+    assert imem_stats.accesses == imem_stats.misses == 8
+    assert imem_stats.hit_rate == 0.0
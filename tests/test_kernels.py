@@ -0,0 +1,106 @@
+import pytest
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.programs.parameterized_fused_attention import ParameterizedFusedAttentionQ32K64Program
+from npu_model.configs.programs.parameterized_matmul import (
+    ParameterizedMatmulDoubleBufferedProgram,
+    ParameterizedMatmulProgram,
+    _make_program,
+)
+from npu_model.kernels import (
+    AttentionVariant,
+    MatmulVariant,
+    VmemAllocator,
+    attention_program,
+    build_attention,
+    double_buffered_matmul,
+    elementwise_program,
+    gemm_program,
+    measure_overlap,
+)
+from npu_model.software.program import InstantiableProgram
+from tests.helpers import read_dram_tensor, run_simulation
+
+
+def test_double_buffering_hides_more_dma_than_the_hand_written_kernel() -> None:
+    config = DefaultHardwareConfig()
+    baseline = run_simulation(ParameterizedMatmulProgram(), config, max_cycles=100000, record_timeline=True)
+    program = ParameterizedMatmulDoubleBufferedProgram()
+    generated = run_simulation(program, config, max_cycles=100000, record_timeline=True)
+
+    base, expected = program.golden_result
+    assert torch.equal(read_dram_tensor(generated, base, expected), expected)
+
+    before, after = measure_overlap(baseline), measure_overlap(generated)
+    assert after.overlap > before.overlap
+    assert after.cycles < before.cycles
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        MatmulVariant(mxus=(0,)),
+        MatmulVariant(order="mn", reuse=2, mxus=(0, 1)),
+        MatmulVariant(order="nm", reuse=2, mxus=(1,)),
+        MatmulVariant(order="nm", reuse=1, mxus=(1, 0)),
+    ],
+    ids=lambda variant: variant.label,
+)
+def test_generated_matmul_variants_match_the_reference(variant: MatmulVariant) -> None:
+    config = DefaultHardwareConfig()
+    program = InstantiableProgram(double_buffered_matmul(96, 64, 96, config, variant=variant))
+    program.memory_regions, (base, expected) = _make_program(96, 64, 96, seed=5)
+    sim = run_simulation(program, config, max_cycles=200000)
+    assert torch.equal(read_dram_tensor(sim, base, expected), expected)
+
+
+def test_working_set_must_fit_in_vmem() -> None:
+    allocator = VmemAllocator(capacity=0x3000)
+    first = allocator.allocate("A", 1000)
+    assert first.addr == 0x2000
+    assert allocator.allocate("B", 1024).addr == 0x2400
+    with pytest.raises(ValueError, match="VMEM capacity exceeded"):
+        allocator.allocate("C", 4096)
+
+
+def test_dimensions_must_be_tile_multiples() -> None:
+    with pytest.raises(ValueError, match="multiples of 32"):
+        double_buffered_matmul(64, 48, 64, DefaultHardwareConfig())
+
+
+@pytest.mark.parametrize(
+    "make_program",
+    [
+        lambda config: gemm_program(64, 96, 32, config, MatmulVariant(reuse=2, mxus=(0, 1))),
+        lambda config: attention_program(64, 64, config),
+        lambda config: attention_program(32, 96, config, head_dim=32, variant=AttentionVariant(0, 0, False)),
+        lambda config: elementwise_program("sub", 64, 96, config),
+        lambda config: elementwise_program("div", 32, 64, config, double_buffer=False),
+    ],
+    ids=["gemm", "attention", "attention-d32-single", "sub", "div-single"],
+)
+def test_generated_programs_match_their_golden_result(make_program) -> None:
+    config = DefaultHardwareConfig()
+    program = make_program(config)
+    sim = run_simulation(program, config, max_cycles=200000)
+    base, expected = program.golden_result
+    rtol, atol = getattr(program, "kernel_tolerance", (1e-2, 1e-2))
+    assert torch.allclose(read_dram_tensor(sim, base, expected).float(), expected.float(), rtol=rtol, atol=atol)
+
+
+def test_generated_attention_beats_the_hand_written_kernel() -> None:
+    config = DefaultHardwareConfig()
+    baseline = run_simulation(ParameterizedFusedAttentionQ32K64Program(), config, max_cycles=100000)
+    generated = run_simulation(attention_program(32, 64, config), config, max_cycles=100000)
+    assert generated.get_stats().cycles < baseline.get_stats().cycles
+
+
+def test_generator_arguments_are_checked() -> None:
+    config = DefaultHardwareConfig()
+    with pytest.raises(ValueError, match="multiples of 32"):
+        build_attention(32, 64, config, head_dim=48)
+    with pytest.raises(ValueError, match="matrix registers"):
+        build_attention(32, 64, config, head_dim=1024)
+    with pytest.raises(ValueError, match="op must be one of"):
+        elementwise_program("pow", 32, 32, config)
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_assembler_and_linter_do_not_import_torch() -> None:
+    out = _run(
+        """
+        import io, sys
+        from npu_model.util.converter import input_to_program
+        from npu_model.lsp.linter import lint_text
+
+        program = input_to_program(io.StringIO("li x1, 0x12345\\nvload m0, 0(x1)\\n"))
+        program.assemble()
+        lint_text("addi x1, x0, 1\\n")
+        print("torch" in sys.modules)
+        """
+    )
+    assert out == "False"
+
+
+def test_torch_loads_on_first_execution() -> None:
+    out = _run(
+        """
+        import sys
+        from npu_model.configs.isa_definition import _int_to_le_bytes
+
+        before = "torch" in sys.modules
+        data = _int_to_le_bytes(0x0102, 2)
+        print(before, "torch" in sys.modules, data.tolist())
+        """
+    )
+    assert out == "False True [2, 1]"
@@ -0,0 +1,30 @@
+from npu_model.lsp.linter import IncrementalLinter, lint_text
+
+SOURCE = """\
+loop:
+addi x1, x1, -1
+bne x1, x0, loop
+beq x1, x0, done
+vload m0, 0(x2)
+"""
+
+
+def test_incremental_linter_matches_full_lint_across_edits() -> None:
+    linter = IncrementalLinter()
+    assert linter.lint(SOURCE) == lint_text(SOURCE)
+    assert linter.relinted == 5
+
+    # an edit to one line re-lints that line only
+    edited = SOURCE.replace("addi x1, x1, -1", "addi x1, x1, -2")
+    assert linter.lint(edited) == lint_text(edited)
+    assert linter.relinted == 6
+
+    # defining `done` re-lints the lines whose operands name it
+    edited += "done:\n"
+    assert linter.lint(edited) == lint_text(edited)
+    assert linter.relinted == 8
+
+    # moving lines around re-uses their cached diagnostics
+    moved = "\n".join(reversed(edited.splitlines())) + "\n"
+    assert linter.lint(moved) == lint_text(moved)
+    assert linter.relinted == 8
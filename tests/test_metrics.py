@@ -0,0 +1,59 @@
+from typing import List, Tuple
+
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.isa import Instruction
+from npu_model.metrics import JsonlMetricsSink, PrometheusMetricsSink, read_jsonl_snapshots
+from npu_model.software import Program, m, x
+from tests.helpers import run_simulation
+
+
+class _DelayProgram(Program):
+    instructions: list[Instruction] = [
+        ADDI(rd=x(1), rs1=x(0), imm=1),
+        VLI_ALL(vd=m(0), imm=0x3F80),
+        DELAY(imm=60),
+        ADDI(rd=x(2), rs1=x(0), imm=2),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+def test_jsonl_sink_streams_periodic_snapshots(tmp_path) -> None:
+    path = tmp_path / "metrics.jsonl"
+    sim = run_simulation(
+        _DelayProgram(),
+        DefaultHardwareConfig(),
+        max_cycles=500,
+        metrics_sinks=[JsonlMetricsSink(path)],
+        metrics_interval=10,
+    )
+    snapshots = read_jsonl_snapshots(path)
+
+    periodic, final = snapshots[:-1], snapshots[-1]
+    assert [s.cycle for s in periodic] == list(range(10, sim.cycle_count + 1, 10))
+    assert not any(s.finished for s in periodic)
+    assert final.finished
+    assert final.cycle == sim.cycle_count
+    assert final.instructions == sim.core.total_completed
+    assert final.exu_busy_cycles["Vector0"] > 0
+    # the delay keeps retirement flat for several intervals
+    assert max(s.cycles_since_progress for s in periodic) >= 30
+
+
+def test_prometheus_sink_holds_latest_snapshot(tmp_path) -> None:
+    path = tmp_path / "npu.prom"
+    sim = run_simulation(
+        _DelayProgram(),
+        DefaultHardwareConfig(),
+        max_cycles=500,
+        metrics_sinks=[PrometheusMetricsSink(path)],
+        metrics_interval=10,
+    )
+    text = path.read_text()
+
+    assert f"npu_sim_cycles {sim.cycle_count}\n" in text
+    assert "npu_sim_finished 1\n" in text
+    assert 'npu_sim_exu_utilization{unit="Vector0"}' in text
+    assert not (tmp_path / "npu.prom.tmp").exists()
@@ -0,0 +1,63 @@
+from typing import List, Tuple
+
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.isa import Instruction
+from npu_model.isa_types import (
+    CSR_CYCLE,
+    CSR_EXU_BUSY_BASE,
+    CSR_HIGH_HALF_OFFSET,
+    CSR_INSTRET,
+    CSR_STALL_CYCLES,
+)
+from npu_model.software import Program, m, x
+from tests.helpers import run_simulation
+
+_VECTOR0 = 3  # index of Vector0 in DefaultHardwareConfig.execution_units
+
+
+class _CounterProgram(Program):
+    instructions: list[Instruction] = [
+        CSRRS(rd=x(1), rs1=x(0), imm=CSR_CYCLE),
+        ADDI(rd=x(10), rs1=x(0), imm=1),
+        ADDI(rd=x(10), rs1=x(0), imm=2),
+        ADDI(rd=x(10), rs1=x(0), imm=3),
+        CSRRS(rd=x(2), rs1=x(0), imm=CSR_CYCLE),
+        CSRRS(rd=x(3), rs1=x(0), imm=CSR_INSTRET),
+        CSRRS(rd=x(4), rs1=x(0), imm=CSR_CYCLE + CSR_HIGH_HALF_OFFSET),
+        VLI_ALL(vd=m(0), imm=0x3F80),
+        DELAY(imm=100),
+        CSRRS(rd=x(5), rs1=x(0), imm=CSR_EXU_BUSY_BASE + _VECTOR0),
+        CSRRS(rd=x(6), rs1=x(0), imm=CSR_STALL_CYCLES),
+        CSRRW(rd=x(7), rs1=x(2), imm=CSR_CYCLE),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+def test_programs_read_perf_counters() -> None:
+    sim = run_simulation(_CounterProgram(), DefaultHardwareConfig(), max_cycles=1000)
+    xrf = sim.core.arch_state.xrf
+
+    # one scalar instruction per cycle between the two cycle reads
+    assert xrf[2] - xrf[1] == 4
+    # csrr x1, three addis and csrr x2 retired before csrr x3 executes
+    assert xrf[3] == 5
+    assert xrf[4] == 0
+    vector0 = sim.core.exus[_VECTOR0]
+    assert vector0.name == "Vector0"
+    assert xrf[5] == vector0.busy_cycles > 0
+    # the delay stalls dispatch for most of its length
+    assert xrf[6] >= 90
+
+
+def test_perf_counter_csrs_are_read_only() -> None:
+    sim = run_simulation(_CounterProgram(), DefaultHardwareConfig(), max_cycles=1000)
+    state = sim.core.arch_state
+
+    assert state.csrf[CSR_CYCLE] == 0
+    assert state.xrf[7] > state.xrf[2]
+    counters = sim.core.perf_counters.snapshot()
+    assert counters[CSR_CYCLE] == sim.core.cycle_accounting.cycles
+    assert counters[CSR_INSTRET] == sim.core.total_completed
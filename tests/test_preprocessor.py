@@ -0,0 +1,104 @@
+import io
+
+import pytest
+
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.lsp.linter import lint_text
+from npu_model.util.converter import format_instruction, input_to_program
+from npu_model.util.preprocessor import AsmSyntaxError, hi, lo, preprocess
+
+
+def _assemble(source: str) -> list[str]:
+    return [format_instruction(insn) for insn in input_to_program(io.StringIO(source)).instructions]
+
+
+def test_macros_and_repeats_expand_to_plain_assembly() -> None:
+    source = r"""
+        .equ VMEM_A, 0x2000
+        .equ TILE_BYTES, 32 * 32
+        .macro load_tile dst, offset=0
+            li x5, VMEM_A + \offset
+            vload \dst, 0(x5)
+        .endm
+        .equ I, 0
+        .irp r, 0, 1
+            load_tile m\r, I * TILE_BYTES   # a comment
+            .equ I, I + 1
+        .endr
+        .rept 2
+            addi x1, x1, -(TILE_BYTES / 512)
+        .endr
+        addi x2 x2 1
+    """
+    assert _assemble(source) == [
+        "lui x5, 2",
+        "vload m0, 0(x5)",
+        "lui x5, 2",
+        "addi x5, x5, 1024",
+        "vload m1, 0(x5)",
+        "addi x1, x1, -2",
+        "addi x1, x1, -2",
+        "addi x2, x2, 1",
+    ]
+
+
+def test_macro_labels_are_unique_per_expansion() -> None:
+    source = r"""
+        .macro spin n
+        wait\@:
+            addi x7, x7, 1
+            blt x7, x8, wait\@
+            delay 0
+            delay \n
+        .endm
+        spin 1
+        spin 2
+    """
+    assembled = _assemble(source)
+    assert assembled[1] == assembled[5] == "blt x7, x8, -4"
+    assert assembled[3::4] == ["delay 1", "delay 2"]
+
+
+@pytest.mark.parametrize("value", [0x2000, 0x2800, 0x12345FFF, 0x7FF, -1, 0xFFFFF800])
+def test_hi_and_lo_rebuild_the_value(value: int) -> None:
+    assert ((hi(value) << 12) + lo(value) - value) & 0xFFFFFFFF == 0
+    assert _assemble(f"lui x6, %hi({value})\naddi x6, x6, %lo({value})") == [
+        f"lui x6, {hi(value)}",
+        f"addi x6, x6, {lo(value)}",
+    ]
+
+
+def test_expanded_lines_remember_their_source() -> None:
+    lines = preprocess(".macro twice\n addi x1, x1, 1\n addi x1, x1, 2\n.endm\nnop\n twice\n")
+    assert [(s.text, s.line, s.origin) for s in lines] == [
+        ("nop", 4, 4),
+        ("addi x1, x1, 1", 1, 5),
+        ("addi x1, x1, 2", 2, 5),
+    ]
+
+
+@pytest.mark.parametrize(
+    "source, line, message",
+    [
+        ("nop\naddi x1, x1, FOO + 1", 1, "Unknown symbol 'FOO'"),
+        (".rept 2\naddi x1, x1, 1", 0, "'.rept' without '.endr'"),
+        (".macro m a\n addi x1, x1, \\b\n.endm\nm 1", 1, "Unknown macro parameter '\\b'"),
+        (".macro m a\n.endm\nm", 2, "Macro 'm' is missing argument 'a'"),
+        (".bogus 1", 0, "Unknown or unmatched directive '.bogus'"),
+        ("addi x1, x1, 1 / 0", 0, "Division by zero"),
+    ],
+)
+def test_errors_name_the_source_line(source: str, line: int, message: str) -> None:
+    with pytest.raises(AsmSyntaxError) as exc_info:
+        preprocess(source)
+    assert (exc_info.value.line, exc_info.value.message) == (line, message)
+
+
+def test_linter_reports_expanded_problems_on_the_invocation() -> None:
+    source = (
+        ".macro load dst\n    vload \\dst, 0(x1)\n.endm\n"
+        ".equ N, 4\n    addi x1, x1, N\n    load m99\n    load m1\n"
+    )
+    diagnostics = lint_text(source)
+    assert [(d.line, d.col_start) for d in diagnostics] == [(5, 4)]
+    assert lint_text(".equ N, 4\naddi x1, x1, N + M\n")[0].message == "Unknown symbol 'M'"
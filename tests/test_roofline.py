@@ -0,0 +1,64 @@
+from typing import List, Tuple
+
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.isa import Instruction
+from npu_model.roofline import roofline_peaks, roofline_point
+from npu_model.software import Program, acc, m, w, x
+from tests.helpers import run_simulation
+
+
+class _DmaLoadProgram(Program):
+    instructions: list[Instruction] = [
+        ADDI(rd=x(2), rs1=x(0), imm=1024),
+        DMA_CONFIG_CH0(rs1=x(0)),
+        DMA_WAIT_CH0(),
+        DMA_LOAD_CH0(rd=x(0), rs1=x(0), rs2=x(2)),
+        DMA_WAIT_CH0(),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = [
+        (0, torch.zeros(1024, dtype=torch.uint8)),
+    ]
+
+
+class _MatmulProgram(Program):
+    instructions: list[Instruction] = [
+        VMATMUL_MXU0(vd=acc(0), vs1=m(0), vs2=w(0)),
+        VADD_BF16(vd=m(4), vs1=m(2), vs2=m(2)),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+def test_roofs_follow_the_hardware_config() -> None:
+    peaks = roofline_peaks(DefaultHardwareConfig())
+
+    assert peaks.mxu_macs_per_cycle == 2 * 32 * 1024 / 32
+    assert peaks.vpu_element_ops_per_cycle == 32 * 32 / 4
+    assert peaks.dma_bytes_per_cycle == 2
+    assert peaks.ridge_point == peaks.mxu_macs_per_cycle / 2
+
+
+def test_dma_bound_kernel() -> None:
+    sim = run_simulation(_DmaLoadProgram(), DefaultHardwareConfig(), max_cycles=5000)
+    point = roofline_point(sim, "dma")
+
+    assert point.dma_bytes == 1024
+    assert point.mxu_macs == 0
+    assert point.bound == "dma"
+    assert point.sol_cycles == 512
+    assert point.cycles >= point.sol_cycles
+    assert 0.0 < point.sol_fraction <= 1.0
+
+
+def test_mxu_and_vpu_work_is_counted() -> None:
+    sim = run_simulation(_MatmulProgram(), DefaultHardwareConfig(), max_cycles=500)
+    stats = sim.get_stats()
+
+    assert stats.mxu_macs == 32 * 32 * 32
+    assert stats.vpu_element_ops == 32 * 32
+    point = roofline_point(sim, "matmul")
+    assert point.arithmetic_intensity is None
+    assert point.bound == "mxu"
+    assert point.sol_cycles == 16
@@ -0,0 +1,100 @@
+from typing import List, Tuple
+
+import pytest
+import torch
+
+import npu_model.configs.programs as program_configs
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.isa import Instruction
+from npu_model.scheduler import schedule_instructions, schedule_program, verify_schedule
+from npu_model.software import Program, m, x
+from tests.helpers import SerialProgram, run_simulation
+
+
+def test_schedule_overlaps_units_and_keeps_results() -> None:
+    config = DefaultHardwareConfig()
+    program = SerialProgram()
+    scheduled = schedule_program(program, config)
+
+    original = run_simulation(program, config, max_cycles=2000)
+    rescheduled = run_simulation(scheduled, config, max_cycles=2000)
+
+    assert rescheduled.cycle_count < original.cycle_count
+    for reg in (0, 2, 3):
+        assert torch.equal(
+            rescheduled.core.arch_state.mrf[reg], original.core.arch_state.mrf[reg]
+        )
+    assert rescheduled.core.arch_state.read_xrf(1) == 1
+
+
+def test_schedule_rejects_absolute_addresses() -> None:
+    with pytest.raises(ValueError, match="auipc"):
+        schedule_instructions([AUIPC(rd=x(1), imm=0)], DefaultHardwareConfig())
+
+
+@pytest.mark.parametrize(
+    "program_name",
+    ["SmolVLAFusedAttentionProgram", "ParameterizedElementwiseAdd32x32Program"],
+)
+def test_scheduled_kernel_matches_golden(program_name: str) -> None:
+    program = getattr(program_configs, program_name)()
+    config = DefaultHardwareConfig()
+    scheduled = schedule_program(program, config)
+
+    result = verify_schedule(
+        program, scheduled, config, max_cycles=getattr(program, "kernel_max_cycles", 200000)
+    )
+
+    assert result.golden_match, f"max abs error {result.max_abs_error}"
+    assert result.scheduled_cycles <= result.original_cycles
+    if program_name == "SmolVLAFusedAttentionProgram":
+        assert result.cycles_saved > 0
+
+
+_QUEUED_A = (torch.arange(4096) % 251).to(torch.uint8)
+_QUEUED_B = torch.full((1024,), 7, dtype=torch.uint8)
+_QUEUED_C = torch.full((1024,), 9, dtype=torch.uint8)
+
+
+class _QueuedTransferProgram(Program):
+    """A DMA load queued behind another whose registers are reused right after it."""
+
+    instructions: list[Instruction] = [
+        DMA_CONFIG_CH0(rs1=x(0)),
+        DMA_WAIT_CH0(),
+        DMA_CONFIG_CH1(rs1=x(0)),
+        DMA_WAIT_CH1(),
+        DMA_CONFIG_CH2(rs1=x(0)),
+        DMA_WAIT_CH2(),
+        LUI(rd=x(1), imm=2),
+        LUI(rd=x(2), imm=1),
+        DMA_LOAD_CH0(rd=x(1), rs1=x(0), rs2=x(2)),
+        LUI(rd=x(3), imm=3),
+        LUI(rd=x(4), imm=1),
+        ADDI(rd=x(5), rs1=x(0), imm=1024),
+        # waits behind the 4 KB transfer, then reads x3, x4 and x5
+        DMA_LOAD_CH1(rd=x(3), rs1=x(4), rs2=x(5)),
+        ADDI(rd=x(3), rs1=x(3), imm=1024),
+        ADDI(rd=x(4), rs1=x(4), imm=1024),
+        DMA_LOAD_CH2(rd=x(3), rs1=x(4), rs2=x(5)),
+        DMA_WAIT_CH0(),
+        DMA_WAIT_CH1(),
+        DMA_WAIT_CH2(),
+        LUI(rd=x(6), imm=2),
+        ADDI(rd=x(6), rs1=x(6), imm=-2048),
+        # A, B and C lie side by side in VMEM; 0x1800 is also their size
+        DMA_STORE_CH0(rd=x(6), rs1=x(1), rs2=x(6)),
+        DMA_WAIT_CH0(),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = [(0x0000, _QUEUED_A), (0x1000, _QUEUED_B), (0x1400, _QUEUED_C)]
+    golden_result: tuple[int, torch.Tensor] = (0x1800, torch.cat([_QUEUED_A, _QUEUED_B, _QUEUED_C]))
+
+
+def test_queued_transfers_keep_their_registers() -> None:
+    program = _QueuedTransferProgram()
+    config = DefaultHardwareConfig()
+
+    result = verify_schedule(program, schedule_program(program, config), config, max_cycles=20000)
+
+    assert result.golden_match, f"max abs error {result.max_abs_error}"
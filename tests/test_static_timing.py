@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.static_timing import BankConflict, StaticTimer
+from npu_model.util.converter import strip_comment
+
+ASM_DIR = Path(__file__).resolve().parent.parent / "npu_model" / "configs" / "programs" / "asm"
+
+SOURCE = """\
+li x1, 0
+vload m0, 0(x1)
+vadd.bf16 m2, m0, m0
+delay 40
+vload m4, 0(x1)
+loop:
+addi x2, x2, 1
+bne x2, x0, loop
+nop
+nop
+"""
+
+
+def test_static_timing_follows_latencies_delays_and_banks() -> None:
+    blocks = StaticTimer(DefaultHardwareConfig()).estimate(SOURCE)
+    assert [(b.start_line, b.end_line) for b in blocks] == [(0, 5), (5, 10)]
+
+    first = blocks[0]
+    issue = {t.line: t.issue for t in first.lines}
+    assert issue == {0: 0, 1: 1, 2: 35, 3: 76, 4: 77}
+    # the vadd reads m0 while the vload is still writing it
+    assert first.conflicts == [BankConflict(line=2, resource="m0", holder=1, until=35)]
+    assert first.lines[2].stall == 33
+    assert first.cycles == 111
+    assert first.busy == {"scalar": 2, "LSU": 68, "VPU": 66}
+    assert blocks[1].cycles == 4
+
+
+def test_static_timing_retimes_changed_blocks_only() -> None:
+    timer = StaticTimer(DefaultHardwareConfig())
+    timer.estimate(SOURCE)
+    assert timer.retimed == 2
+
+    # an edit inside the loop leaves the first block cached
+    edited = SOURCE.replace("addi x2, x2, 1", "addi x2, x2, 2")
+    timer.estimate(edited)
+    assert timer.retimed == 3
+
+    # changing a register value entering the loop re-times both
+    timer.estimate(edited.replace("li x1, 0", "li x1, 32"))
+    assert timer.retimed == 5
+
+
+def test_static_timing_expands_directives_onto_source_lines() -> None:
+    source = """\
+.equ BASE, 0
+.macro load_add dst
+    vload m0, 0(x1)
+    vadd.bf16 \\dst, m0, m0
+.endm
+li x1, BASE
+load_add m2
+"""
+    (block,) = StaticTimer(DefaultHardwareConfig()).estimate(source)
+    assert (block.start_line, block.end_line) == (5, 7)
+
+    # the macro's vload and vadd are reported on the invocation
+    assert [(t.line, t.unit, t.issue, t.complete, t.stall) for t in block.lines] == [
+        (5, "scalar", 0, 1, 0),
+        (6, "VPU", 1, 101, 33),
+    ]
+    assert block.conflicts == [BankConflict(line=6, resource="m0", holder=6, until=35)]
+
+
+def test_static_timing_times_every_instruction_of_a_directive_kernel() -> None:
+    source = (ASM_DIR / "matmul.S").read_text()
+    lines = source.splitlines()
+    code = {n for n, line in enumerate(lines) if strip_comment(line) and not strip_comment(line).startswith(".")}
+
+    blocks = StaticTimer(DefaultHardwareConfig()).estimate(source)
+    assert {t.line for block in blocks for t in block.lines} == code
@@ -0,0 +1,81 @@
+from typing import List, Tuple
+
+import numpy as np
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.isa import Instruction
+from npu_model.software import Program, m, x
+from npu_model.timeline import Timeline
+from tests.helpers import run_simulation
+
+
+class _FakeUnit:
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.busy_cycles = 0
+
+    def step(self, cycle: int) -> None:
+        self.busy_cycles += self.pattern[cycle] == "#"
+
+
+class _OverlapProgram(Program):
+    instructions: list[Instruction] = [
+        VLI_ALL(vd=m(0), imm=0x3F80),
+        ADDI(rd=x(1), rs1=x(0), imm=1),
+        ADDI(rd=x(2), rs1=x(0), imm=2),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+def _record(patterns: dict[str, str]) -> Timeline:
+    units = [_FakeUnit(pattern) for pattern in patterns.values()]
+    timeline = Timeline(patterns)
+    for cycle in range(len(next(iter(patterns.values())))):
+        for unit in units:
+            unit.step(cycle)
+        timeline.record(units)  # type: ignore[arg-type]
+    timeline.finish()
+    return timeline
+
+
+def test_intervals_masks_and_overlap() -> None:
+    timeline = _record({"a": "##..###.", "b": ".###...#"})
+
+    starts, ends = timeline.intervals("a")
+    assert starts.tolist() == [0, 4] and ends.tolist() == [2, 7]
+    assert timeline.mask("b").tolist() == [c == "#" for c in ".###...#"]
+    assert timeline.busy_cycles("a") == 5
+    assert timeline[1] == {"a": True, "b": True}
+    assert timeline[-1] == {"a": False, "b": True}
+    assert timeline.active_counts().tolist() == [1, 2, 1, 1, 1, 1, 1, 1]
+    assert timeline.concurrency_histogram().tolist() == [0, 7, 1]
+    assert timeline.overlap_cycles(["a"], ["b"]) == 1
+    assert timeline.bar("a", 4) == "█·██"
+    assert timeline.bar("a", 4, active="#", idle=".") == "#.##"
+
+
+def test_npz_round_trip(tmp_path) -> None:
+    timeline = _record({"a": "##..###.", "b": "........"})
+    path = tmp_path / "timeline.npz"
+    timeline.save(path)
+    loaded = Timeline.load(path)
+
+    assert loaded.names == ["a", "b"]
+    assert len(loaded) == 8
+    for name in loaded.names:
+        assert np.array_equal(loaded.mask(name), timeline.mask(name))
+
+
+def test_simulation_timeline_matches_busy_cycles() -> None:
+    sim = run_simulation(
+        _OverlapProgram(), DefaultHardwareConfig(), max_cycles=500, record_timeline=True
+    )
+    timeline = sim.timeline
+    assert timeline is not None
+
+    assert len(timeline) == sim.cycle_count
+    for exu in sim.core.exus:
+        assert timeline.busy_cycles(exu.name) == exu.busy_cycles
+    assert timeline.overlap_cycles(["Vector0"], ["Scalar0"]) > 0
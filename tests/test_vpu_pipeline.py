@@ -0,0 +1,69 @@
+from typing import List, Tuple
+
+import pytest
+import torch
+
+from npu_model.configs.hardware import DefaultHardwareConfig, PipelinedVpuHardwareConfig
+from npu_model.configs.isa_definition import *  # noqa: F401, F403
+from npu_model.hardware.bank_conflict import BankConflictError
+from npu_model.hardware.vpu import VPU_OP_LATENCIES, vpu_op_class
+from npu_model.isa import Instruction
+from npu_model.software import Program, m
+from tests.helpers import run_simulation
+
+BF16_ONE = 0x3F80
+
+
+class _OverlappedVliProgram(Program):
+    instructions: list[Instruction] = [
+        VLI_ALL(vd=m(0), imm=BF16_ONE),
+        DELAY(imm=2),
+        VLI_ALL(vd=m(1), imm=BF16_ONE),
+        DELAY(imm=2),
+        VLI_ALL(vd=m(2), imm=BF16_ONE),
+        DELAY(imm=2),
+        VLI_ALL(vd=m(3), imm=BF16_ONE),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+class _OverlappedConflictProgram(Program):
+    instructions: list[Instruction] = [
+        VLI_ALL(vd=m(0), imm=BF16_ONE),
+        DELAY(imm=2),
+        VLI_ALL(vd=m(0), imm=BF16_ONE),
+    ]
+    memory_regions: List[Tuple[int, torch.Tensor]] = []
+
+
+def test_op_classes() -> None:
+    assert vpu_op_class("vadd.bf16") == "simple"
+    assert vpu_op_class("vexp.bf16") == "non_pipelineable"
+    assert vpu_op_class("vredsum.bf16") == "non_pipelineable"
+    assert vpu_op_class("vtrpose.xlu") == "transform"
+
+
+def test_pipelined_vpu_overlaps_independent_ops() -> None:
+    sim = run_simulation(_OverlappedVliProgram(), PipelinedVpuHardwareConfig(), max_cycles=500)
+
+    vpu = next(exu for exu in sim.core.exus if exu.name == "Vector0")
+    assert vpu.total_instructions == 4
+    assert vpu.peak_in_flight == 4
+    assert vpu.busy_cycles < 4 * VPU_OP_LATENCIES["vli.all"]
+
+    stats = sim.get_stats()
+    assert stats.exu_stats["Vector0"].throughput > 1 / VPU_OP_LATENCIES["vli.all"]
+
+    expected = torch.ones_like(sim.core.arch_state.read_mrf_bf16(0))
+    for reg in range(4):
+        assert torch.equal(sim.core.arch_state.read_mrf_bf16(reg), expected)
+
+
+def test_blocking_vpu_rejects_overlapped_schedule() -> None:
+    with pytest.raises(RuntimeError, match="Backpressure"):
+        run_simulation(_OverlappedVliProgram(), DefaultHardwareConfig(), max_cycles=500)
+
+
+def test_pipelined_vpu_reports_structural_hazards() -> None:
+    with pytest.raises(BankConflictError):
+        run_simulation(_OverlappedConflictProgram(), PipelinedVpuHardwareConfig(), max_cycles=500)
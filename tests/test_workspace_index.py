@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+
+from npu_model.lsp.workspace_index import WorkspaceIndex
+
+KERNEL = """\
+    li x1, 4
+loop:
+    addi x1, x1, -1   # loop body
+    bne x1, x0, loop
+    beq x1, x0, done
+done:
+    nop
+"""
+
+PROGRAM = """\
+class LoopProgram(Program):
+    instructions = load_asm(ASM_FOLDER / 'loop.S')
+
+class OtherProgram(Program):
+    instructions = load_asm(ASM_FOLDER / "loop.S")
+"""
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> tuple[WorkspaceIndex, Path, Path]:
+    (tmp_path / "asm").mkdir()
+    kernel = tmp_path / "asm" / "loop.S"
+    kernel.write_text(KERNEL)
+    program = tmp_path / "loop_program.py"
+    program.write_text(PROGRAM)
+    index = WorkspaceIndex(tmp_path, workers=2)
+    index.build().result(timeout=10)
+    return index, kernel, program
+
+
+def test_labels_and_kernel_users_are_indexed(workspace: tuple[WorkspaceIndex, Path, Path]) -> None:
+    index, kernel, program = workspace
+    assert index.symbol_at(kernel, 3, 17) == ("label", "loop")
+    assert index.symbol_at(kernel, 3, 4) is None  # the mnemonic
+    assert index.label_definition(kernel, "loop").line == 1
+    assert [loc.line for loc in index.label_references(kernel, "loop")] == [1, 3]
+    assert [loc.line for loc in index.label_references(kernel, "done", include_definition=False)] == [4]
+
+    users = index.programs_using("loop.S")
+    assert [(ref.class_name, ref.location.line) for ref in users] == [("LoopProgram", 1), ("OtherProgram", 4)]
+    assert index.symbol_at(program, 1, users[0].location.col_start) == ("kernel", "loop.S")
+    assert index.kernel_path("loop.S") == kernel
+
+
+def test_updates_follow_editor_buffers_and_disk(workspace: tuple[WorkspaceIndex, Path, Path]) -> None:
+    index, kernel, program = workspace
+    index.update(kernel, KERNEL.replace("done", "exit"))
+    assert index.labels(kernel) == ["loop", "exit"]
+
+    # while the buffer is open, the copy on disk is ignored
+    index.update(kernel)
+    assert index.labels(kernel) == ["loop", "exit"]
+    index.close(kernel)
+    assert index.labels(kernel) == ["loop", "done"]
+
+    program.write_text(PROGRAM.replace("'loop.S'", "'other.S'"))
+    index.update(program)
+    assert [ref.class_name for ref in index.programs_using("loop.S")] == ["OtherProgram"]
+    index.remove(program)
+    assert index.programs_using("loop.S") == []
+
+
+def test_rename(workspace: tuple[WorkspaceIndex, Path, Path]) -> None:
+    index, kernel, program = workspace
+    assert len(index.rename_label(kernel, "loop", "again")) == 2
+    with pytest.raises(ValueError):
+        index.rename_label(kernel, "loop", "done")
+    with pytest.raises(ValueError):
+        index.rename_label(kernel, "loop", "1bad")
+
+    assert {loc.path for loc in index.rename_kernel("loop.S", "countdown.S")} == {program}
+    with pytest.raises(ValueError):
+        index.rename_kernel("loop.S", "countdown.py")